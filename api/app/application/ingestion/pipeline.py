@@ -0,0 +1,191 @@
+"""
+Staged ingestion pipeline.
+
+Stages run concurrently and are connected by bounded asyncio queues, so a
+slow stage applies backpressure to the ones before it instead of letting
+intermediate results pile up in memory.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Stage workers receive an item and an `emit` coroutine that forwards outputs
+# to the next stage (blocking while that stage's queue is full).
+Emit = Callable[[Any], Awaitable[None]]
+StageWorker = Callable[[Any, Emit], Awaitable[None]]
+
+_END = object()
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline stage: a worker function run by `concurrency` tasks.
+    """
+    name: str
+    worker: StageWorker
+    concurrency: int = 1
+
+
+@dataclass
+class StageMetrics:
+    """
+    Throughput and queue-depth metrics for a single stage.
+    """
+    name: str
+    concurrency: int
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Wall time between the first item and the stage finishing."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second of wall time."""
+        elapsed = self.elapsed_seconds
+        return self.items_in / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize metrics for logging and the API."""
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "throughput": round(self.throughput, 2),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+@dataclass
+class PipelineMetrics:
+    """
+    Metrics for one pipeline run.
+    """
+    stages: List[StageMetrics] = field(default_factory=list)
+    queue_size: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize metrics for logging and the API."""
+        return {
+            "queue_size": self.queue_size,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+
+class Pipeline:
+    """
+    Runs a list of stages connected by bounded queues.
+
+    The first stage receives the initial items; every other stage consumes
+    what the previous stage emits. If any worker fails, all stages are
+    cancelled and the original exception is raised.
+    """
+
+    def __init__(self, stages: List[Stage], queue_size: int = 4):
+        if not stages:
+            raise ValueError("Pipeline requires at least one stage")
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.metrics = PipelineMetrics(
+            stages=[StageMetrics(name=s.name, concurrency=max(1, s.concurrency)) for s in stages],
+            queue_size=self.queue_size
+        )
+
+    async def run(self, items: List[Any]) -> PipelineMetrics:
+        """
+        Feed `items` into the first stage and wait for all stages to drain.
+
+        Args:
+            items: Initial work items for the first stage
+
+        Returns:
+            Metrics collected during the run
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        tasks: List[asyncio.Task] = []
+
+        for index, stage in enumerate(self.stages):
+            workers = [
+                asyncio.create_task(self._run_worker(index, stage, queues))
+                for _ in range(max(1, stage.concurrency))
+            ]
+            tasks.extend(workers)
+            tasks.append(asyncio.create_task(self._close_stage(index, workers, queues)))
+
+        feeder = asyncio.create_task(self._feed(items, queues[0], self.metrics.stages[0]))
+        tasks.append(feeder)
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return self.metrics
+
+    async def _feed(self, items: List[Any], queue: asyncio.Queue, metrics: StageMetrics) -> None:
+        """Push initial items into the first stage, then close it."""
+        for item in items:
+            await self._put(queue, item, metrics)
+        for _ in range(metrics.concurrency):
+            await queue.put(_END)
+
+    async def _run_worker(self, index: int, stage: Stage, queues: List[asyncio.Queue]) -> None:
+        """Consume items from the stage queue until the end marker."""
+        metrics = self.metrics.stages[index]
+        queue = queues[index]
+        is_last = index == len(self.stages) - 1
+        next_metrics = None if is_last else self.metrics.stages[index + 1]
+
+        async def emit(output: Any) -> None:
+            metrics.items_out += 1
+            if not is_last:
+                await self._put(queues[index + 1], output, next_metrics)
+
+        while True:
+            item = await queue.get()
+            metrics.queue_depth = queue.qsize()
+            if item is _END:
+                return
+
+            if metrics.started_at is None:
+                metrics.started_at = time.monotonic()
+            metrics.items_in += 1
+
+            started = time.monotonic()
+            await stage.worker(item, emit)
+            metrics.busy_seconds += time.monotonic() - started
+
+    async def _close_stage(self, index: int, workers: List[asyncio.Task], queues: List[asyncio.Queue]) -> None:
+        """Once all workers of a stage finish, signal the end to the next stage."""
+        await asyncio.gather(*workers)
+        metrics = self.metrics.stages[index]
+        metrics.finished_at = time.monotonic()
+        if index + 1 < len(self.stages):
+            for _ in range(self.metrics.stages[index + 1].concurrency):
+                await queues[index + 1].put(_END)
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue, item: Any, metrics: StageMetrics) -> None:
+        """Put an item on a stage queue and track its depth."""
+        await queue.put(item)
+        metrics.queue_depth = queue.qsize()
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
@@ -0,0 +1,87 @@
+"""
+Adaptive retrieval depth from the similarity distribution of the results.
+"""
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional
+
+# The elbow drop must be this many times the mean of the other drops
+_ELBOW_FACTOR = 2.0
+
+
+@dataclass
+class RetrievalDecision:
+    """How deep a query searched and how many results it kept."""
+
+    requested_k: int
+    retried: bool = False
+    chosen_k: int = 0
+    best_similarity: Optional[float] = None
+    skipped: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def similarity(result: Dict[str, Any]) -> Optional[float]:
+    """Cosine similarity of a result (1 - distance); None for keyword-only hits."""
+    distance = result.get("distance")
+    return None if distance is None else 1.0 - distance
+
+
+def best_similarity(results: List[Dict[str, Any]]) -> Optional[float]:
+    """Highest similarity among the results, or None if none has a distance."""
+    similarities = [s for s in map(similarity, results) if s is not None]
+    return max(similarities) if similarities else None
+
+
+def hit_count(results: List[Dict[str, Any]]) -> int:
+    """Chunks behind the results, counting every chunk of a merged span."""
+    count = 0
+    for result in results:
+        metadata = result.get("metadata") or {}
+        if "last_chunk_index" in metadata and "chunk_index" in metadata:
+            count += int(metadata["last_chunk_index"]) - int(metadata["chunk_index"]) + 1
+        else:
+            count += 1
+    return count
+
+
+def page_saturated(results: List[Dict[str, Any]], k: int, threshold: float) -> bool:
+    """
+    Whether a page of `k` results was filled with hits above `threshold`,
+    so a deeper search would likely find more relevant ones.
+    """
+    similarities = [s for s in map(similarity, results) if s is not None]
+    return bool(similarities) and hit_count(results) >= k and min(similarities) >= threshold
+
+
+def cut_at_gap(results: List[Dict[str, Any]], min_gap: float, min_k: int = 1) -> List[Dict[str, Any]]:
+    """
+    Drop the results below the largest drop in similarity (the elbow of
+    the score distribution), if that drop is at least `min_gap` and stands
+    out from the other drops.
+
+    One clearly stronger hit thus stands alone, while evenly spread scores
+    keep every result. At least `min_k` results with a similarity are kept;
+    keyword-only hits (no distance) are never dropped.
+
+    Args:
+        results: Search results, best first
+        min_gap: Smallest similarity drop that counts as an elbow
+        min_k: Results with a similarity to keep at least
+
+    Returns:
+        The kept results, in their original order
+    """
+    ranked = sorted((s for s in map(similarity, results) if s is not None), reverse=True)
+    if len(ranked) <= max(1, min_k):
+        return results
+
+    drops = [ranked[i - 1] - ranked[i] for i in range(max(1, min_k), len(ranked))]
+    largest = max(drops)
+    others = sorted(drops)[:-1]
+    if largest < min_gap or (others and largest < _ELBOW_FACTOR * sum(others) / len(others)):
+        return results
+
+    cutoff = ranked[max(1, min_k) + drops.index(largest) - 1]
+    return [r for r in results if similarity(r) is None or similarity(r) >= cutoff]
@@ -0,0 +1,136 @@
+"""
+Expansion of search hits into the larger context given to the LLM.
+"""
+from typing import List, Dict, Any, Tuple
+
+from app.application.retrieval.diversity import join_chunks
+
+Key = Tuple[str, int]
+
+
+def parent_keys(results: List[Dict[str, Any]]) -> List[Key]:
+    """(document_id, parent_index) of every hit that was split from a parent."""
+    keys = []
+    for result in results:
+        metadata = result.get("metadata") or {}
+        if "document_id" in metadata and "parent_index" in metadata:
+            keys.append((metadata["document_id"], int(metadata["parent_index"])))
+    return keys
+
+
+def expand_to_parents(results: List[Dict[str, Any]], parents: Dict[Key, str]) -> List[Dict[str, Any]]:
+    """
+    Replace each hit's text with its parent window.
+
+    Hits sharing a parent become one result, at the rank of the best of
+    them (with its distance and "rrf_score"); hits without a stored parent
+    are kept as they are.
+
+    Args:
+        results: Search results, best first
+        parents: Parent texts by (document_id, parent_index)
+
+    Returns:
+        Expanded results, best first
+    """
+    expanded: List[Dict[str, Any]] = []
+    seen = set()
+    for result in results:
+        metadata = result.get("metadata") or {}
+        key = (metadata.get("document_id"), metadata.get("parent_index"))
+        if key[1] is None or (key[0], int(key[1])) not in parents:
+            expanded.append(result)
+            continue
+        key = (key[0], int(key[1]))
+        if key in seen:
+            continue
+        seen.add(key)
+        expanded.append({**result, "document": parents[key]})
+    return expanded
+
+
+def neighbor_windows(results: List[Dict[str, Any]], neighbors: int) -> List[Tuple[int, str, int, int]]:
+    """
+    Chunk windows to read around the hits: `neighbors` chunks on each side
+    of every hit (or merged span), unioned per document.
+
+    Overlapping or touching windows of a document are merged into the one
+    of the best-ranked hit.
+
+    Args:
+        results: Search results, best first
+        neighbors: Chunks to add on each side
+
+    Returns:
+        (rank of the owning hit, document_id, first, last) per window
+    """
+    windows: List[List[Any]] = []
+    for rank, result in enumerate(results):
+        metadata = result.get("metadata") or {}
+        if "document_id" not in metadata or "chunk_index" not in metadata:
+            continue
+        document_id = metadata["document_id"]
+        first = max(0, int(metadata["chunk_index"]) - neighbors)
+        last = int(metadata.get("last_chunk_index", metadata["chunk_index"])) + neighbors
+        for window in windows:
+            if window[1] == document_id and first <= window[3] + 1 and last >= window[2] - 1:
+                window[2] = min(window[2], first)
+                window[3] = max(window[3], last)
+                break
+        else:
+            windows.append([rank, document_id, first, last])
+    return [tuple(window) for window in windows]
+
+
+def expand_to_neighbors(
+    results: List[Dict[str, Any]],
+    windows: List[Tuple[int, str, int, int]],
+    chunks: Dict[Key, str]
+) -> List[Dict[str, Any]]:
+    """
+    Replace each windowed hit's text with its window, joined without the
+    overlap between chunks; hits merged into a better-ranked window are
+    dropped.
+
+    Only the run of stored chunks around the hit is used (windows are
+    clipped at the document's ends); a hit whose own chunks are not stored
+    keeps its text.
+
+    Args:
+        results: Search results, best first
+        windows: Output of neighbor_windows
+        chunks: Chunk texts by (document_id, chunk_index)
+
+    Returns:
+        Expanded results, best first
+    """
+    owners = {window[0]: window for window in windows}
+    expanded: List[Dict[str, Any]] = []
+    for rank, result in enumerate(results):
+        metadata = result.get("metadata") or {}
+        if "document_id" not in metadata or "chunk_index" not in metadata:
+            expanded.append(result)
+            continue
+
+        document_id = metadata["document_id"]
+        hit_first = int(metadata["chunk_index"])
+        hit_last = int(metadata.get("last_chunk_index", hit_first))
+        if any((document_id, i) not in chunks for i in range(hit_first, hit_last + 1)):
+            expanded.append(result)
+            continue
+        if rank not in owners:
+            # Its chunks are part of a better-ranked hit's window
+            continue
+
+        _, _, first, last = owners[rank]
+        start, end = hit_first, hit_last
+        while start > first and (document_id, start - 1) in chunks:
+            start -= 1
+        while end < last and (document_id, end + 1) in chunks:
+            end += 1
+        expanded.append({
+            **result,
+            "document": join_chunks([chunks[(document_id, i)] for i in range(start, end + 1)]),
+            "metadata": {**metadata, "chunk_index": start, "last_chunk_index": end}
+        })
+    return expanded
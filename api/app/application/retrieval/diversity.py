@@ -0,0 +1,163 @@
+"""
+Diversification of ranked search results.
+"""
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+# Characters of the next chunk's start searched for in the previous chunk;
+# shorter shared text (a common word or two) is not treated as overlap
+_OVERLAP_PROBE = 16
+
+
+def maximal_marginal_relevance(
+    results: List[Dict[str, Any]],
+    top_k: int,
+    lambda_: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Pick `top_k` results that are relevant but not redundant (MMR).
+
+    Each step takes the candidate maximizing
+    lambda * relevance - (1 - lambda) * max similarity to the ones already
+    taken. Relevance is the candidate's cosine similarity to the query, or
+    its fused "rrf_score" rescaled to [0, 1] after fusion; similarities
+    come from the candidates' "embedding" matrix. Candidates without an
+    embedding (keyword-only hits) are never penalized for redundancy.
+
+    Args:
+        results: Candidates, best first
+        top_k: Number of results to return
+        lambda_: Relevance/diversity trade-off (defaults to MMR_LAMBDA; 1 keeps the ranking)
+
+    Returns:
+        The selected results in selection order, without their "embedding"
+    """
+    weight = settings.MMR_LAMBDA if lambda_ is None else lambda_
+    if len(results) <= 1 or top_k <= 0:
+        return [_without_embedding(r) for r in results[:top_k]]
+
+    if all("rrf_score" in r for r in results):
+        # Fused scores only order the candidates; spread them over [0, 1]
+        relevance = np.array([r["rrf_score"] for r in results], dtype=np.float32)
+        spread = relevance.max() - relevance.min()
+        relevance = (relevance - relevance.min()) / spread if spread > 0 else np.ones_like(relevance)
+    else:
+        relevance = np.array(
+            [1.0 - r["distance"] if r.get("distance") is not None else 0.0 for r in results],
+            dtype=np.float32
+        )
+
+    embedded = [i for i, r in enumerate(results) if r.get("embedding") is not None]
+    similarity = np.zeros((len(results), len(results)), dtype=np.float32)
+    if len(embedded) > 1:
+        vectors = np.asarray([results[i]["embedding"] for i in embedded], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        similarity[np.ix_(embedded, embedded)] = vectors @ vectors.T
+
+    selected: List[int] = []
+    redundancy = np.full(len(results), -np.inf, dtype=np.float32)
+    available = np.ones(len(results), dtype=bool)
+    for _ in range(min(top_k, len(results))):
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        scores = np.where(available, weight * relevance - (1.0 - weight) * penalty, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+
+    return [_without_embedding(results[i]) for i in selected]
+
+
+def _without_embedding(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in result.items() if key != "embedding"}
+
+
+def _overlap(previous: str, following: str) -> int:
+    """Length of the longest suffix of `previous` that starts `following`."""
+    probe = following[:_OVERLAP_PROBE]
+    if not probe:
+        return 0
+    position = previous.find(probe)
+    while position != -1:
+        if following.startswith(previous[position:]):
+            return len(previous) - position
+        position = previous.find(probe, position + 1)
+    return 0
+
+
+def join_chunks(chunks: List[str]) -> str:
+    """
+    Join consecutive chunks of a document, removing the text each one
+    shares with the previous (CHUNK_OVERLAP); chunks without a detectable
+    overlap are separated by a newline.
+    """
+    text = chunks[0] if chunks else ""
+    for following in chunks[1:]:
+        shared = _overlap(text, following)
+        text += following[shared:] if shared else "\n" + following
+    return text
+
+
+def merge_adjacent_chunks(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge results that are consecutive chunks of the same document into
+    one span, removing the text the chunks share (CHUNK_OVERLAP).
+
+    A span takes the place of its best-ranked chunk, the smallest distance
+    and the largest "rrf_score" of its chunks; its metadata is the first
+    chunk's, plus "last_chunk_index".
+
+    Args:
+        results: Search results, best first
+
+    Returns:
+        Results with adjacent chunks merged, best first
+    """
+    positions: Dict[tuple, int] = {}
+    for rank, result in enumerate(results):
+        metadata = result.get("metadata") or {}
+        if "document_id" in metadata and "chunk_index" in metadata:
+            positions[(metadata["document_id"], int(metadata["chunk_index"]))] = rank
+
+    merged: List[Dict[str, Any]] = []
+    consumed = set()
+    for rank, result in enumerate(results):
+        if rank in consumed:
+            continue
+        metadata = result.get("metadata") or {}
+        if (metadata.get("document_id"), metadata.get("chunk_index")) not in positions:
+            merged.append(result)
+            continue
+
+        document_id, index = metadata["document_id"], int(metadata["chunk_index"])
+        first = last = index
+        while (document_id, first - 1) in positions and positions[(document_id, first - 1)] not in consumed:
+            first -= 1
+        while (document_id, last + 1) in positions and positions[(document_id, last + 1)] not in consumed:
+            last += 1
+        if first == last:
+            merged.append(result)
+            continue
+
+        members = [results[positions[(document_id, i)]] for i in range(first, last + 1)]
+        consumed.update(positions[(document_id, i)] for i in range(first, last + 1))
+
+        text = join_chunks([member["document"] for member in members])
+
+        distances = [m["distance"] for m in members if m.get("distance") is not None]
+        span = {
+            **members[0],
+            "document": text,
+            "metadata": {**members[0]["metadata"], "last_chunk_index": last},
+            "distance": min(distances) if distances else None
+        }
+        if any("rrf_score" in m for m in members):
+            span["rrf_score"] = max(m.get("rrf_score", 0.0) for m in members)
+        merged.append(span)
+
+    return merged
@@ -0,0 +1,47 @@
+"""
+Merging of ranked search results.
+"""
+from typing import List, Dict, Any, Optional
+
+from app.core.config import settings
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[Dict[str, Any]]],
+    top_k: int,
+    k: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merge ranked result lists with reciprocal-rank fusion (RRF).
+
+    Each chunk scores sum(1 / (k + rank)) over the lists it appears in, so
+    chunks found by several sub-queries rise to the top without having to
+    compare scores across queries. Duplicates keep their smallest distance.
+
+    Args:
+        result_lists: Search results, each list ordered best first
+        top_k: Number of results to return
+        k: Rank damping constant (defaults to RRF_K)
+
+    Returns:
+        Fused results, best first, each with an added "rrf_score"
+    """
+    damping = settings.RRF_K if k is None else k
+    scores: Dict[str, float] = {}
+    best: Dict[str, Dict[str, Any]] = {}
+
+    for results in result_lists:
+        for rank, result in enumerate(results, start=1):
+            chunk_id = result["id"]
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (damping + rank)
+
+            current = best.get(chunk_id)
+            distance = result.get("distance")
+            if current is None or (
+                distance is not None
+                and (current.get("distance") is None or distance < current["distance"])
+            ):
+                best[chunk_id] = result
+
+    ordered = sorted(scores, key=lambda chunk_id: scores[chunk_id], reverse=True)
+    return [{**best[chunk_id], "rrf_score": scores[chunk_id]} for chunk_id in ordered[:top_k]]
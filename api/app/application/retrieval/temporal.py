@@ -0,0 +1,204 @@
+"""
+Rule-based parsing of Spanish period expressions in queries.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, List, Optional, Tuple
+import re
+
+from app.application.tabular.query_engine import fold
+
+_MONTH_NAMES = (
+    "enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto",
+    "septiembre", "octubre", "noviembre", "diciembre"
+)
+_MONTH_NUMBERS = {name: i + 1 for i, name in enumerate(_MONTH_NAMES)}
+_MONTH_NUMBERS["setiembre"] = 9
+_NUMBER_WORDS = {
+    "un": 1, "uno": 1, "dos": 2, "tres": 3, "cuatro": 4, "cinco": 5, "seis": 6,
+    "siete": 7, "ocho": 8, "nueve": 9, "diez": 10, "once": 11, "doce": 12
+}
+_ORDINALS = {
+    "primer": 1, "primero": 1, "1er": 1, "1": 1, "segundo": 2, "2do": 2, "2": 2,
+    "tercer": 3, "tercero": 3, "3er": 3, "3": 3, "cuarto": 4, "4to": 4, "4": 4
+}
+
+_MONTH = "(" + "|".join(sorted(_MONTH_NUMBERS, key=len, reverse=True)) + ")"
+# Quantities that a 4-digit number can count ("2000 unidades", "2024 pesos")
+_QUANTITY_NOUNS = (
+    "unidades|unidad|uds|pesos|cop|usd|dolares|euros|eur|kg|kilos|toneladas|litros|metros|"
+    "items|articulos|productos|clientes|facturas|ordenes|pedidos|registros|filas|personas|"
+    "empleados|mil|millones|horas|dias|veces"
+)
+# Not part of an identifier, a date or an amount ("FAC-2024-003",
+# "2024/01/05", "$2000"), nor a quantity ("2000 unidades")
+_YEAR = (
+    r"(?<![\w./$-])((?:19|20)\d{2})(?![\w/-]|[.,]\d)"
+    rf"(?!\s+(?:{_QUANTITY_NOUNS})\b)"
+)
+_OF_YEAR = rf"(?:\s+(?:de|del)\s+(?:ano\s+)?|\s+){_YEAR}"
+_ORDINAL = "(" + "|".join(sorted(_ORDINALS, key=len, reverse=True)) + ")"
+
+
+@dataclass(frozen=True)
+class PeriodRange:
+    """An inclusive range of months, from (year, month) to (year, month)."""
+    start: Tuple[int, int]
+    end: Tuple[int, int]
+
+    @property
+    def first(self) -> int:
+        """First month as YYYYMM."""
+        return self.start[0] * 100 + self.start[1]
+
+    @property
+    def last(self) -> int:
+        """Last month as YYYYMM."""
+        return self.end[0] * 100 + self.end[1]
+
+    def __str__(self) -> str:
+        return f"{self.start[0]}-{self.start[1]:02d}..{self.end[0]}-{self.end[1]:02d}"
+
+
+def parse_period(query: str, today: date) -> Optional[PeriodRange]:
+    """
+    Find the period a query asks about, at month resolution.
+
+    Understands relative expressions ("este mes", "el mes pasado", "el
+    último trimestre", "los últimos 3 meses", "este año", "el año pasado")
+    and absolute ones ("marzo de 2024", "entre enero y marzo", "primer
+    trimestre de 2023", "T2 2024", "segundo semestre", "2023"). Queries
+    naming several years ("2023 vs 2024") get the span covering them. Months,
+    quarters and semesters without a year are their latest occurrence up
+    to today; "último"/"pasado" is the last complete period.
+
+    Args:
+        query: User question
+        today: Reference date for relative expressions
+
+    Returns:
+        The period, or None if the query names none
+    """
+    text = fold(query)
+    years = sorted({int(year) for year in re.findall(_YEAR, text)})
+    if len(years) > 1:
+        # "2023 vs 2024", "entre 2023 y 2024", "marzo de 2023 y de 2024":
+        # the span covering every year, so no side of a comparison is lost
+        return PeriodRange(start=(years[0], 1), end=(years[-1], 12))
+    for rule in _RULES:
+        period = rule(text, today)
+        if period is not None:
+            return period
+    return None
+
+
+def _month_range(year: int, first_month: int, months: int) -> PeriodRange:
+    """`months` months starting at (year, first_month)."""
+    end = year * 12 + first_month - 1 + months - 1
+    return PeriodRange(start=(year, first_month), end=(end // 12, end % 12 + 1))
+
+
+def _shift(today: date, months: int) -> Tuple[int, int]:
+    """(year, month) `months` months after today's month."""
+    index = today.year * 12 + today.month - 1 + months
+    return index // 12, index % 12 + 1
+
+
+def _latest_year(today: date, first_month: int, year: Optional[str]) -> int:
+    """The given year, or the latest one in which first_month is not in the future."""
+    if year:
+        return int(year)
+    return today.year if first_month <= today.month else today.year - 1
+
+
+def _between_months(text: str, today: date) -> Optional[PeriodRange]:
+    match = re.search(
+        rf"\b(?:entre|desde|de)\s+(?:el\s+mes\s+de\s+)?{_MONTH}(?:{_OF_YEAR})?\s+(?:y|a|al|hasta)\s+"
+        rf"(?:el\s+mes\s+de\s+)?{_MONTH}(?:{_OF_YEAR})?\b",
+        text
+    )
+    if not match:
+        return None
+    first, first_year, last, last_year = match.groups()
+    start_month, end_month = _MONTH_NUMBERS[first], _MONTH_NUMBERS[last]
+    end_year = int(last_year) if last_year else (int(first_year) if first_year else None)
+    if end_year is None:
+        end_year = _latest_year(today, end_month, None)
+    start_year = int(first_year) if first_year else (end_year if start_month <= end_month else end_year - 1)
+    if (start_year, start_month) > (end_year, end_month):
+        return None
+    return PeriodRange(start=(start_year, start_month), end=(end_year, end_month))
+
+
+def _quarter(text: str, today: date) -> Optional[PeriodRange]:
+    match = (
+        re.search(rf"\b{_ORDINAL}\s*(?:o\s+)?trimestre(?:{_OF_YEAR})?\b", text)
+        or re.search(rf"\b[tq]([1-4])(?:{_OF_YEAR})?\b", text)
+    )
+    if not match:
+        return None
+    quarter = _ORDINALS[match.group(1)]
+    first_month = 3 * quarter - 2
+    return _month_range(_latest_year(today, first_month, match.group(2)), first_month, 3)
+
+
+def _semester(text: str, today: date) -> Optional[PeriodRange]:
+    match = re.search(rf"\b(primer|primero|1er|segundo|2do)\s+semestre(?:{_OF_YEAR})?\b", text)
+    if not match:
+        return None
+    first_month = 1 if _ORDINALS[match.group(1)] == 1 else 7
+    return _month_range(_latest_year(today, first_month, match.group(2)), first_month, 6)
+
+
+def _last_months(text: str, today: date) -> Optional[PeriodRange]:
+    match = re.search(r"\bultimos\s+(\d{1,2}|" + "|".join(_NUMBER_WORDS) + r")\s+meses\b", text)
+    if not match:
+        return None
+    months = int(match.group(1)) if match.group(1).isdigit() else _NUMBER_WORDS[match.group(1)]
+    if not 1 <= months <= 60:
+        return None
+    # Including the current month
+    return PeriodRange(start=_shift(today, 1 - months), end=(today.year, today.month))
+
+
+def _relative(text: str, today: date) -> Optional[PeriodRange]:
+    current_quarter_start = 3 * ((today.month - 1) // 3) + 1
+    if re.search(r"\b(este|el presente) mes\b|\bmes (actual|en curso)\b", text):
+        return _month_range(today.year, today.month, 1)
+    if re.search(r"\b(mes (pasado|anterior)|ultimo mes)\b", text):
+        year, month = _shift(today, -1)
+        return _month_range(year, month, 1)
+    if re.search(r"\b(este|el presente) trimestre\b|\btrimestre (actual|en curso)\b", text):
+        return _month_range(today.year, current_quarter_start, 3)
+    if re.search(r"\b(trimestre (pasado|anterior)|ultimo trimestre)\b", text):
+        year, month = _shift(date(today.year, current_quarter_start, 1), -3)
+        return _month_range(year, month, 3)
+    if re.search(r"\b(semestre (pasado|anterior)|ultimo semestre)\b", text):
+        year, month = _shift(date(today.year, 1 if today.month <= 6 else 7, 1), -6)
+        return _month_range(year, month, 6)
+    if re.search(r"\b(este|el presente) ano\b|\bano (actual|en curso)\b|\blo que va del ano\b", text):
+        return _month_range(today.year, 1, 12)
+    if re.search(r"\b(ano (pasado|anterior)|ultimo ano)\b", text):
+        return _month_range(today.year - 1, 1, 12)
+    return None
+
+
+def _month(text: str, today: date) -> Optional[PeriodRange]:
+    match = re.search(rf"\b{_MONTH}(?:{_OF_YEAR})?\b", text)
+    if not match:
+        return None
+    month = _MONTH_NUMBERS[match.group(1)]
+    return _month_range(_latest_year(today, month, match.group(2)), month, 1)
+
+
+def _year(text: str, today: date) -> Optional[PeriodRange]:
+    match = re.search(_YEAR, text)
+    if not match:
+        return None
+    return _month_range(int(match.group(1)), 1, 12)
+
+
+# Most specific first: "de enero a marzo de 2024" is a range, not "enero"
+_RULES: List[Callable[[str, date], Optional[PeriodRange]]] = [
+    _between_months, _quarter, _semester, _last_months, _relative, _month, _year
+]
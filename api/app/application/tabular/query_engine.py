@@ -0,0 +1,270 @@
+"""
+Validation and vectorized execution of aggregate queries over typed tables.
+"""
+from typing import Any, Dict, Optional
+import math
+import re
+import unicodedata
+
+import numpy as np
+
+from app.domain.entities.table import (
+    TypedTable, TypedColumn, Condition, AggregateQuery, AggregateResult,
+    NUMERIC_KINDS, DATE, TEXT, METRICS, OPERATORS, PERIODS
+)
+from app.domain.exceptions import InvalidTableQueryError
+
+# Questions that ask for a computation over rows rather than for a fact in them
+_AGGREGATE_HINT = re.compile(
+    r"\b(cuant[oa]s?|total(es)?|suma[rn]?|sumatoria|promedio|media|maxim[oa]|minim[oa]|"
+    r"mayor(es)?|menor(es)?|cantidad|numero de|contar|cuenta|por (mes|ano|dia|cliente|producto|categoria))\b"
+)
+
+# Text values shown per column when describing a table
+_SAMPLE_VALUES = 5
+
+
+def fold(text: str) -> str:
+    """Lowercase without accents."""
+    return "".join(
+        c for c in unicodedata.normalize("NFD", text.lower()) if unicodedata.category(c) != "Mn"
+    )
+
+
+def looks_aggregate(question: str) -> bool:
+    """Whether a question asks for a total, average, count, extreme or breakdown."""
+    return bool(_AGGREGATE_HINT.search(fold(question)))
+
+
+def describe_table(document_id: str, filename: str, table: TypedTable) -> str:
+    """
+    Schema of a table for the query planner: each column with its kind and
+    unit, the range of numeric and date columns and a few text values.
+    """
+    lines = [f"document_id: {document_id} | archivo: {filename} | filas: {table.row_count}"]
+    for column in table.columns:
+        line = f"- {column.name} ({column.kind}{', ' + column.unit if column.unit else ''})"
+        values = column.values
+        if column.kind in NUMERIC_KINDS and np.isfinite(values).any():
+            line += f": {np.nanmin(values):g} a {np.nanmax(values):g}"
+        elif column.kind == DATE and (~np.isnat(values)).any():
+            present = values[~np.isnat(values)]
+            line += f": {present.min()} a {present.max()}"
+        elif column.kind == TEXT:
+            distinct = [v for v in dict.fromkeys(values.tolist()) if v][:_SAMPLE_VALUES]
+            line += ": " + ", ".join(distinct)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def parse_aggregate_query(data: Dict[str, Any], table: TypedTable) -> AggregateQuery:
+    """
+    Build an AggregateQuery from the planner's JSON and check it against
+    the table's columns.
+
+    Raises:
+        InvalidTableQueryError: If the query does not fit the table
+    """
+    if not isinstance(data, dict):
+        raise InvalidTableQueryError("Query must be an object")
+
+    metric = str(data.get("metric", "")).lower()
+    if metric not in METRICS:
+        raise InvalidTableQueryError(f"Unknown metric: {metric!r}")
+
+    column = data.get("column") or None
+    if column is None and metric != "count":
+        raise InvalidTableQueryError(f"Metric {metric!r} needs a column")
+    if column is not None:
+        target = _column(table, column)
+        if metric != "count" and target.kind not in NUMERIC_KINDS:
+            raise InvalidTableQueryError(f"Column {column!r} is not numeric")
+
+    filters = []
+    for condition in data.get("filters") or []:
+        if not isinstance(condition, dict):
+            raise InvalidTableQueryError("Filters must be objects")
+        filter_column = _column(table, condition.get("column"))
+        op = str(condition.get("op", "="))
+        if op not in OPERATORS:
+            raise InvalidTableQueryError(f"Unknown operator: {op!r}")
+        if op == "contains" and filter_column.kind != TEXT:
+            raise InvalidTableQueryError("'contains' only applies to text columns")
+        if filter_column.kind == TEXT and op not in ("=", "!=", "contains"):
+            raise InvalidTableQueryError(f"Operator {op!r} does not apply to text columns")
+        filters.append(Condition(column=filter_column.name, op=op, value=_coerce(filter_column, condition.get("value"))))
+
+    group_by = data.get("group_by") or None
+    period = data.get("period") or None
+    if group_by is not None:
+        group_column = _column(table, group_by)
+        if period is not None and (group_column.kind != DATE or period not in PERIODS):
+            raise InvalidTableQueryError(f"Period {period!r} needs a date column and one of {PERIODS}")
+        if group_column.kind == DATE and period is None:
+            period = "month"
+    elif period is not None:
+        raise InvalidTableQueryError("Period without group_by")
+
+    return AggregateQuery(
+        document_id=str(data.get("document_id", "")),
+        metric=metric,
+        column=column,
+        filters=filters,
+        group_by=group_by,
+        period=period
+    )
+
+
+def _column(table: TypedTable, name: Any) -> TypedColumn:
+    column = table.column(name) if isinstance(name, str) else None
+    if column is None:
+        raise InvalidTableQueryError(f"Unknown column: {name!r}")
+    return column
+
+
+def _coerce(column: TypedColumn, value: Any) -> Any:
+    """Filter value converted to the column's type."""
+    try:
+        if column.kind in NUMERIC_KINDS:
+            number = float(value)
+            if not math.isfinite(number):
+                raise ValueError
+            return number
+        if column.kind == DATE:
+            return np.datetime64(str(value)[:10], "D")
+    except (TypeError, ValueError):
+        raise InvalidTableQueryError(f"Value {value!r} does not fit column {column.name!r} ({column.kind})")
+    return str(value)
+
+
+def execute_aggregate(table: TypedTable, query: AggregateQuery, max_groups: int = 50) -> AggregateResult:
+    """
+    Run a validated aggregate query with vectorized NumPy operations:
+    boolean masks for the filters, np.unique + np.bincount (or ufunc.at
+    for min/max) for the groups. Missing values are ignored.
+
+    Args:
+        table: Typed table
+        query: Query from parse_aggregate_query
+        max_groups: Groups to return at most
+
+    Returns:
+        The computed value or groups
+    """
+    mask = np.ones(table.row_count, dtype=bool)
+    for condition in query.filters:
+        mask &= _condition_mask(table.column(condition.column), condition)
+
+    target = table.column(query.column) if query.column else None
+    if target is None:
+        values = np.ones(table.row_count)
+    elif target.kind in NUMERIC_KINDS:
+        values = target.values.astype(np.float64)
+    else:
+        # count of a non-numeric column: its non-missing values
+        values = np.where(_present(target), 1.0, np.nan)
+    valid = mask & ~np.isnan(values)
+    unit = target.unit if target is not None and query.metric != "count" else None
+
+    if query.group_by is None:
+        return AggregateResult(
+            query=query,
+            matched_rows=int(mask.sum()),
+            value=_reduce(query.metric, values[valid]),
+            unit=unit
+        )
+
+    group_column = table.column(query.group_by)
+    keys = group_column.values
+    if group_column.kind == DATE:
+        keys = keys.astype({"year": "datetime64[Y]", "month": "datetime64[M]", "day": "datetime64[D]"}[query.period])
+    valid &= _present(group_column)
+
+    labels, inverse = np.unique(keys[valid], return_inverse=True)
+    selected = values[valid]
+    counts = np.bincount(inverse, minlength=len(labels)).astype(np.float64)
+    if query.metric in ("sum", "avg"):
+        totals = np.bincount(inverse, weights=selected, minlength=len(labels))
+        results = totals / counts if query.metric == "avg" else totals
+    elif query.metric == "count":
+        results = counts
+    else:
+        results = np.full(len(labels), np.inf if query.metric == "min" else -np.inf)
+        (np.minimum if query.metric == "min" else np.maximum).at(results, inverse, selected)
+
+    order = np.arange(len(labels)) if group_column.kind == DATE else np.argsort(-results, kind="stable")
+    groups = [(str(labels[i]), float(results[i])) for i in order[:max_groups]]
+    return AggregateResult(
+        query=query,
+        matched_rows=int(mask.sum()),
+        groups=groups,
+        unit=unit,
+        truncated=len(labels) > max_groups
+    )
+
+
+def _present(column: TypedColumn) -> np.ndarray:
+    if column.kind in NUMERIC_KINDS:
+        return ~np.isnan(column.values)
+    if column.kind == DATE:
+        return ~np.isnat(column.values)
+    return column.values != ""
+
+
+def _condition_mask(column: TypedColumn, condition: Condition) -> np.ndarray:
+    values = column.values
+    if column.kind == TEXT:
+        folded = np.array([fold(v) for v in values.tolist()], dtype=str) if len(values) else values
+        needle = fold(condition.value)
+        if condition.op == "contains":
+            return np.char.find(folded, needle) >= 0
+        equal = folded == needle
+        return equal if condition.op == "=" else ~equal
+
+    value = condition.value
+    with np.errstate(invalid="ignore"):
+        result = {
+            "=": lambda: values == value,
+            "!=": lambda: values != value,
+            ">": lambda: values > value,
+            ">=": lambda: values >= value,
+            "<": lambda: values < value,
+            "<=": lambda: values <= value,
+        }[condition.op]()
+    # Missing values never match
+    return result & _present(column)
+
+
+def _reduce(metric: str, values: np.ndarray) -> Optional[float]:
+    if metric == "count":
+        return float(len(values))
+    if len(values) == 0:
+        return None
+    return float({"sum": np.sum, "avg": np.mean, "min": np.min, "max": np.max}[metric](values))
+
+
+def format_number(value: Optional[float]) -> str:
+    """Number in Colombian format: 9.350.000 or 12,50."""
+    if value is None or not math.isfinite(value):
+        return "sin datos"
+    text = f"{value:,.0f}" if float(value).is_integer() else f"{value:,.2f}"
+    return text.replace(",", "\x00").replace(".", ",").replace("\x00", ".")
+
+
+def format_result(result: AggregateResult, filename: str) -> str:
+    """
+    The result as context for the LLM: what was computed, over how many
+    rows, and the value or one line per group.
+    """
+    unit = f" {result.unit}" if result.unit else ""
+    lines = [
+        f"Resultado calculado sobre '{filename}' ({result.matched_rows} filas cumplen los filtros): "
+        f"{result.query.describe()}"
+    ]
+    if result.groups is None:
+        lines.append(f"{format_number(result.value)}{unit}")
+    else:
+        lines.extend(f"{label}: {format_number(value)}{unit}" for label, value in result.groups)
+        if result.truncated:
+            lines.append("(se muestran solo los primeros grupos)")
+    return "\n".join(lines)
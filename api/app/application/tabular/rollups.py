@@ -0,0 +1,280 @@
+"""
+Time-series rollups of typed tables, indexed as summary chunks.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+import numpy as np
+
+from app.application.tabular.query_engine import fold, format_number
+from app.domain.entities.table import TypedTable, TypedColumn, NUMERIC_KINDS, PERCENT, DATE, TEXT
+
+# Granularities, coarsest last, with the label used in the summary text
+GRANULARITIES = (("month", "mensual"), ("quarter", "trimestral"), ("year", "anual"))
+
+# Numeric columns summarized per period at most
+MAX_MEASURES = 6
+
+# Columns whose sum means nothing (prices, rates, averages): summarized by their mean
+_MEAN_WORDS = {"promedio", "precio", "tasa", "media", "unitario", "average", "avg", "price", "rate", "mean"}
+_PER_UNIT = re.compile(r"\w\s*/\s*\w|\bpor (?:unidad|kg|kilo|litro|hora|dia|mes)\b")
+
+_YEAR_NAMES = ("ano", "anio", "year")
+_MONTH_NAMES = ("mes", "month")
+_QUARTER_NAMES = ("trimestre", "quarter")
+_MONTHS = {
+    name: i + 1
+    for names in (
+        ("enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto",
+         "septiembre", "octubre", "noviembre", "diciembre"),
+        ("ene", "feb", "mar", "abr", "may", "jun", "jul", "ago", "sep", "oct", "nov", "dic"),
+        ("january", "february", "march", "april", "may", "june", "july", "august",
+         "september", "october", "november", "december"),
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"),
+    )
+    for i, name in enumerate(names)
+}
+_MONTHS["setiembre"] = 9
+
+
+def compute_rollups(table: TypedTable, filename: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Summarize a table per month, quarter and year: for each period, the
+    sum, mean and count of every numeric column (means only for
+    percentages, prices, rates and per-unit values), and the change of yearly sums against the previous year.
+
+    The period comes from the first date column, or from Año/Mes/Trimestre
+    columns (numbers, month names, "T1"/"Q1"). Tables without one have no
+    rollups. Each period is computed with one np.unique + np.bincount pass
+    per measure.
+
+    Args:
+        table: Typed table of a document
+        filename: Document name, quoted in the summaries
+
+    Returns:
+        (summary text, metadata) per period, months first
+    """
+    periods = period_keys(table)
+    if periods is None:
+        return []
+
+    period_columns = {c.name for c in table.columns if period_axis(c.name)}
+    measures = [
+        c for c in table.columns if c.kind in NUMERIC_KINDS and c.name not in period_columns
+    ][:MAX_MEASURES]
+
+    rollups: List[Tuple[str, Dict[str, Any]]] = []
+    for granularity, label in GRANULARITIES:
+        keys = periods.get(granularity)
+        if keys is None:
+            continue
+        present = keys != ""
+        labels, inverse = np.unique(keys[present], return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(labels))
+
+        stats = {}
+        for measure in measures:
+            values = measure.values[present]
+            valid = ~np.isnan(values)
+            sums = np.bincount(inverse[valid], weights=values[valid], minlength=len(labels))
+            valid_counts = np.bincount(inverse[valid], minlength=len(labels))
+            stats[measure.name] = (sums, valid_counts)
+
+        for i, period in enumerate(labels):
+            parts = [f"Resumen {label} de {filename}", f"Periodo: {period}", f"Registros: {counts[i]}"]
+            for measure in measures:
+                sums, valid_counts = stats[measure.name]
+                if not valid_counts[i]:
+                    continue
+                parts.append(f"{measure.name}: " + _describe(measure, sums[i], valid_counts[i], _previous(
+                    granularity, labels, i, sums, valid_counts
+                )))
+            first, last = _period_bounds(granularity, str(period))
+            rollups.append((" | ".join(parts), {
+                "chunk_kind": "rollup",
+                "granularity": granularity,
+                "period": str(period),
+                "data_period_start": first,
+                "data_period_end": last
+            }))
+    return rollups
+
+
+def _describe(measure: TypedColumn, total: float, count: int, previous: Optional[Tuple[str, float]]) -> str:
+    unit = f" {measure.unit}" if measure.unit else ""
+    mean = f"promedio {format_number(round(total / count, 2))}{unit}"
+    if _averaged(measure):
+        return mean
+    text = f"suma {format_number(round(total, 2))}{unit}"
+    if previous is not None and previous[1]:
+        change = (total - previous[1]) / abs(previous[1]) * 100
+        text += f" ({'+' if change >= 0 else ''}{format_number(round(change, 1))} % vs {previous[0]})"
+    return f"{text}, {mean}, registros {count}"
+
+
+def _averaged(measure: TypedColumn) -> bool:
+    """Whether a column is only meaningful as a mean ("Precio (COP/kg)", "Tasa", a percentage)."""
+    if measure.kind == PERCENT:
+        return True
+    name = fold(f"{measure.name} {measure.unit or ''}")
+    return bool(_MEAN_WORDS & set(re.findall(r"[a-z]+", name))) or bool(_PER_UNIT.search(name))
+
+
+def _previous(granularity: str, labels: np.ndarray, i: int, sums: np.ndarray, counts: np.ndarray):
+    """The previous year's (label, sum), for yearly summaries."""
+    if granularity != "year" or i == 0 or not counts[i - 1]:
+        return None
+    if int(labels[i - 1]) != int(labels[i]) - 1:
+        return None
+    return str(labels[i - 1]), sums[i - 1]
+
+
+def period_axis(name: str) -> Optional[str]:
+    """Time level a column name stands for (Año -> "year", Mes, Trimestre), or None."""
+    folded = fold(name).strip()
+    for axis, names in (("year", _YEAR_NAMES), ("month", _MONTH_NAMES), ("quarter", _QUARTER_NAMES)):
+        if folded in names:
+            return axis
+    return None
+
+
+def row_periods(table: TypedTable) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    First and last month (YYYYMM) each row's data covers: its month, its
+    quarter, or its whole year, depending on what the time axis gives
+    (0 when the row has no period). None if the table has no time axis.
+    """
+    axis = _time_axis(table)
+    if axis is None:
+        return None
+    years, months, quarters = axis
+    first = np.ones(len(years))
+    last = np.full(len(years), 12.0)
+    if quarters is not None:
+        known = ~np.isnan(quarters)
+        first[known] = 3 * quarters[known] - 2
+        last[known] = 3 * quarters[known]
+    if months is not None:
+        known = ~np.isnan(months)
+        first[known] = months[known]
+        last[known] = months[known]
+    present = ~np.isnan(years)
+    starts = np.where(present, years * 100 + first, 0).astype(np.int64)
+    ends = np.where(present, years * 100 + last, 0).astype(np.int64)
+    return starts, ends
+
+
+def non_empty_rows(table: TypedTable) -> np.ndarray:
+    """Rows with at least one value (the ones that become row chunks)."""
+    present = np.zeros(table.row_count, dtype=bool)
+    for column in table.columns:
+        if column.kind in NUMERIC_KINDS:
+            present |= ~np.isnan(column.values)
+        elif column.kind == DATE:
+            present |= ~np.isnat(column.values)
+        else:
+            present |= column.values != ""
+    return present
+
+
+def _time_axis(table: TypedTable) -> Optional[Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]]:
+    """
+    Year, month and quarter of every row as float arrays (NaN when
+    unknown; None for a level the table does not have), or None if the
+    table has no time axis.
+    """
+    date = next((c for c in table.columns if c.kind == DATE), None)
+    if date is not None:
+        values = date.values
+        missing = np.isnat(values)
+        years = (values.astype("datetime64[Y]").astype(np.int64) + 1970).astype(np.float64)
+        months = (values.astype("datetime64[M]").astype(np.int64) % 12 + 1).astype(np.float64)
+        years[missing] = np.nan
+        months[missing] = np.nan
+        return years, months, np.floor((months - 1) / 3) + 1
+
+    axes = {period_axis(c.name): c for c in table.columns if period_axis(c.name)}
+    if "year" not in axes:
+        return None
+    years = _integers(axes["year"])
+    months = _month_numbers(axes["month"]) if "month" in axes else None
+    if months is not None:
+        quarters = np.floor((months - 1) / 3) + 1
+    elif "quarter" in axes:
+        quarters = _quarter_numbers(axes["quarter"])
+    else:
+        quarters = None
+    return years, months, quarters
+
+
+def period_keys(table: TypedTable) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Period label of every row per granularity ("2024-01", "2024-T1",
+    "2024"; "" when unknown), or None if the table has no time axis.
+    """
+    axis = _time_axis(table)
+    if axis is None:
+        return None
+    years, months, quarters = axis
+    missing_year = np.isnan(years)
+
+    keys = {"year": _format_keys(missing_year, years, "{:.0f}")}
+    if quarters is not None:
+        missing = missing_year | np.isnan(quarters)
+        keys["quarter"] = _format_keys(missing, np.stack([years, quarters], axis=1), "{:.0f}-T{:.0f}")
+    if months is not None:
+        missing = missing_year | np.isnan(months)
+        keys["month"] = _format_keys(missing, np.stack([years, months], axis=1), "{:.0f}-{:02.0f}")
+    return keys
+
+
+def _period_bounds(granularity: str, label: str) -> Tuple[int, int]:
+    """First and last month (YYYYMM) of a period label."""
+    year = int(label[:4])
+    if granularity == "month":
+        month = int(label[5:])
+        return year * 100 + month, year * 100 + month
+    if granularity == "quarter":
+        quarter = int(label[6:])
+        return year * 100 + 3 * quarter - 2, year * 100 + 3 * quarter
+    return year * 100 + 1, year * 100 + 12
+
+
+def _format_keys(missing: np.ndarray, values: np.ndarray, template: str) -> np.ndarray:
+    keys = np.full(len(missing), "", dtype=object)
+    for i in np.flatnonzero(~missing):
+        row = values[i]
+        keys[i] = template.format(*row) if np.ndim(row) else template.format(row)
+    return keys.astype(str)
+
+
+def _integers(column: TypedColumn) -> np.ndarray:
+    if column.kind in NUMERIC_KINDS:
+        values = column.values.astype(np.float64)
+    elif column.kind == TEXT:
+        values = np.array([float(v) if v.strip().isdigit() else np.nan for v in column.values.tolist()])
+    else:
+        return np.full(len(column.values), np.nan)
+    return np.where(values == np.floor(values), values, np.nan)
+
+
+def _month_numbers(column: TypedColumn) -> np.ndarray:
+    if column.kind == TEXT:
+        names = [fold(v).strip().rstrip(".") for v in column.values.tolist()]
+        values = np.array([_MONTHS.get(n, float(n) if n.isdigit() else np.nan) for n in names], dtype=np.float64)
+    else:
+        values = _integers(column)
+    return np.where((values >= 1) & (values <= 12), values, np.nan)
+
+
+def _quarter_numbers(column: TypedColumn) -> np.ndarray:
+    if column.kind == TEXT:
+        digits = [
+            "".join(ch for ch in fold(v) if ch.isdigit())
+            for v in column.values.tolist()
+        ]
+        values = np.array([float(d) if len(d) == 1 else np.nan for d in digits], dtype=np.float64)
+    else:
+        values = _integers(column)
+    return np.where((values >= 1) & (values <= 4), values, np.nan)
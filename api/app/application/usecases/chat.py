@@ -2,18 +2,36 @@
 Chat use case.
 """
 from datetime import datetime
-from typing import List, Optional
+from dataclasses import replace
+from typing import List, Optional, Dict, Any, Tuple
+import asyncio
 import uuid
 import logging
 
 from app.domain.entities.message import Message, Source
 from app.domain.entities.conversation import Conversation
+from app.domain.entities.search import SearchFilter
 from app.domain.ports.vector_store import VectorStorePort
+from app.domain.ports.chunk_store import ChunkStorePort, PARENT
+from app.domain.ports.conversation_index import ConversationIndexPort
+from app.domain.ports.document_index import DocumentIndexPort
+from app.domain.ports.lexical_index import LexicalIndexPort
+from app.domain.ports.table_store import TableStorePort
+from app.domain.ports.table_query_planner import TableQueryPlannerPort
+from app.domain.exceptions import InvalidTableQueryError
 from app.domain.ports.llm_service import LLMServicePort
 from app.domain.ports.conversation_repository import ConversationRepositoryPort
 from app.domain.ports.message_repository import MessageRepositoryPort
 from app.domain.ports.query_expansion_service import QueryExpansionServicePort
 from app.infrastructure.llm.openai_embedding import OpenAIEmbeddingService
+from app.application.retrieval.adaptive import RetrievalDecision, best_similarity, page_saturated, cut_at_gap
+from app.application.retrieval.context import parent_keys, expand_to_parents, neighbor_windows, expand_to_neighbors
+from app.application.retrieval.diversity import maximal_marginal_relevance, merge_adjacent_chunks
+from app.application.retrieval.fusion import reciprocal_rank_fusion
+from app.application.retrieval.temporal import parse_period
+from app.application.tabular.query_engine import (
+    looks_aggregate, describe_table, parse_aggregate_query, execute_aggregate, format_result
+)
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -31,7 +49,13 @@ class ChatUseCase:
         embedding_service: OpenAIEmbeddingService,
         conversation_repository: ConversationRepositoryPort,
         message_repository: MessageRepositoryPort,
-        query_expansion_service: QueryExpansionServicePort
+        query_expansion_service: QueryExpansionServicePort,
+        conversation_index: Optional[ConversationIndexPort] = None,
+        lexical_index: Optional[LexicalIndexPort] = None,
+        document_index: Optional[DocumentIndexPort] = None,
+        chunk_store: Optional[ChunkStorePort] = None,
+        table_store: Optional[TableStorePort] = None,
+        table_query_planner: Optional[TableQueryPlannerPort] = None
     ):
         self.vector_store = vector_store
         self.llm_service = llm_service
@@ -39,19 +63,34 @@ class ChatUseCase:
         self.conversation_repository = conversation_repository
         self.message_repository = message_repository
         self.query_expansion_service = query_expansion_service
+        self.conversation_index = conversation_index
+        self.lexical_index = lexical_index
+        self.document_index = document_index
+        self.chunk_store = chunk_store
+        self.table_store = table_store
+        self.table_query_planner = table_query_planner
+        # Depth chosen for the last query (see _retrieve)
+        self.last_retrieval: Optional[RetrievalDecision] = None
 
-    async def execute(self, query: str, conversation_id: Optional[str] = None) -> tuple[Message, str]:
+    async def execute(
+        self,
+        query: str,
+        conversation_id: Optional[str] = None,
+        document_ids: Optional[List[str]] = None
+    ) -> tuple[Message, str]:
         """
         Execute the chat use case.
 
         Args:
             query: User question
             conversation_id: Optional conversation ID. If not provided, creates a new conversation.
+            document_ids: Optional list of documents to restrict the search to
 
         Returns:
             Tuple of (assistant message with answer and sources, conversation_id)
         """
         # Step 0: Create or retrieve conversation
+        is_existing_conversation = bool(conversation_id)
         if not conversation_id:
             # Create new conversation
             now = datetime.utcnow()
@@ -89,26 +128,86 @@ class ChatUseCase:
         # Limit history to recent messages
         conversation_history = conversation_history[-settings.CONVERSATION_HISTORY_LIMIT:]
 
-        # Step 3: Expand query if enabled (improves semantic search)
-        query_for_embedding = query
-        if settings.ENABLE_QUERY_EXPANSION:
-            logger.info(f"🔍 Expanding query: '{query}'")
-            query_for_embedding = await self.query_expansion_service.expand_query(query)
-            logger.debug(f"Expanded query: '{query_for_embedding}'")
+        # Scope the search to the requested documents, if any, and to the
+        # period the query names ("gastos del último trimestre")
+        filters = SearchFilter(document_ids=document_ids) if document_ids else None
+        unscoped_filters = filters
+        period = parse_period(query, datetime.now().date()) if settings.TEMPORAL_FILTERS else None
+        if period is not None:
+            logger.info(f"🗓️ Period in '{query}': {period}")
+            filters = replace(filters or SearchFilter(), period_from=period.first, period_to=period.last)
+        attachments_conversation_id = conversation_id if is_existing_conversation else None
 
-        # Step 4: Generate embedding and search for relevant chunks
-        query_embedding = await self.embedding_service.generate_embedding(query_for_embedding)
+        # Step 3: Keyword search on the original query. Exact tokens (invoice
+        # numbers, supplier names, amounts) are found here; when one chunk
+        # clearly answers the query, expansion and embedding are skipped
+        lexical_results = await self._search_lexical(query, filters)
+        if await self._lexically_confident(lexical_results, attachments_conversation_id):
+            logger.info(f"🔤 Confident keyword match for '{query}', skipping query embedding")
+            search_results = lexical_results
+            self.last_retrieval = RetrievalDecision(requested_k=settings.TOP_K, chosen_k=len(lexical_results))
+        else:
+            # Step 3b: Expand query if enabled (improves semantic search). A
+            # period filter already pins down what expansion would add
+            queries_for_embedding = [query]
+            if settings.ENABLE_QUERY_EXPANSION and period is None:
+                logger.info(f"🔍 Expanding query: '{query}'")
+                if settings.QUERY_EXPANSION_MODE == "multi":
+                    queries_for_embedding = await self.query_expansion_service.expand_to_queries(
+                        query, settings.MULTI_QUERY_COUNT
+                    )
+                else:
+                    queries_for_embedding = [await self.query_expansion_service.expand_query(query)]
+                logger.debug(f"Expanded query: {queries_for_embedding}")
 
-        # Search for relevant chunks in vector store
-        search_results = await self.vector_store.search(
-            query_embedding=query_embedding,
-            top_k=settings.TOP_K
-        )
+            # Step 3c: Generate embeddings (one API call for all sub-queries) and
+            # search for relevant chunks
+            if len(queries_for_embedding) == 1:
+                query_embeddings = [await self.embedding_service.generate_embedding(queries_for_embedding[0])]
+            else:
+                query_embeddings = await self.embedding_service.generate_embeddings(queries_for_embedding)
+
+            search_results = await self._retrieve(
+                query_embeddings,
+                conversation_id=attachments_conversation_id,
+                filters=filters,
+                lexical_results=lexical_results
+            )
+            if period is not None and not search_results and not self.last_retrieval.skipped:
+                # Nothing is tagged with that period (e.g. PDFs): search everything
+                logger.info(f"🗓️ No chunks for period {period}, searching without it")
+                lexical_results = await self._search_lexical(query, unscoped_filters)
+                search_results = await self._retrieve(
+                    query_embeddings,
+                    conversation_id=attachments_conversation_id,
+                    filters=unscoped_filters,
+                    lexical_results=lexical_results
+                )
+            logger.info(f"📏 Retrieval depth for '{query}': {self.last_retrieval.to_dict()}")
+
+        # Step 3d: Aggregate questions over a tabular document are computed
+        # locally; its raw rows are then left out of the context
+        table_answer = await self._answer_from_tables(query, search_results)
+        search_results = await self._expand_context(search_results)
 
         # Step 4: Build context and sources
         context_chunks = []
         sources = []
 
+        if table_answer:
+            computed, document_id, filename = table_answer
+            context_chunks.append(computed)
+            sources.append(Source(
+                document_id=document_id,
+                filename=filename,
+                chunk_index=0,
+                content=computed[:200] + "...",
+                relevance_score=None
+            ))
+            search_results = [
+                r for r in search_results if (r.get("metadata") or {}).get("document_id") != document_id
+            ]
+
         for result in search_results:
             distance = result.get("distance")
 
@@ -167,4 +266,318 @@ class ChatUseCase:
         conversation.updated_at = datetime.utcnow()
         await self.conversation_repository.update(conversation)
 
-        return assistant_message, conversation_id
\ No newline at end of file
+        return assistant_message, conversation_id
+
+    async def _retrieve(
+        self,
+        query_embeddings: List[List[float]],
+        conversation_id: Optional[str],
+        filters: Optional[SearchFilter],
+        lexical_results: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search with a depth adapted to the similarity of the results
+        (ADAPTIVE_RETRIEVAL), recording it in `last_retrieval`:
+
+        - a first page of TOP_K results all above MIN_RELEVANCE is searched
+          again, once, with ADAPTIVE_MAX_K;
+        - results below the elbow of the similarities are dropped;
+        - if even the best hit is RELEVANCE_SKIP_MARGIN below MIN_RELEVANCE,
+          nothing is returned, so no context is built from the documents.
+        """
+        top_k = settings.TOP_K
+        decision = RetrievalDecision(requested_k=top_k)
+        self.last_retrieval = decision
+        results = await self._search(query_embeddings, conversation_id, filters, lexical_results, top_k=top_k)
+        decision.best_similarity = best_similarity(results)
+
+        if settings.ADAPTIVE_RETRIEVAL:
+            if (
+                decision.best_similarity is not None
+                and decision.best_similarity < settings.MIN_RELEVANCE - settings.RELEVANCE_SKIP_MARGIN
+            ):
+                logger.info(
+                    f"🚫 Best hit similarity {decision.best_similarity:.3f} is far below "
+                    f"{settings.MIN_RELEVANCE}, answering without document context"
+                )
+                decision.skipped = True
+                return []
+
+            if settings.ADAPTIVE_MAX_K > top_k and page_saturated(results, top_k, settings.MIN_RELEVANCE):
+                decision.retried = True
+                decision.requested_k = settings.ADAPTIVE_MAX_K
+                results = await self._search(
+                    query_embeddings, conversation_id, filters, lexical_results, top_k=settings.ADAPTIVE_MAX_K
+                )
+
+            results = cut_at_gap(results, settings.ADAPTIVE_MIN_GAP)
+
+        decision.chosen_k = len(results)
+        return results
+
+    async def _search(
+        self,
+        query_embeddings: List[List[float]],
+        conversation_id: Optional[str],
+        filters: Optional[SearchFilter],
+        lexical_results: Optional[List[Dict[str, Any]]] = None,
+        top_k: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the vector store, and the conversation's temporary attachments
+        (if any) at the same time.
+
+        Several query embeddings are sent in a single vector store query and
+        their rankings are merged with reciprocal-rank fusion, as are keyword
+        results when there are any.
+
+        With MMR_CANDIDATE_FACTOR > 1, more candidates are fetched (with
+        their embeddings) and TOP_K diverse ones are kept; consecutive chunks
+        of a document are then merged into one span (see diversity.py).
+        """
+        top_k = top_k or settings.TOP_K
+        diversify = settings.MMR_CANDIDATE_FACTOR > 1
+        candidate_k = top_k * settings.MMR_CANDIDATE_FACTOR if diversify else top_k
+
+        async def search_global() -> List[List[Dict[str, Any]]]:
+            global_filters = await self._scope_to_documents(query_embeddings, filters)
+            if len(query_embeddings) == 1:
+                return [await self.vector_store.search(
+                    query_embedding=query_embeddings[0],
+                    top_k=candidate_k,
+                    filters=global_filters,
+                    include_embeddings=diversify
+                )]
+            return await self.vector_store.search_many(
+                query_embeddings=query_embeddings,
+                top_k=candidate_k,
+                filters=global_filters,
+                include_embeddings=diversify
+            )
+
+        async def search_attachments() -> List[List[Dict[str, Any]]]:
+            if not (self.conversation_index and conversation_id):
+                return []
+            return [
+                await self.conversation_index.search(
+                    conversation_id=conversation_id,
+                    query_embedding=query_embedding,
+                    top_k=candidate_k,
+                    filters=filters,
+                    include_embeddings=diversify
+                )
+                for query_embedding in query_embeddings
+            ]
+
+        global_results, attachment_results = await asyncio.gather(search_global(), search_attachments())
+
+        if lexical_results:
+            candidates = reciprocal_rank_fusion(global_results + attachment_results + [lexical_results], candidate_k)
+        elif len(query_embeddings) == 1:
+            candidates = self._merge_results(
+                global_results[0],
+                attachment_results[0] if attachment_results else [],
+                candidate_k
+            )
+        else:
+            candidates = reciprocal_rank_fusion(global_results + attachment_results, candidate_k)
+
+        if diversify:
+            candidates = maximal_marginal_relevance(candidates, top_k)
+        # Children are replaced by their parent windows afterwards, so merging them is moot
+        if settings.MERGE_ADJACENT_CHUNKS and settings.CONTEXT_EXPANSION != "parent":
+            candidates = merge_adjacent_chunks(candidates)
+        return candidates
+
+    async def _answer_from_tables(
+        self,
+        query: str,
+        results: List[Dict[str, Any]]
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        Answer an aggregate question (totals, averages, counts, breakdowns)
+        over one of the tabular documents among the results: the planner
+        LLM writes a small query against their typed tables, which is
+        validated and executed locally (see query_engine.py).
+
+        Returns:
+            (computed result as context, document_id, filename), or None to
+            answer from the retrieved chunks
+        """
+        if not (settings.STRUCTURED_QUERIES and self.table_store and self.table_query_planner):
+            return None
+        if not looks_aggregate(query):
+            return None
+
+        filenames: Dict[str, str] = {}
+        for result in results:
+            metadata = result.get("metadata") or {}
+            file_type = str(metadata.get("file_type", "")).lower().lstrip(".")
+            if file_type in ("csv", "xlsx", "xls") and metadata.get("document_id"):
+                filenames.setdefault(metadata["document_id"], metadata.get("filename", "unknown"))
+        candidates = list(filenames)[:settings.STRUCTURED_QUERY_MAX_TABLES]
+        if not candidates:
+            return None
+
+        try:
+            tables = {
+                document_id: table
+                for document_id, table in zip(
+                    candidates,
+                    await asyncio.gather(*(self.table_store.get_table(d) for d in candidates))
+                )
+                if table is not None and table.row_count
+            }
+            if not tables:
+                return None
+
+            plan = await self.table_query_planner.plan(
+                query,
+                [describe_table(d, filenames[d], table) for d, table in tables.items()]
+            )
+            if plan is None:
+                return None
+            table = tables.get(str(plan.get("document_id")))
+            if table is None:
+                raise InvalidTableQueryError(f"Unknown document: {plan.get('document_id')!r}")
+
+            aggregate = parse_aggregate_query(plan, table)
+            result = execute_aggregate(table, aggregate, max_groups=settings.STRUCTURED_QUERY_MAX_GROUPS)
+        except InvalidTableQueryError as e:
+            logger.warning(f"Discarding invalid table query for '{query}': {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Table query failed, answering from the retrieved chunks: {e}")
+            return None
+
+        filename = filenames[aggregate.document_id]
+        logger.info(f"🧮 Computed {aggregate.describe()} over '{filename}' ({result.matched_rows} rows)")
+        return format_result(result, filename), aggregate.document_id, filename
+
+    async def _expand_context(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Widen each hit to the context the LLM gets (CONTEXT_EXPANSION) with
+        one batched read of the chunk store: its parent window ("parent")
+        or CONTEXT_NEIGHBORS chunks on each side ("neighbors"). Hits whose
+        texts are not stored (attachments, documents ingested before) keep
+        their own text.
+        """
+        mode = settings.CONTEXT_EXPANSION
+        if not self.chunk_store or not results or mode not in ("parent", "neighbors"):
+            return results
+
+        try:
+            if mode == "parent":
+                parents = await self.chunk_store.get_chunks(parent_keys(results), kind=PARENT)
+                return expand_to_parents(results, parents)
+
+            windows = neighbor_windows(results, settings.CONTEXT_NEIGHBORS)
+            keys = [
+                (document_id, index)
+                for _, document_id, first, last in windows
+                for index in range(first, last + 1)
+            ]
+            chunks = await self.chunk_store.get_chunks(keys)
+            return expand_to_neighbors(results, windows, chunks)
+        except Exception as e:
+            logger.warning(f"Context expansion failed, using the retrieved chunks: {e}")
+            return results
+
+    async def _scope_to_documents(
+        self,
+        query_embeddings: List[List[float]],
+        filters: Optional[SearchFilter]
+    ) -> Optional[SearchFilter]:
+        """
+        First stage of two-stage retrieval: restrict the chunk search to the
+        HIERARCHICAL_TOP_DOCUMENTS documents whose centroids are closest to
+        any of the queries. Small corpora, searches already scoped to
+        documents and an empty document index keep the flat search.
+        """
+        top_documents = settings.HIERARCHICAL_TOP_DOCUMENTS
+        if not self.document_index or top_documents <= 0:
+            return filters
+        if filters is not None and filters.document_ids is not None:
+            return filters
+
+        collection = self.vector_store.collection_name
+        if await self.document_index.count(collection) < max(settings.HIERARCHICAL_MIN_DOCUMENTS, top_documents + 1):
+            return filters
+
+        # Centroids carry document-level metadata only, not the periods of its rows
+        document_filters = replace(filters, period_from=None, period_to=None) if filters is not None else None
+        ranked = await self.document_index.search(collection, query_embeddings, top_documents, document_filters)
+        document_ids = list(dict.fromkeys(document_id for ids in ranked for document_id in ids))
+        if not document_ids:
+            return filters
+
+        logger.info(f"📚 Searching chunks of {len(document_ids)} closest documents")
+        if filters is None:
+            return SearchFilter(document_ids=document_ids)
+        return replace(filters, document_ids=document_ids)
+
+    async def _search_lexical(
+        self,
+        query: str,
+        filters: Optional[SearchFilter]
+    ) -> List[Dict[str, Any]]:
+        """
+        Keyword search, keeping hits that cover enough of the query terms.
+        Keyword search only complements the vector search, so errors are
+        logged and yield no results.
+        """
+        if not self.lexical_index:
+            return []
+
+        try:
+            results = await self.lexical_index.search(query, top_k=settings.TOP_K, filters=filters)
+        except Exception as e:
+            logger.warning(f"Keyword search failed, using vector search only: {e}")
+            return []
+        return [r for r in results if r["coverage"] >= settings.LEXICAL_MIN_COVERAGE]
+
+    async def _lexically_confident(
+        self,
+        lexical_results: List[Dict[str, Any]],
+        conversation_id: Optional[str]
+    ) -> bool:
+        """
+        Whether keyword results alone answer the query: the best hit has all
+        query terms and all its identifiers (amounts, codes), and a BM25 score
+        LEXICAL_CONFIDENT_MARGIN times the runner-up's.
+        """
+        margin = settings.LEXICAL_CONFIDENT_MARGIN
+        if margin <= 0 or not lexical_results:
+            return False
+
+        best = lexical_results[0]
+        if best["coverage"] < 1.0 or not best["identifier_match"] or best["lexical_score"] <= 0:
+            return False
+        if len(lexical_results) > 1 and best["lexical_score"] < margin * lexical_results[1]["lexical_score"]:
+            return False
+
+        # Temporary attachments can only be searched by embedding
+        if conversation_id and self.conversation_index:
+            return not await self.conversation_index.has_chunks(conversation_id)
+        return True
+
+    @staticmethod
+    def _merge_results(
+        global_results: List[Dict[str, Any]],
+        attachment_results: List[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge search results from the shared store and a conversation index.
+
+        Both use cosine distance, so results are ordered by distance and
+        cut to top_k. Results without a distance keep their position last.
+        """
+        if not attachment_results:
+            return global_results
+
+        merged = sorted(
+            global_results + attachment_results,
+            key=lambda r: r["distance"] if r.get("distance") is not None else float("inf")
+        )
+        return merged[:top_k]
\ No newline at end of file
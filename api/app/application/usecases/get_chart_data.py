@@ -0,0 +1,271 @@
+"""
+Get chart data use case.
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import logging
+
+import numpy as np
+
+from app.application.tabular.rollups import period_axis, period_keys
+from app.domain.entities.table import (
+    ChartData, ChartSeries, TypedTable, TypedColumn, NUMERIC_KINDS, DATE, METRICS, GRANULARITIES
+)
+from app.domain.exceptions import InvalidTableQueryError
+from app.domain.ports.document_repository import DocumentRepositoryPort
+from app.domain.ports.ingestion_repository import IngestionRepositoryPort
+from app.domain.ports.table_store import TableStorePort
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# pandas aggregation of each query metric
+_AGGREGATIONS = {"sum": "sum", "avg": "mean", "count": "count", "min": "min", "max": "max"}
+_PERIOD_FREQ = {"day": "D", "month": "M", "quarter": "Q", "year": "Y"}
+
+
+class GetChartDataUseCase:
+    """
+    Use case for the aggregated series behind a chart of a tabular document.
+
+    Series are computed from the document's typed table with a single
+    pandas group-by and cached per document version (the content hash of
+    its upload), so repeated chart requests do not reload or regroup the
+    table.
+    """
+
+    def __init__(
+        self,
+        document_repository: DocumentRepositoryPort,
+        ingestion_repository: IngestionRepositoryPort,
+        table_store: TableStorePort,
+        cache_size: Optional[int] = None
+    ):
+        self.document_repository = document_repository
+        self.ingestion_repository = ingestion_repository
+        self.table_store = table_store
+        self.cache_size = settings.CHART_CACHE_SIZE if cache_size is None else cache_size
+        self._cache: "OrderedDict[Tuple, ChartData]" = OrderedDict()
+
+    async def execute(
+        self,
+        document_id: str,
+        measure: str,
+        group_by: str,
+        granularity: Optional[str] = None,
+        metric: str = "sum",
+        split_by: Optional[str] = None
+    ) -> Optional[ChartData]:
+        """
+        Aggregate a measure column per value of a group-by column.
+
+        Args:
+            document_id: Document identifier
+            measure: Column to aggregate
+            group_by: Axis column; date columns are bucketed by granularity
+            granularity: day, month, quarter or year (date axes, default month)
+            metric: sum, avg, count, min or max
+            split_by: Optional column whose values become separate series
+
+        Returns:
+            The chart data, or None if the document has no typed table
+
+        Raises:
+            InvalidTableQueryError: If the columns or options do not fit the table
+        """
+        document = await self.document_repository.get_by_id(document_id)
+        if not document:
+            return None
+
+        version = await self._version(document_id, document.upload_date)
+        key = (document_id, version, measure, group_by, granularity, metric, split_by)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        table = await self.table_store.get_table(document_id)
+        if table is None:
+            return None
+
+        chart = build_chart(
+            table,
+            document_id=document_id,
+            version=version,
+            measure=measure,
+            group_by=group_by,
+            granularity=granularity,
+            metric=metric,
+            split_by=split_by,
+            max_points=settings.CHART_MAX_POINTS,
+            max_series=settings.CHART_MAX_SERIES
+        )
+        logger.info(
+            f"📊 Chart data for {document_id}: {metric}({measure}) by {group_by} - "
+            f"{len(chart.labels)} point(s), {len(chart.series)} series"
+        )
+
+        if self.cache_size > 0:
+            self._cache[key] = chart
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return chart
+
+    async def _version(self, document_id: str, upload_date) -> str:
+        # A document's table only changes with its content: a resumed upload
+        # must match the original hash
+        job = await self.ingestion_repository.get_job(document_id)
+        if job is not None:
+            return job.content_hash[:16]
+        return str(upload_date)
+
+
+def build_chart(
+    table: TypedTable,
+    document_id: str,
+    version: str,
+    measure: str,
+    group_by: str,
+    granularity: Optional[str] = None,
+    metric: str = "sum",
+    split_by: Optional[str] = None,
+    max_points: int = 500,
+    max_series: int = 10
+) -> ChartData:
+    """
+    Group a typed table with pandas and lay the result out as columns.
+
+    Tables without a date column get their time axis from Año/Mes/Trimestre
+    columns, as in the rollups: grouping by one of them buckets rows by
+    that period ("2024", "2024-T1", "2024-01"), or by another granularity
+    the columns give; split by the year column, the axis is the quarter
+    or month within the year. Time and numeric axes are in ascending order; other
+    axes start with the largest value. With split_by, the series with the
+    largest totals are kept. Missing values are ignored.
+
+    Raises:
+        InvalidTableQueryError: If the columns or options do not fit the table
+    """
+    import pandas as pd
+
+    if metric not in METRICS:
+        raise InvalidTableQueryError(f"Unknown metric: {metric!r}")
+    measure_column = _column(table, measure)
+    if metric != "count" and measure_column.kind not in NUMERIC_KINDS:
+        raise InvalidTableQueryError(f"Column {measure!r} is not numeric")
+    axis_column = _column(table, group_by)
+    periods = _periods(table, group_by)
+    if axis_column.kind == DATE:
+        granularity = granularity or "month"
+        if granularity not in GRANULARITIES:
+            raise InvalidTableQueryError(f"Granularity must be one of {GRANULARITIES}")
+        axis = _axis_keys(axis_column, granularity)
+    elif periods is not None:
+        granularity = granularity or period_axis(group_by)
+        if granularity not in periods:
+            raise InvalidTableQueryError(
+                f"Granularity must be one of {tuple(g for g in GRANULARITIES if g in periods)} "
+                f"for the time columns of this table"
+            )
+        axis = np.where(periods[granularity] == "", None, periods[granularity])
+        if split_by and period_axis(split_by) == "year" and granularity != "year":
+            # one series per year over the same quarters/months ("T1", "01")
+            axis = np.array([None if key is None else key[5:] for key in axis.tolist()], dtype=object)
+    elif granularity is not None:
+        raise InvalidTableQueryError(f"Granularity needs a date column, {group_by!r} is {axis_column.kind}")
+    else:
+        axis = _axis_keys(axis_column, granularity)
+    split_column = _column(table, split_by) if split_by else None
+
+    frame = pd.DataFrame({
+        "axis": axis,
+        "value": _measure_values(measure_column),
+    })
+    keys = ["axis"]
+    if split_column is not None:
+        frame["split"] = _split_keys(split_column)
+        keys.append("split")
+    frame = frame.dropna(subset=keys + ["value"])
+
+    grouped = frame.groupby(keys, sort=True)["value"].agg(_AGGREGATIONS[metric])
+    wide = grouped.unstack("split") if split_column is not None else grouped.to_frame(name=metric)
+
+    truncated = False
+    if split_column is not None and wide.shape[1] > max_series:
+        totals = wide.abs().sum().sort_values(ascending=False, kind="stable")
+        wide = wide[totals.index[:max_series]]
+        truncated = True
+    if axis_column.kind not in NUMERIC_KINDS + (DATE,) and periods is None:
+        wide = wide.loc[wide.sum(axis=1).sort_values(ascending=False, kind="stable").index]
+    if len(wide) > max_points:
+        wide = wide.iloc[:max_points]
+        truncated = True
+
+    return ChartData(
+        document_id=document_id,
+        version=version,
+        measure=measure,
+        metric=metric,
+        group_by=group_by,
+        labels=[_label(label, granularity) for label in wide.index],
+        series=[
+            ChartSeries(name=_label(name, None), values=_values(wide[name].to_numpy(dtype=np.float64)))
+            for name in wide.columns
+        ],
+        granularity=granularity,
+        split_by=split_by,
+        unit=measure_column.unit if metric != "count" else None,
+        truncated=truncated
+    )
+
+
+def _column(table: TypedTable, name: str) -> TypedColumn:
+    column = table.column(name)
+    if column is None:
+        raise InvalidTableQueryError(f"Unknown column: {name!r}")
+    return column
+
+
+def _periods(table: TypedTable, group_by: str):
+    """Period labels per granularity when group_by is an Año/Mes/Trimestre column of an undated table."""
+    if period_axis(group_by) is None or any(c.kind == DATE for c in table.columns):
+        return None
+    return period_keys(table)
+
+
+def _axis_keys(column: TypedColumn, granularity: Optional[str]):
+    import pandas as pd
+
+    if column.kind == DATE:
+        return pd.Series(column.values).dt.to_period(_PERIOD_FREQ[granularity])
+    return _split_keys(column)
+
+
+def _split_keys(column: TypedColumn) -> np.ndarray:
+    if column.kind == DATE:
+        return np.where(np.isnat(column.values), None, column.values.astype(str))
+    if column.kind in NUMERIC_KINDS:
+        return column.values
+    return np.where(column.values == "", None, column.values)
+
+
+def _measure_values(column: TypedColumn) -> np.ndarray:
+    if column.kind in NUMERIC_KINDS:
+        return column.values
+    # counting a non-numeric column: its non-missing values
+    present = ~np.isnat(column.values) if column.kind == DATE else column.values != ""
+    return np.where(present, 1.0, np.nan)
+
+
+def _label(value, granularity: Optional[str]) -> str:
+    if isinstance(value, str):
+        return value
+    if granularity == "quarter":
+        return f"{value.year}-T{value.quarter}"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _values(values: np.ndarray) -> list:
+    return [None if np.isnan(v) else float(v) for v in values.tolist()]
@@ -0,0 +1,149 @@
+"""
+Re-embed collection use case.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+import time
+
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.ports.document_index import DocumentIndexPort
+from app.domain.ports.vector_store import VectorStorePort
+from app.infrastructure.llm.openai_embedding import OpenAIEmbeddingService
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReembedReport:
+    """
+    Summary of a re-embedding migration.
+    """
+    source_collection: str
+    target_collection: str
+    spec: EmbeddingSpec
+    chunks: int = 0
+    activated: bool = False
+    duration_seconds: float = 0.0
+
+
+def _chunk_position(chunk: Dict[str, Any]) -> Tuple[str, int]:
+    """(document_id, chunk_index) of a stored chunk, from metadata or its id."""
+    metadata = chunk["metadata"]
+    if "document_id" in metadata and "chunk_index" in metadata:
+        return metadata["document_id"], int(metadata["chunk_index"])
+    document_id, _, index = chunk["id"].rpartition("_chunk_")
+    return document_id, int(index)
+
+
+class ReembedCollectionUseCase:
+    """
+    Use case for rebuilding the vector index with a different embedding
+    model or dimensions.
+
+    Chunks are read from the active collection, re-embedded and written to a
+    new collection, which is activated only after every chunk is stored. The
+    old collection keeps serving until then and is left in place for rollback.
+    Uploads made while the migration runs land in the old collection, so run
+    it with ingestion paused.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStorePort,
+        embedding_service: OpenAIEmbeddingService,
+        document_index: Optional[DocumentIndexPort] = None
+    ):
+        self.vector_store = vector_store
+        self.embedding_service = embedding_service
+        self.document_index = document_index
+
+    async def execute(
+        self,
+        target_collection: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        activate: bool = True
+    ) -> ReembedReport:
+        """
+        Re-embed every chunk of the active collection into a new collection.
+
+        Args:
+            target_collection: Name of the new collection (derived from the spec if omitted)
+            batch_size: Chunks per embeddings request (defaults to INGEST_EMBED_BATCH_SIZE)
+            activate: Switch to the new collection when done
+
+        Returns:
+            Report of the migration
+        """
+        spec = self.embedding_service.spec
+        name = target_collection or (
+            f"{settings.VECTOR_COLLECTION}_{spec.model}_{spec.dimensions}_"
+            f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+        )
+        report = ReembedReport(
+            source_collection=self.vector_store.collection_name,
+            target_collection=name,
+            spec=spec
+        )
+        started = time.monotonic()
+
+        target = await self.vector_store.create_collection(name, spec)
+        logger.info(f"🔁 Re-embedding '{report.source_collection}' into '{name}' with {spec.model}/{spec.dimensions}")
+
+        async for batch in self.vector_store.iter_chunks(batch_size or settings.INGEST_EMBED_BATCH_SIZE):
+            embeddings = await self.embedding_service.generate_embeddings([c["document"] for c in batch])
+            for document_id, start_index, chunks in self._runs(batch, embeddings):
+                await target.add_chunks(
+                    document_id=document_id,
+                    chunks=[c["document"] for c, _ in chunks],
+                    embeddings=[e for _, e in chunks],
+                    metadata=[c["metadata"] for c, _ in chunks],
+                    start_index=start_index
+                )
+                # Centroids of the new collection, for two-stage retrieval
+                if self.document_index:
+                    await self.document_index.add_embeddings(
+                        collection=name,
+                        document_id=document_id,
+                        embeddings=[e for _, e in chunks],
+                        metadata=chunks[0][0]["metadata"],
+                        start_index=start_index
+                    )
+            report.chunks += len(batch)
+            logger.info(f"🔁 Re-embedded {report.chunks} chunks")
+
+        if activate:
+            await target.activate()
+            report.activated = True
+
+        report.duration_seconds = time.monotonic() - started
+        return report
+
+    @staticmethod
+    def _runs(
+        batch: List[Dict[str, Any]],
+        embeddings: List[List[float]]
+    ) -> List[Tuple[str, int, List[Tuple[Dict[str, Any], List[float]]]]]:
+        """
+        Split a batch into runs of consecutive chunks of one document, so
+        each run keeps its original chunk ids when written with start_index.
+        """
+        ordered = sorted(zip(batch, embeddings), key=lambda pair: _chunk_position(pair[0]))
+        runs = []
+        for document_id, items in groupby(ordered, key=lambda pair: _chunk_position(pair[0])[0]):
+            run: List[Tuple[Dict[str, Any], List[float]]] = []
+            start = previous = None
+            for item in items:
+                index = _chunk_position(item[0])[1]
+                if run and index != previous + 1:
+                    runs.append((document_id, start, run))
+                    run = []
+                if not run:
+                    start = index
+                run.append(item)
+                previous = index
+            runs.append((document_id, start, run))
+        return runs
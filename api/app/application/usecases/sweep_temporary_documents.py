@@ -0,0 +1,118 @@
+"""
+Sweep temporary documents use case.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+import time
+
+from app.domain.ports.chunk_store import ChunkStorePort
+from app.domain.ports.document_index import DocumentIndexPort
+from app.domain.ports.table_store import TableStorePort
+from app.domain.ports.document_repository import DocumentRepositoryPort
+from app.domain.ports.ingestion_repository import IngestionRepositoryPort
+from app.domain.ports.lexical_index import LexicalIndexPort
+from app.domain.ports.vector_store import VectorStorePort
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepReport:
+    """
+    Summary of what a sweep reclaimed.
+    """
+    documents_deleted: int = 0
+    chunks_deleted: int = 0
+    batches: int = 0
+    duration_seconds: float = 0.0
+
+
+class SweepTemporaryDocumentsUseCase:
+    """
+    Use case for deleting temporary documents whose TTL has expired.
+
+    Expired documents are removed in batches from both the vector store and
+    the documents table, so searches only scan the live corpus.
+    """
+
+    def __init__(
+        self,
+        document_repository: DocumentRepositoryPort,
+        vector_store: VectorStorePort,
+        ingestion_repository: IngestionRepositoryPort,
+        lexical_index: Optional[LexicalIndexPort] = None,
+        document_index: Optional[DocumentIndexPort] = None,
+        chunk_store: Optional[ChunkStorePort] = None,
+        table_store: Optional[TableStorePort] = None
+    ):
+        self.document_repository = document_repository
+        self.vector_store = vector_store
+        self.ingestion_repository = ingestion_repository
+        self.lexical_index = lexical_index
+        self.document_index = document_index
+        self.chunk_store = chunk_store
+        self.table_store = table_store
+
+    async def execute(
+        self,
+        ttl_seconds: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> SweepReport:
+        """
+        Delete expired temporary documents.
+
+        Args:
+            ttl_seconds: Time to live of temporary documents (defaults to settings)
+            now: Reference time (defaults to the current time)
+
+        Returns:
+            Report with the number of documents and chunks reclaimed
+        """
+        ttl = settings.TEMP_DOCUMENT_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        # upload_date is stored in local time (see UploadDocumentUseCase)
+        cutoff = (now or datetime.now()) - timedelta(seconds=ttl)
+        batch_size = max(1, settings.TEMP_DOCUMENT_SWEEP_BATCH_SIZE)
+
+        report = SweepReport()
+        started = time.monotonic()
+
+        while True:
+            expired = await self.document_repository.list_expired_temporary(cutoff, batch_size)
+            if not expired:
+                break
+
+            document_ids = [doc.id for doc in expired]
+
+            # Vector store first: a document row without chunks is harmless,
+            # orphaned chunks would keep slowing down every search
+            await self.vector_store.delete_documents(document_ids)
+            if self.lexical_index:
+                await self.lexical_index.delete_documents(document_ids)
+            if self.document_index:
+                await self.document_index.delete_documents(document_ids)
+            if self.chunk_store:
+                await self.chunk_store.delete_documents(document_ids)
+            if self.table_store:
+                await self.table_store.delete_documents(document_ids)
+            await self.ingestion_repository.delete_jobs(document_ids)
+            await self.document_repository.delete_many(document_ids)
+
+            report.batches += 1
+            report.documents_deleted += len(expired)
+            report.chunks_deleted += sum(doc.chunk_count for doc in expired)
+
+            if len(expired) < batch_size:
+                break
+
+        report.duration_seconds = time.monotonic() - started
+
+        if report.documents_deleted:
+            logger.info(
+                f"🧹 Swept {report.documents_deleted} expired temporary document(s), "
+                f"{report.chunks_deleted} chunk(s) reclaimed in {report.duration_seconds:.2f}s"
+            )
+
+        return report
@@ -1,20 +1,81 @@
 """
 Upload document use case.
 """
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+import hashlib
+import logging
 
+from app.application.ingestion.pipeline import Pipeline, PipelineMetrics, Stage
+from app.application.tabular.rollups import compute_rollups, row_periods, non_empty_rows
 from app.domain.entities.document import Document
+from app.domain.entities.table import TypedTable
+from app.domain.entities.ingestion import (
+    IngestionBatch,
+    IngestionJob,
+    BATCH_EMBEDDED,
+    BATCH_WRITTEN,
+    JOB_RUNNING,
+    JOB_FAILED,
+    JOB_COMPLETED
+)
+from app.domain.exceptions import IngestionError, VectorStoreWriteError
+from app.domain.ports.chunk_store import ChunkStorePort, PARENT
+from app.domain.ports.conversation_index import ConversationIndexPort
+from app.domain.ports.table_store import TableStorePort
+from app.domain.ports.document_index import DocumentIndexPort
 from app.domain.ports.document_repository import DocumentRepositoryPort
+from app.domain.ports.ingestion_repository import IngestionRepositoryPort
+from app.domain.ports.lexical_index import LexicalIndexPort
 from app.domain.ports.vector_store import VectorStorePort
 from app.infrastructure.document_processor import DocumentProcessor
 from app.infrastructure.llm.openai_embedding import OpenAIEmbeddingService
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkBatch:
+    """
+    A contiguous range of chunks flowing through the ingestion pipeline.
+    """
+    start_index: int
+    chunks: List[str]
+    embeddings: Optional[List[List[float]]] = None
+    # Parent window of each chunk, in parent-child mode
+    parent_indexes: Optional[List[int]] = None
+    # Extra metadata of each chunk (e.g. rollup summaries)
+    chunk_metadata: Optional[List[Dict[str, Any]]] = None
+
+
+@dataclass
+class _IngestionState:
+    """Mutable state shared by the stages of one upload."""
+    document_id: str
+    filename: str
+    file_type: str
+    file_type_normalized: str
+    chunk_count: int = 0
+    parent_count: int = 0
+    # Chunk ranges already written by a previous (failed) run
+    written_ranges: List[Tuple[int, int]] = field(default_factory=list)
+    # Temporary attachments go to this conversation's in-memory index
+    conversation_id: Optional[str] = None
+    is_temporary: bool = False
+    ingested_at: Optional[datetime] = None
+
 
 class UploadDocumentUseCase:
     """
     Use case for uploading and processing documents.
+
+    Ingestion runs as a staged pipeline (parse -> chunk -> embed -> write)
+    so that text extraction, the embedding API and the vector store work
+    on different batches at the same time. Progress is checkpointed per
+    batch so a failed upload can be resumed without re-embedding the
+    chunks that were already stored.
     """
 
     def __init__(
@@ -22,19 +83,33 @@ class UploadDocumentUseCase:
         document_repository: DocumentRepositoryPort,
         vector_store: VectorStorePort,
         embedding_service: OpenAIEmbeddingService,
-        document_processor: DocumentProcessor
+        document_processor: DocumentProcessor,
+        ingestion_repository: IngestionRepositoryPort,
+        conversation_index: Optional[ConversationIndexPort] = None,
+        lexical_index: Optional[LexicalIndexPort] = None,
+        document_index: Optional[DocumentIndexPort] = None,
+        chunk_store: Optional[ChunkStorePort] = None,
+        table_store: Optional[TableStorePort] = None
     ):
         self.document_repository = document_repository
         self.vector_store = vector_store
         self.embedding_service = embedding_service
         self.document_processor = document_processor
+        self.ingestion_repository = ingestion_repository
+        self.conversation_index = conversation_index
+        self.lexical_index = lexical_index
+        self.document_index = document_index
+        self.chunk_store = chunk_store
+        self.table_store = table_store
+        self.last_metrics: Optional[PipelineMetrics] = None
 
     async def execute(
         self,
         filename: str,
         file_content: bytes,
         file_type: str,
-        is_temporary: bool = False
+        is_temporary: bool = False,
+        conversation_id: Optional[str] = None
     ) -> Document:
         """
         Execute the upload document use case.
@@ -44,67 +119,407 @@ class UploadDocumentUseCase:
             file_content: File content as bytes
             file_type: File extension
             is_temporary: Whether the document is temporary
+            conversation_id: Conversation the temporary document is attached to.
+                Its chunks are then kept in that conversation's in-memory index
+                instead of the shared vector store.
 
         Returns:
             Created document entity
-        """
-        # Step 1-2: Extract chunks according to file type
-        file_type_normalized = file_type.lower().replace(".", "")
-
-        # For tabular data (CSV/Excel), extract chunks row by row
-        if file_type_normalized == "csv":
-            chunks = await self.document_processor.extract_tabular_chunks_from_csv(file_content)
-        elif file_type_normalized in ["xlsx", "xls"]:
-            chunks = await self.document_processor.extract_tabular_chunks_from_excel(file_content)
-        else:
-            # For other formats (PDF, etc.), use traditional text extraction and chunking
-            text = await self.document_processor.extract_text(file_content, file_type)
-            if not text:
-                raise ValueError("No text could be extracted from the document")
-
-            chunks = await self.document_processor.chunk_text(
-                text,
-                chunk_size=settings.CHUNK_SIZE,
-                overlap=settings.CHUNK_OVERLAP
-            )
 
-        if not chunks:
-            raise ValueError("No chunks could be created from the document")
-
-        # Step 3: Generate embeddings
-        embeddings = await self.embedding_service.generate_embeddings(chunks)
-
-        # Step 4: Create document entity
+        Raises:
+            ValueError: If no chunks can be extracted from the document
+            IngestionError: If ingestion fails part-way (it can be resumed)
+        """
+        # Step 1: Save document metadata so chunks can reference its ID
         document = Document(
             id=None,  # Will be generated by repository
             filename=filename,
             file_type=file_type,
-            chunk_count=len(chunks),
+            chunk_count=0,
             upload_date=datetime.now(),
             is_temporary=is_temporary
         )
-
-        # Step 5: Save document metadata to database
         document_id = await self.document_repository.save(document)
         document.id = document_id
 
-        # Step 6: Prepare metadata for each chunk
-        metadata: List[Dict[str, Any]] = [
-            {
-                "document_id": document_id,
-                "chunk_index": i,
-                "filename": filename,
-                "file_type": file_type
-            }
-            for i in range(len(chunks))
-        ]
+        now = datetime.utcnow()
+        await self.ingestion_repository.save_job(IngestionJob(
+            document_id=document_id,
+            filename=filename,
+            file_type=file_type,
+            content_hash=self._hash_content(file_content),
+            status=JOB_RUNNING,
+            created_at=now,
+            updated_at=now
+        ))
 
-        # Step 7: Store chunks and embeddings in vector store
-        await self.vector_store.add_chunks(
+        # Step 2: Run the staged pipeline
+        state = _IngestionState(
             document_id=document_id,
-            chunks=chunks,
-            embeddings=embeddings,
-            metadata=metadata
+            filename=filename,
+            file_type=file_type,
+            file_type_normalized=file_type.lower().replace(".", ""),
+            conversation_id=conversation_id if is_temporary and self.conversation_index else None,
+            is_temporary=is_temporary,
+            ingested_at=document.upload_date
+        )
+        return await self._ingest(document, file_content, state)
+
+    async def resume(self, document_id: str, file_content: bytes) -> Document:
+        """
+        Resume a failed ingestion from its last committed batches.
+
+        The file is parsed again (cheap), but only chunk ranges that were
+        never written to the vector store are embedded and stored.
+
+        Args:
+            document_id: Document identifier of the failed upload
+            file_content: The same file content that was originally uploaded
+
+        Returns:
+            Document entity once ingestion completes
+
+        Raises:
+            ValueError: If there is no resumable ingestion or the content differs
+            IngestionError: If ingestion fails again (it can be resumed later)
+        """
+        job = await self.ingestion_repository.get_job(document_id)
+        document = await self.document_repository.get_by_id(document_id)
+        if not job or not document:
+            raise ValueError(f"No ingestion found for document {document_id}")
+
+        if job.status == JOB_COMPLETED:
+            return document
+
+        if job.content_hash != self._hash_content(file_content):
+            raise ValueError("File content does not match the original upload")
+
+        upload_date = document.upload_date
+        if isinstance(upload_date, str):  # SQLite returns timestamps as text
+            upload_date = datetime.fromisoformat(upload_date)
+
+        state = _IngestionState(
+            document_id=document_id,
+            filename=job.filename,
+            file_type=job.file_type,
+            file_type_normalized=job.file_type.lower().replace(".", ""),
+            written_ranges=job.written_ranges(),
+            is_temporary=document.is_temporary,
+            ingested_at=upload_date
+        )
+
+        logger.info(
+            f"🔁 Resuming ingestion of '{job.filename}' - "
+            f"{job.committed_chunks} chunk(s) already stored"
         )
+        await self.ingestion_repository.update_job_status(document_id, JOB_RUNNING)
 
-        return document
\ No newline at end of file
+        return await self._ingest(document, file_content, state)
+
+    async def _ingest(self, document: Document, file_content: bytes, state: _IngestionState) -> Document:
+        """
+        Run the pipeline for a document and record the outcome.
+        """
+        pipeline = self._build_pipeline(state)
+        # Updated in place while the pipeline runs, so the metrics endpoint
+        # shows an upload in flight
+        self.last_metrics = pipeline.metrics
+        try:
+            await pipeline.run([file_content])
+            if not state.chunk_count:
+                raise ValueError("No chunks could be created from the document")
+        except Exception as e:
+            # Invalid documents and in-memory attachments have nothing to
+            # resume, so do not leave them behind
+            if state.conversation_id or (isinstance(e, ValueError) and not state.written_ranges):
+                if state.conversation_id:
+                    await self.conversation_index.delete_document(state.conversation_id, state.document_id)
+                await self.vector_store.delete_document(state.document_id)
+                if self.lexical_index:
+                    await self.lexical_index.delete_documents([state.document_id])
+                if self.document_index:
+                    await self.document_index.delete_documents([state.document_id])
+                if self.chunk_store:
+                    await self.chunk_store.delete_documents([state.document_id])
+                if self.table_store:
+                    await self.table_store.delete_documents([state.document_id])
+                await self.ingestion_repository.delete_job(state.document_id)
+                await self.document_repository.delete(state.document_id)
+                raise
+
+            # Keep the stored batches so the upload can be resumed
+            await self.ingestion_repository.update_job_status(
+                state.document_id,
+                JOB_FAILED,
+                error=str(e)
+            )
+            raise IngestionError(
+                f"Ingestion of '{state.filename}' failed: {e}",
+                document_id=state.document_id
+            ) from e
+
+        logger.info(
+            f"📊 Ingestion metrics for '{state.filename}': {pipeline.metrics.to_dict()}"
+        )
+
+        # Step 3: Record the final chunk count
+        document.chunk_count = state.chunk_count
+        await self.document_repository.update(document)
+        await self.ingestion_repository.update_job_status(
+            state.document_id,
+            JOB_COMPLETED,
+            total_chunks=state.chunk_count
+        )
+
+        return document
+
+    @staticmethod
+    def _hash_content(file_content: bytes) -> str:
+        """Fingerprint the uploaded file so a resume uses the same content."""
+        return hashlib.sha256(file_content).hexdigest()
+
+    @staticmethod
+    def _pending_ranges(start: int, end: int, written: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Subtract already written ranges from [start, end).
+        """
+        pending = []
+        cursor = start
+        for w_start, w_end in written:
+            if w_end <= cursor or w_start >= end:
+                continue
+            if w_start > cursor:
+                pending.append((cursor, w_start))
+            cursor = max(cursor, w_end)
+        if cursor < end:
+            pending.append((cursor, end))
+        return pending
+
+    @staticmethod
+    def _row_period_metadata(rows: List[str], table: TypedTable) -> Optional[List[Dict[str, Any]]]:
+        """
+        Period each row chunk's data covers (data_period_start/end, YYYYMM),
+        for query-time period filters; None if the table has no time axis
+        or its rows cannot be matched to the chunks.
+        """
+        periods = row_periods(table)
+        if periods is None:
+            return None
+        # Row chunks leave out empty rows
+        kept = non_empty_rows(table)
+        if int(kept.sum()) != len(rows):
+            logger.warning(f"⚠️ {len(rows)} row chunks for {int(kept.sum())} table rows, rows left without periods")
+            return None
+        return [
+            {"data_period_start": int(first), "data_period_end": int(last)} if first else {}
+            for first, last in zip(periods[0][kept], periods[1][kept])
+        ]
+
+    def _build_pipeline(self, state: _IngestionState) -> Pipeline:
+        """
+        Build the parse -> chunk -> embed -> write pipeline for one upload.
+        """
+        batch_size = max(1, settings.INGEST_EMBED_BATCH_SIZE)
+        # Attachments live in memory only, so they are never split into children
+        parent_child = (
+            settings.CONTEXT_EXPANSION == "parent" and self.chunk_store is not None and not state.conversation_id
+        )
+
+        async def split_into_children(parents: List[str]) -> Tuple[List[str], List[int]]:
+            # Parents are stored up front (an idempotent upsert, so resumes
+            # simply rewrite them); only the children are embedded
+            first_parent = state.parent_count
+            state.parent_count += len(parents)
+            await self.chunk_store.add_chunks(state.document_id, parents, start_index=first_parent, kind=PARENT)
+
+            children: List[str] = []
+            parent_indexes: List[int] = []
+            for i, parent in enumerate(parents):
+                parts = await self.document_processor.chunk_text(
+                    parent,
+                    chunk_size=settings.CHILD_CHUNK_SIZE,
+                    overlap=settings.CHILD_CHUNK_OVERLAP
+                )
+                children.extend(parts)
+                parent_indexes.extend([first_parent + i] * len(parts))
+            return children, parent_indexes
+
+        async def typed_table(file_content: bytes) -> Optional[TypedTable]:
+            # Stored for numeric questions (attachments only live in memory),
+            # and the source of the period metadata and rollups of the rows
+            store = self.table_store is not None and not state.conversation_id
+            if not (store or settings.TABULAR_ROLLUPS or settings.TEMPORAL_FILTERS):
+                return None
+            table = await self.document_processor.extract_typed_table(file_content, state.file_type_normalized)
+            if store:
+                await self.table_store.save_table(state.document_id, table)
+            return table
+
+        async def emit_table(rows: List[str], file_content: bytes, emit) -> None:
+            table = await typed_table(file_content)
+            row_metadata = self._row_period_metadata(rows, table) if table is not None and settings.TEMPORAL_FILTERS else None
+            await emit(("records", list(zip(rows, row_metadata))) if row_metadata else ("rows", rows))
+
+            # Summaries per period, indexed after the rows for trend questions
+            if table is None or not settings.TABULAR_ROLLUPS:
+                return
+            try:
+                rollups = compute_rollups(table, state.filename)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not compute rollups for {state.filename}: {e}")
+                return
+            if rollups:
+                logger.info(f"📈 {len(rollups)} rollups for {state.filename}")
+                await emit(("records", rollups))
+
+        async def parse(file_content: bytes, emit) -> None:
+            # For tabular data (CSV/Excel), rows are already chunks
+            if state.file_type_normalized == "csv":
+                rows = await self.document_processor.extract_tabular_chunks_from_csv(file_content)
+                await emit_table(rows, file_content, emit)
+            elif state.file_type_normalized in ["xlsx", "xls"]:
+                rows = await self.document_processor.extract_tabular_chunks_from_excel(file_content)
+                await emit_table(rows, file_content, emit)
+            else:
+                # For other formats (PDF, etc.), use traditional text extraction
+                text = await self.document_processor.extract_text(file_content, state.file_type)
+                if not text:
+                    raise ValueError("No text could be extracted from the document")
+                await emit(("text", text))
+
+        async def chunk(segment, emit) -> None:
+            kind, payload = segment
+            parent_indexes = None
+            chunk_metadata = None
+            if kind == "text":
+                chunks = await self.document_processor.chunk_text(
+                    payload,
+                    chunk_size=settings.CHUNK_SIZE,
+                    overlap=settings.CHUNK_OVERLAP
+                )
+                if parent_child:
+                    chunks, parent_indexes = await split_into_children(chunks)
+            elif kind == "records":
+                # Prebuilt chunks with their own metadata
+                chunks = [text for text, _ in payload]
+                chunk_metadata = [meta for _, meta in payload]
+            else:
+                chunks = payload
+
+            # Emit fixed-size batches; blocks while the embed stage is behind
+            base = state.chunk_count
+            state.chunk_count += len(chunks)
+            for start, end in self._pending_ranges(base, state.chunk_count, state.written_ranges):
+                for offset in range(start, end, batch_size):
+                    batch_end = min(offset + batch_size, end)
+                    batch = ChunkBatch(
+                        start_index=offset,
+                        chunks=chunks[offset - base:batch_end - base],
+                        parent_indexes=parent_indexes[offset - base:batch_end - base] if parent_indexes else None,
+                        chunk_metadata=chunk_metadata[offset - base:batch_end - base] if chunk_metadata else None
+                    )
+                    await emit(batch)
+
+        async def embed(batch: ChunkBatch, emit) -> None:
+            batch.embeddings = await self.embedding_service.generate_embeddings(batch.chunks)
+            await self.ingestion_repository.save_batch(IngestionBatch(
+                document_id=state.document_id,
+                start_index=batch.start_index,
+                end_index=batch.start_index + len(batch.chunks),
+                status=BATCH_EMBEDDED
+            ))
+            await emit(batch)
+
+        async def fold_centroid(batch: ChunkBatch, metadata: List[Dict[str, Any]], count: int) -> None:
+            if self.document_index:
+                await self.document_index.add_embeddings(
+                    collection=self.vector_store.collection_name,
+                    document_id=state.document_id,
+                    embeddings=batch.embeddings[:count],
+                    metadata=metadata[0],
+                    start_index=batch.start_index
+                )
+
+        async def write(batch: ChunkBatch, emit) -> None:
+            metadata: List[Dict[str, Any]] = [
+                {
+                    "document_id": state.document_id,
+                    "chunk_index": batch.start_index + i,
+                    "filename": state.filename,
+                    "file_type": state.file_type,
+                    # Filterable fields (see SearchFilter)
+                    "is_temporary": state.is_temporary,
+                    "ingest_year": state.ingested_at.year,
+                    "ingest_month": state.ingested_at.month
+                }
+                for i in range(len(batch.chunks))
+            ]
+            if batch.parent_indexes:
+                for meta, parent_index in zip(metadata, batch.parent_indexes):
+                    meta["parent_index"] = parent_index
+            if batch.chunk_metadata:
+                for meta, extra in zip(metadata, batch.chunk_metadata):
+                    meta.update(extra)
+            try:
+                if state.conversation_id:
+                    await self.conversation_index.add_chunks(
+                        conversation_id=state.conversation_id,
+                        chunks=batch.chunks,
+                        embeddings=batch.embeddings,
+                        metadata=metadata
+                    )
+                else:
+                    # Local stores first: they are idempotent upserts, so a
+                    # resumed batch simply rewrites its chunks
+                    if self.chunk_store:
+                        await self.chunk_store.add_chunks(
+                            state.document_id,
+                            batch.chunks,
+                            start_index=batch.start_index
+                        )
+                    if self.lexical_index:
+                        await self.lexical_index.add_chunks(
+                            document_id=state.document_id,
+                            chunks=batch.chunks,
+                            metadata=metadata,
+                            start_index=batch.start_index
+                        )
+                    await self.vector_store.add_chunks(
+                        document_id=state.document_id,
+                        chunks=batch.chunks,
+                        embeddings=batch.embeddings,
+                        metadata=metadata,
+                        start_index=batch.start_index
+                    )
+                    # Centroid last, so only stored chunks are folded in
+                    await fold_centroid(batch, metadata, len(batch.chunks))
+            except VectorStoreWriteError as e:
+                # Checkpoint the part of the batch that did make it; a
+                # resume skips it, so its centroid share is folded in now
+                if e.committed_count > batch.start_index:
+                    await fold_centroid(batch, metadata, e.committed_count - batch.start_index)
+                    await self.ingestion_repository.save_batch(IngestionBatch(
+                        document_id=state.document_id,
+                        start_index=batch.start_index,
+                        end_index=e.committed_count,
+                        status=BATCH_WRITTEN
+                    ))
+                raise
+
+            await self.ingestion_repository.save_batch(IngestionBatch(
+                document_id=state.document_id,
+                start_index=batch.start_index,
+                end_index=batch.start_index + len(batch.chunks),
+                status=BATCH_WRITTEN
+            ))
+            await emit(batch)
+
+        return Pipeline(
+            stages=[
+                Stage(name="parse", worker=parse),
+                Stage(name="chunk", worker=chunk),
+                Stage(name="embed", worker=embed, concurrency=settings.INGEST_EMBED_CONCURRENCY),
+                Stage(name="write", worker=write, concurrency=settings.INGEST_WRITE_CONCURRENCY),
+            ],
+            queue_size=settings.INGEST_QUEUE_SIZE
+        )
@@ -0,0 +1,65 @@
+"""
+Verify embedding spec use case.
+"""
+import logging
+
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.exceptions import EmbeddingConfigurationError
+from app.domain.ports.vector_store import VectorStorePort
+from app.infrastructure.llm.openai_embedding import OpenAIEmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+class VerifyEmbeddingSpecUseCase:
+    """
+    Use case for checking, at startup, that query embeddings will match the
+    vectors of the active collection.
+
+    A mismatch would otherwise surface as failed or meaningless searches on
+    the first chat request.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStorePort,
+        embedding_service: OpenAIEmbeddingService
+    ):
+        self.vector_store = vector_store
+        self.embedding_service = embedding_service
+
+    async def execute(self) -> EmbeddingSpec:
+        """
+        Compare the configured embedding spec with the active collection's.
+
+        Empty collections, and collections that predate the recorded spec,
+        are stamped with the configured spec.
+
+        Returns:
+            The spec of the active collection
+
+        Raises:
+            EmbeddingConfigurationError: If model or dimensions do not match
+        """
+        configured = self.embedding_service.spec
+        stored = await self.vector_store.get_embedding_spec()
+        collection = self.vector_store.collection_name
+
+        if stored is not None and not stored.is_compatible_with(configured):
+            raise EmbeddingConfigurationError(
+                f"Collection '{collection}' was embedded with {stored.model or 'an unrecorded model'} "
+                f"at {stored.dimensions} dimensions, but EMBEDDING_MODEL/EMBEDDING_DIMENSIONS are "
+                f"{configured.model} at {configured.dimensions}. Update the configuration or run "
+                f"the re-embedding migration (python -m app.cli.reembed)."
+            )
+
+        if stored is None or stored.model is None:
+            await self.vector_store.set_embedding_spec(configured)
+            logger.info(
+                f"📐 Recorded embedding spec {configured.model}/{configured.dimensions} "
+                f"for collection '{collection}'"
+            )
+            return configured
+
+        logger.info(f"📐 Collection '{collection}' uses {stored.model}/{stored.dimensions}")
+        return stored
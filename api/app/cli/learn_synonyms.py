@@ -0,0 +1,58 @@
+"""
+Learn synonym dictionary entries from the logged LLM query expansions.
+
+Queries the dictionary did not cover are expanded by the LLM and logged
+(QUERY_EXPANSION_LOG_PATH). This adds the synonyms the LLM gave the same
+uncovered term repeatedly to the learned dictionary
+(QUERY_EXPANSION_LEARNED_PATH), so those queries are expanded locally
+from then on. Restart the API to load the new version.
+
+Usage (from the api/ directory):
+    python -m app.cli.learn_synonyms --min-support 2
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+from app.core.config import settings
+from app.infrastructure.expansion.dictionary_query_expansion import learn_synonyms, load_dictionary
+
+
+def main(args: argparse.Namespace) -> None:
+    log_path = Path(settings.QUERY_EXPANSION_LOG_PATH)
+    if not log_path.exists():
+        print(f"No logged expansions at {log_path}")
+        return
+    with open(log_path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    dictionary = load_dictionary(learned_path=settings.QUERY_EXPANSION_LEARNED_PATH)
+    entries = learn_synonyms(records, dictionary, min_support=args.min_support)
+    if not entries:
+        print(f"Nothing new to learn from {len(records)} logged expansions (dictionary v{dictionary.version})")
+        return
+
+    learned_path = Path(settings.QUERY_EXPANSION_LEARNED_PATH)
+    learned = {"version": 0, "entries": []}
+    if learned_path.exists():
+        with open(learned_path, encoding="utf-8") as f:
+            learned = json.load(f)
+    learned["version"] += 1
+    learned["entries"].extend(entries)
+
+    learned_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = learned_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(learned, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, learned_path)
+
+    for entry in entries:
+        print(f"  {entry['terms'][0]} -> {', '.join(entry['expansions'])}")
+    print(f"✅ Learned {len(entries)} entries from {len(records)} logged expansions (learned v{learned['version']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-support", type=int, default=2, help="Times the LLM must have added a synonym")
+    main(parser.parse_args())
@@ -0,0 +1,57 @@
+"""
+Re-embed the vector index with another embedding model or dimensions.
+
+Usage (from the api/ directory):
+    python -m app.cli.reembed --model text-embedding-3-large --dimensions 1024
+
+After it finishes, set EMBEDDING_MODEL/EMBEDDING_DIMENSIONS to the same
+values and restart the API; the startup check refuses a mismatch.
+"""
+import argparse
+import asyncio
+import logging
+
+from app.application.usecases.reembed_collection import ReembedCollectionUseCase
+from app.core.config import settings
+from app.core.container import container
+from app.infrastructure.llm.openai_embedding import OpenAIEmbeddingService
+
+
+async def main(args: argparse.Namespace) -> None:
+    embedding_service = OpenAIEmbeddingService(model=args.model, dimensions=args.dimensions)
+    usecase = ReembedCollectionUseCase(
+        vector_store=container.vector_store,
+        embedding_service=embedding_service,
+        document_index=container.document_index
+    )
+
+    try:
+        report = await usecase.execute(
+            target_collection=args.collection,
+            batch_size=args.batch_size,
+            activate=not args.no_activate
+        )
+    finally:
+        await embedding_service.close()
+
+    print(
+        f"✅ Re-embedded {report.chunks} chunks from '{report.source_collection}' into "
+        f"'{report.target_collection}' ({report.spec.model}/{report.spec.dimensions}) "
+        f"in {report.duration_seconds:.1f}s"
+    )
+    if report.activated:
+        print(
+            f"Active collection switched. Set EMBEDDING_MODEL={report.spec.model} "
+            f"EMBEDDING_DIMENSIONS={report.spec.dimensions} and restart the API."
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--dimensions", type=int, default=None)
+    parser.add_argument("--collection", default=None, help="Name of the new collection")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--no-activate", action="store_true", help="Build the collection without switching to it")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+"""
+Build the keyword (BM25) index from the chunks already in the vector store.
+
+New uploads are indexed as they are stored; run this once for documents
+uploaded before ENABLE_LEXICAL_SEARCH, or to rebuild a lost index file.
+
+Usage (from the api/ directory):
+    python -m app.cli.reindex_lexical
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from app.core.container import container
+from app.infrastructure.lexical.bm25_index import SQLiteBM25Index
+
+
+async def main(args: argparse.Namespace) -> None:
+    index = container.lexical_index or SQLiteBM25Index()
+    started = time.monotonic()
+    total = 0
+
+    async for batch in container.vector_store.iter_chunks(batch_size=args.batch_size):
+        ordered = sorted(batch, key=lambda c: (c["metadata"]["document_id"], c["metadata"]["chunk_index"]))
+        # Runs of consecutive chunks of one document keep their ids with start_index
+        run = []
+        for chunk in ordered + [None]:
+            if run and (
+                chunk is None
+                or chunk["metadata"]["document_id"] != run[-1]["metadata"]["document_id"]
+                or chunk["metadata"]["chunk_index"] != run[-1]["metadata"]["chunk_index"] + 1
+            ):
+                await index.add_chunks(
+                    document_id=run[0]["metadata"]["document_id"],
+                    chunks=[c["document"] for c in run],
+                    metadata=[c["metadata"] for c in run],
+                    start_index=run[0]["metadata"]["chunk_index"]
+                )
+                run = []
+            if chunk is not None:
+                run.append(chunk)
+        total += len(batch)
+
+    print(f"✅ Indexed {total} chunks in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -20,17 +20,128 @@ class Settings:
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-large")
+    # Empty uses the model's native size; text-embedding-3-* can be shortened (e.g. 1024)
+    EMBEDDING_DIMENSIONS: Optional[int] = int(os.getenv("EMBEDDING_DIMENSIONS")) if os.getenv("EMBEDDING_DIMENSIONS") else None
+
+    # Vector store backend: "chroma" (HTTP server) or "numpy" (in-process, memory-mapped)
+    VECTOR_STORE_BACKEND: str = os.getenv("VECTOR_STORE_BACKEND", "chroma").lower()
+    # Collection used until a re-embedding migration activates another one
+    VECTOR_COLLECTION: str = os.getenv("VECTOR_COLLECTION", "financial_documents")
+    NUMPY_VECTOR_STORE_PATH: str = os.getenv("NUMPY_VECTOR_STORE_PATH", "./data/vectors")
+    NUMPY_SEARCH_BLOCK_ROWS: int = int(os.getenv("NUMPY_SEARCH_BLOCK_ROWS", "65536"))
+    # "none", "float16" or "int8"; quantized searches rescore top_k * factor candidates
+    NUMPY_QUANTIZATION: str = os.getenv("NUMPY_QUANTIZATION", "none").lower()
+    NUMPY_RESCORE_FACTOR: int = int(os.getenv("NUMPY_RESCORE_FACTOR", "4"))
+    # IVF (inverted-file) approximate search: number of k-means lists (0 = exact search),
+    # lists probed per query, rows needed before the first training, and the fraction of
+    # rows added since training that triggers a background retraining
+    NUMPY_IVF_LISTS: int = int(os.getenv("NUMPY_IVF_LISTS", "0"))
+    NUMPY_IVF_NPROBE: int = int(os.getenv("NUMPY_IVF_NPROBE", "8"))
+    NUMPY_IVF_MIN_ROWS: int = int(os.getenv("NUMPY_IVF_MIN_ROWS", "50000"))
+    NUMPY_IVF_RETRAIN_FRACTION: float = float(os.getenv("NUMPY_IVF_RETRAIN_FRACTION", "0.25"))
 
     # Chroma Vector Store
     CHROMA_URL: str = os.getenv("CHROMA_URL", "http://localhost:8000")
+    VECTOR_WRITE_BATCH_SIZE: int = int(os.getenv("VECTOR_WRITE_BATCH_SIZE", "256"))
+    VECTOR_WRITE_CONCURRENCY: int = int(os.getenv("VECTOR_WRITE_CONCURRENCY", "2"))
+    # Keep chunk texts only in the local chunk store (CHUNK_STORE_PATH): Chroma holds ids,
+    # vectors and metadata, and search results are hydrated locally
+    CHROMA_LOCAL_CHUNK_TEXT: bool = os.getenv("CHROMA_LOCAL_CHUNK_TEXT", "true").lower() in ("true", "1", "yes")
 
     # RAG Configuration
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
     CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    # Context given to the LLM for each hit: "none" (the chunk), "parent" (embed small child
+    # chunks of CHILD_CHUNK_SIZE, answer with the CHUNK_SIZE window they come from) or
+    # "neighbors" (the chunk plus CONTEXT_NEIGHBORS chunks on each side)
+    CONTEXT_EXPANSION: str = os.getenv("CONTEXT_EXPANSION", "none").lower()
+    CHILD_CHUNK_SIZE: int = int(os.getenv("CHILD_CHUNK_SIZE", "300"))
+    CHILD_CHUNK_OVERLAP: int = int(os.getenv("CHILD_CHUNK_OVERLAP", "50"))
+    CONTEXT_NEIGHBORS: int = int(os.getenv("CONTEXT_NEIGHBORS", "1"))
+    CHUNK_STORE_PATH: str = os.getenv("CHUNK_STORE_PATH", "./data/chunks.db")
     TOP_K: int = int(os.getenv("TOP_K", "5"))
     CONVERSATION_HISTORY_LIMIT: int = int(os.getenv("CONVERSATION_HISTORY_LIMIT", "10"))
     MIN_RELEVANCE: float = float(os.getenv("MIN_RELEVANCE", "0.7"))
+    # Adaptive depth: when all TOP_K results pass MIN_RELEVANCE, search once more with
+    # ADAPTIVE_MAX_K; then drop the results below the largest similarity drop of at least
+    # ADAPTIVE_MIN_GAP. With the best hit RELEVANCE_SKIP_MARGIN below MIN_RELEVANCE, no
+    # document context is used at all
+    ADAPTIVE_RETRIEVAL: bool = os.getenv("ADAPTIVE_RETRIEVAL", "true").lower() in ("true", "1", "yes")
+    ADAPTIVE_MAX_K: int = int(os.getenv("ADAPTIVE_MAX_K", "10"))
+    ADAPTIVE_MIN_GAP: float = float(os.getenv("ADAPTIVE_MIN_GAP", "0.1"))
+    RELEVANCE_SKIP_MARGIN: float = float(os.getenv("RELEVANCE_SKIP_MARGIN", "0.2"))
     ENABLE_QUERY_EXPANSION: bool = os.getenv("ENABLE_QUERY_EXPANSION", "true").lower() in ("true", "1", "yes")
+    # "single": one expanded query; "multi": MULTI_QUERY_COUNT sub-queries fused with RRF
+    QUERY_EXPANSION_MODE: str = os.getenv("QUERY_EXPANSION_MODE", "single").lower()
+    MULTI_QUERY_COUNT: int = int(os.getenv("MULTI_QUERY_COUNT", "3"))
+    # "dictionary": local synonym dictionary, with the LLM only for queries it covers less
+    # than QUERY_EXPANSION_MIN_COVERAGE of; "llm": every query goes to the LLM
+    QUERY_EXPANSION_BACKEND: str = os.getenv("QUERY_EXPANSION_BACKEND", "dictionary").lower()
+    QUERY_EXPANSION_MIN_COVERAGE: float = float(os.getenv("QUERY_EXPANSION_MIN_COVERAGE", "0.5"))
+    QUERY_EXPANSION_MAX_TERMS: int = int(os.getenv("QUERY_EXPANSION_MAX_TERMS", "8"))
+    # LLM fallback expansions, and the entries learned from them (python -m app.cli.learn_synonyms)
+    QUERY_EXPANSION_LOG_PATH: str = os.getenv("QUERY_EXPANSION_LOG_PATH", "./data/query_expansions.jsonl")
+    QUERY_EXPANSION_LEARNED_PATH: str = os.getenv("QUERY_EXPANSION_LEARNED_PATH", "./data/learned_synonyms.json")
+    RRF_K: int = int(os.getenv("RRF_K", "60"))
+    # Diversification: fetch TOP_K * MMR_CANDIDATE_FACTOR candidates and keep TOP_K with
+    # maximal marginal relevance (1 disables; MMR_LAMBDA 1 = pure relevance), then merge
+    # consecutive chunks of a document into one span
+    MMR_CANDIDATE_FACTOR: int = int(os.getenv("MMR_CANDIDATE_FACTOR", "4"))
+    MMR_LAMBDA: float = float(os.getenv("MMR_LAMBDA", "0.7"))
+    MERGE_ADJACENT_CHUNKS: bool = os.getenv("MERGE_ADJACENT_CHUNKS", "true").lower() in ("true", "1", "yes")
+    # Hybrid retrieval: BM25 keyword index fused with the vector results
+    ENABLE_LEXICAL_SEARCH: bool = os.getenv("ENABLE_LEXICAL_SEARCH", "true").lower() in ("true", "1", "yes")
+    LEXICAL_INDEX_PATH: str = os.getenv("LEXICAL_INDEX_PATH", "./data/lexical.db")
+    # Keyword hits covering less than this fraction of the query terms are not fused
+    LEXICAL_MIN_COVERAGE: float = float(os.getenv("LEXICAL_MIN_COVERAGE", "0.5"))
+    # Skip expansion and embedding when the best keyword hit has every query term, all
+    # its identifiers (amounts, codes) and a BM25 score this many times the runner-up's (0 disables)
+    LEXICAL_CONFIDENT_MARGIN: float = float(os.getenv("LEXICAL_CONFIDENT_MARGIN", "2.0"))
+    # Two-stage retrieval: pick the documents with the closest centroids, then search
+    # only their chunks. Applies once a collection has HIERARCHICAL_MIN_DOCUMENTS documents (0 disables)
+    DOCUMENT_INDEX_PATH: str = os.getenv("DOCUMENT_INDEX_PATH", "./data/documents.db")
+    HIERARCHICAL_TOP_DOCUMENTS: int = int(os.getenv("HIERARCHICAL_TOP_DOCUMENTS", "20"))
+    HIERARCHICAL_MIN_DOCUMENTS: int = int(os.getenv("HIERARCHICAL_MIN_DOCUMENTS", "200"))
+
+    # Typed columns of CSV/Excel documents (one .npz file per document)
+    TABLE_STORE_PATH: str = os.getenv("TABLE_STORE_PATH", "./data/tables")
+    # Aggregate questions ("¿cuánto vendí en 2024?") over the tabular documents among the
+    # results are planned by the LLM as a small query and computed locally on these tables
+    STRUCTURED_QUERIES: bool = os.getenv("STRUCTURED_QUERIES", "true").lower() in ("true", "1", "yes")
+    STRUCTURED_QUERY_MAX_TABLES: int = int(os.getenv("STRUCTURED_QUERY_MAX_TABLES", "3"))
+    STRUCTURED_QUERY_MAX_GROUPS: int = int(os.getenv("STRUCTURED_QUERY_MAX_GROUPS", "50"))
+    # Monthly/quarterly/yearly sums, means and counts of tabular documents with a date
+    # or Año/Mes/Trimestre columns, indexed as summary chunks at upload
+    TABULAR_ROLLUPS: bool = os.getenv("TABULAR_ROLLUPS", "true").lower() in ("true", "1", "yes")
+    # Periods named in a query ("ventas de este mes", "primer trimestre de 2024") are parsed
+    # locally and applied as a metadata filter on the period of tabular rows and rollups
+    TEMPORAL_FILTERS: bool = os.getenv("TEMPORAL_FILTERS", "true").lower() in ("true", "1", "yes")
+    # Chart series (GET /documents/{id}/chart), cached per document version
+    CHART_CACHE_SIZE: int = int(os.getenv("CHART_CACHE_SIZE", "128"))
+    CHART_MAX_POINTS: int = int(os.getenv("CHART_MAX_POINTS", "500"))
+    CHART_MAX_SERIES: int = int(os.getenv("CHART_MAX_SERIES", "10"))
+
+    # Ingestion pipeline
+    INGEST_QUEUE_SIZE: int = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+    INGEST_EMBED_BATCH_SIZE: int = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+    INGEST_EMBED_CONCURRENCY: int = int(os.getenv("INGEST_EMBED_CONCURRENCY", "2"))
+    INGEST_WRITE_CONCURRENCY: int = int(os.getenv("INGEST_WRITE_CONCURRENCY", "2"))
+
+    # Temporary documents (0 disables the background sweeper)
+    TEMP_DOCUMENT_TTL_SECONDS: int = int(os.getenv("TEMP_DOCUMENT_TTL_SECONDS", "86400"))
+    TEMP_DOCUMENT_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("TEMP_DOCUMENT_SWEEP_INTERVAL_SECONDS", "3600"))
+    TEMP_DOCUMENT_SWEEP_BATCH_SIZE: int = int(os.getenv("TEMP_DOCUMENT_SWEEP_BATCH_SIZE", "100"))
+
+    # Per-conversation in-memory index for temporary attachments
+    CONVERSATION_INDEX_IDLE_SECONDS: int = int(os.getenv("CONVERSATION_INDEX_IDLE_SECONDS", "3600"))
+    CONVERSATION_INDEX_EVICT_INTERVAL_SECONDS: int = int(os.getenv("CONVERSATION_INDEX_EVICT_INTERVAL_SECONDS", "300"))
+
+    # Startup: attempts per dependency before booting not-ready, then retried in the background
+    STARTUP_ATTEMPTS: int = int(os.getenv("STARTUP_ATTEMPTS", "3"))
+    STARTUP_ATTEMPT_TIMEOUT_SECONDS: float = float(os.getenv("STARTUP_ATTEMPT_TIMEOUT_SECONDS", "10"))
+    STARTUP_RETRY_DELAY_SECONDS: float = float(os.getenv("STARTUP_RETRY_DELAY_SECONDS", "1"))
+    STARTUP_RETRY_MAX_DELAY_SECONDS: float = float(os.getenv("STARTUP_RETRY_MAX_DELAY_SECONDS", "30"))
 
     @property
     def DATABASE_URL(self) -> str:
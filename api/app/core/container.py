@@ -2,21 +2,30 @@
 Dependency container for manual wiring.
 """
 from app.core.config import settings
-from app.infrastructure.db.sqlite_client import SQLiteClient
-from app.infrastructure.db.postgres_client import PostgresClient
+from app.core.startup import StartupManager
 from app.infrastructure.repositories.document_repository import DocumentRepository
 from app.infrastructure.repositories.conversation_repository import ConversationRepository
 from app.infrastructure.repositories.message_repository import MessageRepository
-from app.infrastructure.vector.chroma_store import ChromaVectorStore
+from app.infrastructure.repositories.ingestion_repository import IngestionRepository
+from app.infrastructure.vector.conversation_index import InMemoryConversationIndex
+from app.infrastructure.vector.document_index import NumpyDocumentIndex
+from app.infrastructure.chunks.sqlite_chunk_store import SQLiteChunkStore
+from app.infrastructure.tabular.npz_table_store import NpzTableStore
+from app.infrastructure.lexical.bm25_index import SQLiteBM25Index
 from app.infrastructure.llm.openai_embedding import OpenAIEmbeddingService
 from app.infrastructure.llm.openai_chat import OpenAIChatService
 from app.infrastructure.llm.openai_query_expansion import OpenAIQueryExpansionService
+from app.infrastructure.expansion.dictionary_query_expansion import DictionaryQueryExpansionService
+from app.infrastructure.llm.openai_table_query_planner import OpenAITableQueryPlanner
 from app.infrastructure.document_processor import DocumentProcessor
 from app.application.usecases.upload_document import UploadDocumentUseCase
 from app.application.usecases.chat import ChatUseCase
 from app.application.usecases.create_conversation import CreateConversationUseCase
 from app.application.usecases.list_conversations import ListConversationsUseCase
 from app.application.usecases.get_conversation import GetConversationUseCase
+from app.application.usecases.get_chart_data import GetChartDataUseCase
+from app.application.usecases.sweep_temporary_documents import SweepTemporaryDocumentsUseCase
+from app.application.usecases.verify_embedding_spec import VerifyEmbeddingSpecUseCase
 
 
 class Container:
@@ -39,17 +48,37 @@ class Container:
             return
 
         # Infrastructure layer - Auto-detect database type
+        # (drivers and vector backends are imported here so only the one in use is loaded)
         if settings.DATABASE_URL.startswith("postgresql://"):
+            from app.infrastructure.db.postgres_client import PostgresClient
             self.db_client = PostgresClient()
         else:
+            from app.infrastructure.db.sqlite_client import SQLiteClient
             self.db_client = SQLiteClient()
         self.document_repository = DocumentRepository(self.db_client)
         self.conversation_repository = ConversationRepository(self.db_client)
         self.message_repository = MessageRepository(self.db_client)
-        self.vector_store = ChromaVectorStore()
+        self.ingestion_repository = IngestionRepository(self.db_client)
+        self.chunk_store = SQLiteChunkStore()
+        if settings.VECTOR_STORE_BACKEND == "numpy":
+            from app.infrastructure.vector.numpy_store import NumpyVectorStore
+            self.vector_store = NumpyVectorStore()
+        else:
+            from app.infrastructure.vector.chroma_store import ChromaVectorStore
+            self.vector_store = ChromaVectorStore(
+                chunk_store=self.chunk_store if settings.CHROMA_LOCAL_CHUNK_TEXT else None
+            )
+        self.conversation_index = InMemoryConversationIndex()
+        self.lexical_index = SQLiteBM25Index() if settings.ENABLE_LEXICAL_SEARCH else None
+        self.document_index = NumpyDocumentIndex()
+        self.table_store = NpzTableStore()
         self.embedding_service = OpenAIEmbeddingService()
         self.chat_service = OpenAIChatService()
-        self.query_expansion_service = OpenAIQueryExpansionService()
+        if settings.QUERY_EXPANSION_BACKEND == "llm":
+            self.query_expansion_service = OpenAIQueryExpansionService()
+        else:
+            self.query_expansion_service = DictionaryQueryExpansionService(fallback=OpenAIQueryExpansionService())
+        self.table_query_planner = OpenAITableQueryPlanner()
         self.document_processor = DocumentProcessor()
 
         # Application layer - Use cases
@@ -57,7 +86,13 @@ class Container:
             document_repository=self.document_repository,
             vector_store=self.vector_store,
             embedding_service=self.embedding_service,
-            document_processor=self.document_processor
+            document_processor=self.document_processor,
+            ingestion_repository=self.ingestion_repository,
+            conversation_index=self.conversation_index,
+            lexical_index=self.lexical_index,
+            document_index=self.document_index,
+            chunk_store=self.chunk_store,
+            table_store=self.table_store
         )
 
         self.create_conversation_usecase = CreateConversationUseCase(
@@ -73,6 +108,34 @@ class Container:
             message_repository=self.message_repository
         )
 
+        self.get_chart_data_usecase = GetChartDataUseCase(
+            document_repository=self.document_repository,
+            ingestion_repository=self.ingestion_repository,
+            table_store=self.table_store
+        )
+
+        self.sweep_temporary_documents_usecase = SweepTemporaryDocumentsUseCase(
+            document_repository=self.document_repository,
+            vector_store=self.vector_store,
+            ingestion_repository=self.ingestion_repository,
+            lexical_index=self.lexical_index,
+            document_index=self.document_index,
+            chunk_store=self.chunk_store,
+            table_store=self.table_store
+        )
+
+        self.verify_embedding_spec_usecase = VerifyEmbeddingSpecUseCase(
+            vector_store=self.vector_store,
+            embedding_service=self.embedding_service
+        )
+
+        self.startup = StartupManager(
+            db_client=self.db_client,
+            vector_store=self.vector_store,
+            embedding_service=self.embedding_service,
+            verify_embedding_spec_usecase=self.verify_embedding_spec_usecase
+        )
+
         self._initialized = True
 
     def get_chat_usecase(self) -> ChatUseCase:
@@ -89,7 +152,13 @@ class Container:
             embedding_service=self.embedding_service,
             conversation_repository=self.conversation_repository,
             message_repository=self.message_repository,
-            query_expansion_service=self.query_expansion_service
+            query_expansion_service=self.query_expansion_service,
+            conversation_index=self.conversation_index,
+            lexical_index=self.lexical_index,
+            document_index=self.document_index,
+            chunk_store=self.chunk_store,
+            table_store=self.table_store,
+            table_query_planner=self.table_query_planner
         )
 
 
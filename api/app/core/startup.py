@@ -0,0 +1,156 @@
+"""
+Application startup: connects and warms up external dependencies.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.domain.exceptions import EmbeddingConfigurationError
+from app.infrastructure.db.migrations import run_migrations
+
+logger = logging.getLogger(__name__)
+
+STARTING = "starting"
+READY = "ready"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class StartupManager:
+    """
+    Brings up the database, the vector store and the OpenAI client
+    concurrently, then verifies the embedding spec and runs a warm-up
+    search, and only then reports ready.
+
+    Each dependency is retried with exponential backoff. If one is still
+    down after STARTUP_ATTEMPTS, the application boots not-ready (so an
+    outage of e.g. Chroma does not keep the API from starting) and the
+    remaining steps keep retrying in the background. An embedding spec
+    mismatch is a configuration error and is raised instead.
+    """
+
+    def __init__(self, db_client: Any, vector_store: Any, embedding_service: Any, verify_embedding_spec_usecase: Any):
+        self.db_client = db_client
+        self.vector_store = vector_store
+        self.embedding_service = embedding_service
+        self.verify_embedding_spec_usecase = verify_embedding_spec_usecase
+
+        self._connections: Dict[str, Callable[[], Awaitable[None]]] = {
+            "database": self._connect_database,
+            "vector_store": self.vector_store.connect,
+            "embeddings": self._warm_up_embeddings,
+        }
+        self.components: Dict[str, str] = {name: STARTING for name in [*self._connections, "warmup"]}
+        self.errors: Dict[str, str] = {}
+        self._probe: Optional[List[float]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether every dependency is connected and warmed up."""
+        return all(status in (READY, SKIPPED) for status in self.components.values())
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness report for the health endpoint."""
+        return {
+            "status": READY if self.ready else STARTING,
+            "components": dict(self.components),
+            "errors": dict(self.errors),
+        }
+
+    async def start(self) -> None:
+        """
+        Run the first initialization attempt; on failure, keep retrying in
+        the background and return so the application can boot.
+
+        Raises:
+            EmbeddingConfigurationError: If the embedding model does not match the stored vectors
+        """
+        if await self._initialize(attempts=max(1, settings.STARTUP_ATTEMPTS)):
+            logger.info("✅ All dependencies ready")
+            return
+
+        logger.warning(f"⚠️ Starting not ready ({', '.join(self.errors)}), retrying in the background")
+        self._task = asyncio.create_task(self._initialize_in_background(), name="startup-retry")
+
+    async def stop(self) -> None:
+        """Cancel background retries."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _initialize_in_background(self) -> None:
+        try:
+            await self._initialize(attempts=None)
+            logger.info("✅ All dependencies ready")
+        except EmbeddingConfigurationError as e:
+            logger.error(f"❌ {e}")
+
+    async def _initialize(self, attempts: Optional[int]) -> bool:
+        """
+        Connect every pending dependency concurrently, then warm up.
+
+        Args:
+            attempts: Attempts per step, None to retry until it succeeds
+
+        Returns:
+            True when all steps succeeded
+        """
+        pending = [name for name in self._connections if self.components[name] not in (READY, SKIPPED)]
+        connected = await asyncio.gather(
+            *(self._bring_up(name, self._connections[name], attempts) for name in pending)
+        )
+        if not all(connected):
+            return False
+        return await self._bring_up("warmup", self._warm_up_search, attempts)
+
+    async def _bring_up(self, name: str, step: Callable[[], Awaitable[None]], attempts: Optional[int]) -> bool:
+        """Run one step with a timeout, retrying with exponential backoff."""
+        delay = settings.STARTUP_RETRY_DELAY_SECONDS
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                await asyncio.wait_for(step(), timeout=settings.STARTUP_ATTEMPT_TIMEOUT_SECONDS)
+                if self.components[name] != SKIPPED:
+                    self.components[name] = READY
+                self.errors.pop(name, None)
+                return True
+            except EmbeddingConfigurationError:
+                self.components[name] = FAILED
+                raise
+            except Exception as e:
+                self.components[name] = FAILED
+                self.errors[name] = f"{type(e).__name__}: {e}"
+                logger.warning(f"⚠️ {name} not ready (attempt {attempt}): {self.errors[name]}")
+                if attempts is not None and attempt >= attempts:
+                    return False
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.STARTUP_RETRY_MAX_DELAY_SECONDS)
+
+    async def _connect_database(self) -> None:
+        await self.db_client.connect()
+        await run_migrations(self.db_client)
+
+    async def _warm_up_embeddings(self) -> None:
+        """Open the OpenAI connection with one embedding, reused as the warm-up query."""
+        if not settings.OPENAI_API_KEY:
+            self.components["embeddings"] = SKIPPED
+            return
+        self._probe = await self.embedding_service.generate_embedding("warm-up")
+
+    async def _warm_up_search(self) -> None:
+        """Verify the embedding spec and run one search to page in the index."""
+        await self.verify_embedding_spec_usecase.execute()
+
+        probe = self._probe
+        if probe is None:
+            dimensions = self.embedding_service.spec.dimensions
+            probe = [1.0] + [0.0] * (dimensions - 1)
+        await self.vector_store.search(probe, top_k=1)
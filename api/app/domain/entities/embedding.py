@@ -0,0 +1,28 @@
+"""
+Embedding specification entity.
+"""
+from typing import Optional
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class EmbeddingSpec:
+    """
+    Model and vector size a collection was embedded with.
+
+    `model` is None for collections created before the spec was recorded,
+    where only the dimension can be read back from the stored vectors.
+    """
+    model: Optional[str]
+    dimensions: int
+
+    def __post_init__(self):
+        """Validate entity after initialization."""
+        if self.dimensions <= 0:
+            raise ValueError("dimensions must be positive")
+
+    def is_compatible_with(self, other: "EmbeddingSpec") -> bool:
+        """Whether query vectors of `other` can be searched against this spec."""
+        if self.dimensions != other.dimensions:
+            return False
+        return self.model is None or other.model is None or self.model == other.model
@@ -0,0 +1,78 @@
+"""
+Ingestion progress entities.
+"""
+from datetime import datetime
+from typing import Optional, List, Tuple
+from dataclasses import dataclass
+
+BATCH_EMBEDDED = "embedded"
+BATCH_WRITTEN = "written"
+
+JOB_RUNNING = "running"
+JOB_FAILED = "failed"
+JOB_COMPLETED = "completed"
+
+
+@dataclass
+class IngestionBatch:
+    """
+    A contiguous range of chunks [start_index, end_index) and its status.
+    """
+    document_id: str
+    start_index: int
+    end_index: int
+    status: str  # "embedded" or "written"
+
+    def __post_init__(self):
+        """Validate entity after initialization."""
+        if self.end_index <= self.start_index:
+            raise ValueError("end_index must be greater than start_index")
+        if self.status not in [BATCH_EMBEDDED, BATCH_WRITTEN]:
+            raise ValueError("status must be 'embedded' or 'written'")
+
+
+@dataclass
+class IngestionJob:
+    """
+    Ingestion progress for a single document.
+    """
+    document_id: str
+    filename: str
+    file_type: str
+    content_hash: str
+    status: str  # "running", "failed" or "completed"
+    created_at: datetime
+    updated_at: datetime
+    total_chunks: Optional[int] = None
+    error: Optional[str] = None
+    batches: Optional[List[IngestionBatch]] = None
+
+    def __post_init__(self):
+        """Validate entity after initialization."""
+        if self.status not in [JOB_RUNNING, JOB_FAILED, JOB_COMPLETED]:
+            raise ValueError("status must be 'running', 'failed' or 'completed'")
+        if self.batches is None:
+            self.batches = []
+
+    def written_ranges(self) -> List[Tuple[int, int]]:
+        """
+        Get the merged chunk ranges already stored in the vector store.
+
+        Returns:
+            Sorted, non-overlapping list of (start_index, end_index) tuples
+        """
+        ranges = sorted(
+            (b.start_index, b.end_index) for b in self.batches if b.status == BATCH_WRITTEN
+        )
+        merged: List[Tuple[int, int]] = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    @property
+    def committed_chunks(self) -> int:
+        """Number of chunks already written to the vector store."""
+        return sum(end - start for start, end in self.written_ranges())
@@ -0,0 +1,74 @@
+"""
+Search filter entity.
+"""
+from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass
+
+
+@dataclass
+class SearchFilter:
+    """
+    Restricts a vector search to chunks whose metadata matches every set field.
+
+    Unset (None) fields do not filter. `ingest_year` and `ingest_month` refer
+    to when the document was uploaded; `period_from` and `period_to`
+    (YYYYMM, inclusive) to the period the chunk's data covers, so only
+    chunks tagged with a period inside the range match.
+    """
+    document_ids: Optional[List[str]] = None
+    file_types: Optional[List[str]] = None
+    is_temporary: Optional[bool] = None
+    ingest_year: Optional[int] = None
+    ingest_month: Optional[int] = None
+    period_from: Optional[int] = None
+    period_to: Optional[int] = None
+
+    def __post_init__(self):
+        """Validate entity after initialization."""
+        if self.ingest_month is not None and not 1 <= self.ingest_month <= 12:
+            raise ValueError("ingest_month must be between 1 and 12")
+        if self.period_from is not None and self.period_to is not None and self.period_from > self.period_to:
+            raise ValueError("period_from must not be after period_to")
+        # An empty list means "no restriction", same as None
+        self.document_ids = list(self.document_ids) if self.document_ids else None
+        self.file_types = [t.lower().lstrip(".") for t in self.file_types] if self.file_types else None
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the filter matches every chunk."""
+        return (
+            self.document_ids is None
+            and self.file_types is None
+            and not self.equality_conditions()
+            and not self.range_conditions()
+        )
+
+    def equality_conditions(self) -> Dict[str, Any]:
+        """Single-value metadata conditions that are set."""
+        conditions = {
+            "is_temporary": self.is_temporary,
+            "ingest_year": self.ingest_year,
+            "ingest_month": self.ingest_month,
+        }
+        return {key: value for key, value in conditions.items() if value is not None}
+
+    def range_conditions(self) -> List[Tuple[str, str, int]]:
+        """Bound conditions that are set, as (metadata key, ">=" or "<=", value)."""
+        conditions = []
+        if self.period_from is not None:
+            conditions.append(("data_period_start", ">=", self.period_from))
+        if self.period_to is not None:
+            conditions.append(("data_period_end", "<=", self.period_to))
+        return conditions
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        """Whether a chunk with this metadata passes the filter."""
+        if self.document_ids is not None and metadata.get("document_id") not in self.document_ids:
+            return False
+        if self.file_types is not None and metadata.get("file_type") not in self.file_types:
+            return False
+        for key, op, value in self.range_conditions():
+            bound = metadata.get(key)
+            if bound is None or (bound < value if op == ">=" else bound > value):
+                return False
+        return all(metadata.get(key) == value for key, value in self.equality_conditions().items())
@@ -0,0 +1,138 @@
+"""
+Typed tabular data entities.
+"""
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+# Column kinds: float64 values ("number", "currency", "percent"),
+# datetime64[D] values ("date") or unicode strings ("text")
+NUMBER = "number"
+CURRENCY = "currency"
+PERCENT = "percent"
+DATE = "date"
+TEXT = "text"
+
+NUMERIC_KINDS = (NUMBER, CURRENCY, PERCENT)
+
+
+@dataclass
+class TypedColumn:
+    """
+    A column of a spreadsheet converted to a NumPy array.
+
+    Missing values are NaN in numeric columns, NaT in date columns and ""
+    in text columns. Percentages keep the number shown ("12,5%" is 12.5).
+    """
+    name: str
+    kind: str
+    values: np.ndarray
+    unit: Optional[str] = None  # currency code, e.g. "COP"
+
+    def __post_init__(self):
+        """Validate entity after initialization."""
+        if self.kind not in NUMERIC_KINDS + (DATE, TEXT):
+            raise ValueError(f"Unknown column kind: {self.kind}")
+
+
+@dataclass
+class TypedTable:
+    """
+    The typed columns of a tabular document, all of the same length.
+    """
+    columns: List[TypedColumn]
+
+    def __post_init__(self):
+        """Validate entity after initialization."""
+        if len({len(column.values) for column in self.columns}) > 1:
+            raise ValueError("All columns must have the same length")
+
+    @property
+    def row_count(self) -> int:
+        return len(self.columns[0].values) if self.columns else 0
+
+    def column(self, name: str) -> Optional[TypedColumn]:
+        """Column by name, or None."""
+        return next((column for column in self.columns if column.name == name), None)
+
+
+# Aggregate query vocabulary
+METRICS = ("sum", "avg", "count", "min", "max")
+OPERATORS = ("=", "!=", ">", ">=", "<", "<=", "contains")
+PERIODS = ("year", "month", "day")
+
+
+@dataclass
+class Condition:
+    """A filter of an aggregate query: `column op value`."""
+    column: str
+    op: str
+    value: Any
+
+
+@dataclass
+class AggregateQuery:
+    """
+    An aggregate over the typed table of a document:
+    metric(column) WHERE filters GROUP BY group_by [truncated to period].
+    """
+    document_id: str
+    metric: str
+    column: Optional[str] = None  # None only for "count"
+    filters: List[Condition] = field(default_factory=list)
+    group_by: Optional[str] = None
+    period: Optional[str] = None  # for date group_by columns
+
+    def describe(self) -> str:
+        """Compact text form, e.g. 'sum(Monto) WHERE Año = 2024 GROUP BY Fecha (month)'."""
+        text = f"{self.metric}({self.column or '*'})"
+        if self.filters:
+            text += " WHERE " + " AND ".join(f"{c.column} {c.op} {c.value}" for c in self.filters)
+        if self.group_by:
+            text += f" GROUP BY {self.group_by}" + (f" ({self.period})" if self.period else "")
+        return text
+
+
+@dataclass
+class AggregateResult:
+    """
+    Result of an aggregate query: a single value, or one value per group
+    (groups in chronological order for dates, largest value first otherwise).
+    """
+    query: AggregateQuery
+    matched_rows: int
+    value: Optional[float] = None
+    groups: Optional[List[Tuple[str, float]]] = None
+    unit: Optional[str] = None
+    truncated: bool = False
+
+
+# Time buckets of chart axes over date columns
+GRANULARITIES = ("day", "month", "quarter", "year")
+
+
+@dataclass
+class ChartSeries:
+    """One series of a chart: a value per axis label (None where no rows)."""
+    name: str
+    values: List[Optional[float]]
+
+
+@dataclass
+class ChartData:
+    """
+    Aggregated series of a document's table, in columnar form: the axis
+    labels once, and one array of values per series aligned to them.
+    """
+    document_id: str
+    version: str
+    measure: str
+    metric: str
+    group_by: str
+    labels: List[str]
+    series: List[ChartSeries]
+    granularity: Optional[str] = None
+    split_by: Optional[str] = None
+    unit: Optional[str] = None
+    truncated: bool = False
@@ -0,0 +1,43 @@
+"""
+Domain exceptions.
+"""
+
+
+class VectorStoreWriteError(Exception):
+    """
+    Raised when a batched write to the vector store fails part-way through.
+
+    Chunks before `committed_count` are durably stored, so the write can be
+    resumed from that index instead of starting over.
+    """
+
+    def __init__(self, message: str, committed_count: int):
+        super().__init__(message)
+        self.committed_count = committed_count
+
+
+class IngestionError(Exception):
+    """
+    Raised when a document ingestion fails after its progress was recorded.
+
+    The document can be resumed from its last committed batch using
+    `document_id`.
+    """
+
+    def __init__(self, message: str, document_id: str):
+        super().__init__(message)
+        self.document_id = document_id
+
+
+class EmbeddingConfigurationError(Exception):
+    """
+    Raised at startup when the configured embedding model or dimensions do
+    not match the ones the active vector collection was built with.
+    """
+
+
+class InvalidTableQueryError(ValueError):
+    """
+    Raised when an aggregate query does not fit the table it targets
+    (unknown column, metric or operator, or a value of the wrong type).
+    """
@@ -0,0 +1,66 @@
+"""
+Chunk store port (interface).
+"""
+from abc import ABC, abstractmethod
+from typing import List, Dict, Tuple
+
+# Kinds of stored text: the chunks that are embedded, and the larger parent
+# windows they were split from (parent-child retrieval)
+CHUNK = "chunk"
+PARENT = "parent"
+
+
+class ChunkStorePort(ABC):
+    """
+    Port for a local store of chunk texts keyed by (document_id, index).
+
+    Lets retrieval fetch the text around a hit (its parent window or its
+    neighbouring chunks) in one batched read, without another vector search.
+    """
+
+    @abstractmethod
+    async def add_chunks(
+        self,
+        document_id: str,
+        chunks: List[str],
+        start_index: int = 0,
+        kind: str = CHUNK
+    ) -> None:
+        """
+        Store texts of a document, replacing any with the same keys.
+
+        Args:
+            document_id: Document identifier
+            chunks: Texts, chunks[i] is stored under index start_index + i
+            start_index: Index of chunks[0]
+            kind: CHUNK or PARENT
+        """
+        pass
+
+    @abstractmethod
+    async def get_chunks(
+        self,
+        keys: List[Tuple[str, int]],
+        kind: str = CHUNK
+    ) -> Dict[Tuple[str, int], str]:
+        """
+        Read several texts at once.
+
+        Args:
+            keys: (document_id, index) pairs
+            kind: CHUNK or PARENT
+
+        Returns:
+            Texts by key; missing keys are left out
+        """
+        pass
+
+    @abstractmethod
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Remove every text of several documents.
+
+        Args:
+            document_ids: Document identifiers
+        """
+        pass
@@ -0,0 +1,102 @@
+"""
+Conversation index port (interface).
+"""
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+from app.domain.entities.search import SearchFilter
+
+
+class ConversationIndexPort(ABC):
+    """
+    Port for per-conversation, in-process vector indexes.
+    Holds the chunks of temporary documents attached to a single conversation,
+    so they never enter the shared vector store.
+    """
+
+    @abstractmethod
+    async def add_chunks(
+        self,
+        conversation_id: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        metadata: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Add chunks with embeddings to a conversation's index.
+
+        Args:
+            conversation_id: Conversation identifier
+            chunks: List of text chunks
+            embeddings: List of embedding vectors
+            metadata: List of metadata dicts for each chunk (must include document_id and chunk_index)
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        conversation_id: str,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Search a conversation's index.
+
+        Args:
+            conversation_id: Conversation identifier
+            query_embedding: Query vector
+            top_k: Number of results to return
+            filters: Optional metadata filter
+            include_embeddings: Also return each chunk's vector as "embedding"
+
+        Returns:
+            List of similar chunks in the same format as VectorStorePort.search
+        """
+        pass
+
+    @abstractmethod
+    async def has_chunks(self, conversation_id: str) -> bool:
+        """
+        Whether a conversation has any indexed attachment chunks.
+
+        Args:
+            conversation_id: Conversation identifier
+        """
+        pass
+
+    @abstractmethod
+    async def delete_document(self, conversation_id: str, document_id: str) -> None:
+        """
+        Remove a document's chunks from a conversation's index.
+
+        Args:
+            conversation_id: Conversation identifier
+            document_id: Document identifier
+        """
+        pass
+
+    @abstractmethod
+    async def drop(self, conversation_id: str) -> None:
+        """
+        Free a conversation's index.
+
+        Args:
+            conversation_id: Conversation identifier
+        """
+        pass
+
+    @abstractmethod
+    async def evict_idle(self, max_idle_seconds: float) -> int:
+        """
+        Free indexes that have not been used recently.
+
+        Args:
+            max_idle_seconds: Indexes idle for longer than this are dropped
+
+        Returns:
+            Number of indexes freed
+        """
+        pass
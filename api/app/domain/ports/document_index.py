@@ -0,0 +1,82 @@
+"""
+Document index port (interface).
+"""
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+from app.domain.entities.search import SearchFilter
+
+
+class DocumentIndexPort(ABC):
+    """
+    Port for document-level vectors (one centroid per document).
+    Used to pick the most relevant documents before searching their chunks.
+
+    Centroids are kept per vector store collection, since collections built
+    with different embedding models are not comparable.
+    """
+
+    @abstractmethod
+    async def add_embeddings(
+        self,
+        collection: str,
+        document_id: str,
+        embeddings: List[List[float]],
+        metadata: Dict[str, Any],
+        start_index: Optional[int] = None
+    ) -> None:
+        """
+        Fold chunk embeddings into a document's centroid.
+
+        Args:
+            collection: Vector store collection the chunks were written to
+            document_id: Document identifier
+            embeddings: Embeddings of (some of) the document's chunks
+            metadata: Document-level metadata (matched by SearchFilter)
+            start_index: Chunk index of the first embedding; chunks already
+                folded in are skipped, so a batch can be folded again safely.
+                None folds every embedding.
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        collection: str,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        filters: Optional[SearchFilter] = None
+    ) -> List[List[str]]:
+        """
+        Find the documents whose centroids are closest to each query.
+
+        Args:
+            collection: Vector store collection being searched
+            query_embeddings: Query vectors
+            top_k: Number of documents per query
+            filters: Optional metadata filter on the documents
+
+        Returns:
+            Document ids per query, best first
+        """
+        pass
+
+    @abstractmethod
+    async def count(self, collection: str) -> int:
+        """
+        Number of documents with a centroid in a collection.
+
+        Args:
+            collection: Vector store collection
+        """
+        pass
+
+    @abstractmethod
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Remove the centroids of several documents, in every collection.
+
+        Args:
+            document_ids: Document identifiers
+        """
+        pass
@@ -2,6 +2,7 @@
 Document repository port (interface).
 """
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from app.domain.entities.document import Document
 
@@ -47,6 +48,16 @@ class DocumentRepositoryPort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def update(self, document: Document) -> None:
+        """
+        Update a document (e.g., chunk_count once ingestion finishes).
+
+        Args:
+            document: Document entity to update
+        """
+        pass
+
     @abstractmethod
     async def delete(self, document_id: str) -> None:
         """
@@ -55,4 +66,28 @@ class DocumentRepositoryPort(ABC):
         Args:
             document_id: Document identifier
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def list_expired_temporary(self, cutoff: datetime, limit: int) -> List[Document]:
+        """
+        List temporary documents uploaded before a cutoff date.
+
+        Args:
+            cutoff: Documents uploaded before this date are expired
+            limit: Maximum number of documents to return
+
+        Returns:
+            List of expired temporary document entities, oldest first
+        """
+        pass
+
+    @abstractmethod
+    async def delete_many(self, document_ids: List[str]) -> None:
+        """
+        Delete several documents at once.
+
+        Args:
+            document_ids: Document identifiers
+        """
+        pass
@@ -0,0 +1,84 @@
+"""
+Ingestion progress repository port (interface).
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from app.domain.entities.ingestion import IngestionBatch, IngestionJob
+
+
+class IngestionRepositoryPort(ABC):
+    """
+    Port for ingestion progress operations.
+    """
+
+    @abstractmethod
+    async def save_job(self, job: IngestionJob) -> None:
+        """
+        Create an ingestion job.
+
+        Args:
+            job: Ingestion job entity to save
+        """
+        pass
+
+    @abstractmethod
+    async def get_job(self, document_id: str) -> Optional[IngestionJob]:
+        """
+        Retrieve an ingestion job with its batches.
+
+        Args:
+            document_id: Document identifier
+
+        Returns:
+            Ingestion job entity or None
+        """
+        pass
+
+    @abstractmethod
+    async def update_job_status(
+        self,
+        document_id: str,
+        status: str,
+        total_chunks: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Update the status of an ingestion job.
+
+        Args:
+            document_id: Document identifier
+            status: New job status
+            total_chunks: Total number of chunks, once known
+            error: Error message for failed jobs
+        """
+        pass
+
+    @abstractmethod
+    async def save_batch(self, batch: IngestionBatch) -> None:
+        """
+        Record (or update) the status of a chunk range.
+
+        Args:
+            batch: Ingestion batch entity
+        """
+        pass
+
+    @abstractmethod
+    async def delete_job(self, document_id: str) -> None:
+        """
+        Delete an ingestion job and its batches.
+
+        Args:
+            document_id: Document identifier
+        """
+        pass
+
+    @abstractmethod
+    async def delete_jobs(self, document_ids: List[str]) -> None:
+        """
+        Delete the ingestion jobs and batches of several documents.
+
+        Args:
+            document_ids: Document identifiers
+        """
+        pass
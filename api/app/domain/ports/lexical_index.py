@@ -0,0 +1,68 @@
+"""
+Lexical index port (interface).
+"""
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+from app.domain.entities.search import SearchFilter
+
+
+class LexicalIndexPort(ABC):
+    """
+    Port for keyword (BM25) search over chunk text.
+    Complements the vector store on exact tokens such as invoice numbers,
+    supplier names and amounts, which embeddings retrieve poorly.
+    """
+
+    @abstractmethod
+    async def add_chunks(
+        self,
+        document_id: str,
+        chunks: List[str],
+        metadata: List[Dict[str, Any]],
+        start_index: int = 0
+    ) -> None:
+        """
+        Index document chunks, replacing any chunks with the same ids.
+
+        Args:
+            document_id: Unique identifier for the document
+            chunks: List of text chunks
+            metadata: List of metadata dicts for each chunk
+            start_index: Position of chunks[0] within the document
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search chunks by keyword relevance.
+
+        Args:
+            query: User query text
+            top_k: Number of results to return
+            filters: Optional metadata filter; only matching chunks are ranked
+
+        Returns:
+            List of chunks, best first, in the same format as
+            VectorStorePort.search but with "distance" None and with
+            "lexical_score" (BM25), "coverage" (fraction of the query terms
+            found in the chunk) and "identifier_match" (the query has exact
+            identifiers such as amounts or codes and the chunk has all of them)
+        """
+        pass
+
+    @abstractmethod
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Remove all chunks of several documents.
+
+        Args:
+            document_ids: Document identifiers
+        """
+        pass
@@ -2,6 +2,7 @@
 Query expansion service port (interface).
 """
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class QueryExpansionServicePort(ABC):
@@ -22,3 +23,17 @@ class QueryExpansionServicePort(ABC):
             Expanded query with additional terms for better semantic matching
         """
         pass
+
+    @abstractmethod
+    async def expand_to_queries(self, query: str, count: int) -> List[str]:
+        """
+        Rewrite a query into several sub-queries covering its different facets.
+
+        Args:
+            query: Original user query in Spanish
+            count: Number of sub-queries to return, including the original
+
+        Returns:
+            Up to `count` sub-queries, starting with the original query
+        """
+        pass
@@ -0,0 +1,28 @@
+"""
+Table query planner port (interface).
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class TableQueryPlannerPort(ABC):
+    """
+    Port for turning a question into an aggregate query over one of the
+    typed tables it may be about.
+    """
+
+    @abstractmethod
+    async def plan(self, question: str, tables: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Plan an aggregate query.
+
+        Args:
+            question: User question in Spanish
+            tables: Schema of each candidate table (see query_engine.describe_table)
+
+        Returns:
+            The query as a JSON object (document_id, metric, column,
+            filters, group_by, period), or None if the question is not an
+            aggregate over these tables. It is validated by the caller.
+        """
+        pass
@@ -0,0 +1,49 @@
+"""
+Table store port (interface).
+"""
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from app.domain.entities.table import TypedTable
+
+
+class TableStorePort(ABC):
+    """
+    Port for the typed tables of tabular documents, stored next to their
+    text chunks so numeric questions can be computed instead of asked of
+    the LLM.
+    """
+
+    @abstractmethod
+    async def save_table(self, document_id: str, table: TypedTable) -> None:
+        """
+        Store the typed table of a document, replacing any previous one.
+
+        Args:
+            document_id: Document identifier
+            table: Typed columns
+        """
+        pass
+
+    @abstractmethod
+    async def get_table(self, document_id: str) -> Optional[TypedTable]:
+        """
+        Read the typed table of a document.
+
+        Args:
+            document_id: Document identifier
+
+        Returns:
+            The table, or None if the document has none
+        """
+        pass
+
+    @abstractmethod
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Remove the tables of several documents.
+
+        Args:
+            document_ids: Document identifiers
+        """
+        pass
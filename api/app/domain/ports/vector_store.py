@@ -2,7 +2,10 @@
 Vector store port (interface).
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
+
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.entities.search import SearchFilter
 
 
 class VectorStorePort(ABC):
@@ -10,13 +13,24 @@ class VectorStorePort(ABC):
     Port for vector store operations.
     """
 
+    @abstractmethod
+    async def connect(self) -> None:
+        """
+        Open the underlying client, files or collection.
+
+        Constructors must not connect or load data; this is called at
+        startup, and the other methods open the store on first use otherwise.
+        """
+        pass
+
     @abstractmethod
     async def add_chunks(
         self,
         document_id: str,
         chunks: List[str],
         embeddings: List[List[float]],
-        metadata: List[Dict[str, Any]]
+        metadata: List[Dict[str, Any]],
+        start_index: int = 0
     ) -> None:
         """
         Add document chunks with embeddings to the vector store.
@@ -26,6 +40,11 @@ class VectorStorePort(ABC):
             chunks: List of text chunks
             embeddings: List of embedding vectors
             metadata: List of metadata dicts for each chunk
+            start_index: Position of chunks[0] within the document, used to
+                resume a partially written document
+
+        Raises:
+            VectorStoreWriteError: If only part of the chunks could be stored
         """
         pass
 
@@ -33,7 +52,9 @@ class VectorStorePort(ABC):
     async def search(
         self,
         query_embedding: List[float],
-        top_k: int = 5
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Search for similar chunks based on query embedding.
@@ -41,12 +62,36 @@ class VectorStorePort(ABC):
         Args:
             query_embedding: Query vector
             top_k: Number of results to return
+            filters: Optional metadata filter; only matching chunks are ranked
+            include_embeddings: Also return each chunk's vector as "embedding"
 
         Returns:
             List of similar chunks with metadata
         """
         pass
 
+    @abstractmethod
+    async def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query embeddings in one round trip.
+
+        Args:
+            query_embeddings: Query vectors
+            top_k: Number of results to return per query
+            filters: Optional metadata filter applied to every query
+            include_embeddings: Also return each chunk's vector as "embedding"
+
+        Returns:
+            One result list per query embedding, in the same order
+        """
+        pass
+
     @abstractmethod
     async def delete_document(self, document_id: str) -> None:
         """
@@ -55,4 +100,75 @@ class VectorStorePort(ABC):
         Args:
             document_id: Document identifier
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Delete all chunks for several documents in one operation.
+
+        Args:
+            document_ids: Document identifiers
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def collection_name(self) -> str:
+        """Name of the collection this store reads and writes."""
+        pass
+
+    @abstractmethod
+    async def get_embedding_spec(self) -> Optional[EmbeddingSpec]:
+        """
+        Get the embedding model and dimensions the collection was built with.
+
+        Returns:
+            The recorded spec, a spec with only the dimension for collections
+            that predate it, or None for an empty collection without a spec
+        """
+        pass
+
+    @abstractmethod
+    async def set_embedding_spec(self, spec: EmbeddingSpec) -> None:
+        """
+        Record the embedding model and dimensions with the collection.
+
+        Args:
+            spec: Embedding specification
+        """
+        pass
+
+    @abstractmethod
+    def iter_chunks(self, batch_size: int = 500) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterate over all stored chunks, without their embeddings.
+
+        Args:
+            batch_size: Number of chunks per yielded batch
+
+        Yields:
+            Lists of dicts with "id", "document" and "metadata"
+        """
+        pass
+
+    @abstractmethod
+    async def create_collection(self, name: str, spec: EmbeddingSpec) -> "VectorStorePort":
+        """
+        Create a new, empty collection next to this one.
+
+        Args:
+            name: Collection name (must not exist yet)
+            spec: Embedding specification of the new collection
+
+        Returns:
+            A store bound to the new collection
+        """
+        pass
+
+    @abstractmethod
+    async def activate(self) -> None:
+        """
+        Atomically make this collection the one new store instances open.
+        """
+        pass
@@ -0,0 +1,172 @@
+"""
+SQLite chunk store implementation.
+"""
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional, Any
+import asyncio
+import logging
+import sqlite3
+import threading
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional: texts fall back to zlib
+    zstandard = None
+
+from app.core.config import settings
+from app.domain.ports.chunk_store import ChunkStorePort, CHUNK
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_texts (
+    document_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    text BLOB NOT NULL,
+    PRIMARY KEY (document_id, kind, idx)
+) WITHOUT ROWID;
+"""
+
+# Keys per read; (document_id, kind, idx) binds 3 parameters each and SQLite
+# allows 32766 per statement
+_READ_BATCH = 5000
+
+# First byte of a stored text: how the rest is encoded
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+_ZSTD = b"\x02"
+
+
+def _encode(text: str) -> bytes:
+    """UTF-8 text compressed with zstd (or zlib), unless that does not make it smaller."""
+    data = text.encode("utf-8")
+    if zstandard is not None:
+        packed, codec = zstandard.ZstdCompressor(level=3).compress(data), _ZSTD
+    else:
+        packed, codec = zlib.compress(data, 6), _ZLIB
+    if len(packed) < len(data):
+        return codec + packed
+    return _RAW + data
+
+
+def _decode(value: Any) -> str:
+    if isinstance(value, str):
+        # Written before texts were compressed
+        return value
+    codec, data = value[:1], value[1:]
+    if codec == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Chunk text is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == _ZLIB:
+        return zlib.decompress(data).decode("utf-8")
+    return data.decode("utf-8")
+
+
+class SQLiteChunkStore(ChunkStorePort):
+    """
+    Chunk texts in a local SQLite table clustered by (document_id, kind, idx),
+    so the neighbours of a chunk are adjacent on disk.
+
+    Texts are compressed with zstd when the zstandard package is installed,
+    with zlib otherwise; both can be read back either way (zstd only with
+    the package).
+
+    Construction does no I/O; the database is opened on first use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.CHUNK_STORE_PATH)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _ensure_open(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._db is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(str(self.path), check_same_thread=False)
+                db.executescript(_SCHEMA)
+                self._db = db
+            return self._db
+
+    def _add(self, records: List[Tuple[str, str, int, bytes]]) -> None:
+        db = self._ensure_open()
+        with self._lock, db:
+            db.executemany(
+                "INSERT OR REPLACE INTO chunk_texts (document_id, kind, idx, text) VALUES (?, ?, ?, ?)",
+                records
+            )
+
+    async def add_chunks(
+        self,
+        document_id: str,
+        chunks: List[str],
+        start_index: int = 0,
+        kind: str = CHUNK
+    ) -> None:
+        """
+        Store texts of a document, replacing any with the same keys.
+        """
+        if not chunks:
+            return
+
+        records = [(document_id, kind, start_index + i, _encode(chunk)) for i, chunk in enumerate(chunks)]
+        await asyncio.to_thread(self._add, records)
+
+    def _get(self, keys: List[Tuple[str, int]], kind: str) -> Dict[Tuple[str, int], str]:
+        db = self._ensure_open()
+        found: Dict[Tuple[str, int], str] = {}
+        with self._lock:
+            for start in range(0, len(keys), _READ_BATCH):
+                batch = keys[start:start + _READ_BATCH]
+                params: List[Any] = []
+                for document_id, index in batch:
+                    params.extend((document_id, kind, index))
+                rows = db.execute(
+                    "SELECT document_id, idx, text FROM chunk_texts "
+                    f"WHERE (document_id, kind, idx) IN (VALUES {','.join(['(?, ?, ?)'] * len(batch))})",
+                    params
+                )
+                for document_id, index, text in rows:
+                    found[(document_id, index)] = _decode(text)
+        return found
+
+    async def get_chunks(
+        self,
+        keys: List[Tuple[str, int]],
+        kind: str = CHUNK
+    ) -> Dict[Tuple[str, int], str]:
+        """
+        Read several texts with one query (per 5000 keys).
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        return await asyncio.to_thread(self._get, keys, kind)
+
+    def _delete(self, document_ids: List[str]) -> None:
+        db = self._ensure_open()
+        with self._lock, db:
+            db.execute(
+                f"DELETE FROM chunk_texts WHERE document_id IN ({','.join('?' * len(document_ids))})",
+                document_ids
+            )
+
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Remove every text of several documents.
+        """
+        if not document_ids:
+            return
+
+        await asyncio.to_thread(self._delete, list(document_ids))
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
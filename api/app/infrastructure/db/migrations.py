@@ -2,10 +2,13 @@
 Database migrations.
 """
 import os
-from app.infrastructure.db.sqlite_client import SQLiteClient
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from app.infrastructure.db.sqlite_client import SQLiteClient
 
-async def run_migrations(db_client: SQLiteClient):
+
+async def run_migrations(db_client: "SQLiteClient"):
     """
     Run database migrations.
 
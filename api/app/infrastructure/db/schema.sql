@@ -33,4 +33,33 @@ CREATE TABLE IF NOT EXISTS messages (
 CREATE INDEX IF NOT EXISTS idx_documents_upload_date ON documents(upload_date);
 CREATE INDEX IF NOT EXISTS idx_documents_is_temporary ON documents(is_temporary);
 CREATE INDEX IF NOT EXISTS idx_messages_conversation_id ON messages(conversation_id);
-CREATE INDEX IF NOT EXISTS idx_conversations_created_at ON conversations(created_at);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_conversations_created_at ON conversations(created_at);
+
+-- Ingestion jobs table (per-document ingestion progress)
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    document_id VARCHAR(255) PRIMARY KEY,
+    filename VARCHAR(500) NOT NULL,
+    file_type VARCHAR(50) NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    status VARCHAR(50) NOT NULL,  -- running, failed, completed
+    total_chunks INTEGER,
+    error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Ingestion batches table (chunk ranges and their embed/write status)
+CREATE TABLE IF NOT EXISTS ingestion_batches (
+    document_id VARCHAR(255) NOT NULL,
+    start_index INTEGER NOT NULL,
+    end_index INTEGER NOT NULL,
+    status VARCHAR(50) NOT NULL,  -- embedded, written
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (document_id, start_index),
+    CONSTRAINT fk_ingestion_job
+        FOREIGN KEY (document_id)
+        REFERENCES ingestion_jobs(document_id)
+        ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_status ON ingestion_jobs(status);
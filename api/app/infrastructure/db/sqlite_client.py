@@ -1,10 +1,14 @@
 """
 SQLite database client.
 """
+import re
 import aiosqlite
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.core.config import settings
 
+# Repositories use PostgreSQL-style numbered placeholders ($1, $2, ...)
+_PLACEHOLDER = re.compile(r"\$(\d+)")
+
 
 class SQLiteClient:
     """
@@ -18,7 +22,8 @@ class SQLiteClient:
         """Establish database connection."""
         # Read DATABASE_URL dynamically to allow test overrides
         db_path = settings.DATABASE_URL.replace("sqlite:///", "")
-        self._connection = await aiosqlite.connect(db_path)
+        # Autocommit, like asyncpg, so progress records survive a restart
+        self._connection = await aiosqlite.connect(db_path, isolation_level=None)
         self._connection.row_factory = aiosqlite.Row
 
     async def disconnect(self):
@@ -27,7 +32,24 @@ class SQLiteClient:
             await self._connection.close()
             self._connection = None
 
-    async def execute(self, query: str, params: tuple = ()) -> aiosqlite.Cursor:
+    @staticmethod
+    def _convert_query(query: str, params: tuple) -> Tuple[str, tuple]:
+        """
+        Convert $N placeholders to SQLite's positional `?` placeholders.
+
+        Args:
+            query: SQL query, possibly using $N placeholders
+            params: Query parameters indexed by N
+
+        Returns:
+            Tuple of (SQLite query, parameters in placeholder order)
+        """
+        positions = [int(n) for n in _PLACEHOLDER.findall(query)]
+        if not positions:
+            return query, params
+        return _PLACEHOLDER.sub("?", query), tuple(params[n - 1] for n in positions)
+
+    async def execute(self, query: str, *params) -> aiosqlite.Cursor:
         """
         Execute a single query.
 
@@ -40,6 +62,7 @@ class SQLiteClient:
         """
         if not self._connection:
             await self.connect()
+        query, params = self._convert_query(query, params)
         return await self._connection.execute(query, params)
 
     async def execute_many(self, query: str, params_list: List[tuple]) -> None:
@@ -52,9 +75,12 @@ class SQLiteClient:
         """
         if not self._connection:
             await self.connect()
-        await self._connection.executemany(query, params_list)
+        converted = [self._convert_query(query, tuple(params)) for params in params_list]
+        if not converted:
+            return
+        await self._connection.executemany(converted[0][0], [params for _, params in converted])
 
-    async def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+    async def fetch_one(self, query: str, *params) -> Optional[Dict[str, Any]]:
         """
         Fetch a single row.
 
@@ -65,11 +91,11 @@ class SQLiteClient:
         Returns:
             Dict representing the row, or None
         """
-        cursor = await self.execute(query, params)
+        cursor = await self.execute(query, *params)
         row = await cursor.fetchone()
         return dict(row) if row else None
 
-    async def fetch_all(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    async def fetch_all(self, query: str, *params) -> List[Dict[str, Any]]:
         """
         Fetch all rows.
 
@@ -80,7 +106,7 @@ class SQLiteClient:
         Returns:
             List of dicts representing rows
         """
-        cursor = await self.execute(query, params)
+        cursor = await self.execute(query, *params)
         rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
@@ -1,10 +1,15 @@
 """
 Document processing utilities.
 """
-from typing import List
+from typing import TYPE_CHECKING, List
 from io import BytesIO
-from pdfminer.high_level import extract_text
-import pandas as pd
+
+from app.domain.entities.table import TypedTable
+
+# pdfminer and pandas take most of the API's import time and only file
+# parsing needs them, so they are imported inside the methods that use them
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class DocumentProcessor:
@@ -23,6 +28,8 @@ class DocumentProcessor:
         Returns:
             Extracted text
         """
+        from pdfminer.high_level import extract_text
+
         try:
             text = extract_text(BytesIO(file_content))
             return text.strip()
@@ -40,6 +47,8 @@ class DocumentProcessor:
         Returns:
             Extracted text
         """
+        import pandas as pd
+
         try:
             df = pd.read_csv(BytesIO(file_content))
             # Convert dataframe to text representation
@@ -58,6 +67,8 @@ class DocumentProcessor:
         Returns:
             Extracted text
         """
+        import pandas as pd
+
         try:
             df = pd.read_excel(BytesIO(file_content))
             return df.to_string(index=False)
@@ -139,14 +150,23 @@ class DocumentProcessor:
         Returns:
             List of text chunks (one per row)
         """
+        return DocumentProcessor._rows_to_text_chunks(DocumentProcessor._read_csv(file_content))
+
+    @staticmethod
+    def _read_csv(file_content: bytes, **read_options) -> "pd.DataFrame":
+        """
+        Read a CSV file, trying multiple encodings including UTF-8, UTF-16,
+        Latin-1, etc.
+        """
+        import pandas as pd
+
         # Try multiple encodings in order of likelihood
         encodings = ['utf-8', 'utf-16', 'utf-16-le', 'utf-16-be', 'latin-1', 'iso-8859-1', 'cp1252']
 
         last_error = None
         for encoding in encodings:
             try:
-                df = pd.read_csv(BytesIO(file_content), encoding=encoding)
-                return DocumentProcessor._rows_to_text_chunks(df)
+                return pd.read_csv(BytesIO(file_content), encoding=encoding, **read_options)
             except (UnicodeDecodeError, UnicodeError):
                 last_error = f"Failed with encoding {encoding}"
                 continue
@@ -168,6 +188,8 @@ class DocumentProcessor:
         Returns:
             List of text chunks (one per row)
         """
+        import pandas as pd
+
         try:
             df = pd.read_excel(BytesIO(file_content))
             return DocumentProcessor._rows_to_text_chunks(df)
@@ -175,7 +197,37 @@ class DocumentProcessor:
             raise ValueError(f"Error extracting tabular chunks from Excel: {str(e)}")
 
     @staticmethod
-    def _rows_to_text_chunks(df: pd.DataFrame) -> List[str]:
+    async def extract_typed_table(file_content: bytes, file_type: str) -> TypedTable:
+        """
+        Extract the typed columns of a CSV or Excel file.
+
+        CSV files are read as text so that locale-formatted values are
+        typed by column_typing (pandas alone reads "4.500" as 4.5 and
+        "4.500.000" as text); Excel keeps the types of numeric and date
+        cells, and only text cells are typed.
+
+        Args:
+            file_content: File content as bytes
+            file_type: "csv", "xlsx" or "xls"
+
+        Returns:
+            The typed table
+        """
+        from app.infrastructure.tabular.column_typing import type_table
+
+        if file_type.lower() == "csv":
+            df = DocumentProcessor._read_csv(file_content, dtype=str, keep_default_na=False)
+        else:
+            import pandas as pd
+
+            try:
+                df = pd.read_excel(BytesIO(file_content))
+            except Exception as e:
+                raise ValueError(f"Error extracting typed table from Excel: {str(e)}")
+        return type_table(df)
+
+    @staticmethod
+    def _rows_to_text_chunks(df: "pd.DataFrame") -> List[str]:
         """
         Convert DataFrame rows to text chunks.
 
@@ -188,6 +240,8 @@ class DocumentProcessor:
         Returns:
             List of text chunks (one per row)
         """
+        import pandas as pd
+
         chunks = []
         for _, row in df.iterrows():
             parts = []
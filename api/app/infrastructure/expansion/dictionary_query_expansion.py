@@ -0,0 +1,279 @@
+"""
+Dictionary-based query expansion, with the LLM as a fallback.
+"""
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import re
+import threading
+
+from app.domain.ports.query_expansion_service import QueryExpansionServicePort
+from app.infrastructure.lexical.tokenizer import tokenize, is_identifier
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Spanish/English financial synonyms shipped with the code
+DEFAULT_DICTIONARY_PATH = Path(__file__).with_name("financial_synonyms.json")
+
+# Longest dictionary term, in search terms ("cuentas por cobrar" -> 2)
+_MAX_NGRAM = 3
+
+_WORD_WITH_DIGITS = re.compile(r"\S*\d\S*")
+
+
+def _key(text: str) -> Tuple[str, ...]:
+    """Match key of a term or phrase: its accent-folded, stemmed search terms."""
+    return tuple(tokenize(text))
+
+
+class SynonymDictionary:
+    """
+    Synonym entries indexed by the stemmed terms of every variant, so
+    "Facturas", "factura" and "facturación" find their entries regardless
+    of accents, case and plural.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], version: str):
+        self.version = version
+        self.entries: List[Dict[str, List[str]]] = []
+        self._index: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for entry in entries:
+            self.add(entry["terms"], entry["expansions"])
+
+    def add(self, terms: List[str], expansions: List[str]) -> None:
+        """Add an entry; variants already covered by another entry are shared."""
+        position = len(self.entries)
+        self.entries.append({"terms": list(terms), "expansions": list(expansions)})
+        for term in terms:
+            key = _key(term)
+            if key and position not in self._index[key]:
+                self._index[key].append(position)
+
+    def match(self, query: str) -> Tuple[List[int], List[str], int]:
+        """
+        Find the dictionary terms in a query, longest first.
+
+        Returns:
+            (matched entry positions in query order, content terms left
+            uncovered, number of content terms)
+        """
+        # Words with digits are identifiers (amounts, "FAC-2024-003"), never expanded
+        terms = [t for t in tokenize(_WORD_WITH_DIGITS.sub(" ", query)) if not is_identifier(t)]
+        matched: List[int] = []
+        uncovered: List[str] = []
+        i = 0
+        while i < len(terms):
+            for size in range(min(_MAX_NGRAM, len(terms) - i), 0, -1):
+                positions = self._index.get(tuple(terms[i:i + size]))
+                if positions:
+                    matched.extend(p for p in positions if p not in matched)
+                    i += size
+                    break
+            else:
+                uncovered.append(terms[i])
+                i += 1
+        return matched, uncovered, len(terms)
+
+
+def load_dictionary(path: Path = DEFAULT_DICTIONARY_PATH, learned_path: Optional[str] = None) -> SynonymDictionary:
+    """
+    Load the shipped dictionary and, if present, the entries learned from
+    logged LLM expansions (see learn_synonyms).
+    """
+    with open(path, encoding="utf-8") as f:
+        base = json.load(f)
+    entries = list(base["entries"])
+    version = str(base["version"])
+
+    if learned_path and Path(learned_path).exists():
+        with open(learned_path, encoding="utf-8") as f:
+            learned = json.load(f)
+        entries.extend(learned["entries"])
+        version += f"+learned.{learned['version']}"
+    return SynonymDictionary(entries, version)
+
+
+class DictionaryQueryExpansionService(QueryExpansionServicePort):
+    """
+    Query expansion from a versioned Spanish/English synonym dictionary.
+
+    Expansion is a local lookup (microseconds, no API call). Only queries
+    where the dictionary covers less than QUERY_EXPANSION_MIN_COVERAGE of
+    the content words go to the fallback (the LLM), and those expansions
+    are logged to QUERY_EXPANSION_LOG_PATH so the dictionary can learn
+    them (python -m app.cli.learn_synonyms).
+    """
+
+    def __init__(
+        self,
+        fallback: Optional[QueryExpansionServicePort] = None,
+        dictionary_path: Path = DEFAULT_DICTIONARY_PATH,
+        learned_path: Optional[str] = None,
+        log_path: Optional[str] = None,
+        min_coverage: Optional[float] = None
+    ):
+        self.fallback = fallback
+        self.dictionary_path = dictionary_path
+        self.learned_path = learned_path if learned_path is not None else settings.QUERY_EXPANSION_LEARNED_PATH
+        self.log_path = log_path if log_path is not None else settings.QUERY_EXPANSION_LOG_PATH
+        self.min_coverage = settings.QUERY_EXPANSION_MIN_COVERAGE if min_coverage is None else min_coverage
+        self._dictionary: Optional[SynonymDictionary] = None
+        self._log_lock = threading.Lock()
+
+    @property
+    def dictionary(self) -> SynonymDictionary:
+        """The dictionary, loaded on first use."""
+        if self._dictionary is None:
+            self._dictionary = load_dictionary(self.dictionary_path, self.learned_path)
+            logger.info(
+                f"📖 Synonym dictionary v{self._dictionary.version} loaded "
+                f"({len(self._dictionary.entries)} entries)"
+            )
+        return self._dictionary
+
+    def _lookup(self, query: str) -> Optional[List[Dict[str, List[str]]]]:
+        """Matched entries, or None if the dictionary covers too little of the query."""
+        positions, uncovered, total = self.dictionary.match(query)
+        if total == 0:
+            # Only identifiers and stopwords: nothing to expand
+            return []
+        if (total - len(uncovered)) / total < self.min_coverage:
+            return None
+        return [self.dictionary.entries[p] for p in positions]
+
+    async def expand_query(self, query: str) -> str:
+        """
+        Expand a query with the synonyms of its dictionary terms.
+
+        Args:
+            query: Original user query in Spanish
+
+        Returns:
+            The query followed by comma-separated synonyms
+        """
+        entries = self._lookup(query)
+        if entries is None and self.fallback is not None:
+            logger.info(f"📖 Dictionary covers too little of '{query}', expanding with the LLM")
+            expanded = await self.fallback.expand_query(query)
+            if expanded != query:
+                await asyncio.to_thread(self._log_expansion, query, expanded)
+            return expanded
+
+        terms = self._synonyms(query, entries or [])
+        expanded = ", ".join([query] + terms) if terms else query
+        logger.info(f"🔍 Query expanded from dictionary: '{query}' -> '{expanded}'")
+        return expanded
+
+    async def expand_to_queries(self, query: str, count: int) -> List[str]:
+        """
+        Rewrite a query into sub-queries: the n-th one replaces every
+        dictionary term by its n-th synonym.
+
+        Args:
+            query: Original user query in Spanish
+            count: Number of sub-queries to return, including the original
+
+        Returns:
+            Up to `count` sub-queries, starting with the original query
+        """
+        if count <= 1:
+            return [query]
+        entries = self._lookup(query)
+        if entries is None and self.fallback is not None:
+            logger.info(f"📖 Dictionary covers too little of '{query}', rewriting with the LLM")
+            return await self.fallback.expand_to_queries(query, count)
+
+        queries = [query]
+        for rank in range(max((len(e["expansions"]) for e in entries or []), default=0)):
+            sub_query = " ".join(e["expansions"][rank] for e in entries if rank < len(e["expansions"]))
+            if sub_query.lower() not in (q.lower() for q in queries):
+                queries.append(sub_query)
+            if len(queries) == count:
+                break
+        return queries
+
+    def _synonyms(self, query: str, entries: List[Dict[str, List[str]]]) -> List[str]:
+        """Synonyms of the matched entries not already in the query, at most QUERY_EXPANSION_MAX_TERMS."""
+        seen = {_key(query)} | {(term,) for term in tokenize(query)}
+        terms: List[str] = []
+        # Round-robin over the entries so every matched term gets its best synonyms first
+        for rank in range(max((len(e["expansions"]) for e in entries), default=0)):
+            for entry in entries:
+                if rank >= len(entry["expansions"]):
+                    continue
+                term = entry["expansions"][rank]
+                key = _key(term)
+                if key and key not in seen:
+                    seen.add(key)
+                    terms.append(term)
+        return terms[:settings.QUERY_EXPANSION_MAX_TERMS]
+
+    def _log_expansion(self, query: str, expanded: str) -> None:
+        if not self.log_path:
+            return
+        record = {"query": query, "expansion": expanded, "logged_at": datetime.utcnow().isoformat()}
+        path = Path(self.log_path)
+        with self._log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    async def close(self):
+        """Close the fallback service."""
+        close = getattr(self.fallback, "close", None)
+        if close is not None:
+            await close()
+
+
+def learn_synonyms(
+    records: Iterable[Dict[str, str]],
+    dictionary: SynonymDictionary,
+    min_support: int = 2,
+    max_expansions: int = 4
+) -> List[Dict[str, List[str]]]:
+    """
+    Learn dictionary entries from logged LLM expansions.
+
+    A logged expansion is attributed to a term when that term is the only
+    content word of the query the dictionary did not cover; the synonyms
+    the LLM added for it at least `min_support` times become its entry.
+
+    Args:
+        records: Logged {"query", "expansion"} records
+        dictionary: Current dictionary
+        min_support: Times a synonym must have been added for a term
+        max_expansions: Synonyms kept per learned term
+
+    Returns:
+        New entries ({"terms", "expansions"}), most supported synonyms first
+    """
+    support: Dict[str, Counter] = defaultdict(Counter)
+    surface: Dict[str, Counter] = defaultdict(Counter)
+    for record in records:
+        query, expansion = record.get("query", ""), record.get("expansion", "")
+        _, uncovered, _ = dictionary.match(query)
+        if len(uncovered) != 1:
+            continue
+        term = uncovered[0]
+        # The surface form of the term as the user wrote it
+        for word in query.split():
+            if _key(word) == (term,):
+                surface[term][word.strip("¿?¡!.,;:\"'").lower()] += 1
+        query_key = _key(query)
+        for part in expansion.split(","):
+            part = part.strip()
+            key = _key(part)
+            if part and key and key != query_key and not set(key) <= set(query_key):
+                support[term][part] += 1
+
+    entries = []
+    for term, counts in support.items():
+        expansions = [part for part, n in counts.most_common() if n >= min_support][:max_expansions]
+        if expansions and surface[term]:
+            entries.append({"terms": [surface[term].most_common(1)[0][0]], "expansions": expansions})
+    return entries
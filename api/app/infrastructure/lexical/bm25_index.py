@@ -0,0 +1,174 @@
+"""
+SQLite FTS5 BM25 index implementation.
+"""
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+
+from app.core.config import settings
+from app.domain.entities.search import SearchFilter
+from app.domain.ports.lexical_index import LexicalIndexPort
+from app.infrastructure.lexical.tokenizer import is_identifier, tokenize
+from app.infrastructure.sqlite_filters import sqlite_conditions
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    row INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    document_id TEXT NOT NULL,
+    document TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks(document_id);
+
+-- Pre-tokenized terms (see tokenizer.tokenize), rowid = chunks.row
+CREATE VIRTUAL TABLE IF NOT EXISTS chunk_terms USING fts5(terms);
+"""
+
+
+class SQLiteBM25Index(LexicalIndexPort):
+    """
+    BM25 keyword index persisted in a local SQLite database.
+
+    Chunk text is tokenized in Python (Spanish-aware, accent-folded, see
+    tokenizer.py) and the resulting terms are stored in an FTS5 table, which
+    keeps the inverted index and ranks with its built-in bm25(). Adding or
+    deleting a document only touches that document's rows, so the index is
+    maintained incrementally at upload time.
+
+    Construction does no I/O; the database is opened on first use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.LEXICAL_INDEX_PATH)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _ensure_open(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._db is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(str(self.path), check_same_thread=False)
+                db.executescript(_SCHEMA)
+                self._db = db
+            return self._db
+
+    def _delete_rows(self, db: sqlite3.Connection, where: str, params: List[Any]) -> None:
+        rows = [(row,) for (row,) in db.execute(f"SELECT row FROM chunks WHERE {where}", params)]
+        if rows:
+            db.executemany("DELETE FROM chunk_terms WHERE rowid = ?", rows)
+            db.executemany("DELETE FROM chunks WHERE row = ?", rows)
+
+    def _add(self, records: List[Tuple[str, str, str, str, str]]) -> None:
+        db = self._ensure_open()
+        with self._lock, db:
+            ids = [record[0] for record in records]
+            self._delete_rows(db, f"id IN ({','.join('?' * len(ids))})", ids)
+            for chunk_id, document_id, chunk, metadata, terms in records:
+                row = db.execute(
+                    "INSERT INTO chunks (id, document_id, document, metadata) VALUES (?, ?, ?, ?)",
+                    (chunk_id, document_id, chunk, metadata)
+                ).lastrowid
+                db.execute("INSERT INTO chunk_terms (rowid, terms) VALUES (?, ?)", (row, terms))
+
+    async def add_chunks(
+        self,
+        document_id: str,
+        chunks: List[str],
+        metadata: List[Dict[str, Any]],
+        start_index: int = 0
+    ) -> None:
+        """
+        Index document chunks, replacing any chunks with the same ids.
+        """
+        if not chunks:
+            return
+
+        records = [
+            (
+                f"{document_id}_chunk_{start_index + i}",
+                document_id,
+                chunk,
+                json.dumps(meta),
+                " ".join(tokenize(chunk))
+            )
+            for i, (chunk, meta) in enumerate(zip(chunks, metadata))
+        ]
+        await asyncio.to_thread(self._add, records)
+
+        logger.info(f"[BM25] Indexed {len(chunks)} chunks for document {document_id}")
+
+    def _search(self, terms: List[str], top_k: int, filters: Optional[SearchFilter]) -> List[Dict[str, Any]]:
+        clauses, params = sqlite_conditions(filters) if filters is not None else ([], [])
+        match = " OR ".join(f'"{term}"' for term in terms)
+        sql = (
+            "SELECT c.id, c.document, c.metadata, chunk_terms.terms, bm25(chunk_terms) "
+            "FROM chunk_terms JOIN chunks c ON c.row = chunk_terms.rowid "
+            f"WHERE chunk_terms MATCH ? {''.join(' AND ' + clause for clause in clauses)} "
+            "ORDER BY bm25(chunk_terms) LIMIT ?"
+        )
+
+        db = self._ensure_open()
+        with self._lock:
+            rows = db.execute(sql, [match, *params, top_k]).fetchall()
+
+        identifiers = {term for term in terms if is_identifier(term)}
+        results = []
+        for chunk_id, document, metadata, chunk_terms, rank in rows:
+            found = set(chunk_terms.split())
+            results.append({
+                "id": chunk_id,
+                "document": document,
+                "metadata": json.loads(metadata),
+                "distance": None,
+                # FTS5 ranks are negated BM25 scores
+                "lexical_score": -rank,
+                "coverage": sum(term in found for term in terms) / len(terms),
+                "identifier_match": bool(identifiers) and identifiers <= found
+            })
+        return results
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search chunks by BM25 relevance to the query terms.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or top_k <= 0:
+            return []
+
+        results = await asyncio.to_thread(self._search, terms, top_k, filters)
+        logger.info(f"[BM25] terms={terms} hits={len(results)}")
+        return results
+
+    def _delete(self, document_ids: List[str]) -> None:
+        db = self._ensure_open()
+        with self._lock, db:
+            self._delete_rows(db, f"document_id IN ({','.join('?' * len(document_ids))})", document_ids)
+
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Remove all chunks of several documents.
+        """
+        if not document_ids:
+            return
+
+        await asyncio.to_thread(self._delete, list(document_ids))
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
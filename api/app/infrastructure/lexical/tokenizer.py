@@ -0,0 +1,94 @@
+"""
+Spanish-aware tokenization for lexical search.
+"""
+from typing import List
+import re
+import unicodedata
+
+# Dotted acronyms ("S.A.S.", "E.S.P."), numbers with thousands/decimal
+# separators ("9.350.000", "4.500.000,50"), codes with digits joined by
+# dashes or slashes ("FAC-2024-001", "OC/118") and plain words
+_TOKEN = re.compile(
+    r"(?:[a-z]\.){2,}"
+    r"|\d+(?:[.,]\d+)+"
+    r"|[a-z0-9]+(?:[-/][a-z0-9]+)+"
+    r"|[a-z0-9]+"
+)
+
+_VOWELS = set("aeiou")
+
+# Frequent Spanish function words (accent-folded), they only add noise to BM25
+STOPWORDS = frozenset("""
+a al algo algun alguna algunas alguno algunos ante antes aqui asi aun cada como con contra cual cuales
+cuando cuanto cuantos de del desde donde dos durante e el ella ellas ellos en entre era eran es esa esas
+ese eso esos esta estaba estan estas este esto estos fue fueron ha habia han hasta hay la las le les lo
+los mas me mi mis mucho muy nada ni no nos nuestra nuestro o os otra otras otro otros para pero poco por
+porque que quien quienes se sea segun ser si sido sin sobre son su sus tambien tan tanto te tiene tienen
+todo todos tu tus un una unas uno unos y ya
+""".split())
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents ("Facturación" -> "facturacion", "año" -> "ano")."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _number(token: str) -> str:
+    """
+    Canonical form of a formatted number.
+
+    Groups of three digits after every separator are thousands ("9.350.000",
+    "9,350,000" -> "9350000"); otherwise the last separator is the decimal
+    mark and only the integer part is kept ("4.500.000,50" -> "4500000").
+    """
+    parts = re.split(r"[.,]", token)
+    if all(len(part) == 3 for part in parts[1:]):
+        return "".join(parts)
+    return "".join(parts[:-1])
+
+
+def _stem(word: str) -> str:
+    """
+    Light Spanish stemming: strip the plural, then a final a/e/o, so that
+    singular and plural meet ("facturas", "factura" -> "factur";
+    "proveedores", "proveedor" -> "proveedor"; "luces" -> "luz").
+    """
+    if len(word) <= 4:
+        return word
+    if word.endswith("ces"):
+        word = word[:-3] + "z"
+    elif word.endswith("s") and word[-2] in _VOWELS:
+        word = word[:-1]
+    if len(word) > 4 and word[-1] in "aeo":
+        word = word[:-1]
+    return word
+
+
+def is_identifier(term: str) -> bool:
+    """Whether a term is an exact identifier (amount, invoice number, code)."""
+    return any(c.isdigit() for c in term)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized search terms.
+
+    Text is accent-folded and lowercased, formatted numbers are reduced to
+    their digits, dotted acronyms are joined ("S.A.S." -> "sas"), codes are
+    indexed both whole and by part ("FAC-2024-001" -> "fac2024001", "fac",
+    "2024", "001"), stopwords are dropped and words lightly stemmed.
+    """
+    terms = []
+    for token in _TOKEN.findall(fold(text)):
+        if "." in token and not token[0].isdigit():
+            terms.append(token.replace(".", ""))
+        elif token[0].isdigit() and re.fullmatch(r"\d+(?:[.,]\d+)+", token):
+            terms.append(_number(token))
+        elif "-" in token or "/" in token:
+            parts = re.split(r"[-/]", token)
+            terms.append("".join(parts))
+            terms.extend(part for part in parts if part not in STOPWORDS)
+        elif token not in STOPWORDS:
+            terms.append(token if is_identifier(token) else _stem(token))
+    return terms
@@ -1,13 +1,15 @@
 """
 OpenAI chat service.
 """
-from typing import List, Optional
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, List, Optional
 import logging
 
 from app.domain.ports.llm_service import LLMServicePort
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,13 +21,17 @@ class OpenAIChatService(LLMServicePort):
     def __init__(self):
         self.api_key = settings.OPENAI_API_KEY
         self.model = "gpt-5-mini"  # Fast and cost-effective
-        # Create client once at initialization to avoid httpx wrapper issues
-        self._client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        # Created on first use, importing openai is slow
+        self._client: Optional["AsyncOpenAI"] = None
 
-    def _get_client(self) -> AsyncOpenAI:
-        """Get OpenAI client."""
+    def _get_client(self) -> "AsyncOpenAI":
+        """Get OpenAI client, created once on first use."""
         if not self._client:
-            raise ValueError("OPENAI_API_KEY not configured in environment variables")
+            if not self.api_key:
+                raise ValueError("OPENAI_API_KEY not configured in environment variables")
+            # Single client per service to avoid httpx wrapper issues
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key)
         return self._client
 
     async def generate_response(
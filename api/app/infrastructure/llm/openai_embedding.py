@@ -1,9 +1,19 @@
 """
 OpenAI embedding service.
 """
-from typing import List
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, List, Optional
 from app.core.config import settings
+from app.domain.entities.embedding import EmbeddingSpec
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+# Native output size of each model; text-embedding-3-* accept a smaller `dimensions`
+MODEL_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+}
 
 
 class OpenAIEmbeddingService:
@@ -11,16 +21,30 @@ class OpenAIEmbeddingService:
     Service for generating embeddings using OpenAI.
     """
 
-    def __init__(self):
+    def __init__(self, model: Optional[str] = None, dimensions: Optional[int] = None):
         self.api_key = settings.OPENAI_API_KEY
-        self.model = "text-embedding-3-large"
-        # Create client once at initialization to avoid httpx wrapper issues
-        self._client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        self.model = model or settings.EMBEDDING_MODEL
+        self.dimensions = dimensions or settings.EMBEDDING_DIMENSIONS or MODEL_DIMENSIONS.get(self.model)
+        if self.dimensions is None:
+            raise ValueError(f"EMBEDDING_DIMENSIONS is required for unknown embedding model '{self.model}'")
+        if self.dimensions != MODEL_DIMENSIONS.get(self.model) and not self.model.startswith("text-embedding-3"):
+            raise ValueError(f"Embedding model '{self.model}' does not support shortened dimensions")
+        # Created on first use, importing openai is slow
+        self._client: Optional["AsyncOpenAI"] = None
 
-    def _get_client(self) -> AsyncOpenAI:
-        """Get OpenAI client."""
+    @property
+    def spec(self) -> EmbeddingSpec:
+        """Model and dimensions of the vectors this service produces."""
+        return EmbeddingSpec(model=self.model, dimensions=self.dimensions)
+
+    def _get_client(self) -> "AsyncOpenAI":
+        """Get OpenAI client, created once on first use."""
         if not self._client:
-            raise ValueError("OPENAI_API_KEY not configured in environment variables")
+            if not self.api_key:
+                raise ValueError("OPENAI_API_KEY not configured in environment variables")
+            # Single client per service to avoid httpx wrapper issues
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key)
         return self._client
 
     async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
@@ -37,9 +61,15 @@ class OpenAIEmbeddingService:
             return []
 
         client = self._get_client()
+        # Only send `dimensions` when shortening, older models reject the parameter
+        extra = {}
+        if self.dimensions != MODEL_DIMENSIONS.get(self.model):
+            extra["dimensions"] = self.dimensions
+
         response = await client.embeddings.create(
             model=self.model,
-            input=texts
+            input=texts,
+            **extra
         )
 
         return [item.embedding for item in response.data]
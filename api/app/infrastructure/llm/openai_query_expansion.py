@@ -1,12 +1,16 @@
 """
 OpenAI query expansion service.
 """
-from openai import AsyncOpenAI
+from typing import TYPE_CHECKING, List, Optional
 import logging
+import re
 
 from app.domain.ports.query_expansion_service import QueryExpansionServicePort
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,12 +23,17 @@ class OpenAIQueryExpansionService(QueryExpansionServicePort):
     def __init__(self):
         self.api_key = settings.OPENAI_API_KEY
         self.model = "gpt-4o-mini"  # Fast and cost-effective for query expansion
-        self._client = AsyncOpenAI(api_key=self.api_key) if self.api_key else None
+        # Created on first use, importing openai is slow
+        self._client: Optional["AsyncOpenAI"] = None
 
-    def _get_client(self) -> AsyncOpenAI:
-        """Get OpenAI client."""
+    def _get_client(self) -> "AsyncOpenAI":
+        """Get OpenAI client, created once on first use."""
         if not self._client:
-            raise ValueError("OPENAI_API_KEY not configured in environment variables")
+            if not self.api_key:
+                raise ValueError("OPENAI_API_KEY not configured in environment variables")
+            # Single client per service to avoid httpx wrapper issues
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key)
         return self._client
 
     async def expand_query(self, query: str) -> str:
@@ -96,6 +105,73 @@ Output: cuánto vendí últimamente, sales, revenue, recently, últimos días, t
             logger.warning(f"Using original query due to expansion error: '{query}'")
             return query
 
+    async def expand_to_queries(self, query: str, count: int) -> List[str]:
+        """
+        Rewrite a query into several sub-queries covering its different facets.
+
+        Args:
+            query: Original user query in Spanish
+            count: Number of sub-queries to return, including the original
+
+        Returns:
+            Up to `count` sub-queries, starting with the original query
+        """
+        if count <= 1:
+            return [query]
+
+        client = self._get_client()
+
+        system_prompt = f"""Eres un experto en búsqueda semántica en documentos financieros y de ventas.
+
+Tu tarea: Reescribir la consulta del usuario como {count - 1} consultas de búsqueda distintas, cada una enfocada en un aspecto diferente (sinónimos, términos en inglés, métricas o periodos relacionados).
+
+Contexto de dominio:
+- Documentos de ventas, clientes, facturas, contratos, órdenes de compra
+- Campos técnicos en inglés: sales, customer, totalAmount, date, revenue, invoice, purchaseOrder
+- Consultas de usuarios en español
+
+Reglas importantes:
+1. Exactamente {count - 1} consultas, una por línea
+2. Cada consulta es una frase corta de búsqueda, no una pregunta completa
+3. NO repitas la consulta original
+4. NO numeres las líneas ni agregues explicaciones
+
+Ejemplo:
+Input: "ventas de este mes"
+Output:
+facturación del mes actual
+current month sales revenue
+ingresos totales por ventas recientes"""
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": query}
+        ]
+
+        try:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_completion_tokens=200,
+                temperature=0.3
+            )
+            content = response.choices[0].message.content or ""
+        except Exception as e:
+            logger.error(f"Error generating sub-queries with LLM: {str(e)}", exc_info=True)
+            logger.warning(f"Using original query due to expansion error: '{query}'")
+            return [query]
+
+        queries = [query]
+        for line in content.splitlines():
+            # Drop list markers the model may add anyway ("1.", "-", "*")
+            sub_query = re.sub(r"^\s*(?:\d+[.)]|[-*•])\s*", "", line).strip().strip('"')
+            if sub_query and sub_query.lower() not in (q.lower() for q in queries):
+                queries.append(sub_query)
+
+        queries = queries[:count]
+        logger.info(f"🔍 Query expanded into {len(queries)} sub-queries: {queries}")
+        return queries
+
     async def close(self):
         """Close the OpenAI client and cleanup resources."""
         if self._client:
@@ -0,0 +1,97 @@
+"""
+OpenAI table query planner.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import json
+import logging
+
+from app.domain.ports.table_query_planner import TableQueryPlannerPort
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = """Eres un planificador de consultas sobre tablas de documentos financieros y de ventas.
+
+Tu tarea: si la pregunta del usuario se responde con un cálculo sobre UNA de las tablas (suma, promedio, conteo, máximo o mínimo, con filtros y agrupación opcionales), devuelve la consulta en JSON. Si no, devuelve {"aggregate": false}.
+
+Formato:
+{"aggregate": true,
+ "document_id": "<document_id de la tabla>",
+ "metric": "sum" | "avg" | "count" | "min" | "max",
+ "column": "<columna numérica; null solo para count>",
+ "filters": [{"column": "<columna>", "op": "=" | "!=" | ">" | ">=" | "<" | "<=" | "contains", "value": <valor>}],
+ "group_by": "<columna o null>",
+ "period": "year" | "month" | "day" | null}
+
+Reglas importantes:
+1. Usa solo nombres de columna exactamente como aparecen en el esquema
+2. Números sin separadores de miles (4500000, no 4.500.000); fechas como AAAA-MM-DD
+3. Para un año o un mes usa dos filtros sobre la columna de fecha (>= inicio y < fin)
+4. "period" solo cuando group_by es una columna de fecha
+5. Responde solo el JSON, sin explicaciones
+
+Ejemplo:
+Pregunta: "¿cuánto vendí en 2024 por mes?"
+Respuesta: {"aggregate": true, "document_id": "abc", "metric": "sum", "column": "Total (COP)", "filters": [{"column": "Fecha", "op": ">=", "value": "2024-01-01"}, {"column": "Fecha", "op": "<", "value": "2025-01-01"}], "group_by": "Fecha", "period": "month"}"""
+
+
+class OpenAITableQueryPlanner(TableQueryPlannerPort):
+    """
+    Plans aggregate queries with a small OpenAI model in JSON mode.
+    """
+
+    def __init__(self):
+        self.api_key = settings.OPENAI_API_KEY
+        self.model = "gpt-4o-mini"  # Small structured output, fast model is enough
+        # Created on first use, importing openai is slow
+        self._client: Optional["AsyncOpenAI"] = None
+
+    def _get_client(self) -> "AsyncOpenAI":
+        """Get OpenAI client, created once on first use."""
+        if not self._client:
+            if not self.api_key:
+                raise ValueError("OPENAI_API_KEY not configured in environment variables")
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(api_key=self.api_key)
+        return self._client
+
+    async def plan(self, question: str, tables: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Plan an aggregate query, or None if the question is not one.
+        """
+        client = self._get_client()
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": "Tablas:\n\n" + "\n\n".join(tables) + f"\n\nPregunta: {question}"}
+        ]
+
+        try:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_completion_tokens=300,
+                temperature=0,
+                response_format={"type": "json_object"}
+            )
+            plan = json.loads(response.choices[0].message.content or "{}")
+        except Exception as e:
+            logger.error(f"Error planning table query with LLM: {str(e)}", exc_info=True)
+            return None
+
+        if not isinstance(plan, dict) or not plan.get("aggregate"):
+            return None
+        logger.info(f"🧮 Table query planned for '{question}': {plan}")
+        return plan
+
+    async def close(self):
+        """Close the OpenAI client and cleanup resources."""
+        if self._client:
+            try:
+                await self._client.close()
+            except AttributeError:
+                pass  # Ignore httpx wrapper issues
+            finally:
+                self._client = None
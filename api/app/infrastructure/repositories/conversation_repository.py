@@ -1,13 +1,15 @@
 """
 Conversation repository implementation.
 """
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from datetime import datetime
 import uuid
 
 from app.domain.entities.conversation import Conversation
 from app.domain.ports.conversation_repository import ConversationRepositoryPort
-from app.infrastructure.db.postgres_client import PostgresClient
+
+if TYPE_CHECKING:
+    from app.infrastructure.db.postgres_client import PostgresClient
 
 
 class ConversationRepository(ConversationRepositoryPort):
@@ -15,7 +17,7 @@ class ConversationRepository(ConversationRepositoryPort):
     PostgreSQL conversation repository.
     """
 
-    def __init__(self, db_client: PostgresClient):
+    def __init__(self, db_client: "PostgresClient"):
         self.db = db_client
 
     async def save(self, conversation: Conversation) -> str:
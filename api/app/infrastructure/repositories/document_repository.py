@@ -2,12 +2,14 @@
 Document repository implementation.
 """
 import uuid
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from datetime import datetime
 
 from app.domain.entities.document import Document
 from app.domain.ports.document_repository import DocumentRepositoryPort
-from app.infrastructure.db.postgres_client import PostgresClient
+
+if TYPE_CHECKING:
+    from app.infrastructure.db.postgres_client import PostgresClient
 
 
 class DocumentRepository(DocumentRepositoryPort):
@@ -15,7 +17,7 @@ class DocumentRepository(DocumentRepositoryPort):
     PostgreSQL document repository.
     """
 
-    def __init__(self, db_client: PostgresClient):
+    def __init__(self, db_client: "PostgresClient"):
         self.db = db_client
 
     async def save(self, document: Document) -> str:
@@ -81,9 +83,63 @@ class DocumentRepository(DocumentRepositoryPort):
             for row in rows
         ]
 
+    async def update(self, document: Document) -> None:
+        """
+        Update a document.
+        """
+        query = """
+            UPDATE documents
+            SET filename = $1, file_type = $2, chunk_count = $3, is_temporary = $4
+            WHERE id = $5
+        """
+
+        await self.db.execute(
+            query,
+            document.filename,
+            document.file_type,
+            document.chunk_count,
+            document.is_temporary,
+            document.id
+        )
+
     async def delete(self, document_id: str) -> None:
         """
         Delete a document.
         """
         query = "DELETE FROM documents WHERE id = $1"
-        await self.db.execute(query, document_id)
\ No newline at end of file
+        await self.db.execute(query, document_id)
+
+    async def list_expired_temporary(self, cutoff: datetime, limit: int) -> List[Document]:
+        """
+        List temporary documents uploaded before a cutoff date.
+        """
+        query = """
+            SELECT * FROM documents
+            WHERE is_temporary = TRUE AND upload_date < $1
+            ORDER BY upload_date ASC
+            LIMIT $2
+        """
+        rows = await self.db.fetch_all(query, cutoff, limit)
+
+        return [
+            Document(
+                id=row["id"],
+                filename=row["filename"],
+                file_type=row["file_type"],
+                chunk_count=row["chunk_count"],
+                upload_date=row["upload_date"],
+                is_temporary=bool(row["is_temporary"])
+            )
+            for row in rows
+        ]
+
+    async def delete_many(self, document_ids: List[str]) -> None:
+        """
+        Delete several documents at once.
+        """
+        if not document_ids:
+            return
+
+        placeholders = ", ".join(f"${i}" for i in range(1, len(document_ids) + 1))
+        query = f"DELETE FROM documents WHERE id IN ({placeholders})"
+        await self.db.execute(query, *document_ids)
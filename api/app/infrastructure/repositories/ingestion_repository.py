@@ -0,0 +1,151 @@
+"""
+Ingestion progress repository implementation.
+"""
+from typing import TYPE_CHECKING, List, Optional
+from datetime import datetime
+
+from app.domain.entities.ingestion import IngestionBatch, IngestionJob
+from app.domain.ports.ingestion_repository import IngestionRepositoryPort
+
+if TYPE_CHECKING:
+    from app.infrastructure.db.postgres_client import PostgresClient
+
+
+class IngestionRepository(IngestionRepositoryPort):
+    """
+    PostgreSQL ingestion progress repository.
+    """
+
+    def __init__(self, db_client: "PostgresClient"):
+        self.db = db_client
+
+    async def save_job(self, job: IngestionJob) -> None:
+        """
+        Create an ingestion job.
+        """
+        query = """
+            INSERT INTO ingestion_jobs
+                (document_id, filename, file_type, content_hash, status, total_chunks, error, created_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+        """
+
+        await self.db.execute(
+            query,
+            job.document_id,
+            job.filename,
+            job.file_type,
+            job.content_hash,
+            job.status,
+            job.total_chunks,
+            job.error,
+            job.created_at,
+            job.updated_at
+        )
+
+    async def get_job(self, document_id: str) -> Optional[IngestionJob]:
+        """
+        Retrieve an ingestion job with its batches.
+        """
+        query = "SELECT * FROM ingestion_jobs WHERE document_id = $1"
+        row = await self.db.fetch_one(query, document_id)
+
+        if not row:
+            return None
+
+        batch_query = """
+            SELECT document_id, start_index, end_index, status
+            FROM ingestion_batches
+            WHERE document_id = $1
+            ORDER BY start_index ASC
+        """
+        batch_rows = await self.db.fetch_all(batch_query, document_id)
+
+        return IngestionJob(
+            document_id=row["document_id"],
+            filename=row["filename"],
+            file_type=row["file_type"],
+            content_hash=row["content_hash"],
+            status=row["status"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+            total_chunks=row["total_chunks"],
+            error=row["error"],
+            batches=[
+                IngestionBatch(
+                    document_id=b["document_id"],
+                    start_index=b["start_index"],
+                    end_index=b["end_index"],
+                    status=b["status"]
+                )
+                for b in batch_rows
+            ]
+        )
+
+    async def update_job_status(
+        self,
+        document_id: str,
+        status: str,
+        total_chunks: Optional[int] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Update the status of an ingestion job.
+        """
+        query = """
+            UPDATE ingestion_jobs
+            SET status = $1, total_chunks = COALESCE($2, total_chunks), error = $3, updated_at = $4
+            WHERE document_id = $5
+        """
+
+        await self.db.execute(
+            query,
+            status,
+            total_chunks,
+            error,
+            datetime.utcnow(),
+            document_id
+        )
+
+    async def save_batch(self, batch: IngestionBatch) -> None:
+        """
+        Record (or update) the status of a chunk range.
+        """
+        query = """
+            INSERT INTO ingestion_batches (document_id, start_index, end_index, status, updated_at)
+            VALUES ($1, $2, $3, $4, $5)
+            ON CONFLICT (document_id, start_index)
+            DO UPDATE SET end_index = EXCLUDED.end_index, status = EXCLUDED.status, updated_at = EXCLUDED.updated_at
+        """
+
+        await self.db.execute(
+            query,
+            batch.document_id,
+            batch.start_index,
+            batch.end_index,
+            batch.status,
+            datetime.utcnow()
+        )
+
+    async def delete_job(self, document_id: str) -> None:
+        """
+        Delete an ingestion job and its batches.
+        """
+        await self.db.execute("DELETE FROM ingestion_batches WHERE document_id = $1", document_id)
+        await self.db.execute("DELETE FROM ingestion_jobs WHERE document_id = $1", document_id)
+
+    async def delete_jobs(self, document_ids: List[str]) -> None:
+        """
+        Delete the ingestion jobs and batches of several documents.
+        """
+        if not document_ids:
+            return
+
+        placeholders = ", ".join(f"${i}" for i in range(1, len(document_ids) + 1))
+        await self.db.execute(
+            f"DELETE FROM ingestion_batches WHERE document_id IN ({placeholders})",
+            *document_ids
+        )
+        await self.db.execute(
+            f"DELETE FROM ingestion_jobs WHERE document_id IN ({placeholders})",
+            *document_ids
+        )
@@ -2,13 +2,15 @@
 Message repository implementation.
 """
 import json
-from typing import List
+from typing import TYPE_CHECKING, List
 from datetime import datetime
 import uuid
 
 from app.domain.entities.message import Message, Source
 from app.domain.ports.message_repository import MessageRepositoryPort
-from app.infrastructure.db.postgres_client import PostgresClient
+
+if TYPE_CHECKING:
+    from app.infrastructure.db.postgres_client import PostgresClient
 
 
 class MessageRepository(MessageRepositoryPort):
@@ -16,7 +18,7 @@ class MessageRepository(MessageRepositoryPort):
     PostgreSQL message repository.
     """
 
-    def __init__(self, db_client: PostgresClient):
+    def __init__(self, db_client: "PostgresClient"):
         self.db = db_client
 
     async def save(self, message: Message, conversation_id: str) -> str:
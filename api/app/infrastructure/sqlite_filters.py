@@ -0,0 +1,36 @@
+"""
+SearchFilter translation for the local SQLite-backed indexes.
+"""
+from typing import Any, List, Tuple
+
+from app.domain.entities.search import SearchFilter
+
+
+def sqlite_conditions(filters: SearchFilter) -> Tuple[List[str], List[Any]]:
+    """
+    WHERE clauses and parameters matching a filter.
+
+    Expects a `document_id` column and the chunk metadata as JSON in a
+    `metadata` column.
+
+    Args:
+        filters: Metadata filter
+
+    Returns:
+        Tuple of (clauses to AND together, parameters in placeholder order)
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    if filters.document_ids is not None:
+        clauses.append(f"document_id IN ({','.join('?' * len(filters.document_ids))})")
+        params.extend(filters.document_ids)
+    if filters.file_types is not None:
+        clauses.append(f"json_extract(metadata, '$.file_type') IN ({','.join('?' * len(filters.file_types))})")
+        params.extend(filters.file_types)
+    for key, value in filters.equality_conditions().items():
+        clauses.append(f"json_extract(metadata, '$.{key}') = ?")
+        params.append(value)
+    for key, op, value in filters.range_conditions():
+        clauses.append(f"json_extract(metadata, '$.{key}') {op} ?")
+        params.append(value)
+    return clauses, params
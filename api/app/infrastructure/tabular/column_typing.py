@@ -0,0 +1,153 @@
+"""
+Vectorized typing of spreadsheet columns written as locale-formatted text.
+"""
+from typing import TYPE_CHECKING, Optional, Tuple
+import re
+
+import numpy as np
+
+from app.domain.entities.table import TypedColumn, TypedTable, NUMBER, CURRENCY, PERCENT, DATE, TEXT
+
+# pandas is imported inside the functions (see document_processor.py)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Fraction of a column's non-empty values that must parse for it to be typed;
+# the rest (e.g. "N/A") become missing values
+MIN_PARSED_FRACTION = 0.9
+
+_CURRENCY_CODE = r"COP|USD|EUR"
+# "(COP)", or per unit "(COP/kg)"
+_HEADER_UNIT = re.compile(rf"\(\s*({_CURRENCY_CODE})\s*(?:/\s*\w+)?\s*\)", re.IGNORECASE)
+_VALUE_UNIT = rf"(?i)\(?\s*\b({_CURRENCY_CODE})\b\s*\)?"
+_MARKERS = rf"(?i)\(?\s*\b(?:{_CURRENCY_CODE})\b\s*\)?|\$|%|\s"
+
+# "4.500.000", "4.500.000,50", "12,5" (Colombian) and "4,500,000.50", "12.5";
+# plain integers match both
+_COLOMBIAN = r"[-+]?(?:\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:,\d+)?)"
+_US = r"[-+]?(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%d/%m/%y", "%Y-%m-%d %H:%M:%S")
+
+
+def type_table(df: "pd.DataFrame") -> TypedTable:
+    """
+    Convert every column of a DataFrame to a typed NumPy column. Columns
+    pandas already typed (numbers, dates) are kept; text columns are parsed.
+
+    Each column is typed as a whole with vectorized string operations:
+    currency markers ("$", read as COP, "COP", "(COP)") and "%" are
+    stripped, the thousands/decimal convention is the one the values agree
+    on (Colombian when both fit, as in "4.500"), and dates are tried in a
+    few common formats. Columns where fewer than MIN_PARSED_FRACTION of the
+    values parse stay text.
+
+    Args:
+        df: DataFrame, typically read as text (dtype=str)
+
+    Returns:
+        The typed table
+    """
+    return TypedTable(columns=[type_column(str(name), df[name]) for name in df.columns])
+
+
+def type_column(name: str, series: "pd.Series") -> TypedColumn:
+    """Type one column (see type_table)."""
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return TypedColumn(
+            name=name,
+            kind=_numeric_kind(name, None, False),
+            values=series.to_numpy(dtype=np.float64),
+            unit=_header_unit(name)
+        )
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return TypedColumn(name=name, kind=DATE, values=series.to_numpy(dtype="datetime64[D]"))
+
+    text = series.astype("string").str.strip()
+    present = text.notna() & (text != "")
+    values = text[present]
+    if values.empty:
+        return _text_column(name, text)
+
+    numbers = _parse_numbers(values)
+    if numbers is not None:
+        numeric, unit, percent = numbers
+        column = np.full(len(series), np.nan)
+        column[present.to_numpy()] = numeric
+        unit = unit or _header_unit(name)
+        return TypedColumn(name=name, kind=_numeric_kind(name, unit, percent), values=column, unit=unit)
+
+    dates = _parse_dates(values)
+    if dates is not None:
+        column = np.full(len(series), np.datetime64("NaT"), dtype="datetime64[D]")
+        column[present.to_numpy()] = dates
+        return TypedColumn(name=name, kind=DATE, values=column)
+
+    return _text_column(name, text)
+
+
+def _text_column(name: str, text: "pd.Series") -> TypedColumn:
+    return TypedColumn(name=name, kind=TEXT, values=text.fillna("").to_numpy(dtype=str))
+
+
+def _header_unit(name: str) -> Optional[str]:
+    match = _HEADER_UNIT.search(name)
+    return match.group(1).upper() if match else None
+
+
+def _numeric_kind(name: str, unit: Optional[str], percent: bool) -> str:
+    if percent or "%" in name:
+        return PERCENT
+    if unit or _header_unit(name):
+        return CURRENCY
+    return NUMBER
+
+
+def _parse_numbers(values: "pd.Series") -> Optional[Tuple[np.ndarray, Optional[str], bool]]:
+    """
+    Parse non-empty strings as numbers.
+
+    Returns:
+        (float64 values, currency code, whether they are percentages), or
+        None if too few values are numbers
+    """
+    import pandas as pd
+
+    units = values.str.extract(_VALUE_UNIT, expand=False).dropna().str.upper()
+    percent = values.str.endswith("%")
+    dollar = values.str.contains("$", regex=False)
+    cleaned = values.str.replace(_MARKERS, "", regex=True)
+
+    colombian = cleaned.str.fullmatch(_COLOMBIAN)
+    us = cleaned.str.fullmatch(_US)
+    needed = MIN_PARSED_FRACTION * len(values)
+    if colombian.sum() >= needed and colombian.sum() >= us.sum():
+        normalized = cleaned.where(colombian).str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    elif us.sum() >= needed:
+        normalized = cleaned.where(us).str.replace(",", "", regex=False)
+    else:
+        return None
+
+    numeric = pd.to_numeric(normalized, errors="coerce").to_numpy(dtype=np.float64)
+    unit = units.mode().iloc[0] if not units.empty else ("COP" if dollar.mean() >= 0.5 else None)
+    return numeric, unit, bool(percent.mean() >= 0.5)
+
+
+def _parse_dates(values: "pd.Series") -> Optional[np.ndarray]:
+    """
+    Parse non-empty strings as dates, each with the first format that fits
+    (all of them day-first), or None if too few are dates.
+    """
+    import pandas as pd
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for date_format in _DATE_FORMATS:
+        missing = parsed.isna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(values[missing], format=date_format, errors="coerce")
+    if parsed.notna().sum() < MIN_PARSED_FRACTION * len(values):
+        return None
+    return parsed.to_numpy(dtype="datetime64[D]")
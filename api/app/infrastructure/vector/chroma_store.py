@@ -1,41 +1,123 @@
 """
 Chroma vector store implementation.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import asyncio
 import logging
-import chromadb
-from chromadb.config import Settings
+import threading
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.entities.search import SearchFilter
+from app.domain.exceptions import VectorStoreWriteError
+from app.domain.ports.chunk_store import ChunkStorePort
 from app.domain.ports.vector_store import VectorStorePort
 from app.core.config import settings as app_settings
 
 logger = logging.getLogger(__name__)
 
+# Collection whose metadata names the active collection (see activate())
+POINTER_COLLECTION = "vector_index_pointer"
+
 
 class ChromaVectorStore(VectorStorePort):
     """
     Chroma vector store implementation.
     Connects to ChromaDB server via HTTP.
+
+    Without an explicit `collection_name`, the store opens the collection
+    named by the pointer collection, falling back to VECTOR_COLLECTION.
+
+    Construction does no network I/O: the client and collection are opened
+    by connect() at startup, or on first use.
+
+    With a `chunk_store`, Chroma holds only ids, vectors and metadata: chunk
+    texts are not sent on writes (the caller stores them locally first, as
+    UploadDocumentUseCase does) and results are hydrated from the chunk
+    store with one batched read. Chunks written before, whose text is only
+    in Chroma, are read from Chroma and copied to the chunk store.
     """
 
-    def __init__(self):
-        # Initialize Chroma REST client (required for server-based deployments)
-        self.client = chromadb.Client(
-            Settings(
-                chroma_api_impl="chromadb.api.fastapi.FastAPI",
-                chroma_server_host=self._parse_chroma_host(),
-                chroma_server_http_port=self._parse_chroma_port(),
-                anonymized_telemetry=False
+    _client: Optional[Any] = None
+    _collection: Optional[Any] = None
+    _chunk_store: Optional[ChunkStorePort] = None
+
+    def __init__(
+        self,
+        collection_name: Optional[str] = None,
+        client: Optional[Any] = None,
+        chunk_store: Optional[ChunkStorePort] = None
+    ):
+        self._client = client
+        self._collection = None
+        self._chunk_store = chunk_store
+        self._requested_collection = collection_name
+        self._connect_lock = threading.Lock()
+        self._max_batch_size: Optional[int] = None
+
+    @property
+    def client(self) -> Any:
+        """Chroma REST client, created on first use."""
+        if self._client is None:
+            # Imported here: chromadb takes about a second to import
+            import chromadb
+            from chromadb.config import Settings
+
+            # Initialize Chroma REST client (required for server-based deployments)
+            self._client = chromadb.Client(
+                Settings(
+                    chroma_api_impl="chromadb.api.fastapi.FastAPI",
+                    chroma_server_host=self._parse_chroma_host(),
+                    chroma_server_http_port=self._parse_chroma_port(),
+                    anonymized_telemetry=False
+                )
             )
-        )
+        return self._client
 
-        # Get or create collection with cosine metric
-        self.collection = self.client.get_or_create_collection(
-            name="financial_documents",
-            metadata={
-                "description": "Financial documents embeddings",
-                "hnsw:space": "cosine"  # Force cosine metric
-            }
-        )
+    @client.setter
+    def client(self, value: Any) -> None:
+        self._client = value
+
+    @property
+    def collection(self) -> Any:
+        """Chroma collection, opened (or created) on first use."""
+        if self._collection is None:
+            with self._connect_lock:
+                if self._collection is None:
+                    # Get or create collection with cosine metric
+                    self._collection = self.client.get_or_create_collection(
+                        name=self._requested_collection or self._active_collection_name(),
+                        metadata={
+                            "description": "Financial documents embeddings",
+                            "hnsw:space": "cosine"  # Force cosine metric
+                        }
+                    )
+        return self._collection
+
+    @collection.setter
+    def collection(self, value: Any) -> None:
+        self._collection = value
+
+    async def connect(self) -> None:
+        """
+        Open the client and collection without blocking the event loop.
+        """
+        collection = await asyncio.to_thread(lambda: self.collection)
+        count = await asyncio.to_thread(collection.count)
+        logger.info(f"[Chroma] Connected to collection '{collection.name}' ({count} chunks)")
+
+    def _active_collection_name(self) -> str:
+        """Read the active collection from the pointer collection."""
+        from chromadb.errors import NotFoundError
+
+        try:
+            pointer = self.client.get_collection(POINTER_COLLECTION)
+        except NotFoundError:
+            return app_settings.VECTOR_COLLECTION
+        return (pointer.metadata or {}).get("active") or app_settings.VECTOR_COLLECTION
+
+    @property
+    def collection_name(self) -> str:
+        """Name of the collection this store reads and writes."""
+        return self.collection.name
 
     def _parse_chroma_host(self) -> str:
         """Extract host from CHROMA_URL."""
@@ -59,64 +141,231 @@ class ChromaVectorStore(VectorStorePort):
             return int(url.split(":")[1])
         return 8000  # Default ChromaDB port
 
+    def _get_batch_size(self) -> int:
+        """
+        Get the write batch size, capped by the server's max batch size.
+        """
+        if self._max_batch_size is None:
+            try:
+                self._max_batch_size = self.client.get_max_batch_size()
+            except Exception as e:
+                logger.warning(f"Could not read Chroma max batch size: {e}")
+                self._max_batch_size = app_settings.VECTOR_WRITE_BATCH_SIZE
+        return max(1, min(app_settings.VECTOR_WRITE_BATCH_SIZE, self._max_batch_size))
+
     async def add_chunks(
         self,
         document_id: str,
         chunks: List[str],
         embeddings: List[List[float]],
-        metadata: List[Dict[str, Any]]
+        metadata: List[Dict[str, Any]],
+        start_index: int = 0
     ) -> None:
         """
         Add document chunks with embeddings to the vector store.
+
+        Chunks are written in batches no larger than the server allows, with at
+        most VECTOR_WRITE_CONCURRENCY batches in flight. Batches are upserted,
+        so resuming from `committed_count` after a failure is idempotent.
         """
         if not chunks:
             return
 
-        # Generate IDs for chunks
-        ids = [f"{document_id}_chunk_{i}" for i in range(len(chunks))]
+        batch_size = self._get_batch_size()
+        semaphore = asyncio.Semaphore(max(1, app_settings.VECTOR_WRITE_CONCURRENCY))
+        failed = asyncio.Event()
+
+        async def write_batch(offset: int) -> bool:
+            async with semaphore:
+                # Stop scheduling new batches once one has failed
+                if failed.is_set():
+                    return False
+
+                end = min(offset + batch_size, len(chunks))
+                ids = [f"{document_id}_chunk_{start_index + i}" for i in range(offset, end)]
+                payload: Dict[str, Any] = {
+                    "ids": ids,
+                    "embeddings": embeddings[offset:end],
+                    "metadatas": metadata[offset:end]
+                }
+                if self._chunk_store is None:
+                    payload["documents"] = chunks[offset:end]
+                try:
+                    await asyncio.to_thread(self.collection.upsert, **payload)
+                except Exception:
+                    failed.set()
+                    raise
+                return True
+
+        offsets = list(range(0, len(chunks), batch_size))
+        results = await asyncio.gather(
+            *(write_batch(offset) for offset in offsets),
+            return_exceptions=True
+        )
+
+        # Only the contiguous prefix of successful batches counts as committed
+        committed = len(chunks)
+        error: Optional[BaseException] = None
+        for offset, result in zip(offsets, results):
+            if result is not True:
+                committed = offset
+                error = next(r for r in results if isinstance(r, BaseException))
+                break
+
+        if error is not None:
+            logger.error(
+                f"[Chroma] Batched write failed for document {document_id} "
+                f"after {start_index + committed} chunks: {error}"
+            )
+            raise VectorStoreWriteError(
+                f"Error writing chunks for document {document_id}: {error}",
+                committed_count=start_index + committed
+            ) from error
 
-        # Add to collection
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            documents=chunks,
-            metadatas=metadata
+        logger.info(
+            f"[Chroma] Stored {len(chunks)} chunks for document {document_id} "
+            f"in {len(offsets)} batch(es) of up to {batch_size}"
         )
 
+    @staticmethod
+    def _where(filters: Optional[SearchFilter]) -> Optional[Dict[str, Any]]:
+        """Translate a SearchFilter into a Chroma `where` clause."""
+        if filters is None or filters.is_empty:
+            return None
+
+        conditions: List[Dict[str, Any]] = []
+        for key, values in (("document_id", filters.document_ids), ("file_type", filters.file_types)):
+            if values is not None:
+                conditions.append({key: values[0]} if len(values) == 1 else {key: {"$in": list(values)}})
+        conditions.extend({key: value} for key, value in filters.equality_conditions().items())
+        conditions.extend(
+            {key: {"$gte" if op == ">=" else "$lte": value}} for key, op, value in filters.range_conditions()
+        )
+
+        return conditions[0] if len(conditions) == 1 else {"$and": conditions}
+
     async def search(
         self,
         query_embedding: List[float],
-        top_k: int = 5
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Search for similar chunks based on query embedding.
+
+        Filters are evaluated by Chroma before ranking, so scoped queries only
+        score the matching chunks.
+        """
+        return (await self.search_many(
+            [query_embedding], top_k=top_k, filters=filters, include_embeddings=include_embeddings
+        ))[0]
+
+    async def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query embeddings with a single collection query.
         """
+        if not query_embeddings:
+            return []
+
+        query: Dict[str, Any] = {}
+        where = self._where(filters)
+        if where is not None:
+            query["where"] = where
+
+        include = ["metadatas", "distances"] + (["embeddings"] if include_embeddings else [])
+        if self._chunk_store is None:
+            include.append("documents")
         results = self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=query_embeddings,
             n_results=top_k,
-            include=["documents", "metadatas", "distances"]
+            include=include,
+            **query
         )
 
         # Log distances for inspection
         try:
-            dists = results.get("distances", [[]])[0]
-            logger.info(f"[Chroma] top_k={top_k} distances={dists}")
+            dists = results.get("distances") or []
+            logger.info(f"[Chroma] queries={len(query_embeddings)} top_k={top_k} distances={dists}")
         except Exception as e:
             logger.warning(f"Could not log distances: {e}")
 
-        # Format results
+        formatted = [self._format_results(results, q) for q in range(len(query_embeddings))]
+        if self._chunk_store is not None:
+            await self._hydrate([result for results_q in formatted for result in results_q])
+        return formatted
+
+    @staticmethod
+    def _format_results(results: Dict[str, Any], q: int) -> List[Dict[str, Any]]:
+        """Results of the q-th query embedding in the port's format."""
         formatted_results = []
-        if results["documents"] and results["documents"][0]:
-            for i in range(len(results["documents"][0])):
+        if results["ids"] and results["ids"][q]:
+            for i in range(len(results["ids"][q])):
                 formatted_results.append({
-                    "id": results["ids"][0][i],
-                    "document": results["documents"][0][i],
-                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                    "distance": results["distances"][0][i] if results.get("distances") else None
+                    "id": results["ids"][q][i],
+                    "document": results["documents"][q][i] if results.get("documents") else None,
+                    "metadata": results["metadatas"][q][i] if results["metadatas"] else {},
+                    "distance": results["distances"][q][i] if results.get("distances") else None
                 })
+                if results.get("embeddings") is not None:
+                    formatted_results[-1]["embedding"] = results["embeddings"][q][i]
 
         return formatted_results
 
+    @staticmethod
+    def _chunk_key(result: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+        metadata = result.get("metadata") or {}
+        if "document_id" not in metadata or "chunk_index" not in metadata:
+            return None
+        return metadata["document_id"], int(metadata["chunk_index"])
+
+    async def _hydrate(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Fill in the "document" of results read without their text: one
+        batched chunk store read, then one Chroma read for the chunks the
+        store does not have yet (which are copied to it).
+        """
+        if not results:
+            return
+
+        keys = [self._chunk_key(result) for result in results]
+        texts = await self._chunk_store.get_chunks([key for key in keys if key is not None])
+
+        missing = list(dict.fromkeys(
+            result["id"] for result, key in zip(results, keys) if key not in texts
+        ))
+        legacy: Dict[str, str] = {}
+        if missing:
+            page = await asyncio.to_thread(self.collection.get, ids=missing, include=["documents", "metadatas"])
+            backfill: Dict[Tuple[str, int], str] = {}
+            for chunk_id, document, metadata in zip(page["ids"], page["documents"] or [], page["metadatas"] or []):
+                if document is None:
+                    continue
+                legacy[chunk_id] = document
+                key = self._chunk_key({"metadata": metadata})
+                if key is not None:
+                    backfill[key] = document
+            # One write per run of consecutive chunks of a document
+            runs: List[Tuple[str, int, List[str]]] = []
+            for (document_id, index) in sorted(backfill):
+                if runs and runs[-1][0] == document_id and runs[-1][1] + len(runs[-1][2]) == index:
+                    runs[-1][2].append(backfill[(document_id, index)])
+                else:
+                    runs.append((document_id, index, [backfill[(document_id, index)]]))
+            for document_id, start_index, documents in runs:
+                await self._chunk_store.add_chunks(document_id, documents, start_index=start_index)
+            if backfill:
+                logger.info(f"[Chroma] Copied {len(backfill)} chunk texts to the local chunk store")
+
+        for result, key in zip(results, keys):
+            result["document"] = texts[key] if key in texts else legacy.get(result["id"], "")
+
     async def delete_document(self, document_id: str) -> None:
         """
         Delete all chunks for a document.
@@ -128,3 +377,102 @@ class ChromaVectorStore(VectorStorePort):
             )
         except Exception as e:
             print(f"Error deleting document {document_id}: {e}")
+
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Delete all chunks for several documents in one operation.
+        """
+        if not document_ids:
+            return
+
+        await asyncio.to_thread(
+            self.collection.delete,
+            where={"document_id": {"$in": list(document_ids)}}
+        )
+
+    async def get_embedding_spec(self) -> Optional[EmbeddingSpec]:
+        """
+        Get the embedding model and dimensions the collection was built with.
+        """
+        metadata = self.collection.metadata or {}
+        if metadata.get("embedding_dimensions"):
+            return EmbeddingSpec(
+                model=metadata.get("embedding_model"),
+                dimensions=int(metadata["embedding_dimensions"])
+            )
+
+        # Collections created before the spec was recorded: read the size of
+        # a stored vector
+        sample = await asyncio.to_thread(self.collection.get, limit=1, include=["embeddings"])
+        embeddings = sample.get("embeddings")
+        if embeddings is None or len(embeddings) == 0:
+            return None
+        return EmbeddingSpec(model=None, dimensions=len(embeddings[0]))
+
+    async def set_embedding_spec(self, spec: EmbeddingSpec) -> None:
+        """
+        Record the embedding model and dimensions in the collection metadata.
+        """
+        # The distance function cannot be re-sent on modify; it is kept in
+        # the collection configuration
+        metadata = {
+            key: value for key, value in (self.collection.metadata or {}).items()
+            if not key.startswith("hnsw:")
+        }
+        metadata["embedding_dimensions"] = spec.dimensions
+        if spec.model:
+            metadata["embedding_model"] = spec.model
+
+        await asyncio.to_thread(self.collection.modify, metadata=metadata)
+        self.collection = await asyncio.to_thread(self.client.get_collection, self.collection.name)
+
+    async def iter_chunks(self, batch_size: int = 500) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterate over all stored chunks, without their embeddings.
+        """
+        offset = 0
+        while True:
+            page = await asyncio.to_thread(
+                self.collection.get,
+                limit=batch_size,
+                offset=offset,
+                include=["metadatas"] if self._chunk_store is not None else ["documents", "metadatas"]
+            )
+            if not page["ids"]:
+                return
+
+            documents = page.get("documents") or [None] * len(page["ids"])
+            chunks = [
+                {"id": chunk_id, "document": document, "metadata": metadata or {}}
+                for chunk_id, document, metadata in zip(page["ids"], documents, page["metadatas"])
+            ]
+            if self._chunk_store is not None:
+                await self._hydrate(chunks)
+            yield chunks
+            offset += len(page["ids"])
+
+    async def create_collection(self, name: str, spec: EmbeddingSpec) -> "ChromaVectorStore":
+        """
+        Create a new, empty collection on the same server.
+        """
+        metadata = {
+            "description": "Financial documents embeddings",
+            "hnsw:space": "cosine",
+            "embedding_dimensions": spec.dimensions
+        }
+        if spec.model:
+            metadata["embedding_model"] = spec.model
+
+        await asyncio.to_thread(self.client.create_collection, name=name, metadata=metadata)
+        return ChromaVectorStore(collection_name=name, client=self.client, chunk_store=self._chunk_store)
+
+    async def activate(self) -> None:
+        """
+        Point new store instances at this collection.
+
+        The switch is a single metadata update of the pointer collection, so
+        readers see either the old or the new collection, never a mix.
+        """
+        pointer = await asyncio.to_thread(self.client.get_or_create_collection, name=POINTER_COLLECTION)
+        await asyncio.to_thread(pointer.modify, metadata={"active": self.collection.name})
+        logger.info(f"[Chroma] Active collection is now '{self.collection.name}'")
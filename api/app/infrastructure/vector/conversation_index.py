@@ -0,0 +1,164 @@
+"""
+In-memory per-conversation vector index.
+"""
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional
+import logging
+import time
+
+import numpy as np
+
+from app.domain.entities.search import SearchFilter
+from app.domain.ports.conversation_index import ConversationIndexPort
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _EphemeralIndex:
+    """Normalized embedding matrix plus the chunk payloads of one conversation."""
+    matrix: Optional[np.ndarray] = None
+    ids: List[str] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    metadatas: List[Dict[str, Any]] = field(default_factory=list)
+    last_access: float = field(default_factory=time.monotonic)
+
+
+class InMemoryConversationIndex(ConversationIndexPort):
+    """
+    Brute-force cosine search over a NumPy matrix per conversation.
+
+    Temporary attachments are small (one invoice, one report), so an exact
+    matrix-vector product is faster than any network round trip and the
+    index disappears with the conversation.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, _EphemeralIndex] = {}
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    async def add_chunks(
+        self,
+        conversation_id: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        metadata: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Add chunks with embeddings to a conversation's index.
+        """
+        if not chunks:
+            return
+
+        index = self._indexes.setdefault(conversation_id, _EphemeralIndex())
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        if index.matrix is None:
+            index.matrix = vectors
+        else:
+            index.matrix = np.vstack([index.matrix, vectors])
+
+        index.ids.extend(f"{m['document_id']}_chunk_{m['chunk_index']}" for m in metadata)
+        index.documents.extend(chunks)
+        index.metadatas.extend(metadata)
+        index.last_access = time.monotonic()
+
+    async def search(
+        self,
+        conversation_id: str,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Search a conversation's index.
+        """
+        index = self._indexes.get(conversation_id)
+        if index is None or index.matrix is None or not len(index.ids):
+            return []
+
+        index.last_access = time.monotonic()
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        similarities = index.matrix @ (query / norm)
+        if filters is not None and not filters.is_empty:
+            excluded = [i for i, m in enumerate(index.metadatas) if not filters.matches(m)]
+            similarities[excluded] = -np.inf
+
+        k = min(top_k, len(similarities))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        top = top[np.isfinite(similarities[top])]
+
+        results = [
+            {
+                "id": index.ids[i],
+                "document": index.documents[i],
+                "metadata": index.metadatas[i],
+                # Cosine distance, same convention as the Chroma collection
+                "distance": float(1.0 - similarities[i])
+            }
+            for i in top
+        ]
+        if include_embeddings:
+            for result, i in zip(results, top):
+                result["embedding"] = index.matrix[i]
+        return results
+
+    async def has_chunks(self, conversation_id: str) -> bool:
+        """
+        Whether a conversation has any indexed attachment chunks.
+        """
+        index = self._indexes.get(conversation_id)
+        return index is not None and bool(index.ids)
+
+    async def delete_document(self, conversation_id: str, document_id: str) -> None:
+        """
+        Remove a document's chunks from a conversation's index.
+        """
+        index = self._indexes.get(conversation_id)
+        if index is None or index.matrix is None:
+            return
+
+        keep = [i for i, m in enumerate(index.metadatas) if m.get("document_id") != document_id]
+        if not keep:
+            del self._indexes[conversation_id]
+            return
+
+        index.matrix = index.matrix[keep]
+        index.ids = [index.ids[i] for i in keep]
+        index.documents = [index.documents[i] for i in keep]
+        index.metadatas = [index.metadatas[i] for i in keep]
+
+    async def drop(self, conversation_id: str) -> None:
+        """
+        Free a conversation's index.
+        """
+        self._indexes.pop(conversation_id, None)
+
+    async def evict_idle(self, max_idle_seconds: float) -> int:
+        """
+        Free indexes that have not been used recently.
+        """
+        now = time.monotonic()
+        idle = [
+            conversation_id
+            for conversation_id, index in self._indexes.items()
+            if now - index.last_access > max_idle_seconds
+        ]
+        for conversation_id in idle:
+            del self._indexes[conversation_id]
+
+        if idle:
+            logger.info(f"🧹 Freed {len(idle)} idle conversation index(es)")
+
+        return len(idle)
@@ -0,0 +1,260 @@
+"""
+Document centroid index implementation.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+
+import numpy as np
+
+from app.core.config import settings
+from app.domain.entities.search import SearchFilter
+from app.domain.ports.document_index import DocumentIndexPort
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS centroids (
+    collection TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    -- float32 sum of the document's unit-normalized chunk embeddings
+    vector_sum BLOB NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    metadata TEXT NOT NULL,
+    -- JSON [[start, end], ...] of the chunk indexes already in vector_sum
+    folded_ranges TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (collection, document_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_centroids_document_id ON centroids(document_id);
+"""
+
+
+@dataclass
+class _Matrix:
+    """Normalized centroids of one collection, as searched."""
+    ids: List[str]
+    vectors: np.ndarray
+    metadata: List[Dict[str, Any]]
+
+
+class NumpyDocumentIndex(DocumentIndexPort):
+    """
+    One centroid vector per document, persisted in a local SQLite database.
+
+    The centroid is the mean direction of the document's chunk embeddings.
+    Sums are stored instead of means so batches of chunks can be folded in
+    as they are written; the chunk ranges folded in are recorded so a
+    batch written again (a resumed upload) is not counted twice. Searches run on an in-memory matrix of normalized
+    centroids per collection, rebuilt on the first search after a write;
+    with one row per document it stays small next to the chunk index.
+
+    Construction does no I/O; the database is opened on first use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or settings.DOCUMENT_INDEX_PATH)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._matrices: Dict[str, _Matrix] = {}
+
+    def _ensure_open(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._db is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(str(self.path), check_same_thread=False)
+                db.executescript(_SCHEMA)
+                columns = {row[1] for row in db.execute("PRAGMA table_info(centroids)")}
+                if "folded_ranges" not in columns:
+                    db.execute("ALTER TABLE centroids ADD COLUMN folded_ranges TEXT NOT NULL DEFAULT '[]'")
+                self._db = db
+            return self._db
+
+    def _add(
+        self,
+        collection: str,
+        document_id: str,
+        vectors: np.ndarray,
+        start_index: Optional[int],
+        metadata: str
+    ) -> None:
+        db = self._ensure_open()
+        with self._lock, db:
+            row = db.execute(
+                "SELECT vector_sum, chunk_count, folded_ranges FROM centroids "
+                "WHERE collection = ? AND document_id = ?",
+                (collection, document_id)
+            ).fetchone()
+            previous = np.frombuffer(row[0], dtype=np.float32) if row is not None else None
+            if previous is not None and previous.shape != vectors.shape[1:]:
+                # Different embedding dimensions: start over
+                previous, row = None, None
+            ranges = [tuple(r) for r in json.loads(row[2])] if row is not None else []
+
+            if start_index is not None:
+                indexes = np.arange(start_index, start_index + len(vectors))
+                new = np.ones(len(vectors), dtype=bool)
+                for start, end in ranges:
+                    new &= (indexes < start) | (indexes >= end)
+                if not new.any():
+                    return
+                vectors = vectors[new]
+                ranges = _merge_ranges(ranges + [(start_index, start_index + len(new))])
+
+            vector_sum = vectors.sum(axis=0)
+            count = len(vectors)
+            if previous is not None:
+                vector_sum = vector_sum + previous
+                count += row[1]
+            db.execute(
+                "INSERT OR REPLACE INTO centroids "
+                "(collection, document_id, vector_sum, chunk_count, metadata, folded_ranges) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    collection, document_id, vector_sum.astype(np.float32).tobytes(), count, metadata,
+                    json.dumps([list(r) for r in ranges])
+                )
+            )
+            self._matrices.pop(collection, None)
+
+    async def add_embeddings(
+        self,
+        collection: str,
+        document_id: str,
+        embeddings: List[List[float]],
+        metadata: Dict[str, Any],
+        start_index: Optional[int] = None
+    ) -> None:
+        """
+        Fold chunk embeddings into a document's centroid, skipping chunks
+        already folded in.
+        """
+        if not embeddings:
+            return
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        document_metadata = {key: value for key, value in metadata.items() if key != "chunk_index"}
+        await asyncio.to_thread(
+            self._add, collection, document_id, vectors / norms, start_index, json.dumps(document_metadata)
+        )
+
+    def _matrix(self, collection: str) -> _Matrix:
+        db = self._ensure_open()
+        with self._lock:
+            matrix = self._matrices.get(collection)
+            if matrix is not None:
+                return matrix
+
+            rows = db.execute(
+                "SELECT document_id, vector_sum, metadata FROM centroids WHERE collection = ? ORDER BY document_id",
+                (collection,)
+            ).fetchall()
+            if rows:
+                vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob, _ in rows])
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                vectors = vectors / norms
+            else:
+                vectors = np.zeros((0, 0), dtype=np.float32)
+            matrix = _Matrix(
+                ids=[document_id for document_id, _, _ in rows],
+                vectors=vectors,
+                metadata=[json.loads(meta) for _, _, meta in rows]
+            )
+            self._matrices[collection] = matrix
+            return matrix
+
+    def _search(
+        self,
+        collection: str,
+        queries: np.ndarray,
+        top_k: int,
+        filters: Optional[SearchFilter]
+    ) -> List[List[str]]:
+        matrix = self._matrix(collection)
+        rows = np.arange(len(matrix.ids))
+        if filters is not None and not filters.is_empty:
+            rows = np.array(
+                [i for i, meta in enumerate(matrix.metadata) if filters.matches({**meta, "document_id": matrix.ids[i]})],
+                dtype=np.int64
+            )
+        if not len(rows) or matrix.vectors.shape[1] != queries.shape[1]:
+            return [[] for _ in queries]
+
+        scores = queries @ matrix.vectors[rows].T
+        k = min(top_k, len(rows))
+        results = []
+        for row_scores in scores:
+            best = np.argpartition(-row_scores, k - 1)[:k]
+            best = best[np.argsort(-row_scores[best])]
+            results.append([matrix.ids[rows[i]] for i in best])
+        return results
+
+    async def search(
+        self,
+        collection: str,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        filters: Optional[SearchFilter] = None
+    ) -> List[List[str]]:
+        """
+        Find the documents whose centroids are most similar to each query.
+        """
+        if not query_embeddings or top_k <= 0:
+            return []
+
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return await asyncio.to_thread(self._search, collection, queries / norms, top_k, filters)
+
+    async def count(self, collection: str) -> int:
+        """
+        Number of documents with a centroid in a collection.
+        """
+        matrix = await asyncio.to_thread(self._matrix, collection)
+        return len(matrix.ids)
+
+    def _delete(self, document_ids: List[str]) -> None:
+        db = self._ensure_open()
+        with self._lock, db:
+            db.execute(
+                f"DELETE FROM centroids WHERE document_id IN ({','.join('?' * len(document_ids))})",
+                document_ids
+            )
+            self._matrices.clear()
+
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Remove the centroids of several documents, in every collection.
+        """
+        if not document_ids:
+            return
+
+        await asyncio.to_thread(self._delete, list(document_ids))
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            self._matrices.clear()
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
@@ -0,0 +1,300 @@
+"""
+Inverted-file (IVF) index for the NumPy vector store.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+
+from app.core.config import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+# File in the index directory naming the generation in use
+_CURRENT_FILE = "CURRENT"
+
+# Lloyd iterations and training points per list for k-means
+_KMEANS_ITERATIONS = 10
+_TRAIN_POINTS_PER_LIST = 64
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, block_rows: int) -> np.ndarray:
+    """Closest centroid (by inner product) of each row, computed in blocks."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), block_rows):
+        block = np.asarray(vectors[start:start + block_rows], dtype=np.float32)
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def kmeans(sample: np.ndarray, lists: int, rng: np.random.Generator, iterations: int = _KMEANS_ITERATIONS) -> np.ndarray:
+    """
+    Spherical k-means: `lists` unit centroids for normalized vectors.
+
+    Centroid sums are computed with one sort and np.add.reduceat per
+    iteration; lists that end up empty are reseeded with random points.
+    """
+    lists = min(lists, len(sample))
+    centroids = sample[rng.choice(len(sample), lists, replace=False)].astype(np.float32)
+    block_rows = max(1, app_settings.NUMPY_SEARCH_BLOCK_ROWS)
+
+    for _ in range(iterations):
+        labels = _nearest(sample, centroids, block_rows)
+        counts = np.bincount(labels, minlength=lists)
+        order = np.argsort(labels, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        nonempty = counts > 0
+
+        sums = np.zeros_like(centroids)
+        sums[nonempty] = np.add.reduceat(sample[order], starts[nonempty], axis=0)
+        empty = np.flatnonzero(~nonempty)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        centroids = _normalize(sums).astype(np.float32)
+
+    return centroids
+
+
+@dataclass
+class _Generation:
+    """One trained layout of the index."""
+    path: Path
+    centroids: np.ndarray
+    # Live rows at training time, grouped by list: list l is
+    # packed[offsets[l]:offsets[l + 1]], holding store rows packed_rows[...]
+    packed: np.ndarray
+    packed_rows: np.ndarray
+    offsets: np.ndarray
+    # Store rows >= trained_rows were added later; tail[i] is the list of row trained_rows + i
+    trained_rows: int
+    tail: np.ndarray
+
+    @property
+    def lists(self) -> int:
+        return len(self.centroids)
+
+
+class IVFIndex:
+    """
+    Coarse-quantized index over the rows of a NumpyVectorStore matrix.
+
+    Training clusters a sample of the live vectors with k-means and copies
+    every live vector into a second file where the vectors of each list are
+    contiguous, so probing a list is one sequential read. Rows added after
+    training are assigned to their closest list as they are written (the
+    "tail") and gathered from the main matrix when their list is probed.
+
+    A search scores the `nprobe` closest lists only. Deleted rows stay in
+    the packed file until the next training and are masked out with the
+    store's live-row mask.
+
+    Each training writes a new generation directory and then switches the
+    CURRENT file, so searches keep using the previous layout until the new
+    one is complete. The store decides when to (re)train (see
+    NumpyVectorStore._maybe_train).
+    """
+
+    def __init__(self, path: Path, lists: int):
+        self.path = path
+        self.lists = lists
+        self._generation: Optional[_Generation] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether a trained layout with the configured number of lists is loaded."""
+        generation = self._generation
+        return generation is not None and generation.lists == self.lists
+
+    @property
+    def trained_rows(self) -> int:
+        return self._generation.trained_rows if self._generation is not None else 0
+
+    @property
+    def tail_rows(self) -> int:
+        return len(self._generation.tail) if self._generation is not None else 0
+
+    def load(self, matrix: Optional[np.ndarray]) -> None:
+        """
+        Open the current generation, if any, and assign the rows of
+        `matrix` that were written after its tail was last saved.
+        """
+        current = self.path / _CURRENT_FILE
+        if not current.exists():
+            return
+
+        path = self.path / current.read_text().strip()
+        info = json.loads((path / "info.json").read_text())
+        if matrix is None or info["dimension"] != matrix.shape[1]:
+            return
+
+        packed_count = info["packed_count"]
+        tail_file = path / "tail.i32"
+        tail = np.fromfile(tail_file, dtype=np.int32) if tail_file.exists() else np.zeros(0, dtype=np.int32)
+        generation = _Generation(
+            path=path,
+            centroids=np.fromfile(path / "centroids.f32", dtype=np.float32).reshape(info["lists"], info["dimension"]),
+            packed=np.memmap(path / "packed.f32", dtype=np.float32, mode="r", shape=(packed_count, info["dimension"]))
+            if packed_count else np.zeros((0, info["dimension"]), dtype=np.float32),
+            packed_rows=np.fromfile(path / "packed_rows.i64", dtype=np.int64),
+            offsets=np.fromfile(path / "offsets.i64", dtype=np.int64),
+            trained_rows=info["trained_rows"],
+            tail=tail
+        )
+        self._sync_tail(generation, matrix)
+        self._generation = generation
+        logger.info(
+            f"[IVF] Loaded {path.name}: {generation.lists} lists, {packed_count} packed rows, "
+            f"{len(generation.tail)} tail rows"
+        )
+
+    def _sync_tail(self, generation: _Generation, matrix: np.ndarray) -> None:
+        """Make the tail cover exactly the rows of `matrix` past the trained ones."""
+        expected = max(0, matrix.shape[0] - generation.trained_rows)
+        tail_file = generation.path / "tail.i32"
+        if len(generation.tail) > expected:
+            generation.tail = generation.tail[:expected].copy()
+            generation.tail.tofile(tail_file)
+        elif len(generation.tail) < expected:
+            start = generation.trained_rows + len(generation.tail)
+            missing = _nearest(matrix[start:], generation.centroids, max(1, app_settings.NUMPY_SEARCH_BLOCK_ROWS))
+            with open(tail_file, "ab") as f:
+                f.write(missing.tobytes())
+            generation.tail = np.concatenate([generation.tail, missing])
+
+    def append(self, vectors: np.ndarray) -> None:
+        """
+        Assign newly written rows (normalized vectors) to their lists.
+        Called by the store, under its lock, in row order.
+        """
+        generation = self._generation
+        if generation is None:
+            return
+
+        labels = np.argmax(vectors @ generation.centroids.T, axis=1).astype(np.int32)
+        with open(generation.path / "tail.i32", "ab") as f:
+            f.write(labels.tobytes())
+        generation.tail = np.concatenate([generation.tail, labels])
+
+    def train(self, matrix: np.ndarray, alive: np.ndarray, seed: Optional[int] = None) -> _Generation:
+        """
+        Build a new generation from the live rows of `matrix` (a snapshot).
+
+        Only files of the new generation are written, so this can run in a
+        background thread while the store keeps serving and appending.
+        """
+        rng = np.random.default_rng(seed)
+        block_rows = max(1, app_settings.NUMPY_SEARCH_BLOCK_ROWS)
+        live = np.flatnonzero(alive[:matrix.shape[0]])
+
+        sample_size = min(len(live), self.lists * _TRAIN_POINTS_PER_LIST)
+        # Sorted sample rows keep the reads on the mapped file sequential
+        sample_rows = np.sort(rng.choice(live, sample_size, replace=False))
+        centroids = kmeans(np.asarray(matrix[sample_rows], dtype=np.float32), self.lists, rng)
+
+        labels = np.empty(len(live), dtype=np.int32)
+        for start in range(0, len(live), block_rows):
+            rows = live[start:start + block_rows]
+            labels[start:start + len(rows)] = np.argmax(np.asarray(matrix[rows]) @ centroids.T, axis=1)
+        order = np.argsort(labels, kind="stable")
+        packed_rows = live[order]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(centroids)))]).astype(np.int64)
+
+        path = self.path / f"g{time.time_ns()}"
+        path.mkdir(parents=True)
+        centroids.tofile(path / "centroids.f32")
+        packed_rows.tofile(path / "packed_rows.i64")
+        offsets.tofile(path / "offsets.i64")
+        with open(path / "packed.f32", "wb") as f:
+            for start in range(0, len(packed_rows), block_rows):
+                f.write(np.ascontiguousarray(matrix[packed_rows[start:start + block_rows]], dtype=np.float32).tobytes())
+        (path / "tail.i32").touch()
+        (path / "info.json").write_text(json.dumps({
+            "lists": len(centroids),
+            "dimension": matrix.shape[1],
+            "trained_rows": matrix.shape[0],
+            "packed_count": len(packed_rows)
+        }))
+
+        return _Generation(
+            path=path,
+            centroids=centroids,
+            packed=np.memmap(path / "packed.f32", dtype=np.float32, mode="r", shape=(len(packed_rows), matrix.shape[1]))
+            if len(packed_rows) else np.zeros((0, matrix.shape[1]), dtype=np.float32),
+            packed_rows=packed_rows,
+            offsets=offsets,
+            trained_rows=matrix.shape[0],
+            tail=np.zeros(0, dtype=np.int32)
+        )
+
+    def install(self, generation: _Generation, matrix: np.ndarray) -> None:
+        """
+        Switch to a trained generation. `matrix` holds every row written so
+        far; rows appended while training are assigned to the new lists.
+        Called by the store under its lock.
+        """
+        self._sync_tail(generation, matrix)
+
+        tmp = self.path / f"{_CURRENT_FILE}.tmp"
+        tmp.write_text(generation.path.name)
+        os.replace(tmp, self.path / _CURRENT_FILE)
+
+        previous = self._generation
+        self._generation = generation
+        if previous is not None and previous.path != generation.path:
+            # Searches still reading the old memmap keep their mapping
+            shutil.rmtree(previous.path, ignore_errors=True)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        matrix: np.ndarray,
+        alive: np.ndarray,
+        top_k: int,
+        nprobe: int
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Approximate top-k (row, score) pairs per normalized query, probing
+        the `nprobe` lists whose centroids are closest to it.
+        """
+        generation = self._generation
+        nprobe = min(nprobe, generation.lists)
+        probes = np.argpartition(-(queries @ generation.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        tail_lists = generation.tail
+        tail_rows = generation.trained_rows + np.arange(len(tail_lists))
+
+        results = []
+        for query, lists in zip(queries, probes):
+            blocks = [(generation.offsets[l], generation.offsets[l + 1]) for l in np.sort(lists)]
+            rows = np.concatenate([generation.packed_rows[start:end] for start, end in blocks])
+            scores = np.concatenate([generation.packed[start:end] @ query for start, end in blocks])
+
+            tail = tail_rows[np.isin(tail_lists, lists)]
+            tail = tail[tail < matrix.shape[0]]
+            if len(tail):
+                rows = np.concatenate([rows, tail])
+                scores = np.concatenate([scores, matrix[tail] @ query])
+
+            keep = rows < len(alive)
+            keep[keep] = alive[rows[keep]]
+            rows, scores = rows[keep], scores[keep]
+
+            k = min(top_k, len(rows))
+            if k == 0:
+                results.append([])
+                continue
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            results.append([(int(rows[i]), float(scores[i])) for i in best])
+        return results
@@ -0,0 +1,733 @@
+"""
+In-process NumPy vector store implementation.
+"""
+from pathlib import Path
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.entities.search import SearchFilter
+from app.domain.ports.vector_store import VectorStorePort
+from app.infrastructure.vector.ivf import IVFIndex
+from app.infrastructure.sqlite_filters import sqlite_conditions
+from app.core.config import settings as app_settings
+
+logger = logging.getLogger(__name__)
+
+_QUANTIZED_DTYPES = {"float16": np.float16, "int8": np.int8}
+_UPCAST_BLOCK_ELEMENTS = 1 << 20
+
+# Filtered searches gather candidate rows instead of scanning the whole
+# matrix when they match at most this fraction of it
+_GATHER_FRACTION = 0.25
+
+# File in the store root naming the active collection (see activate())
+_ACTIVE_FILE = "ACTIVE"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    row INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    document_id TEXT NOT NULL,
+    document TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_chunks_id ON chunks(id);
+CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks(document_id);
+"""
+
+
+class NumpyVectorStore(VectorStorePort):
+    """
+    Exact cosine search over an append-only, memory-mapped float32 matrix.
+
+    Each collection is a directory under NUMPY_VECTOR_STORE_PATH; without an
+    explicit `collection_name` the one named in the ACTIVE file is opened,
+    falling back to VECTOR_COLLECTION. Row i of `vectors.f32` is the normalized embedding of row i in the
+    `chunks.db` sidecar, which holds ids, texts and metadata. Upserts and
+    deletes only tombstone rows in the sidecar; the matrix is never rewritten.
+    Vectors are appended before the sidecar commits, so rows past the last
+    committed one are left over from an interrupted write and are truncated
+    on open.
+
+    With NUMPY_QUANTIZATION set to "float16" or "int8" (per-vector scale), a
+    quantized copy of the matrix is kept next to it. Searches scan the
+    quantized copy and rescore the best `top_k * NUMPY_RESCORE_FACTOR`
+    candidates against the full-precision rows, so only those rows of the
+    float32 file are paged in. The quantized copy is derived data and is
+    rebuilt on open if it is missing or out of date.
+
+    With NUMPY_IVF_LISTS set, unfiltered and broadly filtered searches go
+    through an inverted-file index (see ivf.py) once the collection has
+    NUMPY_IVF_MIN_ROWS rows: only the NUMPY_IVF_NPROBE closest k-means
+    lists are scored, on full-precision vectors. The index is trained in a
+    background thread and retrained the same way once the rows added since
+    exceed NUMPY_IVF_RETRAIN_FRACTION of the trained ones; until then the
+    store keeps answering with the exact scan.
+
+    Construction only resolves paths; the sidecar is opened and the files
+    are checked by connect() at startup, or on first use.
+    """
+
+    def __init__(self, path: Optional[str] = None, collection_name: Optional[str] = None):
+        self.root = Path(path or app_settings.NUMPY_VECTOR_STORE_PATH)
+        self._collection_name = collection_name or self._active_collection_name()
+        self.path = self.root / self._collection_name
+        self._vectors_path = self.path / "vectors.f32"
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+
+        self._quantization = app_settings.NUMPY_QUANTIZATION
+        if self._quantization not in _QUANTIZED_DTYPES and self._quantization != "none":
+            raise ValueError(f"Unsupported NUMPY_QUANTIZATION: {self._quantization}")
+        self._quantized_path = self.path / f"vectors.{self._quantization}"
+        self._scales_path = self.path / "scales.f32"
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._dimension: Optional[int] = None
+        self._alive = np.ones(0, dtype=bool)
+        self._matrix: Optional[np.ndarray] = None
+        self._quantized: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+
+        self._ivf = IVFIndex(self.path / "ivf", app_settings.NUMPY_IVF_LISTS) if app_settings.NUMPY_IVF_LISTS > 0 else None
+        self._ivf_training: Optional[threading.Thread] = None
+
+    def _ensure_open(self) -> None:
+        """Open the sidecar, repair the files and load the live-row mask, once."""
+        if self._db is not None:
+            return
+        with self._open_lock:
+            if self._db is not None:
+                return
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path / "chunks.db"), check_same_thread=False)
+            db.executescript(_SCHEMA)
+
+            row = db.execute("SELECT value FROM store_info WHERE key = 'dimension'").fetchone()
+            self._dimension = int(row[0]) if row else None
+
+            count = db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM chunks").fetchone()[0]
+            alive = np.ones(count, dtype=bool)
+            deleted = [r for (r,) in db.execute("SELECT row FROM chunks WHERE deleted = 1")]
+            alive[deleted] = False
+            self._alive = alive
+
+            self._truncate_uncommitted(count)
+            self._sync_quantized(count)
+            if self._ivf is not None and count:
+                self._ivf.load(np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self._dimension)))
+            self._db = db
+
+            logger.info(
+                f"[NumpyStore] Opened {self.path} with {int(self._alive.sum())} live chunks "
+                f"({count} rows, dimension={self._dimension}, quantization={self._quantization})"
+            )
+        self._maybe_train()
+
+    async def connect(self) -> None:
+        """
+        Open the store without blocking the event loop.
+        """
+        await asyncio.to_thread(self._ensure_open)
+
+    def _active_collection_name(self) -> str:
+        """Read the active collection from the ACTIVE file."""
+        active = self.root / _ACTIVE_FILE
+        if active.exists():
+            name = active.read_text().strip()
+            if name:
+                return name
+        return app_settings.VECTOR_COLLECTION
+
+    @property
+    def collection_name(self) -> str:
+        """Name of the collection this store reads and writes."""
+        return self._collection_name
+
+    @property
+    def count(self) -> int:
+        """Number of live chunks."""
+        self._ensure_open()
+        return int(self._alive.sum())
+
+    def _truncate_uncommitted(self, count: int) -> None:
+        """Drop vectors appended after the last committed sidecar row."""
+        if not self._vectors_path.exists():
+            self._vectors_path.touch()
+            return
+
+        expected = count * (self._dimension or 0) * 4
+        if self._vectors_path.stat().st_size > expected:
+            logger.warning(f"[NumpyStore] Truncating uncommitted vectors in {self._vectors_path}")
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(expected)
+
+    @property
+    def quantized(self) -> bool:
+        """Whether searches scan a quantized copy of the matrix."""
+        return self._quantization != "none"
+
+    def _quantize(self, vectors: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Quantize normalized vectors; int8 also returns one scale per vector."""
+        if self._quantization == "float16":
+            return vectors.astype(np.float16), None
+
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(vectors / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+
+    def _append_quantized(self, vectors: np.ndarray) -> None:
+        quantized, scales = self._quantize(vectors)
+        with open(self._quantized_path, "ab") as f:
+            f.write(np.ascontiguousarray(quantized).tobytes())
+        if scales is not None:
+            with open(self._scales_path, "ab") as f:
+                f.write(scales.tobytes())
+
+    def _sync_quantized(self, count: int) -> None:
+        """Make the quantized copy hold exactly the `count` committed rows."""
+        if not self.quantized:
+            return
+
+        paths = [self._quantized_path]
+        row_bytes = [(self._dimension or 0) * np.dtype(_QUANTIZED_DTYPES[self._quantization]).itemsize]
+        if self._quantization == "int8":
+            paths.append(self._scales_path)
+            row_bytes.append(4)
+
+        for path in paths:
+            path.touch()
+        rows = min(
+            (path.stat().st_size // size if size else 0)
+            for path, size in zip(paths, row_bytes)
+        )
+
+        # Drop rows past the committed count (or a partially written last row)
+        for path, size in zip(paths, row_bytes):
+            if path.stat().st_size != min(rows, count) * size:
+                with open(path, "r+b") as f:
+                    f.truncate(min(rows, count) * size)
+
+        if rows >= count:
+            return
+
+        logger.info(f"[NumpyStore] Building {self._quantization} copy of {count - rows} rows")
+        full = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(count, self._dimension))
+        block_rows = max(1, app_settings.NUMPY_SEARCH_BLOCK_ROWS)
+        for start in range(rows, count, block_rows):
+            self._append_quantized(np.asarray(full[start:start + block_rows]))
+
+    def _get_matrix(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], Optional[np.ndarray], np.ndarray]:
+        """
+        Snapshot of the mapped full-precision matrix, its quantized copy and
+        int8 scales (None when not quantized), and the live-row mask.
+        """
+        with self._lock:
+            rows = len(self._alive)
+            if rows == 0:
+                return None, None, None, self._alive
+            if self._matrix is None or self._matrix.shape[0] != rows:
+                self._matrix = np.memmap(
+                    self._vectors_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(rows, self._dimension)
+                )
+                if self.quantized:
+                    self._quantized = np.memmap(
+                        self._quantized_path,
+                        dtype=_QUANTIZED_DTYPES[self._quantization],
+                        mode="r",
+                        shape=(rows, self._dimension)
+                    )
+                if self._quantization == "int8":
+                    self._scales = np.memmap(self._scales_path, dtype=np.float32, mode="r", shape=(rows,))
+            return self._matrix, self._quantized, self._scales, self._alive
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _append(
+        self,
+        ids: List[str],
+        document_id: str,
+        chunks: List[str],
+        vectors: np.ndarray,
+        metadata: List[Dict[str, Any]]
+    ) -> None:
+        self._ensure_open()
+        with self._lock:
+            if self._dimension is None:
+                self._dimension = vectors.shape[1]
+                self._db.execute(
+                    "INSERT INTO store_info (key, value) VALUES ('dimension', ?)",
+                    (str(self._dimension),)
+                )
+            elif vectors.shape[1] != self._dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store dimension {self._dimension}"
+                )
+
+            first_row = len(self._alive)
+            with open(self._vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            if self.quantized:
+                self._append_quantized(vectors)
+
+            # Upsert: previous rows with the same ids become tombstones
+            placeholders = ",".join("?" * len(ids))
+            replaced = [
+                r for (r,) in self._db.execute(
+                    f"SELECT row FROM chunks WHERE deleted = 0 AND id IN ({placeholders})", ids
+                )
+            ]
+            with self._db:
+                if replaced:
+                    self._db.execute(
+                        f"UPDATE chunks SET deleted = 1 WHERE row IN ({','.join('?' * len(replaced))})",
+                        replaced
+                    )
+                self._db.executemany(
+                    "INSERT INTO chunks (row, id, document_id, document, metadata) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (first_row + i, chunk_id, document_id, chunk, json.dumps(meta))
+                        for i, (chunk_id, chunk, meta) in enumerate(zip(ids, chunks, metadata))
+                    ]
+                )
+
+            alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+            alive[replaced] = False
+            self._alive = alive
+            if self._ivf is not None:
+                self._ivf.append(vectors)
+        self._maybe_train()
+
+    async def add_chunks(
+        self,
+        document_id: str,
+        chunks: List[str],
+        embeddings: List[List[float]],
+        metadata: List[Dict[str, Any]],
+        start_index: int = 0
+    ) -> None:
+        """
+        Add document chunks with embeddings to the vector store.
+
+        Each call is a single append, so it either commits completely or not
+        at all and never raises VectorStoreWriteError.
+        """
+        if not chunks:
+            return
+
+        ids = [f"{document_id}_chunk_{start_index + i}" for i in range(len(chunks))]
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        await asyncio.to_thread(self._append, ids, document_id, chunks, vectors, metadata)
+
+        logger.info(f"[NumpyStore] Stored {len(chunks)} chunks for document {document_id}")
+
+    @staticmethod
+    def _scan(
+        queries: np.ndarray,
+        matrix: np.ndarray,
+        scales: Optional[np.ndarray],
+        alive: np.ndarray,
+        top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k rows and scores of `matrix` for a batch of normalized queries.
+
+        The matrix is scanned in blocks of NUMPY_SEARCH_BLOCK_ROWS so memory
+        stays bounded regardless of how many rows are mapped.
+        """
+        block_rows = max(1, app_settings.NUMPY_SEARCH_BLOCK_ROWS)
+        if matrix.dtype != np.float32:
+            # Quantized blocks are upcast before the matmul; keep the copy cache-sized
+            block_rows = min(block_rows, max(1, _UPCAST_BLOCK_ELEMENTS // matrix.shape[1]))
+        candidate_rows = []
+        candidate_scores = []
+
+        for start in range(0, matrix.shape[0], block_rows):
+            end = min(start + block_rows, matrix.shape[0])
+            block = matrix[start:end]
+            if block.dtype != np.float32:
+                block = block.astype(np.float32)
+            scores = queries @ block.T
+            if scales is not None:
+                scores *= scales[start:end]
+            scores[:, ~alive[start:end]] = -np.inf
+
+            k = min(top_k, end - start)
+            best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            candidate_rows.append(best + start)
+            candidate_scores.append(np.take_along_axis(scores, best, axis=1))
+
+        rows = np.concatenate(candidate_rows, axis=1)
+        scores = np.concatenate(candidate_scores, axis=1)
+        k = min(top_k, rows.shape[1])
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        return np.take_along_axis(rows, best, axis=1), np.take_along_axis(scores, best, axis=1)
+
+    def _maybe_train(self) -> None:
+        """
+        Start a background (re)training of the IVF index when the collection
+        reached NUMPY_IVF_MIN_ROWS, the number of lists changed, or enough
+        rows were added since the last training.
+        """
+        if self._ivf is None:
+            return
+        with self._lock:
+            if self._ivf_training is not None and self._ivf_training.is_alive():
+                return
+            rows = len(self._alive)
+            if self._ivf.ready:
+                due = self._ivf.tail_rows > app_settings.NUMPY_IVF_RETRAIN_FRACTION * max(1, self._ivf.trained_rows)
+            else:
+                due = int(self._alive.sum()) >= max(app_settings.NUMPY_IVF_MIN_ROWS, self._ivf.lists)
+            if not due:
+                return
+            self._ivf_training = threading.Thread(target=self._train_ivf, name="ivf-train", daemon=True)
+            self._ivf_training.start()
+
+    def _train_ivf(self) -> None:
+        """Train a new IVF layout on a snapshot of the matrix, then switch to it."""
+        try:
+            matrix, _, _, alive = self._get_matrix()
+            if matrix is None:
+                return
+            started = time.monotonic()
+            generation = self._ivf.train(matrix, alive)
+            with self._lock:
+                current = np.memmap(self._vectors_path, dtype=np.float32, mode="r", shape=(len(self._alive), self._dimension))
+                self._ivf.install(generation, current)
+            logger.info(
+                f"[NumpyStore] Trained IVF index with {generation.lists} lists over "
+                f"{len(generation.packed_rows)} rows in {time.monotonic() - started:.1f}s"
+            )
+        except Exception as e:
+            logger.error(f"[NumpyStore] IVF training failed, searches stay exact: {e}")
+
+    async def train_index(self) -> None:
+        """
+        Train (or retrain) the IVF index now and wait for it, instead of in
+        the background. Does nothing when NUMPY_IVF_LISTS is 0.
+        """
+        if self._ivf is None:
+            return
+        await self.connect()
+        training = self._ivf_training
+        if training is not None:
+            await asyncio.to_thread(training.join)
+        await asyncio.to_thread(self._train_ivf)
+
+    def _candidate_rows(self, filters: SearchFilter) -> np.ndarray:
+        """Live rows matching a filter, resolved in the sidecar."""
+        clauses, params = sqlite_conditions(filters)
+        clauses.insert(0, "deleted = 0")
+
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT row FROM chunks WHERE {' AND '.join(clauses)} ORDER BY row", params
+            ).fetchall()
+        return np.fromiter((r for (r,) in rows), dtype=np.int64, count=len(rows))
+
+    def _top_k(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        filters: Optional[SearchFilter] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """
+        Exact top-k rows by cosine similarity for a batch of normalized queries.
+
+        When quantized, candidates from the quantized scan are rescored with
+        their full-precision vectors. With a selective filter, only the
+        matching rows are gathered and scored.
+        """
+        matrix, quantized, scales, alive = self._get_matrix()
+        if matrix is None or top_k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        if filters is not None and not filters.is_empty:
+            candidates = self._candidate_rows(filters)
+            candidates = candidates[candidates < matrix.shape[0]]
+            if len(candidates) <= len(alive) * _GATHER_FRACTION:
+                scores = queries @ matrix[candidates].T
+                rows = np.broadcast_to(candidates, scores.shape)
+                return self._ranked(rows, scores, top_k)
+
+            mask = np.zeros_like(alive)
+            mask[candidates] = True
+            alive = alive & mask
+
+        if self._ivf is not None and self._ivf.ready:
+            return self._ivf.search(queries, matrix, alive, top_k, max(1, app_settings.NUMPY_IVF_NPROBE))
+
+        if quantized is None:
+            rows, scores = self._scan(queries, matrix, None, alive, top_k)
+        else:
+            factor = max(1, app_settings.NUMPY_RESCORE_FACTOR)
+            rows, _ = self._scan(queries, quantized, scales, alive, top_k * factor)
+            scores = np.empty(rows.shape, dtype=np.float32)
+            for q in range(len(queries)):
+                # Sorted row order keeps the reads on the mapped file sequential
+                order = np.argsort(rows[q])
+                rows[q] = rows[q][order]
+                scores[q] = matrix[rows[q]] @ queries[q]
+            scores[~alive[rows]] = -np.inf
+
+        return self._ranked(rows, scores, top_k)
+
+    @staticmethod
+    def _ranked(rows: np.ndarray, scores: np.ndarray, top_k: int) -> List[List[Tuple[int, float]]]:
+        """Best `top_k` (row, score) pairs per query, best first."""
+        results = []
+        for q in range(scores.shape[0]):
+            order = np.argsort(-scores[q])[:top_k]
+            results.append([
+                (int(rows[q, i]), float(scores[q, i]))
+                for i in order
+                if np.isfinite(scores[q, i])
+            ])
+        return results
+
+    def _hydrate(
+        self,
+        hits_per_query: List[List[Tuple[int, float]]],
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Attach ids, texts and metadata from the sidecar to (row, score) hits,
+        reading the rows of all queries in one sidecar query. With
+        include_embeddings, the (normalized) vectors of the rows are added.
+        """
+        rows = sorted({row for hits in hits_per_query for row, _ in hits})
+        if not rows:
+            return [[] for _ in hits_per_query]
+
+        with self._lock:
+            records = {
+                row: (chunk_id, document, metadata)
+                for row, chunk_id, document, metadata in self._db.execute(
+                    f"SELECT row, id, document, metadata FROM chunks WHERE row IN ({','.join('?' * len(rows))})",
+                    rows
+                )
+            }
+
+        matrix = self._get_matrix()[0] if include_embeddings else None
+        results = []
+        for hits in hits_per_query:
+            query_results = []
+            for row, score in hits:
+                if row not in records:
+                    continue
+                result = {
+                    "id": records[row][0],
+                    "document": records[row][1],
+                    "metadata": json.loads(records[row][2]),
+                    # Cosine distance, same convention as the Chroma collection
+                    "distance": 1.0 - score
+                }
+                if matrix is not None:
+                    result["embedding"] = np.asarray(matrix[row])
+                query_results.append(result)
+            results.append(query_results)
+        return results
+
+    def _search(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        self._ensure_open()
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if self._dimension is not None and queries.shape[1] != self._dimension:
+            raise ValueError(
+                f"Query dimension {queries.shape[1]} does not match store dimension {self._dimension}"
+            )
+        return self._hydrate(self._top_k(self._normalize(queries), top_k, filters), include_embeddings)
+
+    async def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar chunks based on query embedding.
+        """
+        results = (await asyncio.to_thread(self._search, [query_embedding], top_k, filters, include_embeddings))[0]
+        logger.info(f"[NumpyStore] top_k={top_k} distances={[r['distance'] for r in results]}")
+        return results
+
+    async def search_many(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        filters: Optional[SearchFilter] = None,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several query embeddings in one batched matmul.
+        """
+        if not query_embeddings:
+            return []
+
+        results = await asyncio.to_thread(self._search, query_embeddings, top_k, filters, include_embeddings)
+        logger.info(f"[NumpyStore] queries={len(query_embeddings)} top_k={top_k}")
+        return results
+
+    def _delete(self, document_ids: List[str]) -> None:
+        self._ensure_open()
+        placeholders = ",".join("?" * len(document_ids))
+        with self._lock:
+            rows = [
+                r for (r,) in self._db.execute(
+                    f"SELECT row FROM chunks WHERE deleted = 0 AND document_id IN ({placeholders})",
+                    document_ids
+                )
+            ]
+            if not rows:
+                return
+            with self._db:
+                self._db.execute(
+                    f"UPDATE chunks SET deleted = 1 WHERE deleted = 0 AND document_id IN ({placeholders})",
+                    document_ids
+                )
+            alive = self._alive.copy()
+            alive[rows] = False
+            self._alive = alive
+
+    async def delete_document(self, document_id: str) -> None:
+        """
+        Delete all chunks for a document.
+        """
+        await self.delete_documents([document_id])
+
+    async def delete_documents(self, document_ids: List[str]) -> None:
+        """
+        Delete all chunks for several documents in one operation.
+        """
+        if not document_ids:
+            return
+
+        await asyncio.to_thread(self._delete, list(document_ids))
+
+    def _get_spec(self) -> Optional[EmbeddingSpec]:
+        self._ensure_open()
+        with self._lock:
+            if self._dimension is None:
+                return None
+            row = self._db.execute("SELECT value FROM store_info WHERE key = 'embedding_model'").fetchone()
+            return EmbeddingSpec(model=row[0] if row else None, dimensions=self._dimension)
+
+    async def get_embedding_spec(self) -> Optional[EmbeddingSpec]:
+        """
+        Get the embedding model and dimensions the collection was built with.
+        """
+        return await asyncio.to_thread(self._get_spec)
+
+    def _set_spec(self, spec: EmbeddingSpec) -> None:
+        self._ensure_open()
+        with self._lock:
+            if self._dimension is not None and self._dimension != spec.dimensions:
+                raise ValueError(
+                    f"Collection '{self._collection_name}' already holds {self._dimension}-dimensional vectors"
+                )
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO store_info (key, value) VALUES ('dimension', ?)",
+                    (str(spec.dimensions),)
+                )
+                if spec.model:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO store_info (key, value) VALUES ('embedding_model', ?)",
+                        (spec.model,)
+                    )
+            self._dimension = spec.dimensions
+
+    async def set_embedding_spec(self, spec: EmbeddingSpec) -> None:
+        """
+        Record the embedding model and dimensions with the collection.
+        """
+        await asyncio.to_thread(self._set_spec, spec)
+
+    def _read_page(self, after_row: int, batch_size: int) -> List[Tuple[int, str, str, str]]:
+        self._ensure_open()
+        with self._lock:
+            return self._db.execute(
+                "SELECT row, id, document, metadata FROM chunks WHERE deleted = 0 AND row > ? ORDER BY row LIMIT ?",
+                (after_row, batch_size)
+            ).fetchall()
+
+    async def iter_chunks(self, batch_size: int = 500) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterate over all stored chunks, without their embeddings.
+        """
+        after_row = -1
+        while True:
+            page = await asyncio.to_thread(self._read_page, after_row, batch_size)
+            if not page:
+                return
+
+            yield [
+                {"id": chunk_id, "document": document, "metadata": json.loads(metadata)}
+                for _, chunk_id, document, metadata in page
+            ]
+            after_row = page[-1][0]
+
+    async def create_collection(self, name: str, spec: EmbeddingSpec) -> "NumpyVectorStore":
+        """
+        Create a new, empty collection under the same root.
+        """
+        if (self.root / name / "chunks.db").exists():
+            raise ValueError(f"Collection '{name}' already exists")
+
+        store = NumpyVectorStore(str(self.root), collection_name=name)
+        await store.set_embedding_spec(spec)
+        return store
+
+    async def activate(self) -> None:
+        """
+        Point new store instances at this collection.
+
+        The ACTIVE file is replaced with a rename, which is atomic.
+        """
+        tmp = self.root / f"{_ACTIVE_FILE}.tmp"
+        tmp.write_text(self._collection_name)
+        os.replace(tmp, self.root / _ACTIVE_FILE)
+        logger.info(f"[NumpyStore] Active collection is now '{self._collection_name}'")
+
+    def close(self) -> None:
+        """Close the sidecar database and unmap the matrix."""
+        with self._lock:
+            self._matrix = None
+            self._quantized = None
+            self._scales = None
+            if self._db is not None:
+                self._db.close()
+                self._db = None
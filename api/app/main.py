@@ -9,7 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.container import container
-from app.infrastructure.db.migrations import run_migrations
+from app.core.scheduler import PeriodicTask
 from app.presentation.api import health, documents, chat, conversations
 
 # Configure logging
@@ -41,14 +41,39 @@ async def lifespan(app: FastAPI):
     print(f"🚀 Starting application in {settings.ENV} mode")
     print(f"📊 Database: {settings.DATABASE_URL}")
 
-    # Run database migrations
-    await run_migrations(container.db_client)
+    # Connect the database, vector store and OpenAI concurrently and warm them up.
+    # Unreachable dependencies are retried in the background (see /health/ready);
+    # a mismatched embedding spec refuses to start.
+    await container.startup.start()
+
+    # Periodically evict expired temporary documents
+    sweeper = None
+    if settings.TEMP_DOCUMENT_TTL_SECONDS > 0:
+        sweeper = PeriodicTask(
+            name="temporary-document-sweeper",
+            interval_seconds=settings.TEMP_DOCUMENT_SWEEP_INTERVAL_SECONDS,
+            func=container.sweep_temporary_documents_usecase.execute
+        )
+        sweeper.start()
+
+    # Free in-memory attachment indexes of idle conversations
+    index_evictor = PeriodicTask(
+        name="conversation-index-evictor",
+        interval_seconds=settings.CONVERSATION_INDEX_EVICT_INTERVAL_SECONDS,
+        func=lambda: container.conversation_index.evict_idle(settings.CONVERSATION_INDEX_IDLE_SECONDS)
+    )
+    index_evictor.start()
 
     yield
 
     # Shutdown
     print("👋 Shutting down application")
 
+    if sweeper:
+        await sweeper.stop()
+    await index_evictor.stop()
+    await container.startup.stop()
+
     # Close database
     await container.db_client.disconnect()
 
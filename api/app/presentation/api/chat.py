@@ -24,7 +24,7 @@ async def send_message(
     1. Creates a new conversation if conversation_id is not provided
     2. Saves the user message to the conversation
     3. Generates an embedding for the user's question
-    4. Searches for relevant chunks in the vector store
+    4. Searches for relevant chunks in the vector store (only in `document_ids`, if given)
     5. Uses the top-K most relevant chunks as context
     6. Generates a response using OpenAI's LLM
     7. Saves the assistant message to the conversation
@@ -39,7 +39,8 @@ async def send_message(
         # Execute chat use case (returns message and conversation_id)
         message, conversation_id = await chat_usecase.execute(
             query=request.message,
-            conversation_id=request.conversation_id
+            conversation_id=request.conversation_id,
+            document_ids=request.document_ids
         )
 
         # Convert sources to schema
@@ -159,3 +159,6 @@ async def delete_conversation(conversation_id: str):
 
     # Delete conversation (cascade will delete messages)
     await conversation_repository.delete(conversation_id)
+
+    # Free the in-memory index of its temporary attachments
+    await container.conversation_index.drop(conversation_id)
@@ -2,11 +2,21 @@
 Documents API endpoints.
 """
 import logging
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Query
 from typing import Optional
 
 from app.core.container import container
-from app.presentation.schemas.document import DocumentUploadResponse, DocumentListResponse
+from app.domain.exceptions import IngestionError, InvalidTableQueryError
+from app.presentation.schemas.document import (
+    ChartDataResponse,
+    ChartSeriesSchema,
+    DocumentUploadResponse,
+    DocumentListResponse,
+    IngestionMetricsResponse,
+    IngestionBatchSchema,
+    IngestionProgressResponse,
+    SweepReportResponse
+)
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 logger = logging.getLogger(__name__)
@@ -15,7 +25,11 @@ logger = logging.getLogger(__name__)
 @router.post("/upload", response_model=DocumentUploadResponse, status_code=201)
 async def upload_document(
     file: UploadFile = File(..., description="Document file to upload"),
-    is_temporary: Optional[bool] = Form(False, description="Mark document as temporary")
+    is_temporary: Optional[bool] = Form(False, description="Mark document as temporary"),
+    conversation_id: Optional[str] = Form(
+        None,
+        description="Conversation to attach a temporary document to (kept in an in-memory index)"
+    )
 ):
     """
     Upload and process a document.
@@ -28,6 +42,9 @@ async def upload_document(
     5. Stores chunks in Chroma vector store
     6. Saves metadata in SQLite database
 
+    Temporary documents attached to a conversation (`conversation_id`) are
+    indexed in memory for that conversation only, instead of in Chroma.
+
     Supported formats: PDF, CSV, XLSX
     """
     # Validate file type
@@ -57,12 +74,18 @@ async def upload_document(
 
         logger.info(f"📦 Processing document - Size: {file_size_mb:.2f}MB")
 
+        if is_temporary and conversation_id:
+            conversation = await container.conversation_repository.get_by_id(conversation_id)
+            if not conversation:
+                raise ValueError(f"Conversation {conversation_id} not found")
+
         # Execute use case
         document = await container.upload_document_usecase.execute(
             filename=file.filename,
             file_content=file_content,
             file_type=file_extension,
-            is_temporary=is_temporary or False
+            is_temporary=is_temporary or False,
+            conversation_id=conversation_id
         )
 
         # Log success
@@ -81,6 +104,12 @@ async def upload_document(
     except ValueError as e:
         logger.error(f"❌ Validation error uploading document '{file.filename}': {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    except IngestionError as e:
+        logger.error(f"❌ Ingestion failed for '{file.filename}' (resumable, document {e.document_id}): {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing document: {str(e)}. Resume with POST /documents/{e.document_id}/resume"
+        )
     except Exception as e:
         logger.error(f"❌ Error processing document '{file.filename}': {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing document: {str(e)}")
@@ -124,3 +153,172 @@ async def list_documents():
     except Exception as e:
         logger.error(f"❌ Error listing documents: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error listing documents: {str(e)}")
+
+
+@router.get("/ingestion/metrics", response_model=IngestionMetricsResponse)
+async def get_ingestion_metrics():
+    """
+    Get per-stage metrics of the most recent ingestion pipeline run,
+    live while it is still running.
+
+    Includes, for each stage (parse, chunk, embed, write):
+    - Concurrency
+    - Items processed and throughput
+    - Current and maximum input queue depth
+    """
+    metrics = container.upload_document_usecase.last_metrics
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="No ingestion has run yet")
+
+    return IngestionMetricsResponse(**metrics.to_dict())
+
+
+@router.post("/sweep", response_model=SweepReportResponse)
+async def sweep_temporary_documents():
+    """
+    Delete expired temporary documents now.
+
+    Runs the same sweep as the background task (TEMP_DOCUMENT_TTL_SECONDS)
+    and reports how many documents and chunks were reclaimed.
+    """
+    try:
+        report = await container.sweep_temporary_documents_usecase.execute()
+
+        return SweepReportResponse(
+            documents_deleted=report.documents_deleted,
+            chunks_deleted=report.chunks_deleted,
+            batches=report.batches,
+            duration_seconds=report.duration_seconds
+        )
+
+    except Exception as e:
+        logger.error(f"❌ Error sweeping temporary documents: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error sweeping temporary documents: {str(e)}")
+
+
+@router.get("/{document_id}/ingestion", response_model=IngestionProgressResponse)
+async def get_ingestion_progress(document_id: str):
+    """
+    Get the checkpointed ingestion progress of a document.
+    """
+    job = await container.ingestion_repository.get_job(document_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"No ingestion found for document {document_id}")
+
+    return IngestionProgressResponse(
+        document_id=job.document_id,
+        filename=job.filename,
+        status=job.status,
+        total_chunks=job.total_chunks,
+        committed_chunks=job.committed_chunks,
+        error=job.error,
+        batches=[
+            IngestionBatchSchema(
+                start_index=batch.start_index,
+                end_index=batch.end_index,
+                status=batch.status
+            )
+            for batch in job.batches
+        ],
+        updated_at=job.updated_at
+    )
+
+
+@router.get("/{document_id}/chart", response_model=ChartDataResponse)
+async def get_chart_data(
+    document_id: str,
+    measure: str = Query(..., description="Column to aggregate"),
+    group_by: str = Query(..., description="Axis column"),
+    granularity: Optional[str] = Query(
+        None, description="day, month, quarter or year, for date axes (default month)"
+    ),
+    metric: str = Query("sum", description="sum, avg, count, min or max"),
+    split_by: Optional[str] = Query(None, description="Column whose values become separate series")
+):
+    """
+    Get aggregated series of a CSV/Excel document for a chart.
+
+    Computed from the document's typed columns and cached per document
+    version. The response is columnar: the axis labels once, and one array
+    of values per series.
+    """
+    try:
+        chart = await container.get_chart_data_usecase.execute(
+            document_id=document_id,
+            measure=measure,
+            group_by=group_by,
+            granularity=granularity,
+            metric=metric,
+            split_by=split_by
+        )
+        if chart is None:
+            raise HTTPException(status_code=404, detail=f"No tabular data found for document {document_id}")
+
+        return ChartDataResponse(
+            document_id=chart.document_id,
+            version=chart.version,
+            measure=chart.measure,
+            metric=chart.metric,
+            group_by=chart.group_by,
+            granularity=chart.granularity,
+            split_by=chart.split_by,
+            unit=chart.unit,
+            labels=chart.labels,
+            series=[ChartSeriesSchema(name=s.name, values=s.values) for s in chart.series],
+            truncated=chart.truncated
+        )
+
+    except HTTPException:
+        raise
+    except InvalidTableQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Error computing chart data for document {document_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error computing chart data: {str(e)}")
+
+
+@router.post("/{document_id}/resume", response_model=DocumentUploadResponse)
+async def resume_document_ingestion(
+    document_id: str,
+    file: UploadFile = File(..., description="The same file that was originally uploaded")
+):
+    """
+    Resume a failed document ingestion.
+
+    The file is parsed again, but chunk ranges that were already stored are
+    not re-embedded: ingestion continues from the last committed batches.
+    """
+    try:
+        logger.info(f"🔁 Resuming ingestion - Document: {document_id} | Filename: '{file.filename}'")
+
+        file_content = await file.read()
+        if not file_content:
+            raise HTTPException(status_code=400, detail="File is empty")
+
+        document = await container.upload_document_usecase.resume(
+            document_id=document_id,
+            file_content=file_content
+        )
+
+        logger.info(f"✅ Document ingestion resumed successfully - ID: {document.id} | Chunks: {document.chunk_count}")
+
+        return DocumentUploadResponse(
+            id=document.id,
+            filename=document.filename,
+            file_type=document.file_type,
+            chunk_count=document.chunk_count,
+            upload_date=document.upload_date,
+            is_temporary=document.is_temporary
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"❌ Validation error resuming document {document_id}: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except IngestionError as e:
+        logger.error(f"❌ Ingestion failed again for document {document_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error resuming document: {str(e)}")
+    except Exception as e:
+        logger.error(f"❌ Error resuming document {document_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error resuming document: {str(e)}")
@@ -1,7 +1,10 @@
 """
-Health check endpoint.
+Health check endpoints.
 """
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.container import container
 
 router = APIRouter(tags=["health"])
 
@@ -15,3 +18,16 @@ async def health_check():
         dict: Status of the application
     """
     return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness_check():
+    """
+    Readiness check endpoint.
+
+    Returns:
+        200 with per-dependency status once the database, vector store and
+        OpenAI are connected and warmed up, 503 until then
+    """
+    report = container.startup.status()
+    return JSONResponse(status_code=200 if container.startup.ready else 503, content=report)
@@ -40,12 +40,17 @@ class ChatRequest(BaseModel):
         None,
         description="Optional conversation ID. If not provided, a new conversation will be created."
     )
+    document_ids: Optional[List[str]] = Field(
+        None,
+        description="Optional document IDs to restrict the search to. If not provided, all documents are searched."
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
                 "message": "¿Cuáles fueron los gastos totales del último trimestre?",
-                "conversation_id": "123e4567-e89b-12d3-a456-426614174000"
+                "conversation_id": "123e4567-e89b-12d3-a456-426614174000",
+                "document_ids": ["123e4567-e89b-12d3-a456-426614174000"]
             }
         }
 
@@ -2,6 +2,7 @@
 Document schemas for API requests and responses.
 """
 from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -49,4 +50,95 @@ class DocumentListResponse(BaseModel):
                 ],
                 "total": 1
             }
-        }
\ No newline at end of file
+        }
+
+
+class StageMetricsSchema(BaseModel):
+    """Throughput and queue-depth metrics for one ingestion stage."""
+
+    name: str = Field(..., description="Stage name (parse, chunk, embed, write)")
+    concurrency: int = Field(..., description="Number of concurrent workers")
+    items_in: int = Field(..., description="Items consumed by the stage")
+    items_out: int = Field(..., description="Items emitted by the stage")
+    busy_seconds: float = Field(..., description="Total time spent processing items")
+    elapsed_seconds: float = Field(..., description="Wall time from first item to completion")
+    throughput: float = Field(..., description="Items processed per second")
+    queue_depth: int = Field(..., description="Current depth of the input queue")
+    max_queue_depth: int = Field(..., description="Maximum observed input queue depth")
+
+
+class IngestionMetricsResponse(BaseModel):
+    """Response schema for the last ingestion pipeline run."""
+
+    queue_size: int = Field(..., description="Bound of each inter-stage queue")
+    stages: List[StageMetricsSchema] = Field(..., description="Per-stage metrics")
+
+
+class IngestionBatchSchema(BaseModel):
+    """Schema for a checkpointed chunk range."""
+
+    start_index: int = Field(..., description="First chunk index (inclusive)")
+    end_index: int = Field(..., description="Last chunk index (exclusive)")
+    status: str = Field(..., description="Batch status (embedded or written)")
+
+
+class IngestionProgressResponse(BaseModel):
+    """Response schema for a document's ingestion progress."""
+
+    document_id: str = Field(..., description="Document ID")
+    filename: str = Field(..., description="Original filename")
+    status: str = Field(..., description="Job status (running, failed or completed)")
+    total_chunks: Optional[int] = Field(None, description="Total number of chunks, once known")
+    committed_chunks: int = Field(..., description="Chunks already stored in the vector store")
+    error: Optional[str] = Field(None, description="Error of the last failed run")
+    batches: List[IngestionBatchSchema] = Field(..., description="Checkpointed chunk ranges")
+    updated_at: datetime = Field(..., description="Last progress update")
+
+
+class SweepReportResponse(BaseModel):
+    """Response schema for a temporary document sweep."""
+
+    documents_deleted: int = Field(..., description="Expired temporary documents deleted")
+    chunks_deleted: int = Field(..., description="Chunks removed from the vector store")
+    batches: int = Field(..., description="Number of delete batches")
+    duration_seconds: float = Field(..., description="Time spent sweeping")
+
+
+class ChartSeriesSchema(BaseModel):
+    """One series of a chart, aligned to the labels."""
+
+    name: str = Field(..., description="Metric name, or split_by value")
+    values: List[Optional[float]] = Field(..., description="One value per label (null where no rows)")
+
+
+class ChartDataResponse(BaseModel):
+    """Response schema for the aggregated series of a tabular document."""
+
+    document_id: str = Field(..., description="Document ID")
+    version: str = Field(..., description="Document version the series were computed from")
+    measure: str = Field(..., description="Aggregated column")
+    metric: str = Field(..., description="Aggregation (sum, avg, count, min or max)")
+    group_by: str = Field(..., description="Axis column")
+    granularity: Optional[str] = Field(None, description="Time bucket of a date axis")
+    split_by: Optional[str] = Field(None, description="Column whose values are the series")
+    unit: Optional[str] = Field(None, description="Currency of the values, if any")
+    labels: List[str] = Field(..., description="Axis labels")
+    series: List[ChartSeriesSchema] = Field(..., description="Values per series, aligned to labels")
+    truncated: bool = Field(default=False, description="Whether points or series were left out")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "document_id": "123e4567-e89b-12d3-a456-426614174000",
+                "version": "9f2c1a7b3e5d8c04",
+                "measure": "Monto",
+                "metric": "sum",
+                "group_by": "Fecha",
+                "granularity": "month",
+                "split_by": None,
+                "unit": "COP",
+                "labels": ["2024-01", "2024-02", "2024-03"],
+                "series": [{"name": "sum", "values": [4500000.0, 3900000.0, 5120000.0]}],
+                "truncated": False
+            }
+        }
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks.
+
+Run from the api/ directory, e.g. `python -m benchmarks.vector_store_benchmark`.
+"""
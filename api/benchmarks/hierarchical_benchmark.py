@@ -0,0 +1,119 @@
+"""
+Latency and recall@k of two-stage (document centroid -> chunk) retrieval
+against a flat NumpyVectorStore search, as the corpus grows.
+
+Each synthetic document is a topic: its chunks are points around the
+document's own direction, and documents share a few hundred broader themes
+so that neighbouring documents compete. Recall@k is measured against the
+exact flat search.
+
+Usage:
+    python -m benchmarks.hierarchical_benchmark --documents 100 500 2000 --chunks-per-document 50 --dim 512
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from app.domain.entities.search import SearchFilter
+from app.infrastructure.vector.document_index import NumpyDocumentIndex
+from app.infrastructure.vector.numpy_store import NumpyVectorStore
+
+
+def _corpus(documents: int, per_document: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """(documents, per_document, dim) embeddings: theme + document topic + chunk noise."""
+    themes = rng.standard_normal((max(1, documents // 10), dim), dtype=np.float32)
+    topics = themes[rng.integers(0, len(themes), size=documents)] + 0.7 * rng.standard_normal((documents, dim), dtype=np.float32)
+    return topics[:, None, :] + 0.6 * rng.standard_normal((documents, per_document, dim), dtype=np.float32)
+
+
+async def _load(store: NumpyVectorStore, index: NumpyDocumentIndex, corpus: np.ndarray) -> None:
+    for doc, chunks in enumerate(corpus):
+        document_id = f"bench-doc-{doc}"
+        metadata = [{"document_id": document_id, "chunk_index": i} for i in range(len(chunks))]
+        embeddings = chunks.tolist()
+        await store.add_chunks(
+            document_id=document_id,
+            chunks=[f"chunk {i}" for i in range(len(chunks))],
+            embeddings=embeddings,
+            metadata=metadata
+        )
+        await index.add_embeddings(store.collection_name, document_id, embeddings, metadata[0])
+
+
+async def _flat(store: NumpyVectorStore, queries: np.ndarray, top_k: int) -> Tuple[List[Set[str]], float]:
+    found, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results = await store.search(query.tolist(), top_k=top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found.append({r["id"] for r in results})
+    return found, statistics.median(latencies)
+
+
+async def _two_stage(
+    store: NumpyVectorStore,
+    index: NumpyDocumentIndex,
+    queries: np.ndarray,
+    top_k: int,
+    top_documents: int
+) -> Tuple[List[Set[str]], float]:
+    found, latencies = [], []
+    for query in queries:
+        started = time.perf_counter()
+        [document_ids] = await index.search(store.collection_name, [query.tolist()], top_documents)
+        results = await store.search(query.tolist(), top_k=top_k, filters=SearchFilter(document_ids=document_ids))
+        latencies.append((time.perf_counter() - started) * 1000)
+        found.append({r["id"] for r in results})
+    return found, statistics.median(latencies)
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    print(
+        f"{args.chunks_per_document} chunks/document x {args.dim} dims, {args.queries} queries, "
+        f"top_k={args.top_k}, top documents={args.top_documents}"
+    )
+    print(f"{'documents':>9} {'chunks':>8} {'flat ms':>8} {'2-stage ms':>10} {'speedup':>8} {'recall@k':>9}")
+
+    for documents in args.documents:
+        corpus = _corpus(documents, args.chunks_per_document, args.dim, rng)
+        # Queries are perturbed chunks of random documents
+        picks = corpus[rng.integers(0, documents, size=args.queries), rng.integers(0, args.chunks_per_document, size=args.queries)]
+        queries = picks + 0.6 * rng.standard_normal(picks.shape, dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = NumpyVectorStore(tmp)
+            index = NumpyDocumentIndex(f"{tmp}/documents.db")
+            await _load(store, index, corpus)
+
+            # Warm-up (page in the mapped matrix, build the centroid matrix)
+            await _flat(store, queries[:1], args.top_k)
+            await _two_stage(store, index, queries[:1], args.top_k, args.top_documents)
+
+            exact, flat_ms = await _flat(store, queries, args.top_k)
+            found, two_stage_ms = await _two_stage(store, index, queries, args.top_k, args.top_documents)
+            store.close()
+            index.close()
+
+        recall = statistics.fmean(len(f & e) / len(e) for f, e in zip(found, exact) if e)
+        print(
+            f"{documents:>9} {documents * args.chunks_per_document:>8} {flat_ms:8.2f} {two_stage_ms:10.2f} "
+            f"{flat_ms / two_stage_ms:7.1f}x {recall:9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--chunks-per-document", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--top-documents", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""
+Cold-start import time of the API (`import app.main`).
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+reports the median cumulative import time and the slowest top-level
+packages. Exits with status 1 when the median exceeds --max-ms, or when one
+of the --forbid modules (heavy dependencies that must only load on first
+use) is imported at startup, so it can gate CI.
+
+Usage:
+    python -m benchmarks.import_time_benchmark --runs 5 --max-ms 1500
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+API_ROOT = Path(__file__).resolve().parent.parent
+
+# Heavy dependencies that only their code path should import
+LAZY_MODULES = ["pandas", "pdfminer", "chromadb", "openai", "asyncpg"]
+
+# import time: self [us] | cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _import_once(module: str) -> List[Tuple[str, int, int]]:
+    """Import `module` in a fresh interpreter, return (name, depth, cumulative us) per import."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            imports.append((match.group(4), len(match.group(3)) // 2, int(match.group(2))))
+    return imports
+
+
+def _top_level(imports: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Cumulative microseconds per top-level package, counting each first import once."""
+    totals: Dict[str, int] = defaultdict(int)
+    for name, depth, cumulative in imports:
+        root = name.split(".")[0]
+        # The first time a package shows up is where its import cost is paid
+        if depth > 0 and name == root:
+            totals[root] += cumulative
+    return totals
+
+
+def main(args: argparse.Namespace) -> int:
+    # The import itself is measured: warm the bytecode cache once, then time fresh processes
+    _import_once(args.module)
+
+    totals = []
+    packages: Dict[str, List[int]] = defaultdict(list)
+    imported = set()
+    for _ in range(args.runs):
+        imports = _import_once(args.module)
+        totals.append(next(c for name, _, c in imports if name == args.module) / 1000)
+        for root, cumulative in _top_level(imports).items():
+            packages[root].append(cumulative)
+        imported.update(name.split(".")[0] for name, _, _ in imports)
+
+    median = statistics.median(totals)
+    print(f"import {args.module}: median={median:.0f}ms min={min(totals):.0f}ms max={max(totals):.0f}ms ({args.runs} runs)")
+    print(f"{'package':<28} {'ms':>8}")
+    slowest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))[:args.top]
+    for root, values in slowest:
+        print(f"{root:<28} {statistics.median(values) / 1000:8.1f}")
+
+    failed = False
+    eager = [module for module in args.forbid if module in imported]
+    if eager:
+        print(f"FAIL: imported at startup: {', '.join(eager)}")
+        failed = True
+    if args.max_ms and median > args.max_ms:
+        print(f"FAIL: median {median:.0f}ms exceeds --max-ms {args.max_ms:.0f}ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=1500, help="0 disables the time threshold")
+    parser.add_argument("--forbid", nargs="*", default=LAZY_MODULES)
+    sys.exit(main(parser.parse_args()))
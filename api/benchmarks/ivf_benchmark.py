@@ -0,0 +1,84 @@
+"""
+Recall/latency curve of IVF searches in NumpyVectorStore.
+
+Loads a clustered random corpus once, measures exact search, then reopens
+the store with NUMPY_IVF_LISTS set, trains the index and sweeps nprobe.
+Recall@k is measured against the exact search.
+
+Usage:
+    python -m benchmarks.ivf_benchmark --chunks 200000 --dim 768 --lists 1024 --nprobe 1 4 16 64
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import List, Set
+
+import numpy as np
+
+from app.core.config import settings
+from app.infrastructure.vector.numpy_store import NumpyVectorStore
+from benchmarks.quantization_benchmark import _clustered
+from benchmarks.vector_store_benchmark import _load
+
+
+async def _run(store: NumpyVectorStore, queries: np.ndarray, top_k: int):
+    # Warm-up (page in the mapped files)
+    await store.search(queries[0].tolist(), top_k=top_k)
+
+    ids: List[Set[str]] = []
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        results = await store.search(query.tolist(), top_k=top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        ids.append({r["id"] for r in results})
+    return ids, statistics.median(latencies)
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    corpus = _clustered(args.chunks, args.dim, args.clusters, rng)
+    queries = _clustered(args.queries, args.dim, args.clusters, rng)
+    print(f"Corpus: {args.chunks} chunks x {args.dim} dims, {args.queries} queries, top_k={args.top_k}")
+
+    lists, nprobe = settings.NUMPY_IVF_LISTS, settings.NUMPY_IVF_NPROBE
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.NUMPY_IVF_LISTS = 0
+        store = NumpyVectorStore(tmp)
+        await _load(store, corpus, args.documents)
+        exact, exact_ms = await _run(store, queries, args.top_k)
+        store.close()
+
+        settings.NUMPY_IVF_LISTS = args.lists
+        settings.NUMPY_IVF_MIN_ROWS = args.chunks + 1  # trained explicitly below
+        store = NumpyVectorStore(tmp)
+        started = time.perf_counter()
+        await store.train_index()
+        print(f"Trained {args.lists} lists in {time.perf_counter() - started:.1f}s")
+
+        print(f"{'nprobe':>6} {'scanned':>8} {'recall@k':>9} {'p50 ms':>8} {'speedup':>8}")
+        print(f"{'exact':>6} {1.0:8.1%} {1.0:9.3f} {exact_ms:8.2f} {1.0:7.1f}x")
+        for probes in args.nprobe:
+            settings.NUMPY_IVF_NPROBE = probes
+            found, p50 = await _run(store, queries, args.top_k)
+            recall = statistics.fmean(len(f & e) / len(e) for f, e in zip(found, exact) if e)
+            print(f"{probes:>6} {min(1.0, probes / args.lists):8.1%} {recall:9.3f} {p50:8.2f} {exact_ms / p50:7.1f}x")
+        store.close()
+
+    settings.NUMPY_IVF_LISTS, settings.NUMPY_IVF_NPROBE = lists, nprobe
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--lists", type=int, default=1024)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,101 @@
+"""
+Memory and recall@k of quantized NumpyVectorStore searches.
+
+Loads a clustered random corpus once (float32), then reopens the store with
+each NUMPY_QUANTIZATION mode, which builds the quantized copy from the
+float32 file. Recall@k is measured against exact float32 search, with and
+without rescoring (a rescore factor of 1 only reorders the quantized top-k).
+
+Usage:
+    python -m benchmarks.quantization_benchmark --chunks 50000 --dim 3072 --queries 100
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Set
+
+import numpy as np
+
+from app.core.config import settings
+from app.infrastructure.vector.numpy_store import NumpyVectorStore
+from benchmarks.vector_store_benchmark import _load
+
+
+def _clustered(count: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Embedding-like data: points around a few hundred topic centroids."""
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    labels = rng.integers(0, clusters, size=count)
+    return centers[labels] + 0.5 * rng.standard_normal((count, dim), dtype=np.float32)
+
+
+def _search_bytes(path: Path, quantization: str) -> int:
+    """Bytes a search has to scan (the file the first pass reads)."""
+    if quantization == "none":
+        return (path / "vectors.f32").stat().st_size
+    size = (path / f"vectors.{quantization}").stat().st_size
+    if quantization == "int8":
+        size += (path / "scales.f32").stat().st_size
+    return size
+
+
+async def _run(store: NumpyVectorStore, queries: np.ndarray, top_k: int):
+    ids: List[Set[str]] = []
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        results = await store.search(query.tolist(), top_k=top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        ids.append({r["id"] for r in results})
+    return ids, statistics.median(latencies)
+
+
+async def main(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    corpus = _clustered(args.chunks, args.dim, args.clusters, rng)
+    queries = _clustered(args.queries, args.dim, args.clusters, rng)
+    print(f"Corpus: {args.chunks} chunks x {args.dim} dims, {args.queries} queries, top_k={args.top_k}")
+
+    default_factor = settings.NUMPY_RESCORE_FACTOR
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+        settings.NUMPY_QUANTIZATION = "none"
+        store = NumpyVectorStore(tmp)
+        await _load(store, corpus, args.documents)
+        exact, exact_ms = await _run(store, queries, args.top_k)
+        store.close()
+        full_bytes = _search_bytes(path, "none")
+
+        print(f"{'mode':<8} {'rescore':>7} {'scan MB':>9} {'reduction':>9} {'recall@k':>9} {'p50 ms':>8}")
+        print(f"{'float32':<8} {'-':>7} {full_bytes / 2**20:9.1f} {1.0:8.1f}x {1.0:9.3f} {exact_ms:8.2f}")
+
+        for quantization in ("float16", "int8"):
+            settings.NUMPY_QUANTIZATION = quantization
+            for factor in (1, default_factor):
+                settings.NUMPY_RESCORE_FACTOR = factor
+                store = NumpyVectorStore(tmp)
+                found, p50 = await _run(store, queries, args.top_k)
+                store.close()
+
+                recall = statistics.fmean(len(f & e) / len(e) for f, e in zip(found, exact) if e)
+                scan = _search_bytes(path, quantization)
+                print(
+                    f"{quantization:<8} {factor:>6}x {scan / 2**20:9.1f} "
+                    f"{full_bytes / scan:8.1f}x {recall:9.3f} {p50:8.2f}"
+                )
+
+    settings.NUMPY_RESCORE_FACTOR = default_factor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=3072)
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,121 @@
+"""
+Search latency of NumpyVectorStore vs ChromaVectorStore.
+
+Loads the same random corpus into both stores and times single-query
+searches, over the whole corpus and scoped to one document. Chroma is
+skipped (with a notice) when no server is reachable at CHROMA_URL.
+
+Usage:
+    python -m benchmarks.vector_store_benchmark --chunks 20000 --dim 1536 --queries 200
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.domain.entities.search import SearchFilter
+from app.domain.ports.vector_store import VectorStorePort
+from app.infrastructure.vector.numpy_store import NumpyVectorStore
+
+BENCHMARK_COLLECTION = "benchmark_vectors"
+# Scoped searches: a single document out of --documents
+SCOPED = SearchFilter(document_ids=["bench-doc-0"])
+
+
+def _corpus(chunks: int, dim: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((chunks, dim), dtype=np.float32)
+
+
+async def _load(store: VectorStorePort, corpus: np.ndarray, documents: int) -> float:
+    """Write the corpus as `documents` equally sized documents, return seconds."""
+    started = time.perf_counter()
+    for doc, rows in enumerate(np.array_split(np.arange(len(corpus)), documents)):
+        document_id = f"bench-doc-{doc}"
+        await store.add_chunks(
+            document_id=document_id,
+            chunks=[f"chunk {i}" for i in rows],
+            embeddings=corpus[rows].tolist(),
+            metadata=[{"document_id": document_id, "chunk_index": int(i)} for i in range(len(rows))]
+        )
+    return time.perf_counter() - started
+
+
+async def _time_searches(
+    store: VectorStorePort,
+    queries: np.ndarray,
+    top_k: int,
+    filters: Optional[SearchFilter] = None
+) -> List[float]:
+    # Warm-up (page in the mapped matrix, open HTTP connections)
+    await store.search(queries[0].tolist(), top_k=top_k, filters=filters)
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        await store.search(query.tolist(), top_k=top_k, filters=filters)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def _summary(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))],
+        "mean_ms": statistics.fmean(ordered),
+    }
+
+
+def _report(name: str, load_seconds: float, latencies: List[float]) -> None:
+    s = _summary(latencies)
+    print(
+        f"{name:<13} load={load_seconds:7.2f}s  "
+        f"p50={s['p50_ms']:8.2f}ms  p95={s['p95_ms']:8.2f}ms  mean={s['mean_ms']:8.2f}ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    corpus = _corpus(args.chunks, args.dim, args.seed)
+    queries = _corpus(args.queries, args.dim, args.seed + 1)
+    print(f"Corpus: {args.chunks} chunks x {args.dim} dims, {args.queries} queries, top_k={args.top_k}")
+
+    with tempfile.TemporaryDirectory() as path:
+        store = NumpyVectorStore(path)
+        load_seconds = await _load(store, corpus, args.documents)
+        _report("numpy", load_seconds, await _time_searches(store, queries, args.top_k))
+        _report("numpy/scoped", load_seconds, await _time_searches(store, queries, args.top_k, SCOPED))
+        store.close()
+
+    if args.skip_chroma:
+        return
+
+    try:
+        from app.infrastructure.vector.chroma_store import ChromaVectorStore
+        chroma = ChromaVectorStore(collection_name=BENCHMARK_COLLECTION)
+    except Exception as e:
+        print(f"chroma        skipped ({e})")
+        return
+
+    try:
+        load_seconds = await _load(chroma, corpus, args.documents)
+        _report("chroma", load_seconds, await _time_searches(chroma, queries, args.top_k))
+        _report("chroma/scoped", load_seconds, await _time_searches(chroma, queries, args.top_k, SCOPED))
+    finally:
+        chroma.client.delete_collection(BENCHMARK_COLLECTION)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-chroma", action="store_true")
+    asyncio.run(main(parser.parse_args()))
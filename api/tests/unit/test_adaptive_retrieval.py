@@ -0,0 +1,94 @@
+"""
+Unit tests for adaptive retrieval depth.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.retrieval.adaptive import cut_at_gap, page_saturated
+from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
+
+
+def _hit(name, distance, chunk_index=0):
+    return {
+        "id": name,
+        "document": name,
+        "metadata": {"document_id": name, "chunk_index": chunk_index},
+        "distance": distance
+    }
+
+
+@pytest.fixture
+def usecase(
+    monkeypatch,
+    mock_vector_store,
+    mock_chat_service,
+    mock_embedding_service,
+    mock_conversation_repository,
+    mock_message_repository
+):
+    monkeypatch.setattr(settings, "TOP_K", 3)
+    monkeypatch.setattr(settings, "MMR_CANDIDATE_FACTOR", 1)
+    monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.5)
+    monkeypatch.setattr(settings, "ADAPTIVE_RETRIEVAL", True)
+    monkeypatch.setattr(settings, "ADAPTIVE_MAX_K", 6)
+    monkeypatch.setattr(settings, "ADAPTIVE_MIN_GAP", 0.1)
+    monkeypatch.setattr(settings, "RELEVANCE_SKIP_MARGIN", 0.2)
+    return ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q))
+    )
+
+
+def test_cut_at_gap_keeps_results_above_the_elbow():
+    """Test that a clear drop cuts the list and evenly spread scores are kept."""
+    strong = [_hit("a", 0.10), _hit("b", 0.45), _hit("c", 0.48), _hit("d", 0.50)]
+    even = [_hit("a", 0.10), _hit("b", 0.20), _hit("c", 0.30), _hit("d", 0.40)]
+
+    assert [r["id"] for r in cut_at_gap(strong, min_gap=0.1)] == ["a"]
+    assert [r["id"] for r in cut_at_gap(even, min_gap=0.1)] == ["a", "b", "c", "d"]
+    assert [r["id"] for r in cut_at_gap(strong, min_gap=0.1, min_k=2)] == ["a", "b", "c", "d"]
+
+
+def test_page_saturated_counts_merged_spans():
+    """Test that a merged span counts its chunks towards a full page."""
+    span = {**_hit("a", 0.2), "metadata": {"document_id": "a", "chunk_index": 0, "last_chunk_index": 1}}
+
+    assert page_saturated([span, _hit("b", 0.3)], k=3, threshold=0.5)
+    assert not page_saturated([span, _hit("b", 0.6)], k=3, threshold=0.5)
+    assert not page_saturated([_hit("b", 0.3)], k=3, threshold=0.5)
+
+
+@pytest.mark.asyncio
+async def test_full_page_is_searched_once_more(usecase, mock_vector_store):
+    """Test that a page of TOP_K relevant hits triggers one deeper search, then the elbow cut."""
+    first_page = [_hit("a", 0.10), _hit("b", 0.15), _hit("c", 0.20)]
+    mock_vector_store.search.side_effect = [
+        first_page,
+        first_page + [_hit("d", 0.25), _hit("e", 0.60), _hit("f", 0.65)],
+    ]
+
+    await usecase.execute("ventas")
+
+    assert [c.kwargs["top_k"] for c in mock_vector_store.search.call_args_list] == [3, 6]
+    decision = usecase.last_retrieval
+    assert decision.retried and decision.requested_k == 6
+    assert decision.chosen_k == 4
+    assert decision.best_similarity == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_irrelevant_results_skip_document_context(usecase, mock_vector_store, mock_chat_service):
+    """Test that hits far below MIN_RELEVANCE give the LLM no document context."""
+    mock_vector_store.search.return_value = [_hit("a", 0.75), _hit("b", 0.80)]
+
+    message, _ = await usecase.execute("clima de mañana")
+
+    assert usecase.last_retrieval.skipped and usecase.last_retrieval.chosen_k == 0
+    assert mock_vector_store.search.call_count == 1
+    assert mock_chat_service.generate_response.call_args.kwargs["context"] == []
+    assert message.sources is None
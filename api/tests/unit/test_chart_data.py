@@ -0,0 +1,150 @@
+"""
+Unit tests for the chart data use case.
+"""
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.application.usecases.get_chart_data import GetChartDataUseCase, build_chart
+from app.domain.entities.document import Document
+from app.domain.entities.table import TypedTable, TypedColumn, CURRENCY, DATE, NUMBER, TEXT
+from app.domain.exceptions import InvalidTableQueryError
+
+
+@pytest.fixture
+def sales_table():
+    """Typed sales table."""
+    return TypedTable(columns=[
+        TypedColumn("Fecha", DATE, np.array(
+            ["2024-01-05", "2024-01-20", "2024-02-03", "2024-04-11", "NaT"], dtype="datetime64[D]"
+        )),
+        TypedColumn("Cliente", TEXT, np.array(["Acme", "Beta", "Acme", "Beta", "Acme"])),
+        TypedColumn("Monto", CURRENCY, np.array([100.0, 50.0, 200.0, np.nan, 75.0]), unit="COP"),
+    ])
+
+
+@pytest.fixture
+def quarterly_table():
+    """Typed expense table with Año/Trimestre columns instead of a date."""
+    return TypedTable(columns=[
+        TypedColumn("Año", NUMBER, np.array([2025.0, 2023.0, 2024.0, 2023.0, 2024.0, 2023.0])),
+        TypedColumn("Trimestre", TEXT, np.array(["Q1", "Q4", "Q1", "Q2", "Q3", "Q1"])),
+        TypedColumn("Total", CURRENCY, np.array([10.0, 40.0, 5.0, 20.0, 30.0, 1.0]), unit="COP"),
+    ])
+
+
+def _chart(table, **kwargs):
+    return build_chart(table, document_id="doc-1", version="v1", **kwargs)
+
+
+@pytest.mark.unit
+class TestBuildChart:
+    """Test build_chart."""
+
+    def test_date_axis_by_month(self, sales_table):
+        chart = _chart(sales_table, measure="Monto", group_by="Fecha")
+
+        assert chart.granularity == "month"
+        assert chart.labels == ["2024-01", "2024-02"]
+        assert [(s.name, s.values) for s in chart.series] == [("sum", [150.0, 200.0])]
+        assert chart.unit == "COP"
+
+    def test_split_by_is_columnar(self, sales_table):
+        chart = _chart(sales_table, measure="Monto", group_by="Fecha", granularity="quarter", split_by="Cliente")
+
+        assert chart.labels == ["2024-T1"]
+        assert {s.name: s.values for s in chart.series} == {"Acme": [300.0], "Beta": [50.0]}
+
+    def test_text_axis_largest_first(self, sales_table):
+        chart = _chart(sales_table, measure="Monto", group_by="Cliente", metric="count")
+
+        assert chart.labels == ["Acme", "Beta"]
+        assert chart.series[0].values == [3.0, 1.0]
+        assert chart.unit is None
+
+    def test_truncates_points(self, sales_table):
+        chart = _chart(sales_table, measure="Monto", group_by="Fecha", granularity="day", max_points=2)
+
+        assert chart.labels == ["2024-01-05", "2024-01-20"]
+        assert chart.truncated
+
+    def test_period_columns_are_a_time_axis(self, quarterly_table):
+        by_year = _chart(quarterly_table, measure="Total", group_by="Año")
+        by_quarter = _chart(quarterly_table, measure="Total", group_by="Trimestre")
+        yearly = _chart(quarterly_table, measure="Total", group_by="Trimestre", granularity="year")
+
+        assert by_year.granularity == "year"
+        assert by_year.labels == ["2023", "2024", "2025"]
+        assert by_year.series[0].values == [61.0, 35.0, 10.0]
+        assert by_quarter.granularity == "quarter"
+        assert by_quarter.labels == ["2023-T1", "2023-T2", "2023-T4", "2024-T1", "2024-T3", "2025-T1"]
+        assert yearly.labels == by_year.labels
+        with pytest.raises(InvalidTableQueryError):
+            _chart(quarterly_table, measure="Total", group_by="Año", granularity="month")
+
+    def test_split_by_year_compares_quarters(self, quarterly_table):
+        chart = _chart(quarterly_table, measure="Total", group_by="Trimestre", split_by="Año")
+
+        assert chart.labels == ["T1", "T2", "T3", "T4"]
+        assert {s.name: s.values for s in chart.series} == {
+            "2023": [1.0, 20.0, None, 40.0],
+            "2024": [5.0, None, 30.0, None],
+            "2025": [10.0, None, None, None],
+        }
+
+    @pytest.mark.parametrize("kwargs", [
+        {"measure": "Cliente", "group_by": "Fecha"},
+        {"measure": "Monto", "group_by": "Cliente", "granularity": "month"},
+        {"measure": "Monto", "group_by": "Fecha", "granularity": "week"},
+        {"measure": "Monto", "group_by": "Región"},
+        {"measure": "Monto", "group_by": "Fecha", "metric": "median"},
+    ])
+    def test_invalid_options(self, sales_table, kwargs):
+        with pytest.raises(InvalidTableQueryError):
+            _chart(sales_table, **kwargs)
+
+
+@pytest.mark.unit
+class TestGetChartDataUseCase:
+    """Test GetChartDataUseCase."""
+
+    @pytest.fixture
+    def usecase(self, sales_table):
+        document_repository = AsyncMock()
+        document_repository.get_by_id.return_value = Document(
+            id="doc-1", filename="ventas.csv", file_type="csv", chunk_count=4, upload_date=datetime(2024, 5, 1)
+        )
+        ingestion_repository = AsyncMock()
+        ingestion_repository.get_job.return_value = MagicMock(content_hash="a" * 64)
+        table_store = AsyncMock()
+        table_store.get_table.return_value = sales_table
+        return GetChartDataUseCase(
+            document_repository=document_repository,
+            ingestion_repository=ingestion_repository,
+            table_store=table_store,
+            cache_size=2
+        )
+
+    @pytest.mark.asyncio
+    async def test_cached_per_version(self, usecase):
+        first = await usecase.execute("doc-1", measure="Monto", group_by="Fecha")
+        second = await usecase.execute("doc-1", measure="Monto", group_by="Fecha")
+
+        assert second is first
+        assert first.version == "a" * 16
+        usecase.table_store.get_table.assert_called_once_with("doc-1")
+
+        usecase.ingestion_repository.get_job.return_value = MagicMock(content_hash="b" * 64)
+        third = await usecase.execute("doc-1", measure="Monto", group_by="Fecha")
+        assert third is not first
+        assert usecase.table_store.get_table.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_document_or_table(self, usecase):
+        usecase.table_store.get_table.return_value = None
+        assert await usecase.execute("doc-1", measure="Monto", group_by="Fecha") is None
+
+        usecase.document_repository.get_by_id.return_value = None
+        assert await usecase.execute("doc-2", measure="Monto", group_by="Fecha") is None
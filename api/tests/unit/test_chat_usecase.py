@@ -5,7 +5,18 @@ import pytest
 from unittest.mock import AsyncMock
 
 from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
 from app.domain.entities.message import Message
+from app.domain.entities.search import SearchFilter
+
+
+def _hit(name, distance, chunk_index=0):
+    return {
+        "id": f"{name}_chunk_{chunk_index}",
+        "document": f"Fragmento {chunk_index} de {name}",
+        "metadata": {"document_id": name, "filename": f"{name}.pdf", "chunk_index": chunk_index},
+        "distance": distance
+    }
 
 
 @pytest.mark.unit
@@ -15,6 +26,7 @@ class TestChatUseCase:
     @pytest.fixture
     def usecase(
         self,
+        monkeypatch,
         mock_vector_store,
         mock_chat_service,
         mock_embedding_service,
@@ -22,12 +34,23 @@ class TestChatUseCase:
         mock_message_repository
     ):
         """Create ChatUseCase with mocked dependencies."""
+        monkeypatch.setattr(settings, "TOP_K", 3)
+        monkeypatch.setattr(settings, "MMR_CANDIDATE_FACTOR", 1)
+        monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.5)
+        monkeypatch.setattr(settings, "ADAPTIVE_RETRIEVAL", True)
+        monkeypatch.setattr(settings, "ADAPTIVE_MAX_K", 6)
+        monkeypatch.setattr(settings, "ADAPTIVE_MIN_GAP", 0.1)
+        monkeypatch.setattr(settings, "RELEVANCE_SKIP_MARGIN", 0.2)
+        monkeypatch.setattr(settings, "TEMPORAL_FILTERS", True)
+        monkeypatch.setattr(settings, "LEXICAL_MIN_COVERAGE", 0.5)
+        monkeypatch.setattr(settings, "LEXICAL_CONFIDENT_MARGIN", 2.0)
         return ChatUseCase(
             vector_store=mock_vector_store,
             llm_service=mock_chat_service,
             embedding_service=mock_embedding_service,
             conversation_repository=mock_conversation_repository,
-            message_repository=mock_message_repository
+            message_repository=mock_message_repository,
+            query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q))
         )
 
     @pytest.mark.asyncio
@@ -71,7 +94,8 @@ class TestChatUseCase:
     async def test_execute_no_results(
         self,
         usecase,
-        mock_vector_store
+        mock_vector_store,
+        mock_chat_service
     ):
         """Test chat with no search results."""
         # Mock empty search results
@@ -80,11 +104,11 @@ class TestChatUseCase:
         query = "Pregunta sin resultados"
         message, conversation_id = await usecase.execute(query)
 
-        # Should return a message saying no information was found
+        # The LLM answers without document context
         assert isinstance(message, Message)
         assert message.role == "assistant"
-        assert "No encontré información relevante" in message.content
-        assert message.sources is None or len(message.sources) == 0
+        assert mock_chat_service.generate_response.call_args.kwargs["context"] == []
+        assert message.sources is None
         assert conversation_id == "test-conversation-id"
 
     @pytest.mark.asyncio
@@ -94,7 +118,7 @@ class TestChatUseCase:
         mock_vector_store,
         mock_chat_service
     ):
-        """Test chat with multiple source chunks."""
+        """Test chat with multiple source chunks (non-adjacent, so not merged)."""
         # Mock multiple search results
         mock_vector_store.search.return_value = [
             {
@@ -109,12 +133,12 @@ class TestChatUseCase:
                 "distance": 0.1
             },
             {
-                "id": "doc1_chunk_1",
+                "id": "doc1_chunk_5",
                 "document": "Segundo fragmento de información",
                 "metadata": {
                     "document_id": "doc1",
                     "filename": "report1.pdf",
-                    "chunk_index": 1,
+                    "chunk_index": 5,
                     "file_type": "pdf"
                 },
                 "distance": 0.15
@@ -202,98 +226,108 @@ class TestChatUseCase:
         assert message.sources[0].content.endswith("...")
 
     @pytest.mark.asyncio
-    async def test_execute_conversational_greeting(
+    async def test_execute_skips_irrelevant_documents(
         self,
         usecase,
         mock_chat_service,
-        mock_embedding_service,
         mock_vector_store
     ):
-        """Test that conversational messages like 'hola' don't trigger RAG."""
-        # Mock classify_intent to return "conversational"
-        mock_chat_service.classify_intent.return_value = "conversational"
-        mock_chat_service.generate_conversational_response.return_value = "¡Hola! Soy tu asistente financiero. ¿En qué puedo ayudarte hoy?"
-
-        query = "hola"
-        message, conversation_id = await usecase.execute(query)
-
-        # Verify classification was called
-        mock_chat_service.classify_intent.assert_called_once()
+        """Test that hits below MIN_RELEVANCE - RELEVANCE_SKIP_MARGIN give the LLM no document context."""
+        mock_vector_store.search.return_value = [_hit("a", 0.75), _hit("b", 0.80)]
 
-        # Verify conversational response was generated
-        mock_chat_service.generate_conversational_response.assert_called_once()
+        message, _ = await usecase.execute("hola")
 
-        # Verify RAG was NOT executed
-        mock_embedding_service.generate_embedding.assert_not_called()
-        mock_vector_store.search.assert_not_called()
-        mock_chat_service.generate_response.assert_not_called()
-
-        # Verify response is conversational, not the "no documents found" message
-        assert isinstance(message, Message)
-        assert message.role == "assistant"
-        assert "No encontré información relevante en los documentos para responder tu pregunta. Por favor, asegúrate de haber subido documentos relacionados con tu consulta." not in message.content
-        assert "¡Hola!" in message.content or "asistente" in message.content.lower()
+        assert usecase.last_retrieval.skipped
+        assert mock_vector_store.search.call_count == 1
+        assert mock_chat_service.generate_response.call_args.kwargs["context"] == []
         assert message.sources is None
 
     @pytest.mark.asyncio
-    async def test_execute_conversational_followup(
+    async def test_execute_answers_followup_from_history(
         self,
         usecase,
         mock_chat_service,
         mock_message_repository,
-        mock_embedding_service,
         mock_vector_store
     ):
-        """Test that follow-up questions use conversational mode when appropriate."""
-        from app.domain.entities.message import Message
+        """Test that a follow-up without document hits is answered from the conversation history."""
         from datetime import datetime
 
-        # Mock conversation history with previous messages
-        mock_message_repository.get_by_conversation_id.return_value = [
-            Message(
-                id="msg-1",
-                role="user",
-                content="¿Cuánto gasté en enero?",
-                created_at=datetime(2024, 1, 15, 10, 30, 0),
-                sources=None
-            ),
-            Message(
-                id="msg-2",
-                role="assistant",
-                content="En enero gastaste $5,000 en total.",
-                created_at=datetime(2024, 1, 15, 10, 30, 5),
-                sources=[]
-            ),
-            Message(
-                id="msg-3",
-                role="user",
-                content="¿Puedes explicarme mejor?",
-                created_at=datetime(2024, 1, 15, 10, 31, 0),
-                sources=None
-            )
+        history = [
+            Message(id="msg-1", role="user", content="¿Cuánto gasté en enero?",
+                    created_at=datetime(2024, 1, 15, 10, 30, 0), sources=None),
+            Message(id="msg-2", role="assistant", content="En enero gastaste $5,000 en total.",
+                    created_at=datetime(2024, 1, 15, 10, 30, 5), sources=[]),
+            Message(id="msg-3", role="user", content="¿Puedes explicarme mejor?",
+                    created_at=datetime(2024, 1, 15, 10, 31, 0), sources=None),
         ]
+        mock_message_repository.get_by_conversation_id.side_effect = lambda _conversation_id: history
+        mock_vector_store.search.return_value = []
 
-        # Mock classify_intent to return "conversational" for follow-up
-        mock_chat_service.classify_intent.return_value = "conversational"
-        mock_chat_service.generate_conversational_response.return_value = "Claro, los $5,000 se distribuyeron en..."
+        message, _ = await usecase.execute("¿Puedes explicarme mejor?", conversation_id="existing-conv-id")
 
-        query = "¿Puedes explicarme mejor?"
-        message, conversation_id = await usecase.execute(query, conversation_id="existing-conv-id")
+        context = mock_chat_service.generate_response.call_args.kwargs["context"]
+        assert len(context) == 1
+        assert "USER: ¿Cuánto gasté en enero?" in context[0]
+        assert "ASSISTANT: En enero gastaste $5,000 en total." in context[0]
+        assert "¿Puedes explicarme mejor?" not in context[0]
+        assert message.sources is None
 
-        # Verify classification was called with history
-        mock_chat_service.classify_intent.assert_called_once()
-        call_args = mock_chat_service.classify_intent.call_args
-        history = call_args.kwargs["conversation_history"]
+    @pytest.mark.asyncio
+    async def test_execute_retries_saturated_page(
+        self,
+        usecase,
+        mock_vector_store
+    ):
+        """Test that a page of TOP_K relevant hits is searched again at ADAPTIVE_MAX_K."""
+        first_page = [_hit("a", 0.10), _hit("b", 0.15), _hit("c", 0.20)]
+        mock_vector_store.search.side_effect = [
+            first_page,
+            first_page + [_hit("d", 0.25), _hit("e", 0.60), _hit("f", 0.65)],
+        ]
+
+        message, _ = await usecase.execute("gastos principales")
 
-        # History should include previous messages but not the current one
-        assert len(history) >= 2
-        assert history[0]["content"] == "¿Cuánto gasté en enero?"
-        assert history[1]["content"] == "En enero gastaste $5,000 en total."
+        assert [c.kwargs["top_k"] for c in mock_vector_store.search.call_args_list] == [3, 6]
+        assert usecase.last_retrieval.retried
+        assert [s.document_id for s in message.sources] == ["a", "b", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_execute_short_circuits_on_confident_keyword_match(
+        self,
+        usecase,
+        mock_embedding_service,
+        mock_vector_store
+    ):
+        """Test that a confident keyword hit answers without embedding or vector search."""
+        hit = {
+            **_hit("invoices", None),
+            "document": "Factura FAC-2024-003 de Acme",
+            "coverage": 1.0,
+            "identifier_match": True,
+            "lexical_score": 9.0,
+        }
+        usecase.lexical_index = AsyncMock()
+        usecase.lexical_index.search.return_value = [hit, {**hit, "id": "other", "lexical_score": 1.0}]
+
+        message, _ = await usecase.execute("factura FAC-2024-003")
 
-        # Verify RAG was NOT executed
         mock_embedding_service.generate_embedding.assert_not_called()
         mock_vector_store.search.assert_not_called()
+        assert message.sources[0].document_id == "invoices"
+
+    @pytest.mark.asyncio
+    async def test_execute_falls_back_when_period_is_empty(
+        self,
+        usecase,
+        mock_vector_store
+    ):
+        """Test that a period with no tagged chunks is searched again without it."""
+        mock_vector_store.search.side_effect = [[], [_hit("report", 0.1)]]
+
+        message, _ = await usecase.execute("resumen de gastos de 2024", document_ids=["report"])
 
-        # Verify response is conversational
-        assert "No encontré información relevante en los documentos para responder tu pregunta. Por favor, asegúrate de haber subido documentos relacionados con tu consulta." not in message.content
-        assert message.sources is None
\ No newline at end of file
+        first, second = [c.kwargs["filters"] for c in mock_vector_store.search.call_args_list]
+        assert (first.period_from, first.period_to) == (202401, 202412)
+        assert second == SearchFilter(document_ids=["report"])
+        assert message.sources[0].document_id == "report"
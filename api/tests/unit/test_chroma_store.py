@@ -0,0 +1,241 @@
+"""
+Unit tests for ChromaVectorStore.
+"""
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.config import settings
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.entities.search import SearchFilter
+from app.domain.exceptions import VectorStoreWriteError
+from app.infrastructure.vector.chroma_store import ChromaVectorStore, POINTER_COLLECTION
+
+
+@pytest.mark.unit
+class TestChromaVectorStoreBatching:
+    """Test batched insertion in ChromaVectorStore."""
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        """Create a store backed by a mocked collection (no Chroma server)."""
+        monkeypatch.setattr(settings, "VECTOR_WRITE_BATCH_SIZE", 3)
+        monkeypatch.setattr(settings, "VECTOR_WRITE_CONCURRENCY", 2)
+
+        store = ChromaVectorStore.__new__(ChromaVectorStore)
+        store.client = MagicMock()
+        store.client.get_max_batch_size.return_value = 100
+        store.collection = MagicMock()
+        store._max_batch_size = None
+        return store
+
+    @staticmethod
+    def _payload(n):
+        chunks = [f"chunk {i}" for i in range(n)]
+        embeddings = [[float(i)] * 4 for i in range(n)]
+        metadata = [{"document_id": "doc", "chunk_index": i} for i in range(n)]
+        return chunks, embeddings, metadata
+
+    @pytest.mark.asyncio
+    async def test_add_chunks_splits_into_batches(self, store):
+        """Test that chunks are written in batches of the configured size."""
+        chunks, embeddings, metadata = self._payload(7)
+
+        await store.add_chunks("doc", chunks, embeddings, metadata)
+
+        calls = store.collection.upsert.call_args_list
+        assert [len(c.kwargs["ids"]) for c in calls] == [3, 3, 1]
+        all_ids = [i for c in calls for i in c.kwargs["ids"]]
+        assert all_ids == [f"doc_chunk_{i}" for i in range(7)]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_capped_by_server(self, store):
+        """Test that the server max batch size caps the configured size."""
+        store.client.get_max_batch_size.return_value = 2
+        chunks, embeddings, metadata = self._payload(5)
+
+        await store.add_chunks("doc", chunks, embeddings, metadata)
+
+        calls = store.collection.upsert.call_args_list
+        assert [len(c.kwargs["ids"]) for c in calls] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_failure_reports_committed_prefix(self, store, monkeypatch):
+        """Test that a failed batch reports the contiguous committed prefix."""
+        monkeypatch.setattr(settings, "VECTOR_WRITE_CONCURRENCY", 1)
+
+        def upsert(ids, **kwargs):
+            if "doc_chunk_6" in ids:
+                raise RuntimeError("payload too large")
+
+        store.collection.upsert.side_effect = upsert
+        chunks, embeddings, metadata = self._payload(10)
+
+        with pytest.raises(VectorStoreWriteError) as exc_info:
+            await store.add_chunks("doc", chunks, embeddings, metadata)
+
+        assert exc_info.value.committed_count == 6
+        # The batch after the failure is never sent
+        assert store.collection.upsert.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_resume_uses_absolute_chunk_ids(self, store):
+        """Test that resuming from start_index keeps chunk IDs stable."""
+        chunks, embeddings, metadata = self._payload(10)
+
+        await store.add_chunks("doc", chunks[6:], embeddings[6:], metadata[6:], start_index=6)
+
+        all_ids = [i for c in store.collection.upsert.call_args_list for i in c.kwargs["ids"]]
+        assert all_ids == [f"doc_chunk_{i}" for i in range(6, 10)]
+
+
+@pytest.mark.unit
+class TestChromaVectorStoreCollections:
+    """Test embedding spec and collection switching in ChromaVectorStore."""
+
+    @pytest.fixture
+    def store(self):
+        """Create a store backed by a mocked client (no Chroma server)."""
+        store = ChromaVectorStore.__new__(ChromaVectorStore)
+        store.client = MagicMock()
+        store.collection = MagicMock()
+        store.collection.name = "financial_documents"
+        store.collection.metadata = {"hnsw:space": "cosine", "description": "docs"}
+        return store
+
+    @pytest.mark.asyncio
+    async def test_legacy_spec_read_from_stored_vector(self, store):
+        """Test that collections without a recorded spec report the stored vector size."""
+        store.collection.get.return_value = {"embeddings": [[0.1] * 3072]}
+
+        spec = await store.get_embedding_spec()
+
+        assert spec == EmbeddingSpec(model=None, dimensions=3072)
+
+    @pytest.mark.asyncio
+    async def test_set_spec_keeps_distance_function(self, store):
+        """Test that recording the spec does not re-send the hnsw settings."""
+        collection = store.collection
+
+        await store.set_embedding_spec(EmbeddingSpec(model="text-embedding-3-large", dimensions=1024))
+
+        collection.modify.assert_called_once_with(metadata={
+            "description": "docs",
+            "embedding_dimensions": 1024,
+            "embedding_model": "text-embedding-3-large"
+        })
+
+    @pytest.mark.asyncio
+    async def test_activate_updates_pointer(self, store):
+        """Test that activation is a single update of the pointer collection."""
+        pointer = MagicMock()
+        store.client.get_or_create_collection.return_value = pointer
+
+        await store.activate()
+
+        store.client.get_or_create_collection.assert_called_once_with(name=POINTER_COLLECTION)
+        pointer.modify.assert_called_once_with(metadata={"active": "financial_documents"})
+
+
+@pytest.mark.unit
+class TestChromaVectorStoreFilters:
+    """Test translation of search filters into Chroma where clauses."""
+
+    def test_no_filter(self):
+        """Test that empty filters search the whole collection."""
+        assert ChromaVectorStore._where(None) is None
+        assert ChromaVectorStore._where(SearchFilter(document_ids=[])) is None
+
+    def test_single_condition(self):
+        """Test that a single condition is not wrapped in $and."""
+        assert ChromaVectorStore._where(SearchFilter(document_ids=["doc-1"])) == {"document_id": "doc-1"}
+
+    def test_combined_conditions(self):
+        """Test that several conditions are combined with $and."""
+        where = ChromaVectorStore._where(SearchFilter(
+            document_ids=["doc-1", "doc-2"],
+            file_types=[".XLSX"],
+            is_temporary=False,
+            ingest_year=2024
+        ))
+
+        assert where == {"$and": [
+            {"document_id": {"$in": ["doc-1", "doc-2"]}},
+            {"file_type": "xlsx"},
+            {"is_temporary": False},
+            {"ingest_year": 2024}
+        ]}
+
+    @pytest.mark.asyncio
+    async def test_search_passes_where(self):
+        """Test that search forwards the where clause to the collection query."""
+        store = ChromaVectorStore.__new__(ChromaVectorStore)
+        store.collection = MagicMock()
+        store.collection.query.return_value = {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+
+        await store.search([0.1, 0.2], top_k=3, filters=SearchFilter(is_temporary=True))
+
+        assert store.collection.query.call_args.kwargs["where"] == {"is_temporary": True}
+
+    @pytest.mark.asyncio
+    async def test_search_many_single_query_call(self):
+        """Test that several query embeddings are sent in one collection query."""
+        store = ChromaVectorStore.__new__(ChromaVectorStore)
+        store.collection = MagicMock()
+        store.collection.query.return_value = {
+            "ids": [["a"], ["b"]],
+            "documents": [["doc a"], ["doc b"]],
+            "metadatas": [[{}], [{}]],
+            "distances": [[0.1], [0.2]]
+        }
+
+        results = await store.search_many([[0.1], [0.2]], top_k=1)
+
+        store.collection.query.assert_called_once()
+        assert [[r["id"] for r in hits] for hits in results] == [["a"], ["b"]]
+
+
+@pytest.mark.unit
+class TestChromaVectorStoreLocalText:
+    """Test ChromaVectorStore with chunk texts kept in the local chunk store."""
+
+    @pytest.fixture
+    async def store(self, tmp_path):
+        """Create a store with a mocked collection and a real chunk store."""
+        from app.infrastructure.chunks.sqlite_chunk_store import SQLiteChunkStore
+
+        chunk_store = SQLiteChunkStore(str(tmp_path / "chunks.db"))
+        await chunk_store.add_chunks("doc", ["ventas del trimestre", "gastos de transporte"])
+        client = MagicMock()
+        client.get_max_batch_size.return_value = 100
+        store = ChromaVectorStore(collection_name="test", client=client, chunk_store=chunk_store)
+        store.collection = MagicMock()
+        yield store
+        chunk_store.close()
+
+    @pytest.mark.asyncio
+    async def test_add_chunks_sends_no_text(self, store):
+        """Test that only ids, vectors and metadata are written to Chroma."""
+        await store.add_chunks("doc", ["a"], [[0.1]], [{"document_id": "doc", "chunk_index": 0}])
+
+        assert "documents" not in store.collection.upsert.call_args.kwargs
+
+    @pytest.mark.asyncio
+    async def test_search_hydrates_text_locally(self, store):
+        """Test that results get their text from the chunk store, and legacy texts are copied there."""
+        store.collection.query.return_value = {
+            "ids": [["doc_chunk_1", "old_chunk_0"]],
+            "metadatas": [[{"document_id": "doc", "chunk_index": 1}, {"document_id": "old", "chunk_index": 0}]],
+            "distances": [[0.1, 0.2]]
+        }
+        store.collection.get.return_value = {
+            "ids": ["old_chunk_0"],
+            "documents": ["nómina de enero"],
+            "metadatas": [{"document_id": "old", "chunk_index": 0}]
+        }
+
+        results = await store.search([0.1], top_k=2)
+
+        assert "documents" not in store.collection.query.call_args.kwargs["include"]
+        assert [r["document"] for r in results] == ["gastos de transporte", "nómina de enero"]
+        assert store.collection.get.call_args.kwargs["ids"] == ["old_chunk_0"]
+        assert await store._chunk_store.get_chunks([("old", 0)]) == {("old", 0): "nómina de enero"}
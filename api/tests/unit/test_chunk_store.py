@@ -0,0 +1,139 @@
+"""
+Unit tests for the chunk text store and context expansion.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
+from app.infrastructure.chunks.sqlite_chunk_store import SQLiteChunkStore
+
+REPORT = [
+    "Resumen del informe anual de la empresa.",
+    "Las ventas crecieron 12% en el trimestre.",
+    "Los gastos de transporte subieron por el combustible.",
+    "La nómina se mantuvo estable durante el año.",
+    "Conclusiones y recomendaciones de la gerencia.",
+]
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = SQLiteChunkStore(str(tmp_path / "chunks.db"))
+    await store.add_chunks("report", REPORT)
+    await store.add_chunks("report", ["Ventas y gastos del trimestre."], kind="parent")
+    yield store
+    store.close()
+
+
+def _hit(chunk_index, distance, document_id="report", **metadata):
+    return {
+        "id": f"{document_id}_chunk_{chunk_index}",
+        "document": REPORT[chunk_index] if document_id == "report" else "adjunto",
+        "metadata": {"document_id": document_id, "chunk_index": chunk_index, **metadata},
+        "distance": distance
+    }
+
+
+def _usecase(chunk_store, mock_vector_store, mock_chat_service, mock_embedding_service,
+             mock_conversation_repository, mock_message_repository):
+    return ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q)),
+        chunk_store=chunk_store
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_reads_batches_and_deletes(store):
+    """Test batched reads by key and kind, upserts and deletion."""
+    found = await store.get_chunks([("report", 1), ("report", 3), ("report", 9), ("other", 0)])
+    assert found == {("report", 1): REPORT[1], ("report", 3): REPORT[3]}
+    assert await store.get_chunks([("report", 0)], kind="parent") == {("report", 0): "Ventas y gastos del trimestre."}
+
+    await store.add_chunks("report", ["Ventas revisadas."], start_index=1)
+    assert (await store.get_chunks([("report", 1)]))[("report", 1)] == "Ventas revisadas."
+
+    await store.delete_documents(["report"])
+    assert await store.get_chunks([("report", 0)]) == {}
+
+
+@pytest.mark.asyncio
+async def test_store_compresses_texts(store, monkeypatch):
+    """Test that long texts are stored compressed (zlib without zstandard) and short ones raw."""
+    from app.infrastructure.chunks import sqlite_chunk_store
+
+    monkeypatch.setattr(sqlite_chunk_store, "zstandard", None)
+    text = "Factura | Proveedor: AgroAndina | Total: $9.350.000\n" * 20
+    await store.add_chunks("invoices", [text, "corto"])
+
+    stored = dict(store._ensure_open().execute(
+        "SELECT idx, text FROM chunk_texts WHERE document_id = 'invoices'"
+    ).fetchall())
+    assert stored[0][:1] == b"\x01" and len(stored[0]) < len(text) / 5
+    assert stored[1] == b"\x00corto"
+    assert await store.get_chunks([("invoices", 0), ("invoices", 1)]) == {
+        ("invoices", 0): text, ("invoices", 1): "corto"
+    }
+
+
+@pytest.mark.asyncio
+async def test_chat_expands_hits_to_neighbors(
+    monkeypatch,
+    store,
+    mock_vector_store,
+    mock_chat_service,
+    mock_embedding_service,
+    mock_conversation_repository,
+    mock_message_repository
+):
+    """Test that close hits share one neighbour window and unstored hits keep their text."""
+    monkeypatch.setattr(settings, "CONTEXT_EXPANSION", "neighbors")
+    monkeypatch.setattr(settings, "CONTEXT_NEIGHBORS", 1)
+    monkeypatch.setattr(settings, "MMR_CANDIDATE_FACTOR", 1)
+    monkeypatch.setattr(settings, "MERGE_ADJACENT_CHUNKS", False)
+    monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.0)
+    monkeypatch.setattr(settings, "ADAPTIVE_RETRIEVAL", False)
+    mock_vector_store.search.return_value = [_hit(1, 0.1), _hit(0, 0.2, document_id="attachment"), _hit(3, 0.3)]
+
+    usecase = _usecase(store, mock_vector_store, mock_chat_service, mock_embedding_service,
+                       mock_conversation_repository, mock_message_repository)
+    message, _ = await usecase.execute("ventas")
+
+    context = mock_chat_service.generate_response.call_args.kwargs["context"]
+    # Windows [0, 2] and [2, 4] touch: one read, one span owned by the best hit
+    assert context == ["\n".join(REPORT), "adjunto"]
+    assert [s.chunk_index for s in message.sources] == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_chat_expands_children_to_parents(
+    monkeypatch,
+    store,
+    mock_vector_store,
+    mock_chat_service,
+    mock_embedding_service,
+    mock_conversation_repository,
+    mock_message_repository
+):
+    """Test that children of one parent become a single parent window."""
+    monkeypatch.setattr(settings, "CONTEXT_EXPANSION", "parent")
+    monkeypatch.setattr(settings, "MMR_CANDIDATE_FACTOR", 1)
+    monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.0)
+    monkeypatch.setattr(settings, "ADAPTIVE_RETRIEVAL", False)
+    mock_vector_store.search.return_value = [
+        _hit(1, 0.1, parent_index=0),
+        _hit(2, 0.2, parent_index=0),
+        _hit(4, 0.3, parent_index=7),
+    ]
+
+    usecase = _usecase(store, mock_vector_store, mock_chat_service, mock_embedding_service,
+                       mock_conversation_repository, mock_message_repository)
+    await usecase.execute("ventas")
+
+    context = mock_chat_service.generate_response.call_args.kwargs["context"]
+    assert context == ["Ventas y gastos del trimestre.", REPORT[4]]
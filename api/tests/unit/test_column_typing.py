@@ -0,0 +1,59 @@
+"""
+Unit tests for typing of locale-formatted tabular columns and the table store.
+"""
+import numpy as np
+import pytest
+
+from app.domain.entities.table import CURRENCY, DATE, NUMBER, PERCENT, TEXT
+from app.infrastructure.document_processor import DocumentProcessor
+from app.infrastructure.tabular.npz_table_store import NpzTableStore
+
+CSV = """Fecha,Concepto,Monto (COP),IVA,Margen,Total,Unidades,Precio Promedio (COP/kg)
+2024-01-05,Compra suministros,4.500.000,"$ 855.000",12%,"9.350.000,50 COP",1.5,"12.500"
+15/02/2024,Pago servicios,800,,"12,5%",N/A,2,"13.200"
+2024-03-10,Transporte,1.200,"$ 10",1%,"4.500 COP",3.25,"11.900"
+""".encode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_colombian_formats_are_typed():
+    """Test thousands/decimal separators, currencies, percentages and dates per column."""
+    table = await DocumentProcessor.extract_typed_table(CSV, "csv")
+    columns = {c.name: c for c in table.columns}
+
+    assert table.row_count == 3
+    assert columns["Fecha"].kind == DATE
+    assert list(columns["Fecha"].values) == list(np.array(["2024-01-05", "2024-02-15", "2024-03-10"], dtype="datetime64[D]"))
+    assert columns["Concepto"].kind == TEXT
+    assert columns["Monto (COP)"].kind == CURRENCY and columns["Monto (COP)"].unit == "COP"
+    np.testing.assert_array_equal(columns["Monto (COP)"].values, [4_500_000, 800, 1_200])
+    assert columns["IVA"].unit == "COP"
+    np.testing.assert_array_equal(columns["IVA"].values, [855_000, np.nan, 10])
+    assert columns["Margen"].kind == PERCENT
+    np.testing.assert_array_equal(columns["Margen"].values, [12, 12.5, 1])
+    # With "N/A", only 2 of 3 values parse (below MIN_PARSED_FRACTION): the column stays text
+    assert columns["Total"].kind == TEXT
+    # "1.5" and "3.25" only fit the US convention
+    assert columns["Unidades"].kind == NUMBER
+    np.testing.assert_array_equal(columns["Unidades"].values, [1.5, 2, 3.25])
+    # A per-unit header keeps its currency
+    price = columns["Precio Promedio (COP/kg)"]
+    assert price.kind == CURRENCY and price.unit == "COP"
+    np.testing.assert_array_equal(price.values, [12_500, 13_200, 11_900])
+
+
+@pytest.mark.asyncio
+async def test_table_store_round_trip(tmp_path):
+    """Test that typed tables are stored without pickling and read back intact."""
+    store = NpzTableStore(str(tmp_path / "tables"))
+    table = await DocumentProcessor.extract_typed_table(CSV, "csv")
+
+    await store.save_table("doc-1", table)
+    loaded = await store.get_table("doc-1")
+
+    assert [(c.name, c.kind, c.unit) for c in loaded.columns] == [(c.name, c.kind, c.unit) for c in table.columns]
+    np.testing.assert_array_equal(loaded.column("Monto (COP)").values, table.column("Monto (COP)").values)
+    assert loaded.column("Concepto").values[0] == "Compra suministros"
+
+    await store.delete_documents(["doc-1"])
+    assert await store.get_table("doc-1") is None
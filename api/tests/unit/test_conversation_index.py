@@ -0,0 +1,82 @@
+"""
+Unit tests for InMemoryConversationIndex.
+"""
+import pytest
+
+from app.application.usecases.chat import ChatUseCase
+from app.domain.entities.search import SearchFilter
+from app.infrastructure.vector.conversation_index import InMemoryConversationIndex
+
+
+def _metadata(document_id, count):
+    return [{"document_id": document_id, "chunk_index": i, "filename": f"{document_id}.pdf"} for i in range(count)]
+
+
+@pytest.fixture
+async def index():
+    """Index with two chunks of one attachment in conversation 'conv-1'."""
+    index = InMemoryConversationIndex()
+    await index.add_chunks(
+        "conv-1",
+        ["ventas enero", "gastos marzo"],
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        _metadata("doc-1", 2)
+    )
+    return index
+
+
+@pytest.mark.asyncio
+async def test_search_orders_by_distance(index):
+    """Test that results are ordered by cosine distance."""
+    results = await index.search("conv-1", [0.2, 0.9, 0.0], top_k=5)
+
+    assert [r["document"] for r in results] == ["gastos marzo", "ventas enero"]
+    assert results[0]["id"] == "doc-1_chunk_1"
+    assert results[0]["distance"] < results[1]["distance"]
+
+
+@pytest.mark.asyncio
+async def test_search_is_scoped_to_conversation(index):
+    """Test that other conversations do not see the attachment."""
+    assert await index.search("conv-2", [1.0, 0.0, 0.0]) == []
+
+
+@pytest.mark.asyncio
+async def test_delete_document_and_drop(index):
+    """Test removing a document's chunks and dropping the whole index."""
+    await index.add_chunks("conv-1", ["proveedores"], [[0.0, 0.0, 1.0]], _metadata("doc-2", 1))
+
+    await index.delete_document("conv-1", "doc-1")
+    results = await index.search("conv-1", [1.0, 0.0, 0.0], top_k=5)
+    assert [r["metadata"]["document_id"] for r in results] == ["doc-2"]
+
+    await index.drop("conv-1")
+    assert await index.search("conv-1", [0.0, 0.0, 1.0]) == []
+
+
+@pytest.mark.asyncio
+async def test_search_with_filter(index):
+    """Test that chunks outside the filter are not returned."""
+    await index.add_chunks("conv-1", ["proveedores"], [[0.0, 0.0, 1.0]], _metadata("doc-2", 1))
+
+    results = await index.search("conv-1", [1.0, 0.0, 0.0], top_k=5, filters=SearchFilter(document_ids=["doc-2"]))
+
+    assert [r["document"] for r in results] == ["proveedores"]
+
+
+@pytest.mark.asyncio
+async def test_evict_idle(index):
+    """Test that idle indexes are freed."""
+    assert await index.evict_idle(3600) == 0
+    assert await index.evict_idle(-1) == 1
+    assert await index.search("conv-1", [1.0, 0.0, 0.0]) == []
+
+
+def test_merge_results_by_distance():
+    """Test that chat merges shared and attachment results by distance."""
+    global_results = [{"id": "g1", "distance": 0.3}, {"id": "g2", "distance": 0.6}]
+    attachment_results = [{"id": "a1", "distance": 0.1}, {"id": "a2", "distance": 0.5}]
+
+    merged = ChatUseCase._merge_results(global_results, attachment_results, top_k=3)
+
+    assert [r["id"] for r in merged] == ["a1", "g1", "a2"]
@@ -0,0 +1,99 @@
+"""
+Unit tests for the document centroid index and two-stage retrieval.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
+from app.domain.entities.search import SearchFilter
+from app.infrastructure.vector.document_index import NumpyDocumentIndex
+
+
+def _meta(file_type="pdf"):
+    return {"document_id": "ignored", "chunk_index": 3, "file_type": file_type, "is_temporary": False}
+
+
+@pytest.fixture
+async def index(tmp_path):
+    index = NumpyDocumentIndex(str(tmp_path / "documents.db"))
+    await index.add_embeddings("main", "ventas", [[1.0, 0.1, 0.0], [0.9, 0.0, 0.1]], _meta())
+    await index.add_embeddings("main", "gastos", [[0.0, 1.0, 0.0]], _meta(file_type="csv"))
+    await index.add_embeddings("main", "nomina", [[0.0, 0.0, 1.0]], _meta())
+    yield index
+    index.close()
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_documents_per_query(index):
+    """Test that each query gets the documents with the closest centroids first."""
+    results = await index.search("main", [[1.0, 0.0, 0.0], [0.1, 0.0, 1.0]], top_k=2)
+
+    assert results[0][0] == "ventas"
+    assert results[1][0] == "nomina"
+    assert all(len(ids) == 2 for ids in results)
+    assert await index.count("main") == 3
+    assert await index.count("other") == 0
+
+
+@pytest.mark.asyncio
+async def test_search_filters_on_document_metadata(index):
+    """Test that document-level metadata is matched by SearchFilter."""
+    results = await index.search("main", [[1.0, 0.0, 0.0]], top_k=5, filters=SearchFilter(file_types=["csv"]))
+
+    assert results == [["gastos"]]
+
+
+@pytest.mark.asyncio
+async def test_batches_fold_into_centroid_and_persist(index, tmp_path):
+    """Test that later batches move the centroid, deletes apply and the index persists."""
+    await index.add_embeddings("main", "gastos", [[1.0, 0.0, 0.0]] * 5, _meta(file_type="csv"))
+    index.close()
+
+    reopened = NumpyDocumentIndex(str(tmp_path / "documents.db"))
+    assert await reopened.search("main", [[1.0, 0.0, 0.0]], top_k=2) == [["ventas", "gastos"]]
+
+    await reopened.delete_documents(["gastos", "ventas"])
+    assert await reopened.search("main", [[1.0, 0.0, 0.0]], top_k=5) == [["nomina"]]
+    reopened.close()
+
+
+@pytest.fixture
+def usecase(index, mock_vector_store, mock_chat_service, mock_embedding_service,
+            mock_conversation_repository, mock_message_repository):
+    mock_vector_store.collection_name = "main"
+    mock_embedding_service.generate_embedding.return_value = [1.0, 0.0, 0.0]
+    return ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q)),
+        document_index=index
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_searches_chunks_of_closest_documents(monkeypatch, usecase, mock_vector_store):
+    """Test that large corpora are searched in two stages."""
+    monkeypatch.setattr(settings, "HIERARCHICAL_MIN_DOCUMENTS", 2)
+    monkeypatch.setattr(settings, "HIERARCHICAL_TOP_DOCUMENTS", 1)
+
+    await usecase.execute("¿Cuánto vendimos?")
+
+    filters = mock_vector_store.search.call_args.kwargs["filters"]
+    assert filters.document_ids == ["ventas"]
+
+
+@pytest.mark.asyncio
+async def test_chat_keeps_flat_search_on_small_corpus(monkeypatch, usecase, mock_vector_store):
+    """Test that corpora below HIERARCHICAL_MIN_DOCUMENTS and scoped searches are not narrowed."""
+    monkeypatch.setattr(settings, "HIERARCHICAL_MIN_DOCUMENTS", 10)
+    await usecase.execute("¿Cuánto vendimos?")
+    assert mock_vector_store.search.call_args.kwargs["filters"] is None
+
+    monkeypatch.setattr(settings, "HIERARCHICAL_MIN_DOCUMENTS", 2)
+    monkeypatch.setattr(settings, "HIERARCHICAL_TOP_DOCUMENTS", 1)
+    await usecase.execute("¿Cuánto vendimos?", document_ids=["nomina"])
+    assert mock_vector_store.search.call_args.kwargs["filters"].document_ids == ["nomina"]
@@ -0,0 +1,102 @@
+"""
+Unit tests for the staged ingestion pipeline.
+"""
+import asyncio
+import pytest
+
+from app.application.ingestion.pipeline import Pipeline, Stage
+
+
+@pytest.mark.unit
+class TestPipeline:
+    """Test Pipeline class."""
+
+    @pytest.mark.asyncio
+    async def test_items_flow_through_all_stages(self):
+        """Test that every item reaches the last stage."""
+        results = []
+
+        async def double(item, emit):
+            await emit(item * 2)
+
+        async def split(item, emit):
+            await emit(item)
+            await emit(item + 1)
+
+        async def collect(item, emit):
+            results.append(item)
+            await emit(item)
+
+        pipeline = Pipeline(
+            stages=[
+                Stage(name="double", worker=double),
+                Stage(name="split", worker=split, concurrency=2),
+                Stage(name="collect", worker=collect, concurrency=3),
+            ],
+            queue_size=2
+        )
+        metrics = await pipeline.run([1, 2, 3])
+
+        assert sorted(results) == [2, 3, 4, 5, 6, 7]
+        by_name = {s.name: s for s in metrics.stages}
+        assert by_name["double"].items_in == 3
+        assert by_name["split"].items_out == 6
+        assert by_name["collect"].items_in == 6
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_is_bounded(self):
+        """Test that a slow stage applies backpressure upstream."""
+        async def produce(item, emit):
+            for i in range(20):
+                await emit(i)
+
+        async def slow(item, emit):
+            await asyncio.sleep(0.001)
+            await emit(item)
+
+        pipeline = Pipeline(
+            stages=[
+                Stage(name="produce", worker=produce),
+                Stage(name="slow", worker=slow),
+            ],
+            queue_size=3
+        )
+        metrics = await pipeline.run([None])
+
+        assert metrics.stages[1].items_in == 20
+        assert metrics.stages[1].max_queue_depth <= 3
+
+    @pytest.mark.asyncio
+    async def test_stage_error_cancels_pipeline(self):
+        """Test that a failing stage stops the pipeline and re-raises."""
+        async def produce(item, emit):
+            for i in range(100):
+                await emit(i)
+
+        async def fail(item, emit):
+            if item == 5:
+                raise ValueError("boom")
+            await emit(item)
+
+        pipeline = Pipeline(
+            stages=[
+                Stage(name="produce", worker=produce),
+                Stage(name="fail", worker=fail, concurrency=2),
+            ],
+            queue_size=2
+        )
+
+        with pytest.raises(ValueError, match="boom"):
+            await pipeline.run([None])
+
+    def test_metrics_serialization(self):
+        """Test that metrics serialize with every stage."""
+        async def noop(item, emit):
+            await emit(item)
+
+        pipeline = Pipeline(stages=[Stage(name="a", worker=noop), Stage(name="b", worker=noop)])
+        data = pipeline.metrics.to_dict()
+
+        assert data["queue_size"] == 4
+        assert [s["name"] for s in data["stages"]] == ["a", "b"]
+        assert {"throughput", "queue_depth", "max_queue_depth"} <= set(data["stages"][0])
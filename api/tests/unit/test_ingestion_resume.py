@@ -0,0 +1,150 @@
+"""
+Unit tests for ingestion checkpointing and resume.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.usecases.upload_document import UploadDocumentUseCase
+from app.core.config import settings
+from app.domain.exceptions import IngestionError, VectorStoreWriteError
+from app.infrastructure.repositories.document_repository import DocumentRepository
+from app.infrastructure.repositories.ingestion_repository import IngestionRepository
+from app.infrastructure.vector.document_index import NumpyDocumentIndex
+
+
+CHUNKS = [f"chunk {i}" for i in range(10)]
+
+
+@pytest.fixture
+def processor():
+    """Mock document processor producing ten chunks."""
+    processor = AsyncMock()
+    processor.extract_text.return_value = "Texto del documento."
+    processor.chunk_text.return_value = CHUNKS
+    return processor
+
+
+@pytest.fixture
+def embedding_service():
+    """Mock embedding service that fails on the batch containing chunk 6."""
+    service = AsyncMock()
+    service.fail_on = "chunk 6"
+
+    async def generate_embeddings(texts):
+        if service.fail_on in texts:
+            raise RuntimeError("rate limited")
+        return [[0.1] * 4 for _ in texts]
+
+    service.generate_embeddings.side_effect = generate_embeddings
+    return service
+
+
+@pytest.fixture
+def usecase(sqlite_client, mock_vector_store, embedding_service, processor, monkeypatch):
+    """Create UploadDocumentUseCase backed by SQLite repositories."""
+    monkeypatch.setattr(settings, "INGEST_EMBED_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "INGEST_EMBED_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "INGEST_WRITE_CONCURRENCY", 1)
+    return UploadDocumentUseCase(
+        document_repository=DocumentRepository(sqlite_client),
+        vector_store=mock_vector_store,
+        embedding_service=embedding_service,
+        document_processor=processor,
+        ingestion_repository=IngestionRepository(sqlite_client)
+    )
+
+
+@pytest.mark.asyncio
+async def test_failure_records_committed_batches(usecase, sqlite_client):
+    """Test that batches written before a failure are checkpointed."""
+    with pytest.raises(IngestionError) as exc_info:
+        await usecase.execute(filename="big.pdf", file_content=b"%PDF-1", file_type="pdf")
+
+    job = await IngestionRepository(sqlite_client).get_job(exc_info.value.document_id)
+
+    assert job.status == "failed"
+    assert "rate limited" in job.error
+    # Batches still in flight when the pipeline is cancelled are not counted
+    committed = job.committed_chunks
+    assert 2 <= committed <= 6
+    assert job.written_ranges() == [(0, committed)]
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_committed_batches(usecase, sqlite_client, embedding_service, mock_vector_store):
+    """Test that resume only embeds and writes the missing chunk ranges."""
+    with pytest.raises(IngestionError) as exc_info:
+        await usecase.execute(filename="big.pdf", file_content=b"%PDF-1", file_type="pdf")
+    document_id = exc_info.value.document_id
+    committed = (await IngestionRepository(sqlite_client).get_job(document_id)).committed_chunks
+
+    embedding_service.fail_on = None
+    embedding_service.generate_embeddings.reset_mock()
+    mock_vector_store.add_chunks.reset_mock()
+
+    document = await usecase.resume(document_id, b"%PDF-1")
+
+    embedded = [t for c in embedding_service.generate_embeddings.call_args_list for t in c.args[0]]
+    assert embedded == CHUNKS[committed:]
+    starts = [c.kwargs["start_index"] for c in mock_vector_store.add_chunks.call_args_list]
+    assert starts == list(range(committed, 10, 2))
+
+    assert document.chunk_count == 10
+    job = await IngestionRepository(sqlite_client).get_job(document_id)
+    assert job.status == "completed"
+    assert job.total_chunks == 10
+    assert job.written_ranges() == [(0, 10)]
+
+    stored = await DocumentRepository(sqlite_client).get_by_id(document_id)
+    assert stored.chunk_count == 10
+
+
+@pytest.mark.asyncio
+async def test_partial_write_folds_committed_prefix_once(usecase, sqlite_client, embedding_service, mock_vector_store, tmp_path):
+    """Test that every stored chunk is folded into the document centroid exactly once across a resume."""
+    embedding_service.fail_on = None
+    mock_vector_store.collection_name = "main"
+    usecase.document_index = NumpyDocumentIndex(str(tmp_path / "documents.db"))
+
+    async def add_chunks(**kwargs):
+        if kwargs["start_index"] == 4 and not add_chunks.failed:
+            add_chunks.failed = True
+            raise VectorStoreWriteError("timeout", committed_count=5)
+    add_chunks.failed = False
+    mock_vector_store.add_chunks.side_effect = add_chunks
+
+    with pytest.raises(IngestionError) as exc_info:
+        await usecase.execute(filename="big.pdf", file_content=b"%PDF-1", file_type="pdf")
+    document_id = exc_info.value.document_id
+
+    def folded():
+        return usecase.document_index._ensure_open().execute(
+            "SELECT chunk_count, folded_ranges FROM centroids WHERE document_id = ?", (document_id,)
+        ).fetchone()
+
+    assert folded() == (5, "[[0, 5]]")
+
+    await usecase.resume(document_id, b"%PDF-1")
+    assert folded() == (10, "[[0, 10]]")
+
+    # Folding a batch again leaves the centroid unchanged
+    await usecase.document_index.add_embeddings("main", document_id, [[0.1] * 4] * 2, {}, start_index=4)
+    assert folded() == (10, "[[0, 10]]")
+    usecase.document_index.close()
+
+
+@pytest.mark.asyncio
+async def test_resume_rejects_different_content(usecase):
+    """Test that resume refuses a file that differs from the original."""
+    with pytest.raises(IngestionError) as exc_info:
+        await usecase.execute(filename="big.pdf", file_content=b"%PDF-1", file_type="pdf")
+
+    with pytest.raises(ValueError, match="does not match"):
+        await usecase.resume(exc_info.value.document_id, b"%PDF-2")
+
+
+@pytest.mark.asyncio
+async def test_resume_unknown_document(usecase):
+    """Test that resume fails for a document without ingestion progress."""
+    with pytest.raises(ValueError, match="No ingestion found"):
+        await usecase.resume("missing-id", b"%PDF-1")
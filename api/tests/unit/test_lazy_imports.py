@@ -0,0 +1,41 @@
+"""
+Unit tests for the cold-start import footprint.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.import_time_benchmark import LAZY_MODULES
+
+API_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _modules_after_import(statement: str) -> set:
+    result = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print('\\n'.join(sys.modules))"],
+        cwd=API_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return {name.split(".")[0] for name in result.stdout.split()}
+
+
+def test_app_import_does_not_load_heavy_dependencies():
+    """Test that importing the API loads none of the heavy dependencies."""
+    modules = _modules_after_import("import app.main")
+
+    assert not modules & set(LAZY_MODULES)
+
+
+def test_only_configured_database_driver_is_imported():
+    """Test that the SQLite configuration does not import the PostgreSQL driver, and vice versa."""
+    sqlite = _modules_after_import(
+        "import os; os.environ['DATABASE_URL'] = 'sqlite:///:memory:'; import app.core.container"
+    )
+    postgres = _modules_after_import(
+        "import os; os.environ['DATABASE_URL'] = 'postgresql://localhost/db'; import app.core.container"
+    )
+
+    assert "aiosqlite" in sqlite and "asyncpg" not in sqlite
+    assert "asyncpg" in postgres and "aiosqlite" not in postgres
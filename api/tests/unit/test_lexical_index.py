@@ -0,0 +1,120 @@
+"""
+Unit tests for the BM25 keyword index and hybrid retrieval.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
+from app.domain.entities.search import SearchFilter
+from app.infrastructure.lexical.bm25_index import SQLiteBM25Index
+from app.infrastructure.lexical.tokenizer import tokenize
+
+INVOICES = [
+    "Factura FAC-2024-001 | Proveedor: AgroAndina S.A.S. | Total: $9.350.000",
+    "Factura FAC-2024-002 | Proveedor: Lácteos del Valle | Total: $1.200.000",
+    "Factura FAC-2024-003 | Proveedor: Transportes Rápidos | Total: $4.500.000,50",
+]
+
+
+def _metadata(document_id, count, file_type="csv"):
+    return [{"document_id": document_id, "chunk_index": i, "file_type": file_type} for i in range(count)]
+
+
+@pytest.fixture
+async def index(tmp_path):
+    index = SQLiteBM25Index(str(tmp_path / "lexical.db"))
+    await index.add_chunks("invoices", INVOICES, _metadata("invoices", 3))
+    await index.add_chunks(
+        "report",
+        ["Informe de gestión: las ventas del año crecieron", "Gastos de transporte por región"],
+        _metadata("report", 2, file_type="pdf")
+    )
+    yield index
+    index.close()
+
+
+def test_tokenize_spanish_financial_text():
+    """Test accent folding, number canonicalization, acronyms, codes, stopwords and stemming."""
+    assert tokenize("Facturación de AgroAndina S.A.S. por $9.350.000") == [
+        "facturacion", "agroandin", "sas", "9350000"
+    ]
+    assert tokenize("FAC-2024-001") == ["fac2024001", "fac", "2024", "001"]
+    assert tokenize("9,350,000 y 4.500.000,50") == ["9350000", "4500000"]
+    assert tokenize("Proveedores, proveedor, facturas y factura") == ["proveedor", "proveedor", "factur", "factur"]
+
+
+@pytest.mark.asyncio
+async def test_search_exact_tokens(index):
+    """Test that amounts and supplier names match regardless of formatting and accents."""
+    by_amount = await index.search("¿Qué factura fue por 9350000?")
+    by_name = await index.search("lacteos del valle")
+
+    assert by_amount[0]["id"] == "invoices_chunk_0"
+    assert by_amount[0]["distance"] is None
+    assert by_amount[0]["identifier_match"]
+    assert by_name[0]["id"] == "invoices_chunk_1"
+    assert by_name[0]["coverage"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_search_filters_and_stopword_only_query(index):
+    """Test metadata filters and that a query without terms returns nothing."""
+    results = await index.search("transporte", filters=SearchFilter(file_types=["pdf"]))
+
+    assert [r["id"] for r in results] == ["report_chunk_1"]
+    assert await index.search("de la por") == []
+
+
+@pytest.mark.asyncio
+async def test_upsert_and_delete_are_incremental(index, tmp_path):
+    """Test that re-indexing replaces chunks, deletes remove them and the index persists."""
+    await index.add_chunks("invoices", ["Nota crédito NC-7"], _metadata("invoices", 1))
+    index.close()
+
+    reopened = SQLiteBM25Index(str(tmp_path / "lexical.db"))
+    assert await reopened.search("agroandina") == []
+    assert [r["id"] for r in await reopened.search("NC-7")] == ["invoices_chunk_0"]
+
+    await reopened.delete_documents(["invoices"])
+    assert await reopened.search("NC-7") == []
+    assert len(await reopened.search("ventas")) == 1
+    reopened.close()
+
+
+@pytest.fixture
+def usecase(index, mock_vector_store, mock_chat_service, mock_embedding_service,
+            mock_conversation_repository, mock_message_repository):
+    return ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q)),
+        lexical_index=index
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_skips_embedding_on_confident_keyword_match(usecase, mock_embedding_service, mock_vector_store):
+    """Test that a query answered by an exact identifier skips the embedding call."""
+    message, _ = await usecase.execute("factura FAC-2024-003")
+
+    mock_embedding_service.generate_embedding.assert_not_called()
+    mock_vector_store.search.assert_not_called()
+    assert message.sources[0].content.startswith("Factura FAC-2024-003")
+
+
+@pytest.mark.asyncio
+async def test_chat_fuses_keyword_and_vector_results(monkeypatch, usecase, mock_embedding_service, mock_vector_store):
+    """Test that ambiguous queries are embedded and keyword hits are fused with vector hits."""
+    monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.0)
+    mock_vector_store.search.return_value = [
+        {"id": "report_chunk_0", "document": "Informe", "metadata": {"document_id": "report"}, "distance": 0.2}
+    ]
+
+    message, _ = await usecase.execute("gastos de transporte")
+
+    mock_embedding_service.generate_embedding.assert_called_once()
+    assert {s.document_id for s in message.sources} == {"report", "invoices"}
@@ -0,0 +1,252 @@
+"""
+Unit tests for NumpyVectorStore.
+"""
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.domain.entities.search import SearchFilter
+from app.infrastructure.vector.numpy_store import NumpyVectorStore
+
+
+def _metadata(document_id, count, start=0):
+    return [{"document_id": document_id, "chunk_index": start + i} for i in range(count)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty store in a temporary directory."""
+    store = NumpyVectorStore(str(tmp_path))
+    yield store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_search_orders_by_cosine_distance(store):
+    """Test that search returns the closest chunks first with their payload."""
+    await store.add_chunks(
+        "doc-1",
+        ["ventas", "gastos", "proveedores"],
+        [[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 1.0]],
+        _metadata("doc-1", 3)
+    )
+
+    results = await store.search([0.1, 1.0, 0.0], top_k=2)
+
+    assert [r["id"] for r in results] == ["doc-1_chunk_1", "doc-1_chunk_0"]
+    assert results[0]["document"] == "gastos"
+    assert results[0]["metadata"] == {"document_id": "doc-1", "chunk_index": 1}
+    assert results[0]["distance"] == pytest.approx(1 - 1 / np.sqrt(1.01), abs=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_search_scans_in_blocks(store, monkeypatch):
+    """Test that block-wise scanning finds the same top-k as a full scan."""
+    monkeypatch.setattr(settings, "NUMPY_SEARCH_BLOCK_ROWS", 7)
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((50, 8)).astype(np.float32)
+    await store.add_chunks("doc-1", [str(i) for i in range(50)], vectors.tolist(), _metadata("doc-1", 50))
+
+    query = rng.standard_normal(8).astype(np.float32)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ query))[:5]
+
+    results = await store.search(query.tolist(), top_k=5)
+
+    assert [r["document"] for r in results] == [str(i) for i in expected]
+
+
+@pytest.mark.asyncio
+async def test_upsert_and_delete_documents(store):
+    """Test that rewritten chunks replace old ones and deleted documents disappear."""
+    await store.add_chunks("doc-1", ["old"], [[1.0, 0.0]], _metadata("doc-1", 1))
+    await store.add_chunks("doc-1", ["new"], [[1.0, 0.0]], _metadata("doc-1", 1))
+    await store.add_chunks("doc-2", ["other"], [[0.0, 1.0]], _metadata("doc-2", 1))
+
+    results = await store.search([1.0, 0.0], top_k=5)
+    assert [r["document"] for r in results] == ["new", "other"]
+
+    await store.delete_documents(["doc-1"])
+    results = await store.search([1.0, 0.0], top_k=5)
+    assert [r["document"] for r in results] == ["other"]
+    assert store.count == 1
+
+
+@pytest.mark.asyncio
+async def test_reopen_persists_and_truncates_uncommitted_rows(tmp_path):
+    """Test that the store reloads from disk and drops vectors without sidecar rows."""
+    store = NumpyVectorStore(str(tmp_path))
+    await store.add_chunks("doc-1", ["a", "b"], [[1.0, 0.0], [0.0, 1.0]], _metadata("doc-1", 2))
+    await store.delete_document("doc-1")
+    await store.add_chunks("doc-2", ["c"], [[1.0, 1.0]], _metadata("doc-2", 1))
+    store.close()
+
+    # Simulate a crash between appending vectors and committing the sidecar
+    with open(store.path / "vectors.f32", "ab") as f:
+        f.write(np.ones(2, dtype=np.float32).tobytes())
+
+    reopened = NumpyVectorStore(str(tmp_path))
+    results = await reopened.search([1.0, 0.0], top_k=5)
+    reopened.close()
+
+    assert [r["document"] for r in results] == ["c"]
+    assert (store.path / "vectors.f32").stat().st_size == 3 * 2 * 4
+
+
+@pytest.mark.asyncio
+async def test_dimension_mismatch(store):
+    """Test that vectors of a different dimension are rejected."""
+    await store.add_chunks("doc-1", ["a"], [[1.0, 0.0]], _metadata("doc-1", 1))
+
+    with pytest.raises(ValueError):
+        await store.add_chunks("doc-2", ["b"], [[1.0, 0.0, 0.0]], _metadata("doc-2", 1))
+    with pytest.raises(ValueError):
+        await store.search([1.0, 0.0, 0.0])
+
+
+@pytest.mark.asyncio
+async def test_search_empty_store(store):
+    """Test that an empty store returns no results."""
+    assert await store.search([1.0, 0.0]) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quantization", ["float16", "int8"])
+async def test_quantized_search_rescores_full_precision(tmp_path, monkeypatch, quantization):
+    """Test that quantized search returns exact full-precision top-k and distances."""
+    monkeypatch.setattr(settings, "NUMPY_QUANTIZATION", quantization)
+    monkeypatch.setattr(settings, "NUMPY_SEARCH_BLOCK_ROWS", 64)
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((300, 32)).astype(np.float32)
+    store = NumpyVectorStore(str(tmp_path))
+    await store.add_chunks("doc-1", [str(i) for i in range(300)], vectors.tolist(), _metadata("doc-1", 300))
+
+    query = rng.standard_normal(32).astype(np.float32)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    similarities = normalized @ (query / np.linalg.norm(query))
+    expected = np.argsort(-similarities)[:5]
+
+    results = await store.search(query.tolist(), top_k=5)
+    store.close()
+
+    assert [r["document"] for r in results] == [str(i) for i in expected]
+    assert results[0]["distance"] == pytest.approx(1 - similarities[expected[0]], abs=1e-5)
+    assert (store.path / f"vectors.{quantization}").stat().st_size == 300 * 32 * np.dtype(quantization).itemsize
+
+
+@pytest.mark.asyncio
+async def test_quantized_copy_built_for_existing_store(tmp_path, monkeypatch):
+    """Test that enabling quantization on an existing store builds the quantized copy."""
+    store = NumpyVectorStore(str(tmp_path))
+    await store.add_chunks("doc-1", ["a", "b"], [[1.0, 0.0], [0.0, 1.0]], _metadata("doc-1", 2))
+    store.close()
+
+    monkeypatch.setattr(settings, "NUMPY_QUANTIZATION", "int8")
+    reopened = NumpyVectorStore(str(tmp_path))
+    results = await reopened.search([0.0, 1.0], top_k=1)
+    reopened.close()
+
+    assert [r["document"] for r in results] == ["b"]
+    assert (store.path / "vectors.int8").stat().st_size == 2 * 2
+    assert (store.path / "scales.f32").stat().st_size == 2 * 4
+
+
+@pytest.mark.asyncio
+async def test_filtered_search(store):
+    """Test that filters restrict candidates, both for selective and broad filters."""
+    for doc, file_type, temporary in (("doc-1", "pdf", False), ("doc-2", "csv", False), ("doc-3", "csv", True)):
+        await store.add_chunks(
+            doc,
+            [f"{doc} a", f"{doc} b"],
+            [[1.0, 0.0], [0.9, 0.1]],
+            [
+                {"document_id": doc, "chunk_index": i, "file_type": file_type, "is_temporary": temporary}
+                for i in range(2)
+            ]
+        )
+
+    # Selective: gathers only doc-2's rows
+    results = await store.search([1.0, 0.0], top_k=5, filters=SearchFilter(document_ids=["doc-2"]))
+    assert [r["document"] for r in results] == ["doc-2 a", "doc-2 b"]
+
+    # Broad: masks the full scan
+    results = await store.search([1.0, 0.0], top_k=5, filters=SearchFilter(file_types=["CSV"], is_temporary=False))
+    assert {r["metadata"]["document_id"] for r in results} == {"doc-2"}
+
+    results = await store.search([1.0, 0.0], top_k=5, filters=SearchFilter(document_ids=["missing"]))
+    assert results == []
+
+
+@pytest.mark.asyncio
+async def test_search_many(store):
+    """Test that several queries are answered in one call, in order."""
+    await store.add_chunks("doc-1", ["x", "y"], [[1.0, 0.0], [0.0, 1.0]], _metadata("doc-1", 2))
+
+    results = await store.search_many([[0.0, 1.0], [1.0, 0.0]], top_k=1)
+
+    assert [[r["document"] for r in hits] for hits in results] == [["y"], ["x"]]
+
+
+@pytest.mark.asyncio
+async def test_ivf_search_probes_closest_lists(tmp_path, monkeypatch):
+    """Test that the IVF index finds the exact neighbours of clustered data and assigns new rows."""
+    monkeypatch.setattr(settings, "NUMPY_IVF_LISTS", 4)
+    monkeypatch.setattr(settings, "NUMPY_IVF_NPROBE", 1)
+    monkeypatch.setattr(settings, "NUMPY_IVF_MIN_ROWS", 10 ** 9)
+    rng = np.random.default_rng(0)
+    centers = np.eye(8, dtype=np.float32)[:4] * 10
+    vectors = centers[np.arange(200) % 4] + rng.standard_normal((200, 8)).astype(np.float32)
+
+    store = NumpyVectorStore(str(tmp_path))
+    await store.add_chunks("doc-1", [str(i) for i in range(200)], vectors.tolist(), _metadata("doc-1", 200))
+    await store.train_index()
+    await store.add_chunks("doc-2", ["nuevo"], [(centers[2] * 2).tolist()], _metadata("doc-2", 1))
+    await store.delete_documents(["doc-1"])
+    await store.add_chunks("doc-3", [str(i) for i in range(8)], vectors[:8].tolist(), _metadata("doc-3", 8))
+
+    results = await store.search(centers[2].tolist(), top_k=3)
+
+    assert results[0]["document"] == "nuevo"
+    assert {r["metadata"]["document_id"] for r in results} == {"doc-2", "doc-3"}
+    store.close()
+
+    # Reopened, the layout and the rows added after training are still indexed
+    reopened = NumpyVectorStore(str(tmp_path))
+    query = vectors[5] / np.linalg.norm(vectors[5])
+    assert (await reopened.search(query.tolist(), top_k=1))[0]["id"] == "doc-3_chunk_5"
+    assert reopened._ivf.ready and reopened._ivf.tail_rows == 9
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_ivf_retrains_in_background(tmp_path, monkeypatch):
+    """Test that training starts at NUMPY_IVF_MIN_ROWS and again after enough new rows."""
+    monkeypatch.setattr(settings, "NUMPY_IVF_LISTS", 2)
+    monkeypatch.setattr(settings, "NUMPY_IVF_MIN_ROWS", 20)
+    monkeypatch.setattr(settings, "NUMPY_IVF_RETRAIN_FRACTION", 0.5)
+    rng = np.random.default_rng(1)
+    store = NumpyVectorStore(str(tmp_path))
+
+    await store.add_chunks("doc-1", ["a"] * 10, rng.standard_normal((10, 4)).tolist(), _metadata("doc-1", 10))
+    assert store._ivf_training is None
+
+    await store.add_chunks("doc-2", ["b"] * 10, rng.standard_normal((10, 4)).tolist(), _metadata("doc-2", 10))
+    store._ivf_training.join()
+    assert store._ivf.ready and store._ivf.trained_rows == 20
+
+    await store.add_chunks("doc-3", ["c"] * 11, rng.standard_normal((11, 4)).tolist(), _metadata("doc-3", 11))
+    store._ivf_training.join()
+    assert store._ivf.trained_rows == 31 and store._ivf.tail_rows == 0
+    assert len(list((tmp_path / settings.VECTOR_COLLECTION / "ivf").glob("g*"))) == 1
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_search_includes_embeddings(store):
+    """Test that search can return the normalized vectors of its hits."""
+    await store.add_chunks("doc-1", ["a", "b"], [[3.0, 4.0], [0.0, 1.0]], _metadata("doc-1", 2))
+
+    results = await store.search([1.0, 0.0], top_k=2, include_embeddings=True)
+
+    assert np.allclose(results[0]["embedding"], [0.6, 0.8])
+    assert "embedding" not in (await store.search([1.0, 0.0], top_k=1))[0]
@@ -0,0 +1,134 @@
+"""
+Unit tests for the dictionary-based query expansion.
+"""
+import json
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.infrastructure.expansion.dictionary_query_expansion import (
+    DictionaryQueryExpansionService,
+    SynonymDictionary,
+    learn_synonyms,
+    load_dictionary
+)
+
+
+@pytest.fixture
+def dictionary_file(tmp_path):
+    """Small versioned dictionary."""
+    path = tmp_path / "synonyms.json"
+    path.write_text(json.dumps({
+        "version": 3,
+        "entries": [
+            {"terms": ["ventas", "vendí"], "expansions": ["sales", "revenue"]},
+            {"terms": ["clientes"], "expansions": ["customers"]},
+            {"terms": ["cuentas por cobrar"], "expansions": ["accounts receivable"]},
+            {"terms": ["mes"], "expansions": ["month"]},
+        ]
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def fallback():
+    """LLM expansion service."""
+    service = AsyncMock()
+    service.expand_query.side_effect = lambda q: f"{q}, leasing, lease"
+    service.expand_to_queries.side_effect = lambda q, count: [q, "lease contracts"]
+    return service
+
+
+@pytest.fixture
+def service(dictionary_file, fallback, tmp_path):
+    return DictionaryQueryExpansionService(
+        fallback=fallback,
+        dictionary_path=dictionary_file,
+        learned_path=str(tmp_path / "learned.json"),
+        log_path=str(tmp_path / "expansions.jsonl"),
+        min_coverage=0.5
+    )
+
+
+@pytest.mark.unit
+class TestDictionaryQueryExpansionService:
+    """Test DictionaryQueryExpansionService."""
+
+    @pytest.mark.asyncio
+    async def test_expands_from_dictionary(self, service, fallback):
+        """Test accent, case and plural insensitive matching without calling the LLM."""
+        expanded = await service.expand_query("¿Cuánto VENDI a cada cliente este mes?")
+
+        assert expanded == "¿Cuánto VENDI a cada cliente este mes?, sales, customers, month, revenue"
+        fallback.expand_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_matches_phrases(self, service):
+        """Test that multi-word terms match as a whole."""
+        assert await service.expand_query("cuentas por cobrar") == "cuentas por cobrar, accounts receivable"
+
+    @pytest.mark.asyncio
+    async def test_identifiers_are_not_sent_to_the_llm(self, service, fallback):
+        """Test that a query of identifiers only is left as is."""
+        assert await service.expand_query("FAC-2024-003") == "FAC-2024-003"
+        fallback.expand_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_llm_and_logs(self, service, fallback, tmp_path):
+        """Test that a poorly covered query is expanded by the LLM and logged for learning."""
+        expanded = await service.expand_query("contratos de arrendamiento")
+
+        assert expanded == "contratos de arrendamiento, leasing, lease"
+        records = [json.loads(line) for line in (tmp_path / "expansions.jsonl").read_text().splitlines()]
+        assert [(r["query"], r["expansion"]) for r in records] == [(
+            "contratos de arrendamiento", "contratos de arrendamiento, leasing, lease"
+        )]
+
+    @pytest.mark.asyncio
+    async def test_expand_to_queries(self, service, fallback):
+        """Test that sub-queries take the n-th synonym of every term."""
+        assert await service.expand_to_queries("ventas por clientes", 3) == [
+            "ventas por clientes", "sales customers", "revenue"
+        ]
+        assert await service.expand_to_queries("contratos de arrendamiento", 2) == [
+            "contratos de arrendamiento", "lease contracts"
+        ]
+
+    def test_learned_entries_are_loaded(self, service, dictionary_file, tmp_path):
+        """Test that learned entries extend the dictionary and its version."""
+        (tmp_path / "learned.json").write_text(json.dumps({
+            "version": 2,
+            "entries": [{"terms": ["arrendamiento"], "expansions": ["lease"]}]
+        }), encoding="utf-8")
+
+        dictionary = load_dictionary(dictionary_file, str(tmp_path / "learned.json"))
+
+        assert dictionary.version == "3+learned.2"
+        assert dictionary.match("arrendamientos")[1] == []
+
+
+@pytest.mark.unit
+def test_learn_synonyms_from_repeated_expansions(dictionary_file):
+    """Test that synonyms the LLM added repeatedly for the one uncovered term are learned."""
+    dictionary = load_dictionary(dictionary_file)
+    records = [
+        {"query": "ventas de arrendamiento", "expansion": "ventas de arrendamiento, leasing, lease, sales"},
+        {"query": "arrendamientos por mes", "expansion": "arrendamientos por mes, lease, alquiler"},
+        # Two uncovered terms: the expansion cannot be attributed
+        {"query": "arrendamiento financiero", "expansion": "arrendamiento financiero, lease"},
+    ]
+
+    entries = learn_synonyms(records, dictionary, min_support=2)
+
+    assert entries == [{"terms": ["arrendamiento"], "expansions": ["lease"]}]
+
+
+@pytest.mark.unit
+def test_dictionary_entries_share_variants():
+    """Test that a variant listed in two entries finds both."""
+    dictionary = SynonymDictionary([
+        {"terms": ["saldo", "balance"], "expansions": ["balance"]},
+        {"terms": ["balance"], "expansions": ["balance sheet"]},
+    ], version="1")
+
+    assert dictionary.match("balance")[0] == [0, 1]
@@ -0,0 +1,112 @@
+"""
+Unit tests for the re-embedding migration and the startup embedding check.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.application.usecases.reembed_collection import ReembedCollectionUseCase
+from app.application.usecases.verify_embedding_spec import VerifyEmbeddingSpecUseCase
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.exceptions import EmbeddingConfigurationError
+from app.infrastructure.vector.numpy_store import NumpyVectorStore
+
+
+def _embedding_service(model, dimensions):
+    service = MagicMock()
+    service.spec = EmbeddingSpec(model=model, dimensions=dimensions)
+    service.generate_embeddings = AsyncMock(
+        side_effect=lambda texts: [[float(len(t)), 1.0] + [0.0] * (dimensions - 2) for t in texts]
+    )
+    return service
+
+
+@pytest.fixture
+async def source(tmp_path):
+    """Active store with two documents embedded at 4 dimensions."""
+    store = NumpyVectorStore(str(tmp_path))
+    await store.set_embedding_spec(EmbeddingSpec(model="text-embedding-3-large", dimensions=4))
+    for document_id, count in (("doc-a", 3), ("doc-b", 2)):
+        await store.add_chunks(
+            document_id,
+            [f"{document_id} chunk {i}" for i in range(count)],
+            [[1.0, 0.0, 0.0, float(i)] for i in range(count)],
+            [{"document_id": document_id, "chunk_index": i} for i in range(count)]
+        )
+    yield store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_reembed_into_new_collection_and_activate(source, tmp_path):
+    """Test that all chunks are re-embedded with their ids and the new collection becomes active."""
+    service = _embedding_service("text-embedding-3-large", 2)
+    usecase = ReembedCollectionUseCase(vector_store=source, embedding_service=service)
+
+    report = await usecase.execute(target_collection="docs_1024", batch_size=2)
+
+    assert report.chunks == 5
+    assert report.activated is True
+    assert service.generate_embeddings.call_count == 3
+
+    reopened = NumpyVectorStore(str(tmp_path))
+    assert reopened.collection_name == "docs_1024"
+    assert await reopened.get_embedding_spec() == EmbeddingSpec(model="text-embedding-3-large", dimensions=2)
+    ids = sorted(c["id"] for batch in [b async for b in reopened.iter_chunks()] for c in batch)
+    assert ids == sorted(
+        [f"doc-a_chunk_{i}" for i in range(3)] + [f"doc-b_chunk_{i}" for i in range(2)]
+    )
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_reembed_without_activation(source, tmp_path):
+    """Test that the old collection stays active until the switch."""
+    usecase = ReembedCollectionUseCase(vector_store=source, embedding_service=_embedding_service("m", 2))
+
+    await usecase.execute(target_collection="staging", activate=False)
+
+    reopened = NumpyVectorStore(str(tmp_path))
+    assert reopened.collection_name == source.collection_name
+    reopened.close()
+
+
+def test_runs_split_non_contiguous_chunks():
+    """Test that runs break on document changes and gaps in chunk indexes."""
+    batch = [
+        {"id": "b_chunk_0", "document": "", "metadata": {"document_id": "b", "chunk_index": 0}},
+        {"id": "a_chunk_3", "document": "", "metadata": {"document_id": "a", "chunk_index": 3}},
+        {"id": "a_chunk_0", "document": "", "metadata": {}},
+        {"id": "a_chunk_1", "document": "", "metadata": {"document_id": "a", "chunk_index": 1}},
+    ]
+
+    runs = ReembedCollectionUseCase._runs(batch, [[0.0]] * 4)
+
+    assert [(doc, start, len(items)) for doc, start, items in runs] == [("a", 0, 2), ("a", 3, 1), ("b", 0, 1)]
+
+
+@pytest.mark.asyncio
+async def test_verify_spec_mismatch_is_startup_error(source):
+    """Test that a configured dimension different from the collection's is refused."""
+    usecase = VerifyEmbeddingSpecUseCase(
+        vector_store=source,
+        embedding_service=_embedding_service("text-embedding-3-large", 1024)
+    )
+
+    with pytest.raises(EmbeddingConfigurationError):
+        await usecase.execute()
+
+
+@pytest.mark.asyncio
+async def test_verify_spec_records_spec_on_empty_collection(tmp_path):
+    """Test that an empty collection is stamped with the configured spec."""
+    store = NumpyVectorStore(str(tmp_path))
+    usecase = VerifyEmbeddingSpecUseCase(
+        vector_store=store,
+        embedding_service=_embedding_service("text-embedding-3-small", 512)
+    )
+
+    spec = await usecase.execute()
+
+    assert spec == EmbeddingSpec(model="text-embedding-3-small", dimensions=512)
+    assert await store.get_embedding_spec() == spec
+    store.close()
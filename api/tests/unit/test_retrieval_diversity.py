@@ -0,0 +1,92 @@
+"""
+Unit tests for MMR diversification and merging of adjacent chunks.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.retrieval.diversity import maximal_marginal_relevance, merge_adjacent_chunks
+from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
+
+
+def _result(chunk_id, distance, embedding=None, document_id="doc", chunk_index=None, text=None):
+    metadata = {"document_id": document_id}
+    if chunk_index is not None:
+        metadata["chunk_index"] = chunk_index
+    result = {"id": chunk_id, "document": text or chunk_id, "metadata": metadata, "distance": distance}
+    if embedding is not None:
+        result["embedding"] = embedding
+    return result
+
+
+def test_mmr_skips_near_duplicates():
+    """Test that a near-duplicate of the best hit loses to a less similar, still relevant one."""
+    candidates = [
+        _result("a", 0.10, [1.0, 0.0, 0.0]),
+        _result("a-copy", 0.11, [0.99, 0.05, 0.0]),
+        _result("b", 0.20, [0.0, 1.0, 0.0]),
+    ]
+
+    diverse = maximal_marginal_relevance(candidates, top_k=2, lambda_=0.7)
+    ranked = maximal_marginal_relevance(candidates, top_k=2, lambda_=1.0)
+
+    assert [r["id"] for r in diverse] == ["a", "b"]
+    assert [r["id"] for r in ranked] == ["a", "a-copy"]
+    assert all("embedding" not in r for r in diverse)
+
+
+def test_merge_adjacent_chunks_removes_overlap():
+    """Test that consecutive chunks of a document become one span without the repeated text."""
+    results = [
+        _result("doc_chunk_4", 0.15, chunk_index=4, text="12% del trimestre. Los gastos de transporte subieron."),
+        _result("other_chunk_0", 0.20, document_id="other", chunk_index=0),
+        _result("doc_chunk_3", 0.30, chunk_index=3, text="Las ventas crecieron 12% del trimestre."),
+    ]
+
+    merged = merge_adjacent_chunks(results)
+
+    assert [r["id"] for r in merged] == ["doc_chunk_3", "other_chunk_0"]
+    assert merged[0]["document"] == "Las ventas crecieron 12% del trimestre. Los gastos de transporte subieron."
+    assert merged[0]["metadata"]["chunk_index"] == 3
+    assert merged[0]["metadata"]["last_chunk_index"] == 4
+    assert merged[0]["distance"] == 0.15
+
+
+@pytest.mark.asyncio
+async def test_chat_over_fetches_and_diversifies(
+    monkeypatch,
+    mock_vector_store,
+    mock_chat_service,
+    mock_embedding_service,
+    mock_conversation_repository,
+    mock_message_repository
+):
+    """Test that the chat fetches extra candidates with embeddings and keeps TOP_K diverse spans."""
+    monkeypatch.setattr(settings, "TOP_K", 2)
+    monkeypatch.setattr(settings, "MMR_CANDIDATE_FACTOR", 3)
+    monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.0)
+    monkeypatch.setattr(settings, "ADAPTIVE_RETRIEVAL", False)
+    mock_vector_store.search.return_value = [
+        _result("a", 0.10, [1.0, 0.0], chunk_index=0),
+        _result("a-copy", 0.11, [1.0, 0.01], document_id="copy", chunk_index=0),
+        _result("b", 0.20, [0.0, 1.0], chunk_index=1),
+    ]
+
+    usecase = ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q))
+    )
+
+    message, _ = await usecase.execute("ventas y gastos")
+
+    kwargs = mock_vector_store.search.call_args.kwargs
+    assert kwargs["top_k"] == 6 and kwargs["include_embeddings"] is True
+    # "a" and "b" are chunks 0 and 1 of the same document: one span
+    assert len(message.sources) == 1
+    assert message.sources[0].content.startswith("a\nb")
+    context = mock_chat_service.generate_response.call_args.kwargs["context"]
+    assert context == ["a\nb"]
@@ -0,0 +1,77 @@
+"""
+Unit tests for reciprocal-rank fusion and multi-query retrieval.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.retrieval.fusion import reciprocal_rank_fusion
+from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
+
+
+def _result(chunk_id, distance):
+    return {"id": chunk_id, "document": chunk_id, "metadata": {"document_id": "doc"}, "distance": distance}
+
+
+def test_rrf_prefers_chunks_found_by_several_queries():
+    """Test that agreement across lists beats a single top rank."""
+    fused = reciprocal_rank_fusion(
+        [
+            [_result("a", 0.10), _result("b", 0.20)],
+            [_result("c", 0.15), _result("b", 0.30)],
+            [_result("b", 0.25), _result("d", 0.40)],
+        ],
+        top_k=3,
+        k=60
+    )
+
+    assert [r["id"] for r in fused] == ["b", "a", "c"]
+    assert fused[0]["distance"] == 0.20  # Best distance across lists
+    assert fused[0]["rrf_score"] == pytest.approx(2 / 62 + 1 / 61)
+
+
+def test_rrf_empty():
+    """Test that fusing nothing returns nothing."""
+    assert reciprocal_rank_fusion([[], []], top_k=5) == []
+
+
+@pytest.mark.asyncio
+async def test_chat_multi_query_uses_one_embedding_call_and_one_search(
+    monkeypatch,
+    mock_vector_store,
+    mock_chat_service,
+    mock_embedding_service,
+    mock_conversation_repository,
+    mock_message_repository
+):
+    """Test that sub-queries are embedded together, searched together and fused."""
+    monkeypatch.setattr(settings, "ENABLE_QUERY_EXPANSION", True)
+    monkeypatch.setattr(settings, "QUERY_EXPANSION_MODE", "multi")
+    monkeypatch.setattr(settings, "MULTI_QUERY_COUNT", 3)
+    monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.0)
+
+    expansion = AsyncMock()
+    expansion.expand_to_queries.return_value = ["ventas", "sales revenue", "facturación"]
+    mock_embedding_service.generate_embeddings.return_value = [[0.1] * 4, [0.2] * 4, [0.3] * 4]
+    mock_vector_store.search_many.return_value = [
+        [_result("a", 0.1), _result("b", 0.2)],
+        [_result("b", 0.3)],
+        [_result("c", 0.2), _result("b", 0.4)],
+    ]
+
+    usecase = ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=expansion
+    )
+
+    message, _ = await usecase.execute("ventas")
+
+    expansion.expand_to_queries.assert_called_once_with("ventas", 3)
+    mock_embedding_service.generate_embeddings.assert_called_once_with(["ventas", "sales revenue", "facturación"])
+    mock_vector_store.search_many.assert_called_once()
+    mock_vector_store.search.assert_not_called()
+    assert [s.content[:1] for s in message.sources] == ["b", "a", "c"]
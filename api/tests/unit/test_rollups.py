@@ -0,0 +1,92 @@
+"""
+Unit tests for the time-series rollups of typed tables.
+"""
+import numpy as np
+import pytest
+
+from app.application.tabular.rollups import compute_rollups
+from app.domain.entities.table import TypedTable, TypedColumn, NUMBER, CURRENCY, PERCENT, DATE, TEXT
+
+
+def _by_period(rollups):
+    return {meta["period"]: text for text, meta in rollups}
+
+
+@pytest.mark.unit
+class TestComputeRollups:
+    """Test compute_rollups."""
+
+    def test_date_column_rollups(self):
+        table = TypedTable(columns=[
+            TypedColumn("Fecha", DATE, np.array(
+                ["2023-03-05", "2024-01-10", "2024-02-01", "NaT"], dtype="datetime64[D]"
+            )),
+            TypedColumn("Ventas", CURRENCY, np.array([100.0, 200.0, 300.0, 50.0]), unit="COP"),
+            TypedColumn("Margen %", PERCENT, np.array([10.0, 20.0, 30.0, np.nan])),
+            TypedColumn("Cliente", TEXT, np.array(["a", "b", "c", "d"])),
+        ])
+
+        rollups = compute_rollups(table, "ventas.csv")
+
+        granularities = [meta["granularity"] for _, meta in rollups]
+        assert granularities == ["month"] * 3 + ["quarter"] * 2 + ["year"] * 2
+        texts = _by_period(rollups)
+        assert texts["2024-T1"] == (
+            "Resumen trimestral de ventas.csv | Periodo: 2024-T1 | Registros: 2 | "
+            "Ventas: suma 500 COP, promedio 250 COP, registros 2 | Margen %: promedio 25"
+        )
+        # Year over year change of the sums; the undated row is left out
+        assert "suma 500 COP (+400 % vs 2023)" in texts["2024"]
+        assert "Cliente" not in texts["2024"]
+
+    def test_year_and_month_name_columns(self):
+        table = TypedTable(columns=[
+            TypedColumn("Año", NUMBER, np.array([2024.0, 2024.0, 2024.0, np.nan])),
+            TypedColumn("Mes", TEXT, np.array(["Enero", "ene.", "Marzo", "Enero"])),
+            TypedColumn("Gasto", NUMBER, np.array([1.0, 2.0, 4.0, 8.0])),
+        ])
+
+        texts = _by_period(compute_rollups(table, "gastos.xlsx"))
+
+        assert set(texts) == {"2024-01", "2024-03", "2024-T1", "2024"}
+        assert "Registros: 2 | Gasto: suma 3, promedio 1,50" in texts["2024-01"]
+        # Año and Mes are the time axis, not measures
+        assert "Año:" not in texts["2024"]
+
+    def test_year_and_quarter_columns(self):
+        table = TypedTable(columns=[
+            TypedColumn("Año", NUMBER, np.array([2023.0, 2024.0])),
+            TypedColumn("Trimestre", TEXT, np.array(["T4", "Q1"])),
+            TypedColumn("Gasto", NUMBER, np.array([5.0, 7.0])),
+        ])
+
+        rollups = compute_rollups(table, "gastos.csv")
+
+        assert [(m["granularity"], m["period"]) for _, m in rollups] == [
+            ("quarter", "2023-T4"), ("quarter", "2024-T1"), ("year", "2023"), ("year", "2024")
+        ]
+
+    def test_prices_and_rates_are_averaged(self):
+        table = TypedTable(columns=[
+            TypedColumn("Año", NUMBER, np.array([2023.0, 2024.0, 2024.0])),
+            TypedColumn("Precio promedio", CURRENCY, np.array([10.0, 20.0, 30.0]), unit="COP"),
+            TypedColumn("Café (COP/kg)", NUMBER, np.array([8.0, 9.0, 11.0])),
+            TypedColumn("Tasa de cambio", NUMBER, np.array([4.0, 4.0, 5.0])),
+            TypedColumn("Kilos", NUMBER, np.array([1.0, 2.0, 3.0])),
+        ])
+
+        texts = _by_period(compute_rollups(table, "precios.csv"))
+
+        assert texts["2024"] == (
+            "Resumen anual de precios.csv | Periodo: 2024 | Registros: 2 | "
+            "Precio promedio: promedio 25 COP | Café (COP/kg): promedio 10 | Tasa de cambio: promedio 4,50 | "
+            "Kilos: suma 5 (+400 % vs 2023), promedio 2,50, registros 2"
+        )
+
+    def test_without_time_axis(self):
+        table = TypedTable(columns=[
+            TypedColumn("Cliente", TEXT, np.array(["a", "b"])),
+            TypedColumn("Monto", NUMBER, np.array([1.0, 2.0])),
+        ])
+
+        assert compute_rollups(table, "clientes.csv") == []
@@ -0,0 +1,140 @@
+"""
+Unit tests for the startup manager.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.config import settings
+from app.core.startup import StartupManager
+from app.domain.entities.embedding import EmbeddingSpec
+from app.domain.exceptions import EmbeddingConfigurationError
+from app.infrastructure.vector.chroma_store import ChromaVectorStore
+from app.infrastructure.vector.numpy_store import NumpyVectorStore
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "STARTUP_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "STARTUP_RETRY_DELAY_SECONDS", 0)
+    monkeypatch.setattr(settings, "STARTUP_RETRY_MAX_DELAY_SECONDS", 0)
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-test")
+
+
+def _manager(vector_store=None):
+    embedding_service = MagicMock()
+    embedding_service.spec = EmbeddingSpec(model="text-embedding-3-small", dimensions=3)
+    embedding_service.generate_embedding = AsyncMock(return_value=[0.0, 1.0, 0.0])
+    return StartupManager(
+        db_client=AsyncMock(),
+        vector_store=vector_store or AsyncMock(),
+        embedding_service=embedding_service,
+        verify_embedding_spec_usecase=AsyncMock()
+    )
+
+
+@pytest.mark.asyncio
+async def test_start_connects_and_warms_up():
+    """Test that all dependencies connect and the warm-up search uses the warm-up embedding."""
+    manager = _manager()
+
+    with patch("app.core.startup.run_migrations", AsyncMock()) as migrations:
+        await manager.start()
+
+    assert manager.ready
+    assert manager.status()["status"] == "ready"
+    manager.db_client.connect.assert_awaited_once()
+    migrations.assert_awaited_once_with(manager.db_client)
+    manager.vector_store.connect.assert_awaited_once()
+    manager.verify_embedding_spec_usecase.execute.assert_awaited_once()
+    manager.vector_store.search.assert_awaited_once_with([0.0, 1.0, 0.0], top_k=1)
+
+
+@pytest.mark.asyncio
+async def test_transient_failure_is_retried():
+    """Test that a dependency failing once is retried within the startup attempts."""
+    manager = _manager()
+    manager.vector_store.connect.side_effect = [ConnectionError("refused"), None]
+
+    with patch("app.core.startup.run_migrations", AsyncMock()):
+        await manager.start()
+
+    assert manager.ready
+    assert manager.vector_store.connect.await_count == 2
+    assert manager.errors == {}
+
+
+@pytest.mark.asyncio
+async def test_outage_boots_not_ready_and_recovers_in_background():
+    """Test that an unreachable vector store does not block startup and is retried later."""
+    manager = _manager()
+    recovered = asyncio.Event()
+
+    async def connect():
+        if manager.vector_store.connect.await_count <= 3:
+            raise ConnectionError("refused")
+        recovered.set()
+
+    manager.vector_store.connect.side_effect = connect
+
+    with patch("app.core.startup.run_migrations", AsyncMock()):
+        await manager.start()
+
+        status = manager.status()
+        assert status["status"] == "starting"
+        assert status["components"]["database"] == "ready"
+        assert status["components"]["vector_store"] == "failed"
+        assert "ConnectionError" in status["errors"]["vector_store"]
+
+        await asyncio.wait_for(recovered.wait(), timeout=1)
+        for _ in range(10):
+            if manager.ready:
+                break
+            await asyncio.sleep(0)
+
+    assert manager.ready
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_embedding_configuration_error_is_raised():
+    """Test that an embedding spec mismatch refuses to start instead of retrying."""
+    manager = _manager()
+    manager.verify_embedding_spec_usecase.execute.side_effect = EmbeddingConfigurationError("mismatch")
+
+    with patch("app.core.startup.run_migrations", AsyncMock()):
+        with pytest.raises(EmbeddingConfigurationError):
+            await manager.start()
+
+    manager.verify_embedding_spec_usecase.execute.assert_awaited_once()
+    assert not manager.ready
+
+
+@pytest.mark.asyncio
+async def test_warm_up_without_api_key(monkeypatch):
+    """Test that the embedding warm-up is skipped without an API key and a unit vector is searched."""
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "")
+    manager = _manager()
+
+    with patch("app.core.startup.run_migrations", AsyncMock()):
+        await manager.start()
+
+    assert manager.ready
+    assert manager.components["embeddings"] == "skipped"
+    manager.embedding_service.generate_embedding.assert_not_awaited()
+    manager.vector_store.search.assert_awaited_once_with([1.0, 0.0, 0.0], top_k=1)
+
+
+@pytest.mark.asyncio
+async def test_vector_stores_open_lazily(tmp_path):
+    """Test that constructing the stores does no I/O until connect()."""
+    with patch("chromadb.Client") as client:
+        ChromaVectorStore()
+    client.assert_not_called()
+
+    store = NumpyVectorStore(str(tmp_path))
+    assert not store.path.exists()
+
+    await store.connect()
+    assert (store.path / "chunks.db").exists()
+    store.close()
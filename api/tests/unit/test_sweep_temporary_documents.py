@@ -0,0 +1,87 @@
+"""
+Unit tests for SweepTemporaryDocumentsUseCase.
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from app.application.usecases.sweep_temporary_documents import SweepTemporaryDocumentsUseCase
+from app.core.config import settings
+from app.domain.entities.document import Document
+from app.infrastructure.repositories.document_repository import DocumentRepository
+from app.infrastructure.repositories.ingestion_repository import IngestionRepository
+
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+async def _save(repo, filename, age_hours, is_temporary, chunk_count=3):
+    document = Document(
+        id=None,
+        filename=filename,
+        file_type="pdf",
+        chunk_count=chunk_count,
+        upload_date=NOW - timedelta(hours=age_hours),
+        is_temporary=is_temporary
+    )
+    return await repo.save(document)
+
+
+@pytest.fixture
+def document_repository(sqlite_client):
+    """Document repository backed by SQLite."""
+    return DocumentRepository(sqlite_client)
+
+
+@pytest.fixture
+def usecase(sqlite_client, document_repository, mock_vector_store):
+    """Create SweepTemporaryDocumentsUseCase with a mocked vector store."""
+    return SweepTemporaryDocumentsUseCase(
+        document_repository=document_repository,
+        vector_store=mock_vector_store,
+        ingestion_repository=IngestionRepository(sqlite_client)
+    )
+
+
+@pytest.mark.asyncio
+async def test_sweep_deletes_only_expired_temporary(usecase, document_repository, mock_vector_store):
+    """Test that only temporary documents older than the TTL are removed."""
+    expired = await _save(document_repository, "old_temp.pdf", age_hours=48, is_temporary=True, chunk_count=4)
+    fresh = await _save(document_repository, "new_temp.pdf", age_hours=1, is_temporary=True)
+    permanent = await _save(document_repository, "old.pdf", age_hours=48, is_temporary=False)
+
+    report = await usecase.execute(ttl_seconds=24 * 3600, now=NOW)
+
+    assert report.documents_deleted == 1
+    assert report.chunks_deleted == 4
+    mock_vector_store.delete_documents.assert_called_once_with([expired])
+
+    remaining = {doc.id for doc in await document_repository.list_all()}
+    assert remaining == {fresh, permanent}
+
+
+@pytest.mark.asyncio
+async def test_sweep_in_batches(usecase, document_repository, mock_vector_store, monkeypatch):
+    """Test that expired documents are deleted in bounded batches."""
+    monkeypatch.setattr(settings, "TEMP_DOCUMENT_SWEEP_BATCH_SIZE", 2)
+    for i in range(5):
+        await _save(document_repository, f"temp_{i}.pdf", age_hours=48 + i, is_temporary=True)
+
+    report = await usecase.execute(ttl_seconds=3600, now=NOW)
+
+    assert report.documents_deleted == 5
+    assert report.chunks_deleted == 15
+    assert report.batches == 3
+    assert [len(c.args[0]) for c in mock_vector_store.delete_documents.call_args_list] == [2, 2, 1]
+    assert await document_repository.list_all() == []
+
+
+@pytest.mark.asyncio
+async def test_sweep_nothing_expired(usecase, document_repository, mock_vector_store):
+    """Test that a sweep without expired documents is a no-op."""
+    await _save(document_repository, "new_temp.pdf", age_hours=1, is_temporary=True)
+
+    report = await usecase.execute(ttl_seconds=24 * 3600, now=NOW)
+
+    assert report.documents_deleted == 0
+    assert report.batches == 0
+    mock_vector_store.delete_documents.assert_not_called()
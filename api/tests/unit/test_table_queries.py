@@ -0,0 +1,116 @@
+"""
+Unit tests for aggregate queries over typed tables.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.tabular.query_engine import (
+    looks_aggregate, parse_aggregate_query, execute_aggregate, format_number
+)
+from app.application.usecases.chat import ChatUseCase
+from app.core.config import settings
+from app.domain.exceptions import InvalidTableQueryError
+from app.infrastructure.document_processor import DocumentProcessor
+
+SALES = """Fecha,Producto,Cliente,Total (COP)
+2023-12-15,Café molido,Tienda Sur,1.000.000
+2024-01-10,Café molido,Tienda Norte,4.500.000
+2024-01-20,Café en grano,Tienda Sur,2.000.000
+2024-02-05,Café molido,Tienda Sur,3.000.000
+2025-01-03,Café en grano,Tienda Norte,
+""".encode("utf-8")
+
+YEAR_2024 = [
+    {"column": "Fecha", "op": ">=", "value": "2024-01-01"},
+    {"column": "Fecha", "op": "<", "value": "2025-01-01"},
+]
+
+
+@pytest.fixture
+async def table():
+    return await DocumentProcessor.extract_typed_table(SALES, "csv")
+
+
+def test_looks_aggregate():
+    """Test the cheap gate in front of the planner."""
+    assert looks_aggregate("¿Cuánto vendí en 2024?")
+    assert looks_aggregate("promedio de ventas por cliente")
+    assert not looks_aggregate("¿Quién es el proveedor de la factura FAC-001?")
+
+
+def test_sum_with_filters_and_groups(table):
+    """Test filtered totals, monthly groups and text groups ordered by value."""
+    total = execute_aggregate(table, parse_aggregate_query(
+        {"metric": "sum", "column": "Total (COP)", "filters": YEAR_2024}, table
+    ))
+    assert total.value == 9_500_000 and total.matched_rows == 3 and total.unit == "COP"
+
+    monthly = execute_aggregate(table, parse_aggregate_query(
+        {"metric": "sum", "column": "Total (COP)", "filters": YEAR_2024, "group_by": "Fecha", "period": "month"}, table
+    ))
+    assert monthly.groups == [("2024-01", 6_500_000), ("2024-02", 3_000_000)]
+
+    by_product = execute_aggregate(table, parse_aggregate_query(
+        {"metric": "count", "group_by": "Producto", "filters": [{"column": "Cliente", "op": "contains", "value": "sur"}]},
+        table
+    ))
+    assert by_product.groups == [("Café molido", 2), ("Café en grano", 1)]
+    assert format_number(9_500_000) == "9.500.000" and format_number(12.5) == "12,50"
+
+
+@pytest.mark.parametrize("query", [
+    {"metric": "median", "column": "Total (COP)"},
+    {"metric": "sum", "column": "Producto"},
+    {"metric": "sum", "column": "Precio"},
+    {"metric": "sum", "column": "Total (COP)", "filters": [{"column": "Fecha", "op": ">=", "value": "ayer"}]},
+    {"metric": "count", "group_by": "Producto", "period": "month"},
+])
+def test_invalid_queries_are_rejected(table, query):
+    """Test that queries not fitting the table raise InvalidTableQueryError."""
+    with pytest.raises(InvalidTableQueryError):
+        parse_aggregate_query(query, table)
+
+
+@pytest.mark.asyncio
+async def test_chat_answers_with_computed_result(
+    monkeypatch,
+    table,
+    mock_vector_store,
+    mock_chat_service,
+    mock_embedding_service,
+    mock_conversation_repository,
+    mock_message_repository
+):
+    """Test that the LLM gets the computed total instead of the sales rows."""
+    monkeypatch.setattr(settings, "MIN_RELEVANCE", 0.0)
+    monkeypatch.setattr(settings, "MMR_CANDIDATE_FACTOR", 1)
+    monkeypatch.setattr(settings, "ADAPTIVE_RETRIEVAL", False)
+    metadata = {"document_id": "ventas", "filename": "ventas_cafe.csv", "file_type": "csv"}
+    mock_vector_store.search.return_value = [
+        {"id": f"ventas_chunk_{i}", "document": f"fila {i}", "metadata": {**metadata, "chunk_index": i}, "distance": 0.2}
+        for i in range(3)
+    ] + [{"id": "informe_chunk_0", "document": "Informe anual", "metadata": {"document_id": "informe", "chunk_index": 0}, "distance": 0.3}]
+    table_store = AsyncMock()
+    table_store.get_table.return_value = table
+    planner = AsyncMock()
+    planner.plan.return_value = {
+        "aggregate": True, "document_id": "ventas", "metric": "sum", "column": "Total (COP)", "filters": YEAR_2024
+    }
+
+    usecase = ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q)),
+        table_store=table_store,
+        table_query_planner=planner
+    )
+    message, _ = await usecase.execute("¿Cuánto vendí en 2024?")
+
+    context = mock_chat_service.generate_response.call_args.kwargs["context"]
+    assert len(context) == 2 and context[1] == "Informe anual"
+    assert "ventas_cafe.csv" in context[0] and context[0].endswith("9.500.000 COP")
+    assert "Total (COP)" in planner.plan.call_args.args[1][0]
+    assert message.sources[0].document_id == "ventas"
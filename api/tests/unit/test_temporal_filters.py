@@ -0,0 +1,174 @@
+"""
+Unit tests for query-time period parsing and period filters.
+"""
+from datetime import date
+
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock
+
+from app.application.retrieval.temporal import parse_period
+from app.application.tabular.rollups import row_periods
+from app.application.usecases.chat import ChatUseCase
+from app.application.usecases.upload_document import UploadDocumentUseCase
+from app.core.config import settings
+from app.domain.entities.search import SearchFilter
+from app.domain.entities.table import TypedTable, TypedColumn, NUMBER, DATE, TEXT
+from app.infrastructure.sqlite_filters import sqlite_conditions
+from app.infrastructure.vector.chroma_store import ChromaVectorStore
+
+TODAY = date(2025, 5, 14)
+
+
+@pytest.mark.parametrize("query,expected", [
+    ("ventas de este mes", (202505, 202505)),
+    ("¿cuánto gasté el mes pasado?", (202504, 202504)),
+    ("gastos del último trimestre", (202501, 202503)),
+    ("gastos de este trimestre", (202504, 202506)),
+    ("ventas de los últimos tres meses", (202503, 202505)),
+    ("ventas del año pasado", (202401, 202412)),
+    ("ventas de marzo de 2024", (202403, 202403)),
+    ("gastos de diciembre", (202412, 202412)),
+    ("ventas de noviembre a febrero", (202411, 202502)),
+    ("primer trimestre de 2023", (202301, 202303)),
+    ("ventas T2 2024", (202404, 202406)),
+    ("segundo semestre", (202407, 202412)),
+    ("ventas en 2023", (202301, 202312)),
+    ("ventas de 2023 y 2024", (202301, 202412)),
+    ("compara ventas 2023 vs 2024", (202301, 202412)),
+    ("ventas entre 2023 y 2024", (202301, 202412)),
+    ("marzo de 2023 vs marzo de 2024", (202301, 202412)),
+])
+def test_parse_period(query, expected):
+    """Test relative and absolute Spanish period expressions."""
+    period = parse_period(query, TODAY)
+
+    assert (period.first, period.last) == expected
+
+
+@pytest.mark.parametrize("query", [
+    "factura FAC-2024-003", "pago del 2024/01/05", "ventas de Acme",
+    "total de 2000 unidades", "pagos de $2000",
+])
+def test_parse_period_ignores_identifiers(query):
+    """Test that identifiers, quantities and plain queries name no period."""
+    assert parse_period(query, TODAY) is None
+
+
+def test_period_filter_translations():
+    """Test that a period range keeps chunks whose period lies inside it."""
+    filters = SearchFilter(period_from=202401, period_to=202403)
+
+    assert filters.matches({"data_period_start": 202402, "data_period_end": 202402})
+    assert filters.matches({"data_period_start": 202401, "data_period_end": 202403})
+    assert not filters.matches({"data_period_start": 202401, "data_period_end": 202412})
+    assert not filters.matches({"document_id": "pdf"})
+    assert ChromaVectorStore._where(filters) == {"$and": [
+        {"data_period_start": {"$gte": 202401}},
+        {"data_period_end": {"$lte": 202403}},
+    ]}
+    assert sqlite_conditions(filters) == (
+        ["json_extract(metadata, '$.data_period_start') >= ?", "json_extract(metadata, '$.data_period_end') <= ?"],
+        [202401, 202403]
+    )
+
+
+def test_row_periods_follow_the_time_axis():
+    """Test that rows cover their month, quarter or whole year."""
+    dated = TypedTable(columns=[
+        TypedColumn("Fecha", DATE, np.array(["2024-02-10", "NaT"], dtype="datetime64[D]")),
+    ])
+    quarterly = TypedTable(columns=[
+        TypedColumn("Año", NUMBER, np.array([2024.0, 2023.0])),
+        TypedColumn("Trimestre", TEXT, np.array(["T3", ""])),
+    ])
+
+    assert [a.tolist() for a in row_periods(dated)] == [[202402, 0], [202402, 0]]
+    assert [a.tolist() for a in row_periods(quarterly)] == [[202407, 202301], [202409, 202312]]
+
+
+@pytest.mark.asyncio
+async def test_upload_tags_rows_with_their_period(
+    monkeypatch,
+    mock_vector_store,
+    mock_embedding_service,
+    sample_csv_content
+):
+    """Test that row chunks get the period of their table row; empty rows are skipped."""
+    monkeypatch.setattr(settings, "TABULAR_ROLLUPS", False)
+    processor = AsyncMock()
+    processor.extract_tabular_chunks_from_csv.return_value = ["Fecha: 2024-01-05 | Monto: 10", "Monto: 20"]
+    processor.extract_typed_table.return_value = TypedTable(columns=[
+        TypedColumn("Fecha", DATE, np.array(["2024-01-05", "NaT", "NaT"], dtype="datetime64[D]")),
+        TypedColumn("Monto", NUMBER, np.array([10.0, np.nan, 20.0])),
+    ])
+    document_repository = AsyncMock()
+    document_repository.save.return_value = "doc-1"
+    ingestion_repository = AsyncMock()
+    ingestion_repository.get_job.return_value = None
+    usecase = UploadDocumentUseCase(
+        document_repository=document_repository,
+        vector_store=mock_vector_store,
+        embedding_service=mock_embedding_service,
+        document_processor=processor,
+        ingestion_repository=ingestion_repository
+    )
+
+    await usecase.execute(filename="ventas.csv", file_content=sample_csv_content, file_type="csv")
+
+    metadata = mock_vector_store.add_chunks.call_args.kwargs["metadata"]
+    assert (metadata[0]["data_period_start"], metadata[0]["data_period_end"]) == (202401, 202401)
+    assert "data_period_start" not in metadata[1]
+
+
+@pytest.fixture
+def chat_usecase(
+    monkeypatch,
+    mock_vector_store,
+    mock_chat_service,
+    mock_embedding_service,
+    mock_conversation_repository,
+    mock_message_repository
+):
+    monkeypatch.setattr(settings, "TEMPORAL_FILTERS", True)
+    monkeypatch.setattr(settings, "ENABLE_QUERY_EXPANSION", True)
+    monkeypatch.setattr(settings, "QUERY_EXPANSION_MODE", "single")
+    monkeypatch.setattr(settings, "MMR_CANDIDATE_FACTOR", 1)
+    monkeypatch.setattr(settings, "ADAPTIVE_RETRIEVAL", False)
+    return ChatUseCase(
+        vector_store=mock_vector_store,
+        llm_service=mock_chat_service,
+        embedding_service=mock_embedding_service,
+        conversation_repository=mock_conversation_repository,
+        message_repository=mock_message_repository,
+        query_expansion_service=AsyncMock(expand_query=AsyncMock(side_effect=lambda q: q))
+    )
+
+
+@pytest.mark.asyncio
+async def test_chat_filters_by_period_without_expansion(chat_usecase, mock_vector_store):
+    """Test that a named period becomes a search filter and replaces query expansion."""
+    mock_vector_store.search.return_value = [{
+        "id": "c1",
+        "document": "Fecha: 2024-03-02 | Monto: 10",
+        "metadata": {"document_id": "d1", "chunk_index": 0},
+        "distance": 0.1
+    }]
+
+    await chat_usecase.execute("ventas de marzo de 2024")
+
+    filters = mock_vector_store.search.call_args.kwargs["filters"]
+    assert (filters.period_from, filters.period_to) == (202403, 202403)
+    chat_usecase.query_expansion_service.expand_query.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_chat_falls_back_without_period(chat_usecase, mock_vector_store):
+    """Test that the search is repeated without the period when nothing is tagged with it."""
+    mock_vector_store.search.side_effect = [[], []]
+
+    await chat_usecase.execute("resumen del informe de 2024", document_ids=["pdf-1"])
+
+    first, second = [c.kwargs["filters"] for c in mock_vector_store.search.call_args_list]
+    assert first.period_from == 202401
+    assert second == SearchFilter(document_ids=["pdf-1"])
@@ -1,12 +1,15 @@
 """
 Unit tests for UploadDocumentUseCase.
 """
+import numpy as np
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock
 
 from app.application.usecases.upload_document import UploadDocumentUseCase
 from app.domain.entities.document import Document
+from app.domain.entities.table import TypedTable, TypedColumn, DATE, CURRENCY
+from app.domain.exceptions import IngestionError
 
 
 @pytest.mark.unit
@@ -29,22 +32,36 @@ class TestUploadDocumentUseCase:
             "Este es un documento de prueba",
             "con contenido financiero"
         ]
+        processor.extract_tabular_chunks_from_csv.return_value = [
+            "Fecha: 2024-01-01 | Concepto: Compra suministros | Monto: 1500",
+            "Fecha: 2024-01-02 | Concepto: Pago servicios | Monto: 800"
+        ]
+        processor.extract_typed_table.return_value = TypedTable(columns=[])
         return processor
 
+    @pytest.fixture
+    def mock_ingestion_repository(self):
+        """Mock ingestion progress repository."""
+        repo = AsyncMock()
+        repo.get_job.return_value = None
+        return repo
+
     @pytest.fixture
     def usecase(
         self,
         mock_document_repository,
         mock_vector_store,
         mock_embedding_service,
-        mock_document_processor
+        mock_document_processor,
+        mock_ingestion_repository
     ):
         """Create UploadDocumentUseCase with mocked dependencies."""
         return UploadDocumentUseCase(
             document_repository=mock_document_repository,
             vector_store=mock_vector_store,
             embedding_service=mock_embedding_service,
-            document_processor=mock_document_processor
+            document_processor=mock_document_processor,
+            ingestion_repository=mock_ingestion_repository
         )
 
     @pytest.mark.asyncio
@@ -74,9 +91,13 @@ class TestUploadDocumentUseCase:
         assert result.chunk_count == 2
         assert result.is_temporary is False
 
-        # Verify calls
-        mock_document_processor.extract_text.assert_called_once_with(sample_csv_content, "csv")
-        mock_document_processor.chunk_text.assert_called_once()
+        # Verify calls: CSV rows are chunks, no text extraction or splitting
+        mock_document_processor.extract_tabular_chunks_from_csv.assert_called_once_with(sample_csv_content)
+        mock_document_processor.extract_text.assert_not_called()
+        mock_document_processor.chunk_text.assert_not_called()
+        assert mock_vector_store.add_chunks.call_args.kwargs["chunks"] == (
+            mock_document_processor.extract_tabular_chunks_from_csv.return_value
+        )
         mock_embedding_service.generate_embeddings.assert_called_once()
         mock_vector_store.add_chunks.assert_called_once()
         mock_document_repository.save.assert_called_once()
@@ -85,17 +106,16 @@ class TestUploadDocumentUseCase:
     async def test_execute_empty_text(
         self,
         usecase,
-        mock_document_processor,
-        sample_csv_content
+        mock_document_processor
     ):
-        """Test upload with empty extracted text."""
+        """Test upload of a text document with empty extracted text."""
         mock_document_processor.extract_text.return_value = ""
 
         with pytest.raises(ValueError, match="No text could be extracted"):
             await usecase.execute(
-                filename="empty.csv",
-                file_content=sample_csv_content,
-                file_type="csv"
+                filename="empty.pdf",
+                file_content=b"%PDF",
+                file_type="pdf"
             )
 
     @pytest.mark.asyncio
@@ -105,9 +125,8 @@ class TestUploadDocumentUseCase:
         mock_document_processor,
         sample_csv_content
     ):
-        """Test upload with no chunks created."""
-        mock_document_processor.extract_text.return_value = "Some text"
-        mock_document_processor.chunk_text.return_value = []
+        """Test upload of a CSV without rows."""
+        mock_document_processor.extract_tabular_chunks_from_csv.return_value = []
 
         with pytest.raises(ValueError, match="No chunks could be created"):
             await usecase.execute(
@@ -132,6 +151,126 @@ class TestUploadDocumentUseCase:
 
         assert result.is_temporary is True
 
+    @pytest.mark.asyncio
+    async def test_execute_conversation_attachment(
+        self,
+        mock_document_repository,
+        mock_vector_store,
+        mock_embedding_service,
+        mock_document_processor,
+        mock_ingestion_repository,
+        sample_csv_content
+    ):
+        """Test that attachments of a conversation skip the shared vector store."""
+        conversation_index = AsyncMock()
+        usecase = UploadDocumentUseCase(
+            document_repository=mock_document_repository,
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            document_processor=mock_document_processor,
+            ingestion_repository=mock_ingestion_repository,
+            conversation_index=conversation_index
+        )
+
+        await usecase.execute(
+            filename="temp.csv",
+            file_content=sample_csv_content,
+            file_type="csv",
+            is_temporary=True,
+            conversation_id="conv-1"
+        )
+
+        conversation_index.add_chunks.assert_called_once()
+        assert conversation_index.add_chunks.call_args.kwargs["conversation_id"] == "conv-1"
+        mock_vector_store.add_chunks.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_indexes_keywords(
+        self,
+        mock_document_repository,
+        mock_vector_store,
+        mock_embedding_service,
+        mock_document_processor,
+        mock_ingestion_repository,
+        sample_csv_content
+    ):
+        """Test that stored chunks are also added to the keyword index with the same positions."""
+        lexical_index = AsyncMock()
+        usecase = UploadDocumentUseCase(
+            document_repository=mock_document_repository,
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            document_processor=mock_document_processor,
+            ingestion_repository=mock_ingestion_repository,
+            lexical_index=lexical_index
+        )
+
+        await usecase.execute(filename="data.csv", file_content=sample_csv_content, file_type="csv")
+
+        lexical_index.add_chunks.assert_called_once()
+        kwargs = lexical_index.add_chunks.call_args.kwargs
+        assert kwargs["document_id"] == "test-doc-id"
+        assert kwargs["chunks"] == mock_vector_store.add_chunks.call_args.kwargs["chunks"]
+        assert kwargs["start_index"] == 0
+
+    @pytest.mark.asyncio
+    async def test_execute_stores_typed_table(
+        self,
+        mock_document_repository,
+        mock_vector_store,
+        mock_embedding_service,
+        mock_document_processor,
+        mock_ingestion_repository,
+        sample_csv_content
+    ):
+        """Test that tabular documents also get their typed table stored."""
+        table_store = AsyncMock()
+        usecase = UploadDocumentUseCase(
+            document_repository=mock_document_repository,
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            document_processor=mock_document_processor,
+            ingestion_repository=mock_ingestion_repository,
+            table_store=table_store
+        )
+
+        await usecase.execute(filename="data.csv", file_content=sample_csv_content, file_type="csv")
+
+        mock_document_processor.extract_typed_table.assert_called_once_with(sample_csv_content, "csv")
+        table_store.save_table.assert_called_once_with(
+            "test-doc-id", mock_document_processor.extract_typed_table.return_value
+        )
+
+    @pytest.mark.asyncio
+    async def test_execute_indexes_rollups(
+        self,
+        usecase,
+        mock_vector_store,
+        mock_document_processor,
+        sample_csv_content
+    ):
+        """Test that tabular documents with dates get period summaries as extra chunks."""
+        mock_document_processor.extract_typed_table.return_value = TypedTable(columns=[
+            TypedColumn("Fecha", DATE, np.array(["2024-01-01", "2024-01-02"], dtype="datetime64[D]")),
+            TypedColumn("Monto", CURRENCY, np.array([1500.0, 800.0]), unit="COP"),
+        ])
+
+        await usecase.execute(filename="data.csv", file_content=sample_csv_content, file_type="csv")
+
+        chunks, metadata = [], []
+        for call in mock_vector_store.add_chunks.call_args_list:
+            chunks.extend(call.kwargs["chunks"])
+            metadata.extend(call.kwargs["metadata"])
+        # Two rows, then one summary per month, quarter and year
+        assert len(chunks) == 5
+        assert "chunk_kind" not in metadata[0]
+        assert [(m["granularity"], m["period"]) for m in metadata[2:]] == [
+            ("month", "2024-01"), ("quarter", "2024-T1"), ("year", "2024")
+        ]
+        assert all(m["chunk_kind"] == "rollup" and m["document_id"] == "test-doc-id" for m in metadata[2:])
+        assert [m["chunk_index"] for m in metadata] == [0, 1, 2, 3, 4]
+        assert "Monto: suma 2.300 COP" in chunks[2]
+
     @pytest.mark.asyncio
     async def test_execute_metadata_creation(
         self,
@@ -155,4 +294,130 @@ class TestUploadDocumentUseCase:
         assert all(m["filename"] == "test.csv" for m in metadata)
         assert all(m["file_type"] == "csv" for m in metadata)
         assert metadata[0]["chunk_index"] == 0
-        assert metadata[1]["chunk_index"] == 1
\ No newline at end of file
+        assert metadata[1]["chunk_index"] == 1
+    @pytest.mark.asyncio
+    async def test_execute_writes_in_batches(
+        self,
+        usecase,
+        mock_document_processor,
+        mock_embedding_service,
+        mock_vector_store,
+        mock_document_repository,
+        monkeypatch
+    ):
+        """Test that the pipeline embeds and writes chunks in batches."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "INGEST_EMBED_BATCH_SIZE", 2)
+        mock_document_processor.extract_text.return_value = "Texto del documento."
+        mock_document_processor.chunk_text.return_value = [f"chunk {i}" for i in range(5)]
+        live = []
+
+        def generate_embeddings(texts):
+            # Metrics of the running pipeline are visible mid-upload
+            live.append(usecase.last_metrics.stages[0].items_in)
+            return [[0.1] * 4 for _ in texts]
+        mock_embedding_service.generate_embeddings.side_effect = generate_embeddings
+
+        result = await usecase.execute(
+            filename="report.pdf",
+            file_content=b"%PDF",
+            file_type="pdf"
+        )
+
+        assert live == [1, 1, 1]
+        assert result.chunk_count == 5
+        assert mock_embedding_service.generate_embeddings.call_count == 3
+        starts = sorted(c.kwargs["start_index"] for c in mock_vector_store.add_chunks.call_args_list)
+        assert starts == [0, 2, 4]
+        mock_document_repository.update.assert_called_once()
+        assert usecase.last_metrics.stages[-1].items_in == 3
+
+    @pytest.mark.asyncio
+    async def test_execute_parent_child_chunks(
+        self,
+        mock_document_repository,
+        mock_vector_store,
+        mock_embedding_service,
+        mock_document_processor,
+        mock_ingestion_repository,
+        monkeypatch
+    ):
+        """Test that parent mode stores parent windows and embeds their children with parent_index."""
+        from app.core.config import settings
+
+        monkeypatch.setattr(settings, "CONTEXT_EXPANSION", "parent")
+        mock_document_processor.extract_text.return_value = "Texto del documento."
+        mock_document_processor.chunk_text.side_effect = lambda text, chunk_size, overlap: (
+            ["ventas gastos", "nomina"] if chunk_size == settings.CHUNK_SIZE else text.split()
+        )
+        mock_embedding_service.generate_embeddings.side_effect = lambda texts: [[0.1] * 4 for _ in texts]
+        chunk_store = AsyncMock()
+        usecase = UploadDocumentUseCase(
+            document_repository=mock_document_repository,
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            document_processor=mock_document_processor,
+            ingestion_repository=mock_ingestion_repository,
+            chunk_store=chunk_store
+        )
+
+        result = await usecase.execute(filename="report.pdf", file_content=b"%PDF", file_type="pdf")
+
+        assert result.chunk_count == 3
+        kwargs = mock_vector_store.add_chunks.call_args.kwargs
+        assert kwargs["chunks"] == ["ventas", "gastos", "nomina"]
+        assert [m["parent_index"] for m in kwargs["metadata"]] == [0, 0, 1]
+        parents, children = chunk_store.add_chunks.call_args_list
+        assert parents.args == ("test-doc-id", ["ventas gastos", "nomina"])
+        assert parents.kwargs == {"start_index": 0, "kind": "parent"}
+        assert children.args == ("test-doc-id", ["ventas", "gastos", "nomina"])
+
+    @pytest.mark.asyncio
+    async def test_execute_invalid_document_cleans_up(
+        self,
+        usecase,
+        mock_document_processor,
+        mock_vector_store,
+        mock_document_repository,
+        mock_ingestion_repository
+    ):
+        """Test that a document without text is not left behind."""
+        mock_document_processor.extract_text.return_value = ""
+
+        with pytest.raises(ValueError, match="No text could be extracted"):
+            await usecase.execute(
+                filename="report.pdf",
+                file_content=b"%PDF",
+                file_type="pdf"
+            )
+
+        mock_vector_store.delete_document.assert_called_once_with("test-doc-id")
+        mock_ingestion_repository.delete_job.assert_called_once_with("test-doc-id")
+        mock_document_repository.delete.assert_called_once_with("test-doc-id")
+
+    @pytest.mark.asyncio
+    async def test_execute_failure_is_resumable(
+        self,
+        usecase,
+        mock_document_processor,
+        mock_embedding_service,
+        mock_document_repository,
+        mock_ingestion_repository
+    ):
+        """Test that a failed embedding keeps the document for resume."""
+        mock_document_processor.extract_text.return_value = "Texto del documento."
+        mock_embedding_service.generate_embeddings.side_effect = RuntimeError("rate limited")
+
+        with pytest.raises(IngestionError) as exc_info:
+            await usecase.execute(
+                filename="report.pdf",
+                file_content=b"%PDF",
+                file_type="pdf"
+            )
+
+        assert exc_info.value.document_id == "test-doc-id"
+        mock_document_repository.delete.assert_not_called()
+        status_call = mock_ingestion_repository.update_job_status.call_args
+        assert status_call.args[1] == "failed"
+        assert "rate limited" in status_call.kwargs["error"]